@@ -0,0 +1,190 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import re
+import threading
+from testEnviron import LogOutput
+from testEnviron import returnStruct
+
+"""
+Registry of the error signatures VSwitch.ErrorCheckCLI looks for in switch
+CLI output.  The signatures are compiled into one case insensitive
+alternation of named groups and the buffer is scanned once.  Feature modules
+add their own signatures with CliErrorRegister.
+
+When several signatures are found, the return code comes from the last line
+with an error, and on that line from the signature registered last.  A fatal
+signature ends the scan as soon as it is found.
+"""
+
+
+class CliErrorRegistry(object):
+    """
+    CliErrorRegistry Class definition
+
+    Ordered list of error signatures and the regex compiled out of them.
+    """
+
+    def __init__(self):
+        """
+        CliErrorRegistry init method
+        """
+        self.entries = []
+        self.groupEntries = dict()
+        self.regex = None
+        self.lock = threading.Lock()
+
+    def register(self, **kwargs):
+        """
+        register method
+
+        :param returnCode: return code of the error, replaces the entry of
+                           an already registered code
+        :type returnCode: integer
+        :param pattern: regular expression of the error, without groups,
+                        matched anywhere in a line
+        :type pattern: string
+        :param label: text logged in front of the matched error
+        :type label: string
+        :param fatal: stop the scan as soon as the error is found
+        :type fatal: boolean
+        :return: returnStruct object
+        :rtype: object
+        """
+        returnCode = kwargs.get('returnCode')
+        pattern = kwargs.get('pattern')
+        label = kwargs.get('label', "Error detected")
+        fatal = kwargs.get('fatal', False)
+        try:
+            patternGroups = re.compile(pattern).groups
+        except (re.error, TypeError) as e:
+            LogOutput('error', "Invalid CLI error pattern "
+                      + str(pattern) + ": " + str(e))
+            return returnStruct(returnCode=1)
+        if patternGroups != 0:
+            LogOutput('error', "CLI error pattern " + pattern
+                      + " must not contain groups")
+            return returnStruct(returnCode=1)
+        self.lock.acquire()
+        try:
+            self.entries = [curEntry for curEntry in self.entries
+                            if curEntry['returnCode'] != returnCode]
+            self.entries.append(dict(returnCode=returnCode,
+                                     pattern=pattern,
+                                     label=label,
+                                     fatal=fatal))
+            self.regex = None
+        finally:
+            self.lock.release()
+        return returnStruct(returnCode=0)
+
+    def compiled(self):
+        """
+        compiled method
+
+        :return: (regex, group name to (priority, entry)) of the current
+                 signatures, compiled on first use after a change
+        :rtype: tuple
+        """
+        self.lock.acquire()
+        try:
+            if self.regex is None:
+                patterns = []
+                self.groupEntries = dict()
+                for (priority, curEntry) in enumerate(self.entries):
+                    groupName = "e" + str(priority)
+                    self.groupEntries[groupName] = (priority, curEntry)
+                    patterns.append("(?P<" + groupName + ">"
+                                    + curEntry['pattern'] + ")")
+                self.regex = re.compile("|".join(patterns),
+                                        re.I | re.M)
+            return (self.regex, self.groupEntries)
+        finally:
+            self.lock.release()
+
+    def classify(self, **kwargs):
+        """
+        classify method
+
+        :param buffer: CLI output
+        :type buffer: string
+        :return: dictionary with returnCode, 0 when no error was found,
+                 fatal and errors, the list of (returnCode, matched text)
+                 in output order
+        :rtype: dictionary
+        """
+        buffer = kwargs.get('buffer', "")
+        (regex, groupEntries) = self.compiled()
+        returnDict = dict(returnCode=0, fatal=False, errors=[])
+        bestPriority = -1
+        bestLineStart = -2
+        for match in regex.finditer(buffer):
+            (priority, curEntry) = groupEntries[match.lastgroup]
+            errorText = match.group(match.lastgroup)
+            LogOutput('error', curEntry['label'] + "--->" + errorText)
+            returnDict['errors'].append((curEntry['returnCode'], errorText))
+            if curEntry['fatal'] is True:
+                returnDict['returnCode'] = curEntry['returnCode']
+                returnDict['fatal'] = True
+                break
+            lineStart = buffer.rfind("\n", 0, match.start())
+            if lineStart != bestLineStart or priority > bestPriority:
+                returnDict['returnCode'] = curEntry['returnCode']
+                bestPriority = priority
+                bestLineStart = lineStart
+        return returnDict
+
+
+cliErrorRegistry = CliErrorRegistry()
+
+
+def CliErrorRegister(**kwargs):
+    """
+    Library routine to add an error signature to the switch CLI error check
+
+    :param returnCode: return code of the error
+    :type returnCode: integer
+    :param pattern: regular expression of the error, without groups
+    :type pattern: string
+    :param label: text logged in front of the matched error
+    :type label: string
+    :param fatal: stop the error check as soon as the error is found
+    :type fatal: boolean
+    :return: returnStruct object
+    :rtype: object
+    """
+    return cliErrorRegistry.register(**kwargs)
+
+
+# Built in signatures, in the order ErrorCheckCLI has always checked them
+for (curCode, curPattern, curLabel) in [
+        (2, "command not found", "Error detected"),
+        (3, "unknown command", "Error detected"),
+        (4, "Command incomplete", "Error detected"),
+        (5, "LAG\s+port\s+doesn't\s+exist", "Error detected"),
+        (6, "no\s+matched\s+command", "Error detected"),
+        # ssh
+        (7, "Permission denied", "Error detected"),
+        # user add / remove
+        (8, "user [A-Za-z0-9]+ already exists", "Detected"),
+        (9, "Passwords do not match", "Detected"),
+        (10, "Unknown user:", "Detected"),
+        (11, "Cannot delete the last user:", "Detected"),
+        (12, "user [A-Za-z0-9_]+ is currently used by process", "Detected"),
+        (13, "Cannot add more interfaces to LAG. Maximum interface count "
+         "is reached", "Detected")]:
+    CliErrorRegister(returnCode=curCode, pattern=curPattern, label=curLabel)
+CliErrorRegister(returnCode=14, pattern="^Segmentation fault",
+                 label="Fatal error detected", fatal=True)
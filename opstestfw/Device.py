@@ -18,6 +18,8 @@ from opstestfw import *
 import opstestfw.switch
 import time
 import re
+import os
+import threading
 from Topology import Topology
 
 """
@@ -30,6 +32,8 @@ class Device (object):
     """
     This is the base class for any device.
     """
+    # Counter used to build a unique sentinel tag for each batch transaction
+    batchCounter = 0
 
     def __init__(self, **kwargs):
         """
@@ -49,6 +53,7 @@ class Device (object):
                            'bash-\d+.\d+#',
                            pexpect.EOF,
                            pexpect.TIMEOUT]
+        self.InteractDefaults()
         self.Connect()
 
     def cmd(self, cmd):
@@ -70,28 +75,64 @@ class Device (object):
         returnBuffer = retStruct.get('buffer')
         return returnBuffer
 
+    def ReservationTypeGet(self):
+        """
+        Method to look up the reservation type of the topology
+
+        :return: reservation id, "virtual" for docker topologies, None if
+                 the topology has no reservation
+        :rtype: string
+        """
+        model = getattr(self.topology, 'model', None)
+        if model is not None:
+            return model.reservation
+        rsvnEtreeElement = XmlGetElementsByTag(self.topology.TOPOLOGY,
+                                               ".//reservation/id")
+        if rsvnEtreeElement is None:
+            return None
+        return rsvnEtreeElement.text
+
+    def ConnectionInfoGet(self):
+        """
+        Method to look up the connection information of the device in the
+        topology
+
+        :return: dictionary with the name, ipAddr and port keys, None if the
+                 device is not in the topology
+        :rtype: dictionary
+        """
+        model = getattr(self.topology, 'model', None)
+        if model is not None:
+            return model.ConnectionGet(device=self.device)
+        xpathString = ".//device[name='" + self.device + "']/connection"
+        connElement = XmlGetElementsByTag(self.topology.TOPOLOGY, xpathString)
+        if connElement is None:
+            return None
+        connInfo = dict()
+        for curTag in ('name', 'ipAddr', 'port'):
+            curElement = connElement.find(curTag)
+            if curElement is None:
+                connInfo[curTag] = None
+            else:
+                connInfo[curTag] = curElement.text
+        return connInfo
+
     def Connect(self):
         """
         Method to connect to device
         """
         # Look up and see if we are physical or virtual
-        xpathString = ".//reservation/id"
-        rsvnEtreeElement = XmlGetElementsByTag(self.topology.TOPOLOGY,
-                                               xpathString)
-        if rsvnEtreeElement is None:
+        rsvnType = self.ReservationTypeGet()
+        if rsvnType is None:
             # We are not in a good situation, we need to bail
             opstestfw.LogOutput('error',
                                 "Could not find reservation id tag in topology")
             return None
 
-        rsvnType = rsvnEtreeElement.text
-
         # Look up the device name in the topology - grab connectivity
         # information
-        xpathString = ".//device[name='" + self.device + "']"
-        etreeElement = XmlGetElementsByTag(self.topology.TOPOLOGY,
-                                           xpathString)
-        if etreeElement is None:
+        connInfo = self.ConnectionInfoGet()
+        if connInfo is None:
             # We are not in a good situation, we need to bail
             opstestfw.LogOutput('error', "Could not find device "
                                 + self.device + " in topology")
@@ -99,11 +140,7 @@ class Device (object):
         if rsvnType == 'virtual':
             # Code for virtual
             # Go and grab the connection name
-            xpathString = ".//device[name='\
-                          " + self.device + "']/connection/name"
-            virtualConn = XmlGetElementsByTag(self.topology.TOPOLOGY,
-                                              xpathString)
-            if virtualConn is None:
+            if connInfo['name'] is None:
                 opstestfw.LogOutput('error',
                                     "Failed to virtual connection for "
                                     + self.device)
@@ -111,39 +148,27 @@ class Device (object):
             telnetString = "docker exec -ti " + self.device + " /bin/bash"
         else:
             # Code for physical
-            # Grab IP from etree
-            xpthStr = ".//device[name='" + self.device + "']/connection/ipAddr"
-            ipNode = XmlGetElementsByTag(self.topology.TOPOLOGY, xpthStr)
-            if ipNode is None:
+            if connInfo['ipAddr'] is None:
                 opstestfw.LogOutput('error',
                                     "Failed to obtain IP address for device "
                                     + self.device)
                 return None
 
-            self.ipAddress = ipNode.text
+            self.ipAddress = connInfo['ipAddr']
             opstestfw.LogOutput('debug', self.device
                                 + " connection IP address:  "
                                 + self.ipAddress)
 
-            # Grab Port from etree
-            xpathStr = ".//device[name='" + self.device + "']/connection/port"
-            portNode = XmlGetElementsByTag(self.topology.TOPOLOGY, xpathStr)
-            if portNode is None:
+            if connInfo['port'] is None:
                 opstestfw.LogOutput('error',
                                     "Failed to obtain Port for device "
                                     + self.device)
                 return None
 
-            self.port = portNode.text
+            self.port = connInfo['port']
             opstestfw.LogOutput('debug', self.device + " connection port:  "
                                 + self.port)
 
-            # Grab a connetion element - not testing this since this should
-            # exist since we obtained things before us
-            # xpathString = ".//device[name='" + self.device + "']/connection"
-            # connectionElement = XmlGetElementsByTag(self.topology.TOPOLOGY,
-            #                                        xpathString)
-
             # Create Telnet handle
             # Enable expect device Logging for every connection
             # Single Log file exists for logging device exchange using pexpect
@@ -174,6 +199,7 @@ class Device (object):
                 self.expectHndl = pexpect.spawn(telnetString,
                                                 echo=False,
                                                 logfile=logFile)
+                self.InteractSpawnTune()
 
             # Lets go and detect our connection - this will get us to a context
             # we know about
@@ -207,7 +233,8 @@ class Device (object):
         bailflag = 0
 
         self.expectHndl.send('\r')
-        time.sleep(2)
+        if self.lowLatency is False:
+            time.sleep(2)
         connectionBuffer = []
         sanitizedBuffer = ""
         while bailflag == 0:
@@ -271,14 +298,18 @@ class Device (object):
         retStruct['buffer'] = []
 
         # Send the command
-        self.expectHndl.send(command)
-        self.expectHndl.send('\r')
-        time.sleep(1)
+        startTime = time.time()
+        waitTime = 0.0
+        self.InteractSend(command)
+        if self.lowLatency is False:
+            time.sleep(1)
         connectionBuffer = []
 
         while bailflag == 0:
+            waitStart = time.time()
             index = self.expectHndl.expect(self.expectList,
                                            timeout=120)
+            waitTime += time.time() - waitStart
             if index == 0:
                 # Need to send login string
                 self.expectHndl.send("root \r")
@@ -306,7 +337,10 @@ class Device (object):
             else:
                 connectionBuffer.append(self.expectHndl.before)
                 connectionBuffer.append(self.expectHndl.after)
-                self.expectHndl.expect(['$'], timeout=1)
+                if self.lowLatency is True:
+                    connectionBuffer.append(self.InteractDrain())
+                else:
+                    self.expectHndl.expect(['$'], timeout=1)
 
         santString = ""
         for curLine in connectionBuffer:
@@ -331,6 +365,8 @@ class Device (object):
                             + santString + "\n")
         retStruct['returnCode'] = returnCode
         retStruct['buffer'] = santString
+        self.InteractStatsRecord(totalTime=time.time() - startTime,
+                                 waitTime=waitTime)
         return retStruct
 
     def ErrorCheck(self, **kwargs):
@@ -379,3 +415,299 @@ class Device (object):
 
         retStruct['returnCode'] = returnCode
         return retStruct
+
+    def BatchCommandsBuild(self, **kwargs):
+        """
+        Method to build the payload for a batch transaction.  A sentinel
+        marker is injected after every command so the captured output can be
+        split back into one result per command.  In the linux context the
+        marker is an echo that also carries the exit status of the command.
+        In the vtysh contexts the marker is a comment line, which vtysh
+        ignores but echoes back.
+
+        :param commands: list of command strings to send
+        :type commands: list
+        :param context: "linux" for a shell, "CLI" for a vtysh context
+        :type context: string
+        :return: tuple of the sentinel tag and the string to write
+        :rtype: tuple
+        """
+        commands = kwargs.get('commands', [])
+        context = kwargs.get('context', "linux")
+
+        Device.batchCounter += 1
+        tag = "OPSBATCH" + str(os.getpid()) + "x" + str(Device.batchCounter)
+        payload = ""
+        for index in range(0, len(commands)):
+            payload += str(commands[index]) + "\r"
+            if context == "linux":
+                # The quotes keep the echoed command line from matching the
+                # marker, only the output of the echo will match
+                payload += "echo " + tag + "\"\"_" + str(index + 1) \
+                    + "_$?\r"
+            else:
+                payload += "! " + tag + "_" + str(index + 1) + "\r"
+        return (tag, payload)
+
+    def BatchBufferSplit(self, **kwargs):
+        """
+        Method to split the buffer of a batch transaction into the output of
+        each command, using the sentinel markers injected by
+        BatchCommandsBuild.
+
+        :param buffer: buffer captured for the whole batch
+        :type buffer: string
+        :param tag: sentinel tag returned by BatchCommandsBuild
+        :type tag: string
+        :param count: number of commands in the batch
+        :type count: integer
+        :param commands: commands of the batch, used to strip the prompt the
+                         previous command left in front of each echoed
+                         command
+        :type commands: list
+        :return: list of dictionaries with buffer and exitStatus keys.
+                 exitStatus is None when the marker did not carry one and
+                 the buffer is None when the marker was never seen
+        :rtype: list
+        """
+        buffer = kwargs.get('buffer', "")
+        tag = kwargs.get('tag')
+        count = kwargs.get('count', 0)
+        commands = kwargs.get('commands', None)
+
+        results = []
+        for index in range(0, count):
+            results.append({'buffer': None, 'exitStatus': None})
+
+        markerRe = re.compile("(?:! )?" + re.escape(tag) +
+                              "_(\d+)(?:_(\d+))?")
+        echoRe = re.compile("[^\n]*" + re.escape(tag) + "\"\"[^\n]*\n?")
+        startPos = 0
+        for curMatch in markerRe.finditer(buffer):
+            index = int(curMatch.group(1)) - 1
+            if index < 0 or index >= count:
+                continue
+            chunk = buffer[startPos:curMatch.start()]
+            # Drop the echoed marker command lines from the output
+            chunk = echoRe.sub("", chunk)
+            if index > 0:
+                # Everything up to the echoed command is the prompt line the
+                # previous command left behind
+                chunk = chunk.lstrip("\r\n")
+                if commands is not None and index < len(commands):
+                    firstLine = chunk.split("\n", 1)[0]
+                    cmdPos = firstLine.find(str(commands[index]))
+                    if cmdPos > 0:
+                        chunk = chunk[cmdPos:]
+            results[index]['buffer'] = chunk
+            if curMatch.group(2) is not None:
+                results[index]['exitStatus'] = int(curMatch.group(2))
+            startPos = curMatch.end()
+        if count > 0 and results[count - 1]['buffer'] is not None:
+            # Keep the trailing prompt with the last command output
+            results[count - 1]['buffer'] += echoRe.sub("", buffer[startPos:])
+        return results
+
+    def InteractDefaults(self):
+        """
+        Method to set the low latency and interaction statistics members.
+        Low latency mode is turned on for every device when the VSILOWLATENCY
+        environment variable is set.
+        """
+        envLowLatency = os.environ.get('VSILOWLATENCY', None)
+        self.lowLatency = envLowLatency is not None
+        # Devices connect on first use unless VSIEAGERCONNECT is set
+        envEagerConnect = os.environ.get('VSIEAGERCONNECT', None)
+        self.lazyConnect = envEagerConnect is None
+        self.connectPending = False
+        self.connecting = False
+        self.connectLock = threading.RLock()
+        self.InteractStatsReset()
+
+    def setLowLatency(self, **kwargs):
+        """
+        Method to turn the low latency interaction mode on or off.  In low
+        latency mode a command and its terminator are sent in one write with
+        no send delay, no fixed sleeps are taken, and whatever the device
+        sent after the prompt is drained without waiting.
+
+        :param enable: True to turn low latency mode on, False to turn it off
+        :type enable: boolean
+        """
+        self.lowLatency = kwargs.get('enable', True)
+        if self.Connected() is True:
+            self.InteractSpawnTune()
+
+    def ExpectHndlGet(self):
+        """
+        Method behind the expectHndl member.  If the connection to the
+        device was deferred, the device is connected the first time the
+        expect handle is used.
+
+        :return: expect handle
+        :rtype: object
+        """
+        if self.__dict__.get('connectPending', False) is True:
+            self.LazyConnect()
+        return self.__dict__.get('expectHandle', None)
+
+    def ExpectHndlSet(self, expectHndl):
+        """
+        Method behind the expectHndl member, sets the expect handle.
+
+        :param expectHndl: expect handle
+        :type expectHndl: object
+        """
+        self.__dict__['expectHandle'] = expectHndl
+
+    expectHndl = property(ExpectHndlGet, ExpectHndlSet)
+
+    def ConnectDefer(self):
+        """
+        Method to postpone connecting to the device until its expect handle
+        is first used, by DeviceInteract, cmd or a library routine.
+        """
+        self.connectPending = True
+
+    def ConnectPending(self):
+        """
+        Method to check if the connection to the device is deferred
+
+        :return: True if the device has not been connected yet
+        :rtype: boolean
+        """
+        return self.connectPending
+
+    def Connected(self):
+        """
+        Method to check if the device has an expect handle, without
+        connecting a deferred device.
+
+        :return: True if the device has an expect handle
+        :rtype: boolean
+        """
+        expectHndl = self.__dict__.get('expectHandle', None)
+        return expectHndl is not None and expectHndl != ""
+
+    def LazyConnect(self):
+        """
+        Method to connect a device whose connection was deferred.  Only one
+        thread connects, the others wait for it.
+        """
+        self.connectLock.acquire()
+        try:
+            if self.connectPending is False or self.connecting is True:
+                return
+            self.connecting = True
+            try:
+                opstestfw.LogOutput('debug', "Connecting to "
+                                    + str(self.device) + " on first use")
+                self.Connect()
+                self.connectPending = False
+                self.ConnectDone()
+            finally:
+                self.connecting = False
+        finally:
+            self.connectLock.release()
+
+    def ConnectDone(self):
+        """
+        Method called once a deferred connection is made, to get the device
+        to the context it would have been left in by an eager connect.
+        """
+        pass
+
+    def InteractSpawnTune(self):
+        """
+        Method to apply the low latency settings to a new expect handle.
+        """
+        if self.lowLatency is True:
+            self.expectHndl.delaybeforesend = 0
+
+    def InteractSend(self, command):
+        """
+        Method to send a command followed by a carriage return
+
+        :param command: command string to send
+        :type command: string
+        """
+        if self.lowLatency is True:
+            self.expectHndl.send(command + '\r')
+        else:
+            self.expectHndl.send(command)
+            self.expectHndl.send('\r')
+
+    def InteractDrain(self):
+        """
+        Method to collect whatever the device sent after the matched prompt
+        without waiting for more output.
+
+        :return: string of the drained output
+        :rtype: string
+        """
+        drained = self.expectHndl.buffer
+        self.expectHndl.buffer = ""
+        while True:
+            try:
+                drained += self.expectHndl.read_nonblocking(4096, 0)
+            except pexpect.TIMEOUT:
+                break
+            except pexpect.EOF:
+                break
+        return drained
+
+    def InteractStatsReset(self):
+        """
+        Method to clear the per command interaction statistics
+        """
+        self.interactStats = dict()
+        self.interactStats['commands'] = 0
+        self.interactStats['totalTime'] = 0.0
+        self.interactStats['waitTime'] = 0.0
+        self.interactStats['overheadTime'] = 0.0
+        self.interactStats['maxOverhead'] = 0.0
+        self.interactStats['lastOverhead'] = 0.0
+
+    def InteractStatsRecord(self, **kwargs):
+        """
+        Method to record the timing of one command transaction.  The time
+        spent waiting on the device for output is the device latency, the
+        rest is framework overhead.
+
+        :param totalTime: seconds from send to return of the transaction
+        :type totalTime: float
+        :param waitTime: seconds spent waiting for output from the device
+        :type waitTime: float
+        """
+        totalTime = kwargs.get('totalTime', 0.0)
+        waitTime = kwargs.get('waitTime', 0.0)
+        overhead = max(totalTime - waitTime, 0.0)
+        self.interactStats['commands'] += 1
+        self.interactStats['totalTime'] += totalTime
+        self.interactStats['waitTime'] += waitTime
+        self.interactStats['overheadTime'] += overhead
+        self.interactStats['lastOverhead'] = overhead
+        if overhead > self.interactStats['maxOverhead']:
+            self.interactStats['maxOverhead'] = overhead
+
+    def InteractStatsGet(self):
+        """
+        Method to get the interaction statistics of this device
+
+        :return: dictionary with commands, totalTime, waitTime, overheadTime,
+                 maxOverhead, lastOverhead and avgOverhead keys
+        :rtype: dictionary
+        """
+        stats = dict(self.interactStats)
+        if stats['commands'] > 0:
+            stats['avgOverhead'] = stats['overheadTime'] / stats['commands']
+        else:
+            stats['avgOverhead'] = 0.0
+        opstestfw.LogOutput('debug', "Interaction stats for "
+                            + str(self.device) + ": "
+                            + str(stats['commands']) + " commands, "
+                            + "%.4f" % stats['avgOverhead']
+                            + "s average overhead, "
+                            + "%.4f" % stats['maxOverhead']
+                            + "s max overhead")
+        return stats
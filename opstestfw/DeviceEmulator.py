@@ -0,0 +1,417 @@
+#!/usr/bin/env python
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import sys
+import os
+import re
+import time
+import json
+import shlex
+import optparse
+
+"""
+Local stand-in for a switch or workstation container.  The emulator is run in
+place of "docker exec -ti <container> /bin/bash" and speaks the prompts VSwitch
+and VHost expect - the bash prompt, vtysh with its config and config
+subcontext prompts, --More-- paging and yes/no confirmations.  Commands are
+answered with canned output of a configurable size, or with the output of a
+script, after a configurable latency.  It only uses the standard library so
+the interaction layer can be exercised on any Linux box.
+
+    DeviceEmulator.py [options] <name> [/bin/bash]
+
+A script is a JSON list of entries, the first entry whose "match" regular
+expression is found in a command answers it:
+
+    [{"match": "^show version", "context": "vtysh",
+      "output": "OpenSwitch 0.1.0\n", "exitCode": 0},
+     {"match": "^erase", "context": "vtysh", "confirm": "yn", "lines": 2}]
+
+context is "linux", "vtysh" (any vtysh context) or "any", output is the text
+to print or lines the number of canned lines, confirm asks "(yes/no)?" or
+"[y/n]?" before answering and latency overrides the emulator latency.
+"""
+
+# Path of the emulator script, resolved when the module is imported.  The
+# test environment changes the working directory to the results directory
+# before the emulator is started, which breaks a relative __file__.
+emulatorScript = os.path.abspath(__file__)
+if emulatorScript.endswith(".pyc"):
+    emulatorScript = emulatorScript[:-1]
+
+
+class DeviceEmulator(object):
+    """
+    DeviceEmulator Class definition
+
+    Reads commands from stdin and answers them on stdout the way the shell
+    and vtysh of a device would.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        DeviceEmulator init method
+
+        :param name: device name used in the prompts
+        :type name: string
+        :param category: "switch" or "workstation"
+        :type category: string
+        :param latency: seconds to wait before answering a command
+        :type latency: float
+        :param outputLines: number of canned output lines
+        :type outputLines: integer
+        :param outputWidth: width of the canned output lines
+        :type outputWidth: integer
+        :param pageLines: lines per page in vtysh, 0 to turn paging off
+        :type pageLines: integer
+        :param script: list of script entries
+        :type script: list
+        """
+        self.name = kwargs.get('name', "emulator")
+        self.category = kwargs.get('category', "switch")
+        self.latency = kwargs.get('latency', 0.0)
+        self.outputLines = kwargs.get('outputLines', 10)
+        self.outputWidth = kwargs.get('outputWidth', 60)
+        self.pageLines = kwargs.get('pageLines', 0)
+        self.script = []
+        for entry in kwargs.get('script', []):
+            entry = dict(entry)
+            entry['regex'] = re.compile(entry['match'])
+            self.script.append(entry)
+        self.hostname = "switch"
+        self.ps1 = None
+        self.exitCode = 0
+        # linux, vtysh, config or config-<name>
+        self.context = "linux"
+        # vtysh -c commands are not paged
+        self.oneShot = False
+        self.subContexts = {"interface": "config-if",
+                            "router": "config-router",
+                            "vlan": "config-vlan",
+                            "lag": "config-lag"}
+
+    def write(self, text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    def prompt(self):
+        """
+        prompt method
+
+        :return: prompt of the current context
+        :rtype: string
+        """
+        if self.context == "vtysh":
+            return self.hostname + "# "
+        if self.context != "linux":
+            return self.hostname + "(" + self.context + ")# "
+        if self.ps1 is not None:
+            prompt = self.ps1.replace("\\u", "root")
+            prompt = prompt.replace("\\h", self.name)
+            prompt = prompt.replace("\\W", "~")
+            return prompt.replace("$?", str(self.exitCode))
+        return "root@" + self.name + ":~# "
+
+    def cannedOutput(self, lines):
+        """
+        cannedOutput method
+
+        :param lines: number of lines
+        :type lines: integer
+        :return: filler output
+        :rtype: string
+        """
+        output = ""
+        for index in range(1, lines + 1):
+            line = "%s line %d " % (self.name, index)
+            output += (line * (self.outputWidth // len(line) + 1))[
+                :self.outputWidth] + "\n"
+        return output
+
+    def scriptEntryGet(self, command):
+        """
+        scriptEntryGet method
+
+        :param command: command line
+        :type command: string
+        :return: first script entry answering the command, None if there is
+                 none
+        :rtype: dictionary
+        """
+        for entry in self.script:
+            context = entry.get('context', "any")
+            if context == "linux" and self.context != "linux":
+                continue
+            if context == "vtysh" and self.context == "linux":
+                continue
+            if entry['regex'].search(command):
+                return entry
+        return None
+
+    def confirm(self, style):
+        """
+        confirm method
+
+        Asks for a confirmation and reads the answer.
+
+        :param style: "yesno" or "yn"
+        :type style: string
+        :return: True if the answer was yes
+        :rtype: boolean
+        """
+        if style == "yn":
+            self.write("Do you want to continue [y/n]? ")
+        else:
+            self.write("Are you sure you want to continue (yes/no)? ")
+        answer = sys.stdin.readline()
+        self.write(answer)
+        return answer.strip().lower() in ("y", "yes")
+
+    def page(self, output):
+        """
+        page method
+
+        Writes the output of a vtysh command, pausing at every page with a
+        --More-- prompt.
+
+        :param output: command output
+        :type output: string
+        """
+        if self.pageLines <= 0 or self.context == "linux" \
+                or self.oneShot is True:
+            self.write(output)
+            return
+        lines = output.splitlines(True)
+        for index in range(0, len(lines), self.pageLines):
+            self.write("".join(lines[index:index + self.pageLines]))
+            if index + self.pageLines >= len(lines):
+                break
+            self.write("--More--")
+            answer = sys.stdin.readline()
+            self.write("\n")
+            if answer.strip() == "q":
+                break
+
+    def scripted(self, command, entry):
+        """
+        scripted method
+
+        Answers a command with a script entry.
+
+        :param command: command line
+        :type command: string
+        :param entry: script entry
+        :type entry: dictionary
+        """
+        time.sleep(entry.get('latency', self.latency))
+        if 'confirm' in entry and self.confirm(entry['confirm']) is False:
+            self.exitCode = 1
+            return
+        if 'output' in entry:
+            output = entry['output']
+        else:
+            output = self.cannedOutput(entry.get('lines', self.outputLines))
+        self.page(output)
+        self.exitCode = entry.get('exitCode', 0)
+
+    def linuxCommand(self, command):
+        """
+        linuxCommand method
+
+        :param command: command line
+        :type command: string
+        """
+        words = command.split()
+        if words[0] == "exit":
+            sys.exit(0)
+        if words[0] == "vtysh":
+            if self.category != "switch":
+                self.write("bash: vtysh: command not found\n")
+                self.exitCode = 127
+                return
+            if len(words) == 1:
+                self.context = "vtysh"
+                self.exitCode = 0
+                return
+            # vtysh -c cmd1 -c cmd2 ...
+            try:
+                args = shlex.split(command)
+            except ValueError:
+                args = words
+            self.context = "vtysh"
+            self.oneShot = True
+            for index in range(1, len(args) - 1):
+                if args[index] == "-c":
+                    self.vtyshCommand(args[index + 1])
+            self.oneShot = False
+            self.context = "linux"
+            return
+        if words[0] == "echo":
+            text = command[len("echo"):].replace("$?", str(self.exitCode))
+            try:
+                text = " ".join(shlex.split(text))
+            except ValueError:
+                text = text.strip()
+            self.write(text + "\n")
+            self.exitCode = 0
+            return
+        if words[0] == "export" and command.find("PS1=") != -1:
+            try:
+                args = shlex.split(command)
+            except ValueError:
+                args = []
+            for curArg in args:
+                if curArg.startswith("PS1="):
+                    self.ps1 = curArg[len("PS1="):]
+            self.exitCode = 0
+            return
+        if words[0] in ("true", "cd"):
+            self.exitCode = 0
+            return
+        if words[0] == "false":
+            self.exitCode = 1
+            return
+        time.sleep(self.latency)
+        self.write(self.cannedOutput(self.outputLines))
+        self.exitCode = 0
+
+    def vtyshCommand(self, command):
+        """
+        vtyshCommand method
+
+        :param command: command line
+        :type command: string
+        """
+        words = command.split()
+        if words[0].startswith("!"):
+            return
+        entry = self.scriptEntryGet(command)
+        if entry is not None:
+            self.scripted(command, entry)
+            return
+        if words[0] == "exit":
+            if self.context == "vtysh":
+                self.context = "linux"
+            elif self.context == "config":
+                self.context = "vtysh"
+            else:
+                self.context = "config"
+            return
+        if words[0] == "end":
+            self.context = "vtysh"
+            return
+        if words[0] in ("configure", "config", "conf") and \
+                self.context == "vtysh":
+            self.context = "config"
+            return
+        if self.context != "vtysh" and words[0] in self.subContexts:
+            self.context = self.subContexts[words[0]]
+            return
+        if words[0] == "hostname" and len(words) > 1 \
+                and self.context == "config":
+            self.hostname = words[1]
+            return
+        if words[0] in ("show", "do", "copy", "ping", "traceroute"):
+            time.sleep(self.latency)
+            self.page(self.cannedOutput(self.outputLines))
+            return
+        if self.context == "vtysh":
+            self.write("% Unknown command.\n")
+            return
+        # Configuration commands are accepted silently
+        time.sleep(self.latency)
+
+    def run(self):
+        """
+        run method
+
+        Answers commands until stdin is closed or the shell is exited.
+        """
+        self.write(self.prompt())
+        while True:
+            line = sys.stdin.readline()
+            if line == "":
+                break
+            command = line.strip("\r\n")
+            # Echo the command line the way readline does
+            self.write(command + "\n")
+            if command.strip() != "":
+                entry = None
+                if self.context == "linux":
+                    entry = self.scriptEntryGet(command)
+                if entry is not None:
+                    self.scripted(command, entry)
+                elif self.context == "linux":
+                    self.linuxCommand(command.strip())
+                else:
+                    self.vtyshCommand(command.strip())
+            self.write(self.prompt())
+
+
+def EmulatorCommandGet(**kwargs):
+    """
+    Library routine to build the command that runs the emulator for a device,
+    used in place of the docker exec connection string
+
+    :param category: "switch" or "workstation"
+    :type category: string
+    :param options: extra emulator options
+    :type options: string
+    :return: command line prefix, the device name is appended to it
+    :rtype: string
+    """
+    category = kwargs.get('category', "switch")
+    options = kwargs.get('options', "")
+    return "%s %s --category %s %s " % (sys.executable, emulatorScript,
+                                        category, options)
+
+
+def EmulatorMain():
+    parser = optparse.OptionParser(
+        usage="%prog [options] <name> [/bin/bash]")
+    parser.add_option("--category", default="switch",
+                      help="switch or workstation")
+    parser.add_option("--latency", type="float", default=0.0,
+                      help="seconds to wait before answering a command")
+    parser.add_option("--output-lines", type="int", default=10,
+                      help="number of canned output lines")
+    parser.add_option("--output-width", type="int", default=60,
+                      help="width of the canned output lines")
+    parser.add_option("--page-lines", type="int", default=0,
+                      help="lines per vtysh page, 0 to turn paging off")
+    parser.add_option("--script", default=None,
+                      help="JSON file of scripted answers")
+    (options, args) = parser.parse_args()
+    name = "emulator"
+    if len(args) > 0:
+        name = args[0]
+    script = []
+    if options.script is not None:
+        scriptFile = open(options.script)
+        script = json.load(scriptFile)
+        scriptFile.close()
+    emulator = DeviceEmulator(name=name,
+                              category=options.category,
+                              latency=options.latency,
+                              outputLines=options.output_lines,
+                              outputWidth=options.output_width,
+                              pageLines=options.page_lines,
+                              script=script)
+    emulator.run()
+
+
+if __name__ == "__main__":
+    EmulatorMain()
@@ -0,0 +1,285 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import sys
+import time
+import threading
+import Queue
+from testEnviron import LogOutput
+
+"""
+Device sessions let a test case drive several devices at the same time.
+Every session owns one worker thread that runs the requests for its device
+in order, over the device object's existing connection, so the prompt
+handling and error checking are the ones of VSwitch and VHost.
+"""
+
+
+class DeviceRequest(object):
+    """
+    DeviceRequest Class definition
+
+    Handle for a request queued on a DeviceSession.  The caller keeps running
+    while the request is in progress and collects the outcome with the wait
+    and result methods.
+    """
+
+    def __init__(self, function, **kwargs):
+        """
+        DeviceRequest init method
+
+        :param function: callable to run on the session worker
+        :type function: function
+        """
+        self.function = function
+        self.kwargs = kwargs
+        self.doneEvent = threading.Event()
+        self.returnValue = None
+        self.excInfo = None
+        self.startTime = None
+        self.endTime = None
+
+    def run(self):
+        """
+        run method
+
+        Runs the request on the session worker.  Any exception, including
+        the SystemExit raised on a lost connection, is kept so it can be
+        raised again in the caller by the result method.
+        """
+        self.startTime = time.time()
+        try:
+            self.returnValue = self.function(**self.kwargs)
+        except BaseException:
+            self.excInfo = sys.exc_info()
+        self.endTime = time.time()
+        self.doneEvent.set()
+
+    def done(self):
+        """
+        done method
+
+        :return: True if the request completed
+        :rtype: boolean
+        """
+        return self.doneEvent.is_set()
+
+    def wait(self, **kwargs):
+        """
+        wait method
+
+        Waits for the request to complete.
+
+        :param timeout: seconds to wait, None to wait forever
+        :type timeout: float
+        :return: True if the request completed
+        :rtype: boolean
+        """
+        timeout = kwargs.get('timeout', None)
+        self.doneEvent.wait(timeout)
+        return self.doneEvent.is_set()
+
+    def result(self, **kwargs):
+        """
+        result method
+
+        Waits for the request to complete and returns what the device method
+        returned.  An exception raised by the device method is raised again
+        here.
+
+        :param timeout: seconds to wait, None to wait forever
+        :type timeout: float
+        :return: return value of the device method, None on timeout
+        """
+        timeout = kwargs.get('timeout', None)
+        if self.wait(timeout=timeout) is False:
+            LogOutput('error', "Timed out waiting for device request")
+            return None
+        if self.excInfo is not None:
+            raise self.excInfo[0], self.excInfo[1], self.excInfo[2]
+        return self.returnValue
+
+    def elapsed(self):
+        """
+        elapsed method
+
+        :return: seconds the request took to run, None if not complete
+        :rtype: float
+        """
+        if self.endTime is None:
+            return None
+        return self.endTime - self.startTime
+
+
+class DeviceSession(object):
+    """
+    DeviceSession Class definition
+
+    Runs the requests for one device object on a worker thread of its own.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        DeviceSession init method
+
+        :param deviceObj: VSwitch or VHost device object
+        :type deviceObj: object
+        """
+        self.deviceObj = kwargs.get('deviceObj', None)
+        self.requestQueue = Queue.Queue()
+        self.worker = threading.Thread(target=self.workerLoop,
+                                       name="DeviceSession-"
+                                       + str(self.deviceObj.device))
+        self.worker.daemon = True
+        self.worker.start()
+
+    def workerLoop(self):
+        """
+        workerLoop method
+
+        Worker thread body - runs queued requests until the session closes.
+        """
+        while True:
+            request = self.requestQueue.get()
+            if request is None:
+                break
+            request.run()
+
+    def submit(self, function, **kwargs):
+        """
+        submit method
+
+        Queues a callable to run on the session worker.
+
+        :param function: callable to run
+        :type function: function
+        :return: DeviceRequest handle
+        :rtype: object
+        """
+        request = DeviceRequest(function, **kwargs)
+        self.requestQueue.put(request)
+        return request
+
+    def interact(self, **kwargs):
+        """
+        interact method
+
+        Queues a DeviceInteract call.  Takes the same arguments as the
+        DeviceInteract method of the device.
+
+        :return: DeviceRequest handle, the result is the DeviceInteract
+                 dictionary
+        :rtype: object
+        """
+        return self.submit(self.deviceObj.DeviceInteract, **kwargs)
+
+    def batch(self, **kwargs):
+        """
+        batch method
+
+        Queues a DeviceInteractBatch call.  Takes the same arguments as the
+        DeviceInteractBatch method of the device.
+
+        :return: DeviceRequest handle, the result is the DeviceInteractBatch
+                 list
+        :rtype: object
+        """
+        return self.submit(self.deviceObj.DeviceInteractBatch, **kwargs)
+
+    def call(self, function, **kwargs):
+        """
+        call method
+
+        Queues a library function that takes a deviceObj argument, such as
+        the switch CLI helpers.  deviceObj is filled in with the device of
+        this session.
+
+        :param function: library function to run
+        :type function: function
+        :return: DeviceRequest handle
+        :rtype: object
+        """
+        kwargs['deviceObj'] = self.deviceObj
+        return self.submit(function, **kwargs)
+
+    def close(self):
+        """
+        close method
+
+        Stops the worker once the queued requests are done.  The device
+        connection stays open.
+        """
+        if self.worker.is_alive():
+            self.requestQueue.put(None)
+            self.worker.join()
+
+
+def DeviceSessionsOpen(**kwargs):
+    """
+    Library routine to open a session for each device of a topology
+
+    :param topology: topology object
+    :type topology: object
+    :param devices: list of device names, all devices when not given
+    :type devices: list
+    :return: dictionary of DeviceSession objects keyed by device name
+    :rtype: dictionary
+    """
+    topology = kwargs.get('topology', None)
+    devices = kwargs.get('devices', None)
+    if devices is None:
+        devices = topology.deviceObjList()
+    sessions = dict()
+    for curDev in devices:
+        sessions[curDev] = DeviceSession(
+            deviceObj=topology.deviceObjGet(device=curDev))
+    return sessions
+
+
+def DeviceSessionsClose(sessions):
+    """
+    Library routine to close the sessions opened by DeviceSessionsOpen
+
+    :param sessions: dictionary of DeviceSession objects
+    :type sessions: dictionary
+    """
+    for curSession in sessions.values():
+        curSession.close()
+
+
+def DeviceRequestsWait(requests, **kwargs):
+    """
+    Library routine to wait for a list of device requests and collect the
+    results in the same order
+
+    :param requests: list of DeviceRequest handles
+    :type requests: list
+    :param timeout: seconds to wait for all of the requests, None to wait
+                    forever
+    :type timeout: float
+    :return: list of results, None for requests that did not complete
+    :rtype: list
+    """
+    timeout = kwargs.get('timeout', None)
+    if timeout is not None:
+        deadline = time.time() + timeout
+    results = []
+    for curRequest in requests:
+        if timeout is None:
+            results.append(curRequest.result())
+        else:
+            remaining = max(deadline - time.time(), 0)
+            results.append(curRequest.result(timeout=remaining))
+    return results
@@ -16,18 +16,31 @@
 #
 import os
 import xml.dom.minidom
-from mininet.net import *
-from mininet.topo import *
-from mininet.node import *
-from mininet.link import *
-from mininet.cli import *
-from mininet.log import *
-from mininet.util import *
-from subprocess import *
-from subprocess import *
-from opsvsi.docker import *
-from opsvsi.opsvsitest import *
 from subprocess import *
+try:
+    import mininet
+    from mininet.net import *
+    from mininet.topo import *
+    from mininet.node import *
+    from mininet.link import *
+    from mininet.cli import *
+    from mininet.log import *
+    from mininet.util import *
+    from opsvsi.docker import *
+    from opsvsi.opsvsitest import *
+except ImportError:
+    # Without mininet and opsvsi a topology can only be backed by the local
+    # device emulator (VSIEMULATOR)
+    mininet = None
+    Mininet = object
+    OpsVsiHost = object
+    OpsVsiLink = object
+    VsiOpenSwitch = None
+
+    class OpsVsiTest(object):
+
+        def setLogLevel(self, levelname='info'):
+            pass
 import xml.etree.ElementTree as ET
 import re
 import select
@@ -53,6 +66,103 @@ class FTOpsVsiHost(OpsVsiHost):
         opstestfw.LogOutput('info', name + " docker image: " + image)
         super(OpsVsiHost, self).__init__(name, image, **kwargs)
 
+class BatchVethLink(OpsVsiLink):
+
+    """
+    OpsVsiLink whose veth pair may already have been created by the batched
+    link stage of FTMininet.  Pairs that were not created there, such as the
+    links put back by RestartSwitches, are created one at a time as usual.
+    """
+
+    def makeIntfPair(self, intfname1, intfname2, addr1=None, addr2=None,
+                     node1=None, node2=None, deleteIntfs=True):
+        batchPairs = getattr(node1, 'batchVethPairs', None)
+        if batchPairs is not None and (intfname1, intfname2) in batchPairs:
+            batchPairs.remove((intfname1, intfname2))
+            return ""
+        return super(BatchVethLink, self).makeIntfPair(
+            intfname1, intfname2, addr1, addr2, node1, node2,
+            deleteIntfs=deleteIntfs)
+
+
+class FTMininet(Mininet):
+
+    """
+    Mininet network that keeps track of the time spent creating links, so
+    link creation is reported apart from booting the containers.  With the
+    BatchVethLink link class, the veth pairs of all the topology links are
+    created before the first link is added, with one ip -batch per namespace
+    they are created from.
+    """
+
+    # Lines written per printf when building an ip -batch file, the node
+    # shells read commands through a pty with a limited line length
+    batchChunkLines = 32
+
+    def __init__(self, **kwargs):
+        self.linkCreateTime = 0.0
+        self.vethBatchDone = False
+        super(FTMininet, self).__init__(**kwargs)
+
+    def addLink(self, node1, node2, **kwargs):
+        linkStart = time.time()
+        if self.vethBatchDone is False and self.topo is not None \
+                and issubclass(self.link, BatchVethLink):
+            self.vethBatchDone = True
+            self.VethBatchCreate()
+        link = super(FTMininet, self).addLink(node1, node2, **kwargs)
+        self.linkCreateTime += time.time() - linkStart
+        return link
+
+    def VethBatchCreate(self):
+        """
+        This method creates the veth pairs of all the links of the topology.
+        Each pair is created from the namespace of its first node with the
+        peer moved to the namespace of the second node, as makeIntfPair
+        does, but the commands of a namespace go through one ip -batch.
+        Links with MAC addresses are left to makeIntfPair.
+        """
+        # The link class names the interfaces, it is not initialized
+        namer = self.link.__new__(self.link)
+        batches = dict()
+        for (srcName, dstName, params) in self.topo.links(sort=True,
+                                                          withInfo=True):
+            if params.get('addr1') is not None \
+                    or params.get('addr2') is not None \
+                    or params.get('port1') is None \
+                    or params.get('port2') is None:
+                continue
+            node1 = self[params['node1']]
+            node2 = self[params['node2']]
+            intfName1 = params.get('intfName1', None)
+            if not intfName1:
+                intfName1 = namer.intfName(node1, params['port1'])
+            intfName2 = params.get('intfName2', None)
+            if not intfName2:
+                intfName2 = namer.intfName(node2, params['port2'])
+            if node1 not in batches:
+                batches[node1] = []
+            batches[node1].append((intfName1, intfName2, node2.pid))
+
+        for (node1, pairs) in batches.items():
+            batchFile = "/tmp/vethBatch_" + node1.name
+            node1.cmd("rm -f " + batchFile)
+            for index in range(0, len(pairs), self.batchChunkLines):
+                lines = ""
+                for (intfName1, intfName2, netns) in \
+                        pairs[index:index + self.batchChunkLines]:
+                    lines += " 'link add name %s type veth peer name %s " \
+                        "netns %s'" % (intfName1, intfName2, netns)
+                node1.cmd("printf '%s\\n'" + lines + " >> " + batchFile)
+            cmdOutput = node1.cmd("ip -batch " + batchFile + "; rm -f "
+                                  + batchFile)
+            if cmdOutput:
+                raise Exception("Error creating interface pairs in "
+                                + node1.name + ": " + cmdOutput)
+            node1.batchVethPairs = set([(intfName1, intfName2)
+                                        for (intfName1, intfName2, netns)
+                                        in pairs])
+
 class Topology (OpsVsiTest):
 
     """
@@ -79,6 +189,11 @@ class Topology (OpsVsiTest):
         :type topology: dictionary
         :param runEnv: reference object to testEnviron.py
         :type runEnv:  Object
+        :param emulator: options of the local device emulator to attach the
+                         devices to instead of docker containers, "" for
+                         the defaults.  Defaults to the VSIEMULATOR
+                         environment variable, set to 1 for the defaults
+        :type emulator: string
 
         """
 
@@ -96,6 +211,7 @@ class Topology (OpsVsiTest):
 
         self.topo = dict()
         self.deviceObj = dict()
+        self.deviceConnectFailures = dict()
         self.id = str(os.getpid())
         self.testdir = kwargs.get('resultsDir', None)
         envVsiDebug = os.environ.get('VSIDEBUG', None)
@@ -110,11 +226,39 @@ class Topology (OpsVsiTest):
         self.TOPOLOGY = ""
         self.mininetGlobal = ""
         self.inbandIndex = 0
+        # Warm pool bookkeeping (VSIWARMPOOL)
+        self.warmStarts = 0
+        self.resetTime = None
+        self.dockerLinks = dict()
+        self.baselineSaved = set()
+        # Bring-up and teardown timings in seconds, per phase and per device
+        self.phaseTimes = dict()
+        self.deviceTimes = dict()
+        # Local device emulator (VSIEMULATOR)
+        self.emulatorOptions = kwargs.get('emulator',
+                                          os.environ.get('VSIEMULATOR', None))
+        if self.emulatorOptions == "1":
+            self.emulatorOptions = ""
+        self.emulator = self.emulatorOptions is not None
+        if self.emulator is False and mininet is None:
+            raise ImportError("mininet and opsvsi are needed for docker "
+                              "topologies - set VSIEMULATOR to run on the "
+                              "local device emulator")
+        bringupStart = time.time()
         self.LogicalTopologyCreate()
         self.VirtualXMLCreate()
-        self.setHostImageOpts(self.hostimage)
-        self.setupNet()
+        if self.emulator is True:
+            self.EmulatorSetup()
+        else:
+            self.setHostImageOpts(self.hostimage)
+            self.setupNet()
         self.TopologyXMLWrite()
+        self.coldBringupTime = time.time() - bringupStart
+        # Whatever is not spent in Mininet goes to the model and the XML
+        self.phaseTimes['xmlModel'] = self.coldBringupTime \
+            - self.phaseTimes['mininetBuild'] \
+            - self.phaseTimes['linkCreate'] \
+            - self.phaseTimes['mininetStart']
 
     def getHostOpts(self):
         opts = self.getNodeOpts()
@@ -136,21 +280,9 @@ class Topology (OpsVsiTest):
             hopts=self.getHostOpts(),
             sopts=self.getSwitchOpts())
 
-        logicalTopo = dict()
-        for curDev in str.split(self.topoDevices):
-            logicalTopo[curDev] = dict()
-            logicalTopo[curDev]['attributes'] = dict()
-            logicalTopo[curDev]['links'] = dict()
-
-        # Create a local dictionary around the devices in topoFilters
-        for curFilter in str.split(self.topoFilters, ','):
-            (cDev, cAttr, cVal) = str.split(curFilter, ':')
-            logicalTopo[cDev]['attributes'][cAttr] = cVal
-
-        for curDev in logicalTopo.keys():
+        for curDev in self.model.deviceOrder:
             # Grag attributes for each device
-            devAttrs = logicalTopo[curDev]['attributes']
-            devCategory = devAttrs['system-category']
+            devCategory = self.model.DeviceCategoryGet(device=curDev)
             if devCategory == "switch":
                 opstestfw.LogOutput('debug', "Added Switch Device: " + curDev)
                 self.mntopo.addSwitch(curDev)
@@ -161,85 +293,46 @@ class Topology (OpsVsiTest):
                     curDev)
                 self.mntopo.addHost(curDev)
 
+        # The dockerLinks is a local dictionary to identify what links have
+        # topoLinkFilters associated with them
         dockerLinks = dict()
-        if self.topoLinks != "":
-            # The dockerLinks is a local dictionary to identify what links have
-            # topoLinkFilters associated with them
-
-            for curLink in str.split(self.topoLinks, ','):
-                #print "looking at link " + curLink
-                (link, dev1, dev2) = str.split(curLink, ':')
-                linkFilterMatch = 0
-                if self.topoLinkFilter != "":
-                    tmpLinkDict = dict()
-                    for curLinkFilter in str.split(self.topoLinkFilter, ','):
-                        #print "examing linkfilter " + curLinkFilter
-                        (lfLink, lfDev, lfIntTag, lfInt) =\
-                            str.split(curLinkFilter, ':')
-                        if lfLink.strip(' ') == link:
-                            #print "linkfilter for " + link
-                            linkFilterMatch = 1
-                            # break
-                            if 'dev1' in tmpLinkDict:
-                                tmpLinkDict['dev2'] = lfDev
-                                tmpLinkDict['dev2Port'] = lfInt
-                            else:
-                                tmpLinkDict['dev1'] = lfDev
-                                tmpLinkDict['dev1Port'] = lfInt
-
-                if linkFilterMatch == 0:
-                    # No link filters detected, we will just add the link
-                    linkKey = self.mntopo.addLink(dev1, dev2, key=link)
-                else:
-                    # We are seeing a link filter, lets see if interface is
-                    # eth0
-                    if lfInt == "eth0":
-                        intIndex = "eth0"
-                        opstestfw.LogOutput('info', "Virtual out of band "
-                                            "test.  Out of band link "
-                                            "internal to Docker.")
-                        dockerLinks[link] = dict()
-                        dockerLinks[link]['mininetLink'] = False
-                        dockerLinks[link]['node1'] = dev1
-                        dockerLinks[link]['node2'] = dev2
-                        dockerLinks[link]['port1'] = "eth0"
-                        dockerLinks[link]['port2'] = "eth0"
-                    else:
-                        # Means we have a numeric port
-                        #print "tmpLinkDict"
-                        #print tmpLinkDict
-                        if 'dev1' in tmpLinkDict and 'dev2' in tmpLinkDict:
-                            dev1Port = tmpLinkDict['dev1Port']
-                            dev2Port = tmpLinkDict['dev2Port']
-                            dockerLinks[link] = dict()
-                            dockerLinks[link]['mininetLink'] = True
-                            dockerLinks[link]['node1'] = dev1
-                            dockerLinks[link]['node2'] = dev2
-                            dockerLinks[link]['port1'] = int(dev1Port)
-                            dockerLinks[link]['port2'] = int(dev2Port)
-                            linkKey = self.mntopo.addLink(dev1, dev2, key=link,
-                                                          port1=int(dev1Port),
-                                                          port2=int(dev2Port))
-                        else:
-                            dev1Port = tmpLinkDict['dev1Port']
-                            dockerLinks[link] = dict()
-                            dockerLinks[link]['mininetLink'] = True
-                            dockerLinks[link]['node1'] = dev1
-                            dockerLinks[link]['port1'] = int(dev1Port)
-                            linkKey = self.mntopo.addLink(dev1, dev2, key=link,
-                                                          port1=int(dev1Port))
-                # Add to Link Logical Topology
-                logicalTopo[dev1]['links'][link] = dev2
-                logicalTopo[dev2]['links'][link] = dev1
-                # print logicalTopo
-
-        # Configure MiniNet
-        self.net = mininet.net.Mininet(topo=self.mntopo,
-                                       switch=VsiOpenSwitch,
-                                       host=FTOpsVsiHost,
-                                       link=OpsVsiLink,
-                                       controller=None,
-                                       build=True)
+        for link in self.model.linkOrder:
+            linkInfo = self.model.links[link]
+            dev1 = linkInfo['device1']
+            dev2 = linkInfo['device2']
+            dockerLink = self.DockerLinkGet(link=link)
+            if dockerLink is None:
+                # No link filters detected, we will just add the link
+                linkKey = self.mntopo.addLink(dev1, dev2, key=link)
+                continue
+            dockerLinks[link] = dockerLink
+            if dockerLink['mininetLink'] is False:
+                continue
+            if 'port2' in dockerLink:
+                # Means we have a numeric port
+                linkKey = self.mntopo.addLink(dev1, dev2, key=link,
+                                              port1=dockerLink['port1'],
+                                              port2=dockerLink['port2'])
+            else:
+                linkKey = self.mntopo.addLink(dev1, dev2, key=link,
+                                              port1=dockerLink['port1'])
+        self.dockerLinks = dockerLinks
+
+        # Configure MiniNet.  The veth pairs are created in one batch per
+        # namespace unless VSISERIALLINKS is set
+        linkClass = BatchVethLink
+        if os.environ.get('VSISERIALLINKS', None) is not None:
+            linkClass = OpsVsiLink
+        phaseStart = time.time()
+        self.net = FTMininet(topo=self.mntopo,
+                             switch=VsiOpenSwitch,
+                             host=FTOpsVsiHost,
+                             link=linkClass,
+                             controller=None,
+                             build=True)
+        self.phaseTimes['linkCreate'] = self.net.linkCreateTime
+        self.phaseTimes['mininetBuild'] = time.time() - phaseStart \
+            - self.phaseTimes['linkCreate']
 
         # Check for docker bringup failures and update the flags
         for switch in self.net.switches:
@@ -276,77 +369,38 @@ class Topology (OpsVsiTest):
                 self.topo[logicalDevice] = curHost.container_name
                 self.topo[curHost.container_name] = logicalDevice
 
+        # Index every interface by (container, port number) and by
+        # (container, interface name), so ports are resolved with one lookup
+        intfMap = dict()
+        for curNode in self.net.switches + self.net.hosts:
+            for (curPort, curIntf) in curNode.intfs.items():
+                intfMap[(curNode.container_name, curPort)] = curIntf
+                intfMap[(curNode.container_name, str(curIntf))] = curIntf
+
         # Query Links and update the XML
         topoLinkMininet = self.mntopo.iterLinks(withKeys=True, withInfo=True)
         for curLink in topoLinkMininet:
-            # print curLink
             linkName = curLink[2]
-            linkFilter = 0
-            if linkName in dockerLinks:
-                linkFilter = 1
-            # print "current link = " + str(curLink)
             linkInfo = curLink[3]
-            # print linkInfo
-            node1 = linkInfo['node1']
-            node1Obj = self.searchNetNodes(self.topo[node1])
-            node1port = linkInfo['port1']
-            node1IntStruct = node1Obj.intfList()
-            if linkFilter == 1:
-                # Look for node1 in the dockerLink
-                linkFilterInfo = dockerLinks[linkName]
-                linkNode1 = linkFilterInfo.get('node1', None)
-                linkNode2 = linkFilterInfo.get('node2', None)
-                if node1 == linkNode1:
-                    linkPort1 = linkFilterInfo.get('port1', None)
-                    # Find the index of the port and replace it.
-                    for curIndex in range(0, len(node1IntStruct)):
-                        if str(node1IntStruct[curIndex]) == str(linkPort1):
-                            node1port = curIndex
-                            break
-                elif node1 == linkNode2:
-                    linkPort2 = linkFilterInfo.get('port2', None)
-                    # Find the index of the port and replace it.
-                    for curIndex in range(0, len(node1IntStruct)):
-                        if str(node1IntStruct[curIndex]) == str(linkPort2):
-                            node1port = curIndex
-                            break
-
-            node2 = linkInfo['node2']
-            node2Obj = self.searchNetNodes(self.topo[node2])
-            node2port = linkInfo['port2']
-            # print node2port
-            node2IntStruct = node2Obj.intfList()
-            #print node2IntStruct
-            if linkFilter == 1:
-                # Look for node1 in the dockerLink
-                linkFilterInfo = dockerLinks[linkName]
-                linkNode1 = linkFilterInfo.get('node1', None)
-                linkNode2 = linkFilterInfo.get('node2', None)
-                if node2 == linkNode1:
-                    linkPort1 = linkFilterInfo.get('port1', None)
-                    # Find the index of the port and replace it.
-                    for curIndex in range(0, len(node2IntStruct)):
-                        # print curIndex
-                        if str(node2IntStruct[curIndex]) == str(linkPort1):
-                            node2port = curIndex
-                            break
-                elif node2 == linkNode2:
-                    linkPort2 = linkFilterInfo.get('port2', None)
-                    # Find the index of the port and replace it.
-                    for curIndex in range(0, len(node2IntStruct)):
-                        if str(node2IntStruct[curIndex]) == str(linkPort2):
-                            node2port = curIndex
-                            break
+            linkFilterInfo = dockerLinks.get(linkName, dict())
+            linkPorts = []
+            for (node, port) in ((linkInfo['node1'], linkInfo['port1']),
+                                 (linkInfo['node2'], linkInfo['port2'])):
+                # A link filter names the interface to use on the node
+                if node == linkFilterInfo.get('node1', None) \
+                        and 'port1' in linkFilterInfo:
+                    port = str(linkFilterInfo['port1'])
+                elif node == linkFilterInfo.get('node2', None) \
+                        and 'port2' in linkFilterInfo:
+                    port = str(linkFilterInfo['port2'])
+                linkPorts.append(intfMap[(self.topo[node], port)])
             # Add link to Topology XML
             retStruct =\
                 self.VirtualXMLLinkAdd(link=linkName,
-                                       device1=self.topo[node1],
-                                       device1Port=node1IntStruct[node1port],
-                                       device2=self.topo[node2],
-                                       device2Port=node2IntStruct[node2port])
-            #opstestfw.LogOutput('info', "Link info\n"+self.topo[node1]
-            #                    +" "+str(node1IntStruct[node1Index])
-            #                    + " "+self.topo[node2] + " "+str(node2IntStruct[node2Index]))
+                                       device1=self.topo[linkInfo['node1']],
+                                       device1Port=linkPorts[0],
+                                       device2=self.topo[linkInfo['node2']],
+                                       device2Port=linkPorts[1])
             self.topo[linkName] = linkName
 
         # Now lets look for docker links since they will not be part of mininet
@@ -372,46 +426,47 @@ class Topology (OpsVsiTest):
         opstestfw.LogOutput('info', "========================================"
                             "=============================")
         opstestfw.LogOutput('info', "Topology Mapping")
-        for curDev in str.split(self.topoDevices):
-            #outstring = curDev + "  =  " + self.topo[curDev]
+        for curDev in self.model.deviceOrder:
             outstring = "%-12s" % curDev + " =\t%-12s"\
                         % self.topo[curDev]
             opstestfw.LogOutput('info', outstring)
 
-        if self.topoLinks != "":
-            # Resolve the links
-            for curLink in str.split(self.topoLinks, ','):
-                (link, dev1, dev2) = str.split(curLink, ':')
-                dev1LportStruct = self.InterfaceGetByDeviceLink(
-                    device=self.topo[dev1], link=link)
-                if dev1LportStruct.returnCode() != 0:
-                    opstestfw.LogOutput(
-                        'error',
-                        "Unable to obtain link information for " +
-                        link +
-                        " for " +
-                        dev1)
-                    continue
-                dev1Lport = dev1LportStruct.valueGet()
-                dev2LportStruct = self.InterfaceGetByDeviceLink(
-                    device=self.topo[dev2], link=link)
-                if dev2LportStruct.returnCode() != 0:
-                    # Unable to obtain link information
-                    opstestfw.LogOutput(
-                        'error',
-                        "Unable to obtain link information for " +
-                        link +
-                        " for " +
-                        dev2)
-                    continue
-                dev2Lport = dev2LportStruct.valueGet()
-                outstring = "%-12s" % link + " =\t" + self.topo[dev1] + ":"\
-                    + str(dev1Lport) + " <===> " + self.topo[dev2] + ":"\
-                    + str(dev2Lport)
-                opstestfw.LogOutput('info', outstring)
+        # Resolve the links
+        for link in self.model.linkOrder:
+            dev1 = self.model.links[link]['device1']
+            dev2 = self.model.links[link]['device2']
+            dev1LportStruct = self.InterfaceGetByDeviceLink(
+                device=self.topo[dev1], link=link)
+            if dev1LportStruct.returnCode() != 0:
+                opstestfw.LogOutput(
+                    'error',
+                    "Unable to obtain link information for " +
+                    link +
+                    " for " +
+                    dev1)
+                continue
+            dev1Lport = dev1LportStruct.valueGet()
+            dev2LportStruct = self.InterfaceGetByDeviceLink(
+                device=self.topo[dev2], link=link)
+            if dev2LportStruct.returnCode() != 0:
+                # Unable to obtain link information
+                opstestfw.LogOutput(
+                    'error',
+                    "Unable to obtain link information for " +
+                    link +
+                    " for " +
+                    dev2)
+                continue
+            dev2Lport = dev2LportStruct.valueGet()
+            outstring = "%-12s" % link + " =\t" + self.topo[dev1] + ":"\
+                + str(dev1Lport) + " <===> " + self.topo[dev2] + ":"\
+                + str(dev2Lport)
+            opstestfw.LogOutput('info', outstring)
         opstestfw.LogOutput('info', "======================================="
                             "==============================")
+        phaseStart = time.time()
         self.net.start()
+        self.phaseTimes['mininetStart'] = time.time() - phaseStart
         # Tuntap failure check
         for switch in self.net.switches:
             if isinstance(switch, VsiOpenSwitch) and switch.tuntap_failed:
@@ -419,6 +474,307 @@ class Topology (OpsVsiTest):
                 switch.get_syslog_on_failure()
                 break
 
+    def EmulatorSetup(self):
+        """
+
+        This method populates the physical topology for devices attached to
+        the local device emulator.  No containers or links are created,
+        switch ports are numbered from 1 and workstation ports from eth1.
+
+        """
+        self.net = None
+        self.phaseTimes['mininetBuild'] = 0.0
+        self.phaseTimes['linkCreate'] = 0.0
+        self.phaseTimes['mininetStart'] = 0.0
+        for curDev in self.model.deviceOrder:
+            containerName = self.id + "_" + curDev
+            self.VirtualXMLDeviceAdd(name=containerName)
+            self.topo[curDev] = containerName
+            self.topo[containerName] = curDev
+
+        nextPort = dict()
+        for link in self.model.linkOrder:
+            linkInfo = self.model.links[link]
+            linkPorts = []
+            for curDev in (linkInfo['device1'], linkInfo['device2']):
+                nextPort[curDev] = nextPort.get(curDev, 0) + 1
+                if self.model.DeviceCategoryGet(device=curDev) == "switch":
+                    linkPorts.append(str(nextPort[curDev]))
+                else:
+                    linkPorts.append("eth" + str(nextPort[curDev]))
+            self.VirtualXMLLinkAdd(link=link,
+                                   device1=self.topo[linkInfo['device1']],
+                                   device1Port=linkPorts[0],
+                                   device2=self.topo[linkInfo['device2']],
+                                   device2Port=linkPorts[1])
+            self.topo[link] = link
+
+    def EmulatorAttach(self, **kwargs):
+        """
+        This method points a device object at the local device emulator
+        instead of its docker container
+        :param deviceObj: VSwitch or VHost object created without connecting
+        :type deviceObj: object
+        :param category: "switch" or "workstation"
+        :type category: string
+
+        """
+        deviceObj = kwargs.get('deviceObj')
+        category = kwargs.get('category')
+        deviceObj.connectStringBase = opstestfw.EmulatorCommandGet(
+            category=category, options=self.emulatorOptions)
+        if deviceObj.lazyConnect is False:
+            deviceObj.LazyConnect()
+
+    def DockerLinkGet(self, **kwargs):
+        """
+        This method works out how a link of the logical topology is created
+        out of its link filters
+        :param link: logical link name
+        :type link: string
+        :return: dockerLinks entry of the link, None if the link has no link
+                 filters
+        :rtype: dictionary
+        """
+        link = kwargs.get('link')
+        linkInfo = self.model.links[link]
+        linkFilters = linkInfo['filters']
+        if len(linkFilters) == 0:
+            return None
+        tmpLinkDict = dict()
+        for (lfDev, lfIntTag, lfInt) in linkFilters:
+            if 'dev1' in tmpLinkDict:
+                tmpLinkDict['dev2'] = lfDev
+                tmpLinkDict['dev2Port'] = lfInt
+            else:
+                tmpLinkDict['dev1'] = lfDev
+                tmpLinkDict['dev1Port'] = lfInt
+
+        dockerLink = dict()
+        dockerLink['node1'] = linkInfo['device1']
+        # We are seeing a link filter, lets see if interface is eth0
+        if lfInt == "eth0":
+            opstestfw.LogOutput('info', "Virtual out of band "
+                                "test.  Out of band link "
+                                "internal to Docker.")
+            dockerLink['mininetLink'] = False
+            dockerLink['node2'] = linkInfo['device2']
+            dockerLink['port1'] = "eth0"
+            dockerLink['port2'] = "eth0"
+        elif 'dev2' in tmpLinkDict:
+            # Means we have a numeric port
+            dockerLink['mininetLink'] = True
+            dockerLink['node2'] = linkInfo['device2']
+            dockerLink['port1'] = int(tmpLinkDict['dev1Port'])
+            dockerLink['port2'] = int(tmpLinkDict['dev2Port'])
+        else:
+            dockerLink['mininetLink'] = True
+            dockerLink['port1'] = int(tmpLinkDict['dev1Port'])
+        return dockerLink
+
+    def Reconfigure(self, **kwargs):
+        """
+        This method turns the live topology into the one described by
+        another topology dictionary.  Only the links and devices that differ
+        are removed from or added to the Mininet network, the physical
+        topology XML and the model - the rest of the containers are left
+        running.
+
+        :param topoDict: topology dictionary defined in the test case
+        :type topoDict: dictionary
+        :return: returnStruct, returnCode is not 0 if the topology could not
+                 be reconfigured and has to be rebuilt
+        :rtype: object
+        """
+        topoDict = kwargs.get('topoDict')
+        reconfigStart = time.time()
+        oldModel = self.model
+        newModel = opstestfw.TopologyModel(topoDict=topoDict)
+        diff = oldModel.Diff(model=newModel)
+        if len(diff['devicesChanged']) != 0:
+            opstestfw.LogOutput('error', "Attributes changed for devices "
+                                + " ".join(diff['devicesChanged'])
+                                + " - unable to reconfigure topology")
+            retCls = opstestfw.returnStruct(returnCode=1)
+            return retCls
+
+        # Take out the old links and devices while the old model is in place
+        for curLink in diff['linksRemoved']:
+            self.VirtualLinkDelete(link=curLink)
+        for curDev in diff['devicesRemoved']:
+            self.VirtualDeviceDelete(device=curDev)
+
+        # Move over to the new logical topology, the physical part of the
+        # model is carried over
+        self.topoDict = topoDict
+        self.LogicalTopologyCreate()
+        self.model.PhysicalCopy(model=oldModel)
+        self.setHostImageOpts(self.hostimage)
+
+        newSwitches = []
+        for curDev in diff['devicesAdded']:
+            retStruct = self.VirtualDeviceAdd(device=curDev)
+            if retStruct.returnCode() != 0:
+                return retStruct
+            node = retStruct.valueGet()
+            if isinstance(node, VsiOpenSwitch):
+                newSwitches.append(node)
+        for curLink in diff['linksAdded']:
+            retStruct = self.VirtualLinkAdd(link=curLink)
+            if retStruct.returnCode() != 0:
+                return retStruct
+
+        # New switches are started once their links are in place
+        for curSwitch in newSwitches:
+            curSwitch.start(self.net.controllers)
+            if curSwitch.tuntap_failed:
+                self.tuntap_failure = True
+                curSwitch.get_syslog_on_failure()
+                retCls = opstestfw.returnStruct(returnCode=1)
+                return retCls
+
+        opstestfw.LogOutput('info', "Topology reconfigured in %.2f seconds "
+                            "(devices +%d -%d, links +%d -%d)"
+                            % (time.time() - reconfigStart,
+                               len(diff['devicesAdded']),
+                               len(diff['devicesRemoved']),
+                               len(diff['linksAdded']),
+                               len(diff['linksRemoved'])))
+        retCls = opstestfw.returnStruct(returnCode=0)
+        return retCls
+
+    def VirtualDeviceAdd(self, **kwargs):
+        """
+        This method boots a device of the logical topology into the live
+        Mininet network and adds it to the physical topology
+        :param device: logical device name
+        :type device: string
+        :return: returnStruct, the data is the Mininet node
+        :rtype: object
+        """
+        device = kwargs.get('device')
+        devCategory = self.model.DeviceCategoryGet(device=device)
+        if devCategory == "switch":
+            opstestfw.LogOutput('info', "Adding Switch Device: " + device)
+            node = self.net.addSwitch(device, **self.getSwitchOpts())
+            if node.cur_hw_failed:
+                self.cur_hw_failure = True
+            elif node.switchd_failed:
+                self.switchd_failure = True
+            if self.switchd_failure or self.cur_hw_failure:
+                retCls = opstestfw.returnStruct(returnCode=1)
+                return retCls
+        elif devCategory == "workstation":
+            opstestfw.LogOutput('info', "Adding Workstation Device: "
+                                + device)
+            node = self.net.addHost(device, **self.getHostOpts())
+        else:
+            opstestfw.LogOutput('error', "Unknown system-category for "
+                                + device)
+            retCls = opstestfw.returnStruct(returnCode=1)
+            return retCls
+
+        self.VirtualXMLDeviceAdd(name=str(node.container_name))
+        self.topo[device] = node.container_name
+        self.topo[node.container_name] = device
+        retCls = opstestfw.returnStruct(returnCode=0, data=node)
+        return retCls
+
+    def VirtualDeviceDelete(self, **kwargs):
+        """
+        This method removes a device from the live Mininet network and the
+        physical topology and terminates its container
+        :param device: logical device name
+        :type device: string
+        """
+        device = kwargs.get('device')
+        containerName = self.topo[device]
+        opstestfw.LogOutput('info', "Removing device " + device + " ("
+                            + containerName + ")")
+        node = self.searchNetNodes(containerName)
+        if node is not None:
+            self.net.delNode(node)
+            node.terminate()
+        deviceTag = self.xmlDeviceElements.pop(containerName, None)
+        if deviceTag is not None:
+            self.TOPOLOGY.remove(deviceTag)
+        self.model.ConnectionDelete(device=containerName)
+        self.baselineSaved.discard(device)
+        del self.topo[containerName]
+        del self.topo[device]
+
+    def VirtualLinkAdd(self, **kwargs):
+        """
+        This method adds a link of the logical topology to the live Mininet
+        network and the physical topology
+        :param link: logical link name
+        :type link: string
+        :return: returnStruct
+        :rtype: object
+        """
+        link = kwargs.get('link')
+        linkInfo = self.model.links[link]
+        dev1 = linkInfo['device1']
+        dev2 = linkInfo['device2']
+        opstestfw.LogOutput('debug', "Creating Link " + link + " between "
+                            + dev1 + " & " + dev2)
+        dockerLink = self.DockerLinkGet(link=link)
+        if dockerLink is not None:
+            self.dockerLinks[link] = dockerLink
+        if dockerLink is not None and dockerLink['mininetLink'] is False:
+            # Out of band link internal to docker
+            retStruct = self.VirtualXMLLinkAdd(
+                link=link,
+                device1=self.topo[dev1],
+                device1Port=dockerLink['port1'],
+                device2=self.topo[dev2],
+                device2Port=dockerLink['port2'])
+        else:
+            linkOpts = dict()
+            if dockerLink is not None:
+                linkOpts['port1'] = dockerLink['port1']
+                if 'port2' in dockerLink:
+                    linkOpts['port2'] = dockerLink['port2']
+            node1Obj = self.searchNetNodes(self.topo[dev1])
+            node2Obj = self.searchNetNodes(self.topo[dev2])
+            linkObj = self.net.addLink(node1Obj, node2Obj, **linkOpts)
+            retStruct = self.VirtualXMLLinkAdd(
+                link=link,
+                device1=self.topo[dev1],
+                device1Port=linkObj.intf1,
+                device2=self.topo[dev2],
+                device2Port=linkObj.intf2)
+        self.topo[link] = link
+        self.ShowCachesInvalidate(devices=[dev1, dev2])
+        return retStruct
+
+    def VirtualLinkDelete(self, **kwargs):
+        """
+        This method removes a link from the live Mininet network and the
+        physical topology
+        :param link: logical link name
+        :type link: string
+        """
+        link = kwargs.get('link')
+        linkInfo = self.model.links[link]
+        dev1 = linkInfo['device1']
+        opstestfw.LogOutput('debug', "Removing Link " + link)
+        dockerLink = self.dockerLinks.pop(link, None)
+        if dockerLink is None or dockerLink['mininetLink'] is True:
+            node1Obj = self.searchNetNodes(self.topo[dev1])
+            port1 = self.model.InterfaceGet(device=self.topo[dev1],
+                                            link=link)
+            for curLink in self.net.links:
+                if (curLink.intf1.node is node1Obj
+                        and str(curLink.intf1) == port1) \
+                        or (curLink.intf2.node is node1Obj
+                            and str(curLink.intf2) == port1):
+                    self.net.delLink(curLink)
+                    break
+        self.VirtualXMLLinkDelete(link=link)
+        self.topo.pop(link, None)
+        self.ShowCachesInvalidate(devices=[dev1, linkInfo['device2']])
+
     def VirtualLinkModifyStatus(self, **kwargs):
         """
         This method identifies Link information from the topology dictionary
@@ -435,18 +791,238 @@ class Topology (OpsVsiTest):
         status = kwargs.get('status', 'down')
         # Find out who the link belongs to - can do this with the logical
         # topology
-        xpath = "./link[@name='" + str(link) + "']"
-        linkNameElement = opstestfw.XmlGetElementsByTag(
-            self.LOGICAL_TOPOLOGY, xpath)
-
-        linkAttrs = linkNameElement.attrib
-        device1 = linkAttrs['device1']
-        device2 = linkAttrs['device2']
+        linkInfo = self.model.LinkGet(link=link)
+        if linkInfo is None:
+            opstestfw.LogOutput('error',
+                                "Link " + str(link) + " not in topology")
+            retCls = opstestfw.returnStruct(returnCode=1)
+            return retCls
+        device1 = linkInfo['device1']
+        device2 = linkInfo['device2']
 
         self.net.configLinkStatus(device1, device2, status)
+        self.ShowCachesInvalidate(devices=[device1, device2])
         retCls = opstestfw.returnStruct(returnCode=0)
         return retCls
 
+    def ShowCachesInvalidate(self, **kwargs):
+        """
+        This method drops the cached show results of the switches a link or
+        restart event touched
+        :param devices: logical device names
+        :type devices: list
+
+        """
+        devices = kwargs.get('devices', [])
+        for curDev in devices:
+            devObj = self.deviceObj.get(curDev, None)
+            if devObj is not None and hasattr(devObj, 'ShowCacheInvalidate'):
+                devObj.ShowCacheInvalidate()
+
+    def VirtualLinksModifyStatus(self, **kwargs):
+        """
+        This method modifies the state of a batch of links and records when
+        each transition started and ended.  The links are changed one after
+        the other with configLinkStatus, each transition gets its own start
+        and end, so the last link of a batch changes a little after the
+        first one.
+        :param links: links whose state needs to be modified
+        :type links : list
+        :param status : Link status
+        :type status :  string
+        :return: returnStruct, the data is a list with a dictionary per
+                 transition with the link, status, start and end keys,
+                 start and end in seconds since the epoch
+        :rtype: object
+
+        """
+        links = kwargs.get('links', [])
+        status = kwargs.get('status', 'down')
+
+        transitions = []
+        for link in links:
+            linkInfo = self.model.LinkGet(link=link)
+            if linkInfo is None:
+                opstestfw.LogOutput('error',
+                                    "Link " + str(link) + " not in topology")
+                retCls = opstestfw.returnStruct(returnCode=1,
+                                                data=transitions)
+                return retCls
+            transitionStart = time.time()
+            self.net.configLinkStatus(linkInfo['device1'],
+                                      linkInfo['device2'], status)
+            self.ShowCachesInvalidate(devices=[linkInfo['device1'],
+                                               linkInfo['device2']])
+            transitions.append(dict(link=link, status=status,
+                                    start=transitionStart, end=time.time()))
+        retCls = opstestfw.returnStruct(returnCode=0, data=transitions)
+        return retCls
+
+    def VirtualLinksSchedule(self, **kwargs):
+        """
+        This method plays a schedule of link state changes.  Entries with
+        the same offset are applied as one batch.
+        :param schedule: list of (offset, link, status) tuples, offset in
+                         seconds from the start of the schedule
+        :type schedule : list
+        :return: returnStruct, the data is the list of transitions as
+                 returned by VirtualLinksModifyStatus
+        :rtype: object
+
+        """
+        schedule = sorted(kwargs.get('schedule', []), key=lambda x: x[0])
+
+        scheduleStart = time.time()
+        transitions = []
+        index = 0
+        while index < len(schedule):
+            # Gather the entries due at the same time and status
+            (offset, link, status) = schedule[index]
+            batchLinks = [link]
+            index += 1
+            while index < len(schedule) and schedule[index][0] == offset \
+                    and schedule[index][2] == status:
+                batchLinks.append(schedule[index][1])
+                index += 1
+            delay = scheduleStart + offset - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            retStruct = self.VirtualLinksModifyStatus(links=batchLinks,
+                                                      status=status)
+            transitions.extend(retStruct.valueGet())
+            if retStruct.returnCode() != 0:
+                retCls = opstestfw.returnStruct(returnCode=1,
+                                                data=transitions)
+                return retCls
+        retCls = opstestfw.returnStruct(returnCode=0, data=transitions)
+        return retCls
+
+    def LinkFlapConvergence(self, **kwargs):
+        """
+        This method plays a schedule of link state changes while a
+        workstation keeps pinging a destination, and measures the traffic
+        outage that follows each transition
+        :param schedule: list of (offset, link, status) tuples, see
+                         VirtualLinksSchedule
+        :type schedule : list
+        :param device: logical name of the workstation sending the probes
+        :type device : string
+        :param ipAddr: destination of the probes
+        :type ipAddr : string
+        :param interval: seconds between probes
+        :type interval : float
+        :param settle: seconds to keep probing after the last transition
+        :type settle : float
+        :return: returnStruct, the data is the list of transitions as
+                 returned by LinkOutageMeasure
+        :rtype: object
+
+        """
+        schedule = kwargs.get('schedule', [])
+        device = kwargs.get('device')
+        ipAddr = kwargs.get('ipAddr')
+        interval = kwargs.get('interval', 0.01)
+        settle = kwargs.get('settle', 1.0)
+
+        hostObj = self.deviceObjGet(device=device)
+        retStruct = hostObj.PingProbeStart(ipAddr=ipAddr, interval=interval)
+        if retStruct.returnCode() != 0:
+            opstestfw.LogOutput('error', "Unable to start probes on "
+                                + device)
+            return retStruct
+        # Let the probes get going before the first transition
+        time.sleep(settle)
+        scheduleStruct = self.VirtualLinksSchedule(schedule=schedule)
+        time.sleep(settle)
+        probeEnd = time.time()
+        probeStruct = hostObj.PingProbeStop()
+        if scheduleStruct.returnCode() != 0:
+            return scheduleStruct
+        probeData = probeStruct.valueGet()
+        transitions = self.LinkOutageMeasure(
+            transitions=scheduleStruct.valueGet(),
+            replies=probeData['replies'],
+            interval=probeData['interval'],
+            end=probeEnd)
+        for curTransition in transitions:
+            opstestfw.LogOutput('info', "Link %s %s: outage %.3f seconds, "
+                                "%d probes lost"
+                                % (curTransition['link'],
+                                   curTransition['status'],
+                                   curTransition['outage'],
+                                   curTransition['lost']))
+        retCls = opstestfw.returnStruct(returnCode=0, data=transitions)
+        return retCls
+
+    def LinkOutageMeasure(self, **kwargs):
+        """
+        This method works out the traffic outage around each link state
+        transition from the replies of a ping probe.  The outage of a
+        transition is the longest gap between replies from the last reply
+        before the transition up to the next transition, less one probe
+        interval.  Traffic that has not come back by the next transition, or
+        by the end of the probing for the last one, is an outage up to there.
+        :param transitions: transitions as returned by
+                            VirtualLinksModifyStatus
+        :type transitions : list
+        :param replies: list of (receive time, icmp_seq) tuples
+        :type replies : list
+        :param interval: seconds between probes
+        :type interval : float
+        :param end: time the probing stopped, in seconds since the epoch.
+                    Without it the outage of the last transition only
+                    covers gaps between replies.
+        :type end : float
+        :return: copy of the transitions with the outage (seconds) and lost
+                 (probes) keys added
+        :rtype: list
+
+        """
+        transitions = kwargs.get('transitions', [])
+        replies = sorted(kwargs.get('replies', []))
+        interval = kwargs.get('interval', 0.01)
+        end = kwargs.get('end', None)
+
+        measured = []
+        for index in range(0, len(transitions)):
+            curTransition = dict(transitions[index])
+            windowEnd = end
+            if index + 1 < len(transitions):
+                windowEnd = transitions[index + 1]['start']
+            previous = None
+            outage = 0.0
+            lost = 0
+            for (stamp, seq) in replies:
+                if windowEnd is not None and stamp >= windowEnd:
+                    break
+                if stamp <= curTransition['start']:
+                    previous = (stamp, seq)
+                    continue
+                if previous is None:
+                    # No reply before the transition, the gap starts there
+                    gap = stamp - curTransition['start']
+                    gapLost = int(round(gap / interval))
+                else:
+                    gap = stamp - previous[0] - interval
+                    gapLost = seq - previous[1] - 1
+                if gap > outage:
+                    outage = gap
+                    lost = gapLost
+                previous = (stamp, seq)
+            if windowEnd is not None:
+                # Traffic that has not come back by the end of the window
+                if previous is None:
+                    gap = windowEnd - curTransition['start']
+                else:
+                    gap = windowEnd - previous[0] - interval
+                if gap > outage:
+                    outage = gap
+                    lost = int(round(gap / interval))
+            curTransition['outage'] = outage
+            curTransition['lost'] = lost
+            measured.append(curTransition)
+        return measured
+
     # Restart Switch
     def RestartSwitch(self, **kwargs):
         """
@@ -456,48 +1032,158 @@ class Topology (OpsVsiTest):
 
         """
         switch = kwargs.get('switch', None)
-        opstestfw.LogOutput('info', "Restarting Virtual Switch: " + switch)
-        switches = self.mininetGlobal.net.switches
+        return self.RestartSwitches(switches=[switch])
 
-        for curSwitch in switches:
-            if switch == curSwitch.container_name:
-                switchObj = curSwitch
-                # print switchObj
-                break
+    def RestartSwitches(self, **kwargs):
+        """
+        This method restarts a list of virtual switches.  The containers are
+        replaced one at a time and the links of the switches are put back on
+        the ports they were on, then the switches are started and their
+        VSwitch sessions reconnected concurrently.
+        :param switches : switch container names
+        :type  switches : list
+        :return: returnStruct, the data is a dictionary with the time to
+                 ready of each switch in seconds
+        :rtype: object
 
-        mylogicalDev = self.topo[switch]
+        """
+        switches = kwargs.get('switches', [])
+        restartStart = time.time()
+
+        # Work out which links to restore and the ports they are on before
+        # the switches go away
+        restartNodes = dict()
+        for curName in switches:
+            switchObj = self.searchNetNodes(curName)
+            if switchObj is None:
+                opstestfw.LogOutput('error', "Switch " + str(curName)
+                                    + " not in topology")
+                retCls = opstestfw.returnStruct(returnCode=1)
+                return retCls
+            restartNodes[self.topo[curName]] = switchObj
+        restoreLinks = []
+        for curLink in list(self.net.links):
+            node1 = curLink.intf1.node
+            node2 = curLink.intf2.node
+            if node1.name not in restartNodes \
+                    and node2.name not in restartNodes:
+                continue
+            restoreLinks.append((node1.name, node1.ports[curLink.intf1],
+                                 node2.name, node2.ports[curLink.intf2]))
+            self.net.delLink(curLink)
+
+        # Replace the containers one at a time, Mininet and the topology
+        # mapping are not safe to change from several threads
+        returnCode = 0
+        for (logicalDev, switchObj) in restartNodes.items():
+            try:
+                self.SwitchContainerRestart(device=logicalDev,
+                                            switchObj=switchObj)
+            except Exception as e:
+                opstestfw.LogOutput('error', "Failed to restart " + logicalDev
+                                    + ": " + str(e))
+                returnCode = 1
+        if returnCode != 0:
+            retCls = opstestfw.returnStruct(returnCode=returnCode)
+            return retCls
+
+        # Now put the links back on the ports they were on
+        for (node1, port1, node2, port2) in restoreLinks:
+            opstestfw.LogOutput('debug', "Creating Link between " + node1
+                                + " & " + node2)
+            self.net.addLink(node1, node2, port1=port1, port2=port2)
+
+        # Start the switches and reconnect their sessions on a bounded
+        # worker pool
+        pool = opstestfw.WorkerPool()
+        requests = []
+        for logicalDev in restartNodes.keys():
+            request = pool.submit(self.SwitchReconnect, device=logicalDev)
+            requests.append((logicalDev, request))
+        readyTimes = dict()
+        for (logicalDev, request) in requests:
+            try:
+                retStruct = request.result()
+            except Exception as e:
+                opstestfw.LogOutput('error', "Failed to reconnect to "
+                                    + logicalDev + ": " + str(e))
+                returnCode = 1
+                continue
+            if retStruct.returnCode() != 0:
+                opstestfw.LogOutput('error', "Failed to reconnect to "
+                                    + logicalDev)
+                returnCode = 1
+                continue
+            readyTimes[logicalDev] = retStruct.data['readyTime'] \
+                - restartStart
+        pool.close()
+
+        for logicalDev in sorted(readyTimes.keys()):
+            opstestfw.LogOutput('info', "Switch %s ready %.2f seconds after "
+                                "restart" % (logicalDev,
+                                             readyTimes[logicalDev]))
+        retCls = opstestfw.returnStruct(returnCode=returnCode,
+                                        data=readyTimes)
+        return retCls
+
+    def SwitchContainerRestart(self, **kwargs):
+        """
+        This method replaces the container of a switch with a new one.  It
+        changes the Mininet network and the topology mapping, so it must not
+        run on several threads at once.
+        :param device : logical device name
+        :type  device : string
+        :param switchObj : Mininet switch object
+        :type  switchObj : Object
+
+        """
+        device = kwargs.get('device')
+        switchObj = kwargs.get('switchObj')
+        opstestfw.LogOutput('info', "Restarting Virtual Switch: "
+                            + switchObj.container_name)
 
         # cleanup the old container
-        switchObj.terminate()
+        self.net.delNode(switchObj)
 
         # Clean up old directory
-        mydir = switchObj.testdir + "/" + mylogicalDev
+        mydir = switchObj.testdir + "/" + device
         shutil.rmtree(mydir)
 
         # We actually really need to add the switch again in order to get
         # everything properly setup to as it was before.
-        self.net.addSwitch(
-            mylogicalDev,
+        newSwitch = self.net.addSwitch(
+            device,
             testid=str(self.id),
             testdir=str(self.testdir))
+        del self.topo[switchObj.container_name]
+        self.topo[device] = newSwitch.container_name
+        self.topo[newSwitch.container_name] = device
 
-        # Now search for links in the logical topology that are in respect to
-        # this dev and add them.
-        for curLink in str.split(self.topoLinks, ','):
-            (link, dev1, dev2) = str.split(curLink, ':')
-            if dev1 == mylogicalDev or dev2 == mylogicalDev:
-                # add the link
-                opstestfw.LogOutput(
-                    'debug',
-                    "Creating Link " +
-                    link +
-                    " between " +
-                    dev1 +
-                    " & " +
-                    dev2)
-                self.net.addLink(dev1, dev2)
+    def SwitchReconnect(self, **kwargs):
+        """
+        This method starts a restarted switch and reconnects its VSwitch
+        session.  It is run on the RestartSwitches worker pool.
+        :param device : logical device name
+        :type  device : string
+        :return: returnStruct, the data is a dictionary with readyTime, the
+                 time the switch was ready, taken in the worker
+        :rtype: object
 
-        return None
+        """
+        device = kwargs.get('device')
+        switchObj = self.net.nameToNode[device]
+        switchObj.start(self.net.controllers)
+        devObj = self.deviceObj.get(device, None)
+        if devObj is None:
+            retCls = opstestfw.returnStruct(
+                returnCode=0, data=dict(readyTime=time.time()))
+            return retCls
+        devObj.device = self.topo[device]
+        retStruct = devObj.Reconnect()
+        retCls = opstestfw.returnStruct(returnCode=retStruct.returnCode(),
+                                        buffer=retStruct.buffer(),
+                                        data=dict(readyTime=time.time()))
+        return retCls
 
     def searchNetNodes(self, name):
         """
@@ -527,26 +1213,227 @@ class Topology (OpsVsiTest):
 
         envKeepContainers = os.environ.get('VSIKEEPENV', None)
         if envKeepContainers is not None or envKeepContainers == 1:
+            opstestfw.DeviceLogFlush()
+            opstestfw.LogFlush()
             return
 
+        if opstestfw.TopologyPoolEnabled() is True and self.emulator is False:
+            if self.WarmPark() is True:
+                opstestfw.LogFlush()
+                return
+        self.TopologyDestroy()
+
+    def DeviceHandlesClose(self):
+        """
+        This routine closes the connections to the devices
+        """
+        opstestfw.DeviceLogFlush()
+        for curDev in self.model.deviceOrder:
+            devObj = self.deviceObj.get(curDev, None)
+            if devObj is None or devObj.Connected() is False:
+                continue
+            devObj.expectHndl.close()
+
+    def TopologyDestroy(self):
+        """
+        This routine closes the device connections and deletes the docker
+        container instances
+        """
         # gather up all nodes
         # Close file desc
-        for curDev in str.split(self.topoDevices):
-            devObj = self.deviceObjGet(device=curDev)
-            devObj.expectHndl.close()
+        teardownStart = time.time()
+        self.DeviceHandlesClose()
+        if self.net is None:
+            # Emulated devices go away with their connections
+            opstestfw.LogFlush()
+            return
         self.shell = 1
-        self.net.stop()
         self.setLogLevel('output')
-        switch_list = self.net.switches
-        host_list = self.net.hosts
-        for curHost in host_list:
-            opstestfw.LogOutput('debug', "terminating " + str(curHost))
-            curHost.terminate()
-            curHost.cleanup()
+        # This is the controller and link part of net.stop(), the nodes are
+        # stopped on the worker pool below instead of one after the other
+        for curController in self.net.controllers:
+            curController.stop()
+        for curLink in self.net.links:
+            curLink.stop()
+
+        # Containers are stopped and terminated on a bounded worker pool
+        pool = opstestfw.WorkerPool()
+        requests = []
+        for curHost in self.net.hosts:
+            request = pool.submit(self.NodeTerminate, node=curHost,
+                                  stop=False, cleanup=True)
+            requests.append((str(curHost), request))
+        for curSwitch in self.net.switches:
+            request = pool.submit(self.NodeTerminate, node=curSwitch,
+                                  stop=True, cleanup=False)
+            requests.append((str(curSwitch), request))
+
+        # Wait for every container to be gone and summarize the timings
+        summary = []
+        for (nodeName, request) in requests:
+            try:
+                nodeTime = "%.2f seconds" % request.result()
+            except Exception as e:
+                nodeTime = "failed (" + str(e) + ")"
+                opstestfw.LogOutput('error', "Failed to terminate "
+                                    + nodeName + ": " + str(e))
+            summary.append(nodeName + ": " + nodeTime)
+        pool.close()
+        self.phaseTimes['teardown'] = time.time() - teardownStart
+        opstestfw.LogOutput('info', "Topology teardown took %.2f seconds"
+                            % self.phaseTimes['teardown'])
+        for curLine in summary:
+            opstestfw.LogOutput('debug', "  terminated " + curLine)
+        opstestfw.LogFlush()
+
+    def NodeTerminate(self, **kwargs):
+        """
+        This routine terminates one docker container of the topology.  It is
+        run on the TopologyDestroy worker pool.
+
+        :param node: mininet host or switch object
+        :type node: object
+        :param stop: stop the node before terminating it, as net.stop()
+                     does for switches
+        :type stop: boolean
+        :param cleanup: clean up the node after terminating it
+        :type cleanup: boolean
+        :return: time taken to terminate the node in seconds
+        :rtype: float
+        """
+        node = kwargs.get('node')
+        stop = kwargs.get('stop', False)
+        cleanup = kwargs.get('cleanup', False)
+        nodeStart = time.time()
+        if stop is True:
+            opstestfw.LogOutput('debug', "stopping " + str(node))
+            node.stop()
+        opstestfw.LogOutput('debug', "terminating " + str(node))
+        node.terminate()
+        if cleanup is True:
+            node.cleanup()
+        return time.time() - nodeStart
+
+    def WarmPark(self):
+        """
+        This routine resets the topology to its baseline and parks it in the
+        warm topology pool.  Switches roll their configuration back to the
+        startup-config saved at cold bring-up, workstations drop the
+        addresses of their test interfaces, and all links are brought up.
+
+        :return: True if the topology was parked, False if it has to be
+                 destroyed
+        :rtype: boolean
+        """
+        if self.tuntap_failure or self.switchd_failure \
+                or self.cur_hw_failure or len(self.deviceConnectFailures) != 0:
+            return False
+
+        resetStart = time.time()
+        pool = opstestfw.WorkerPool()
+        requests = []
+        for curDev in self.model.deviceOrder:
+            if curDev not in self.deviceObj:
+                pool.close()
+                return False
+            request = pool.submit(self.DeviceWarmReset, deviceName=curDev)
+            requests.append((curDev, request))
+
+        resetFailed = False
+        for (deviceName, request) in requests:
+            try:
+                returnCode = request.result()
+            except Exception as e:
+                returnCode = str(e)
+            if returnCode != 0:
+                opstestfw.LogOutput('error', "Failed to reset " + deviceName
+                                    + " (" + str(returnCode) + ")")
+                resetFailed = True
+        pool.close()
+        if resetFailed is True:
+            return False
+
+        # Bring back links a test case may have left down
+        for curLink in self.model.linkOrder:
+            if curLink in self.dockerLinks \
+                    and self.dockerLinks[curLink]['mininetLink'] is False:
+                continue
+            linkInfo = self.model.links[curLink]
+            self.net.configLinkStatus(linkInfo['device1'],
+                                      linkInfo['device2'], 'up')
+
+        self.DeviceHandlesClose()
+        self.deviceObj = dict()
+        self.resetTime = time.time() - resetStart
+        opstestfw.LogOutput('info', "Topology reset in %.2f seconds, cold "
+                            "bring-up took %.2f seconds - parking topology"
+                            % (self.resetTime, self.coldBringupTime))
+        opstestfw.topologyPool.park(self)
+        return True
+
+    def DeviceWarmReset(self, **kwargs):
+        """
+        This routine resets one device of the topology to its baseline.  It
+        is run on the WarmPark worker pool.
+
+        :param deviceName: logical device name
+        :type deviceName: string
+        :return: return code, 0 on success
+        :rtype: integer
+        """
+        deviceName = kwargs.get('deviceName')
+        devObj = self.deviceObj[deviceName]
+        isSwitch = self.model.DeviceCategoryGet(device=deviceName) == "switch"
+        if isSwitch is True and deviceName not in self.baselineSaved:
+            # No baseline to roll the switch back to
+            return 1
+        if devObj.ConnectPending() is True:
+            # Never used by the test module, nothing to reset
+            return 0
+        if devObj.Connected() is False:
+            return 1
+        if isSwitch is True:
+            retStruct = devObj.ConfigBaselineRestore()
+        else:
+            retStruct = devObj.AddressReset()
+        return retStruct.returnCode()
 
-        for curSwitch in switch_list:
-            opstestfw.LogOutput('debug', "terminating " + str(curSwitch))
-            curSwitch.terminate()
+    def WarmStart(self, **kwargs):
+        """
+        This routine takes a topology out of the warm topology pool for a new
+        test module.  If the topology dictionary of the module differs from
+        the one of the parked topology, the topology is reconfigured.  The
+        device connections are opened again by CreateDeviceObjects.
+
+        :param topoDict: topology dictionary defined in the test case
+        :type topoDict: dictionary
+        :param runEnv: reference object to testEnviron.py
+        :type runEnv:  Object
+        :param defSwitchContext: default switch context
+        :type defSwitchContext: string
+        :return: returnStruct, returnCode is not 0 if the topology could not
+                 be reused
+        :rtype: object
+        """
+        topoDict = kwargs.get('topoDict', self.topoDict)
+        self.runEnv = kwargs.get('runEnv', self.runEnv)
+        self.defaultSwitchContext = kwargs.get('defSwitchContext',
+                                               self.defaultSwitchContext)
+        self.warmStarts += 1
+        self.deviceConnectFailures = dict()
+        self.inbandIndex = 0
+        opstestfw.LogOutput('info', "Reusing parked topology (reset took "
+                            "%.2f seconds, cold bring-up took %.2f seconds)"
+                            % (self.resetTime, self.coldBringupTime))
+        if opstestfw.TopologyModel(topoDict=topoDict).Signature() != \
+                self.model.Signature():
+            retStruct = self.Reconfigure(topoDict=topoDict)
+            if retStruct.returnCode() != 0:
+                return retStruct
+        self.LogicalTopologyXMLWrite()
+        self.TopologyXMLWrite()
+        retCls = opstestfw.returnStruct(returnCode=0)
+        return retCls
 
     def VirtualXMLCreate(self):
         """
@@ -563,6 +1450,8 @@ class Topology (OpsVsiTest):
         reservationIdTag = ET.SubElement(reservationTag, 'id').text = "virtual"
         reservationUserTag = ET.SubElement(reservationTag, 'user')
         reservationServerTag = ET.SubElement(reservationTag, 'server')
+        # Device elements by name, so links are added without a search
+        self.xmlDeviceElements = dict()
 
     def VirtualXMLDeviceAdd(self, **kwargs):
         """
@@ -590,6 +1479,8 @@ class Topology (OpsVsiTest):
             return retCls
 
         deviceNameTag = ET.SubElement(deviceTag, 'name').text = name
+        self.xmlDeviceElements[name] = deviceTag
+        self.model.ConnectionAdd(device=name, name=name)
 
         # Create System area
         systemTag = ET.SubElement(deviceTag, 'system')
@@ -690,11 +1581,14 @@ class Topology (OpsVsiTest):
         device1Port = kwargs.get("device1Port")
         device2Port = kwargs.get("device2Port")
 
-        # Search for device1 to create interface block and link block
-        xpath = ".//device[name='" + device1 + "']"
-        device1Element = opstestfw.XmlGetElementsByTag(
-            self.TOPOLOGY,
-            ".//device[name='" + device1 + "']")
+        self.model.InterfaceAdd(link=link,
+                                device1=device1,
+                                device1Port=device1Port,
+                                device2=device2,
+                                device2Port=device2Port)
+
+        # Look up device1 to create interface block and link block
+        device1Element = self.xmlDeviceElements[device1]
 
         # create device 1 interface block
         dev1InterfaceTag = ET.SubElement(device1Element, "interface")
@@ -743,9 +1637,8 @@ class Topology (OpsVsiTest):
         type = ET.SubElement(dev1LinkTag, "type").text = "auto"
         asicVersion = ET.SubElement(dev1LinkTag, "asicVersion")
 
-        # Search for device1 to create interface block and link block
-        xpath = ".//device[name='" + device2 + "']"
-        device2Element = opstestfw.XmlGetElementsByTag(self.TOPOLOGY, xpath)
+        # Look up device2 to create interface block and link block
+        device2Element = self.xmlDeviceElements[device2]
 
         # create device 1 interface block
         dev2InterfaceTag = ET.SubElement(device2Element, "interface")
@@ -797,6 +1690,31 @@ class Topology (OpsVsiTest):
         retCls = opstestfw.returnStruct(returnCode=0)
         return retCls
 
+    def VirtualXMLLinkDelete(self, **kwargs):
+        """
+        This routine removes the interface and link blocks of a link from
+        the XML file
+        """
+        link = kwargs.get("link")
+        for (curDev, curLink) in list(self.model.interfaces.keys()):
+            if curLink != link:
+                continue
+            localPort = self.model.interfaces[(curDev, curLink)]['local']
+            deviceElement = self.xmlDeviceElements.get(curDev, None)
+            if deviceElement is None:
+                continue
+            for curTag in list(deviceElement):
+                if curTag.tag == "link" \
+                        and curTag.findtext("name") == link:
+                    deviceElement.remove(curTag)
+                elif curTag.tag == "interface" \
+                        and curTag.findtext("name") == localPort:
+                    deviceElement.remove(curTag)
+        self.model.InterfaceDelete(link=link)
+
+        retCls = opstestfw.returnStruct(returnCode=0)
+        return retCls
+
     def InterfaceGetByDeviceLink(self, **kwargs):
         """
         This method gets the real interfaces attached to a link
@@ -809,10 +1727,11 @@ class Topology (OpsVsiTest):
         device = kwargs.get('device', None)
         link = kwargs.get('link', None)
 
-        xpath = ".//device[name='" + str(device) + \
-            "']/link[name='" + str(link) + "']/localInterface"
-        retStruct = opstestfw.XmlGetElementsByTag(self.TOPOLOGY, xpath)
-        retCls = opstestfw.returnStruct(returnCode=0, data=retStruct.text)
+        localInterface = self.model.InterfaceGet(device=device, link=link)
+        if localInterface is None:
+            retCls = opstestfw.returnStruct(returnCode=1)
+            return retCls
+        retCls = opstestfw.returnStruct(returnCode=0, data=localInterface)
         return retCls
 
     def Links(self, **kwargs):
@@ -824,18 +1743,7 @@ class Topology (OpsVsiTest):
         """
         device = kwargs.get('device', None)
 
-        xpath = ".//link"
-        linksList = []
-        linkElements = opstestfw.XmlGetElementsByTag(
-            self.LOGICAL_TOPOLOGY, xpath, allElements=True)
-        # print linkElements
-        for curElement in linkElements:
-            linkName = curElement.attrib['name']
-            device1 = curElement.attrib['device1']
-            device2 = curElement.attrib['device2']
-            if device == device1 or device == device2:
-                linksList.append(linkName)
-        return linksList
+        return self.model.LinksGet(device=device)
 
     # Get the provisioning targets (Physical devices)
     def GetProvisioningTargets(self):
@@ -858,148 +1766,115 @@ class Topology (OpsVsiTest):
         """
         self.LOGICAL_TOPOLOGY = ET.Element("topology", attrib={'version': "3"})
 
+        # Parse the topology dictionary once - lookups are done on the model,
+        # the XML is only written out for reference.
+        self.model = opstestfw.TopologyModel(topoDict=self.topoDict)
+
         # Get target if there
         self.targets = str(self.topoDict.get('topoTarget', None))
-        # self.topoLinks = str(self.topoDict.get)
-        # create the links
+        # Keep the normalized strings around for existing users
+        self.topoLinks = ",".join(
+            [":".join([curLink, self.model.links[curLink]['device1'],
+                       self.model.links[curLink]['device2']])
+             for curLink in self.model.linkOrder])
         self.topoLinkFilter = ""
-
-        if "topoLinks" in self.topoDict:
-            mytopoLinks = str(self.topoDict['topoLinks'])
-            self.topoLinks = re.sub('\s+', '', mytopoLinks)
-            for curLink in str.split(self.topoLinks, ','):
-                (link, dev1, dev2) = str.split(curLink, ':')
-                linkTag = ET.SubElement(self.LOGICAL_TOPOLOGY,
-                                        'link',
-                                        attrib={'name': link, 'device1': dev1,
-                                                'device2': dev2,
-                                                'rate': "any"})
-
-            # now search for topoLinkFilter in the dictionary
-            if "topoLinkFilter" in self.topoDict:
-                self.topoLinkFilter = str(self.topoDict['topoLinkFilter'])
-        else:
-            self.topoLinks = ""
-        # Create TopoDevices
+        if self.topoLinks != "" and "topoLinkFilter" in self.topoDict:
+            self.topoLinkFilter = str(self.topoDict['topoLinkFilter'])
         self.topoDevices = str(self.topoDict['topoDevices'])
-        for curDev in str.split(self.topoDevices):
-            # Search for device in target
-            curDevTarget = "false"
-            for curTarget in str.split(self.targets):
-                if curTarget == curDev:
-                    curDevTarget = "true"
-                    break
+        self.topoFilters = re.sub('\s+', '', str(self.topoDict['topoFilters']))
 
+        # create the links
+        for curLink in self.model.linkOrder:
+            linkInfo = self.model.links[curLink]
+            linkTag = ET.SubElement(self.LOGICAL_TOPOLOGY,
+                                    'link',
+                                    attrib={'name': curLink,
+                                            'device1': linkInfo['device1'],
+                                            'device2': linkInfo['device2'],
+                                            'rate': "any"})
+
+        # Need to inspect the devices to see if profile is specific.  If not,
+        # lets assume auto-ubuntu-12-04 for workstations
+        self.topo_wrkston_image_dict = dict()
+        for curDev in self.model.deviceOrder:
+            devInfo = self.model.devices[curDev]
+            if devInfo['target'] is True:
+                curDevTarget = "true"
+            else:
+                curDevTarget = "false"
             deviceTag = ET.SubElement(
                 self.LOGICAL_TOPOLOGY,
                 'device',
                 attrib={'name': curDev,
                         'target': curDevTarget,
                         'group': "NULL"})
-
-        mytopoFilters = str(self.topoDict['topoFilters'])
-        self.topoFilters = re.sub('\s+', '', mytopoFilters)
-        for curFilter in str.split(self.topoFilters, ','):
-            # print curFilter
-            (cDev, cAttr, cVal) = str.split(curFilter, ':')
-            # Search for the tag in logical topology
-            xpath = ".//device[@name='" + cDev + "']"
-            deviceTag = opstestfw.XmlGetElementsByTag(
-                self.LOGICAL_TOPOLOGY, xpath)
-            if deviceTag is not None and cAttr != "docker-image":
+            devAttrs = devInfo['attributes']
+            for (cAttr, cVal) in devAttrs.items():
+                if cAttr == "docker-image":
+                    self.hostimage = cVal
                 attributeTag = ET.SubElement(
                     deviceTag,
                     'attribute',
                     attrib={'name': cAttr,
                             'value': cVal})
-            if cAttr == "docker-image":
-                self.hostimage = cVal
-                attributeTag = ET.SubElement(
+            for (cLink, cPort) in devInfo['ports'].items():
+                # Create new subElement for port
+                portTag = ET.SubElement(
                     deviceTag,
+                    'port',
+                    attrib={'link': cLink})
+                # Create Attribute tag now
+                attributeTag = ET.SubElement(
+                    portTag,
                     'attribute',
-                    attrib={'name': cAttr,
-                            'value': cVal})
+                    attrib={'name': 'portName',
+                            'value': cPort})
 
-        # Now parse through topoLinkFilter statements
-        if self.topoLinkFilter != "":
-            for curTopoLinkFilter in str.split(self.topoLinkFilter, ','):
-                # print curTopoLinkFilter
-                (cLink, cDev, cFType, CAttr) = str.split(
-                    curTopoLinkFilter, ':')
-                # Search for Device in logical Topology
-                xpath = ".//device[@name='" + cDev + "']"
-                deviceTag = opstestfw.XmlGetElementsByTag(
-                    self.LOGICAL_TOPOLOGY, xpath)
-                if deviceTag is not None:
-                    # Create new subElement for port
-                    portTag = ET.SubElement(
-                        deviceTag,
-                        'port',
-                        attrib={'link': cLink})
-                    # Create Attribute tag now
-                    attributeTag = ET.SubElement(
-                        portTag,
-                        'attribute',
-                        attrib={'name': 'portName',
-                                'value': CAttr})
-
-        # Need to inspect ETREE to see if profile is specific.  If not, lets
-        # assume auto-ubuntu-12-04 for workstations
-        self.topo_wrkston_image_dict = dict()
-        xpath = ".//device/attribute[@value='workstation']/.."
-        #xpath = ".//device"
-        wrkstonDevsTag = opstestfw.XmlGetElementsByTag(
-            self.LOGICAL_TOPOLOGY, xpath, allElements=True)
-        for curTag in wrkstonDevsTag:
-            #print curTag
-            wrkston_name = curTag.get('name')
+            if devAttrs.get('system-category', None) != "workstation":
+                continue
             # Default to default image
-            self.topo_wrkston_image_dict[wrkston_name] = "openswitch/ubuntutest:latest"
-            # =" + wrkston_name
-            attribute_list = curTag.findall('attribute')
-            # print "attrList "
-            # print attribute_list
-            found_profile = 0
-            found_docker = 0
-            for curAttr in attribute_list:
-                # print "curAttr"
-                attrName = curAttr.get('name')
-                # print attrName
-                if attrName == "system-profile":
-                    found_profile = 1
-                    opstestfw.LogOutput(
-                        'debug',
-                        "Found system-profile attribute stated for device "
-                        "- not assuming auto-ubuntu-12-04")
-                if attrName == "docker-image":
-                    found_docker = 1
-                    found_profile = 1
-                    opstestfw.LogOutput('debug',
-                                        "Found docker-image attribute. "
-                                        "Adding CentOS profile")
-                    attrValue = curAttr.get('value')
-                    self.topo_wrkston_image_dict[wrkston_name] = attrValue
-            if found_profile == 0:
-                # Need to add subelements
+            self.topo_wrkston_image_dict[curDev] = \
+                "openswitch/ubuntutest:latest"
+            if "docker-image" in devAttrs:
+                opstestfw.LogOutput('debug',
+                                    "Found docker-image attribute. "
+                                    "Adding CentOS profile")
+                self.topo_wrkston_image_dict[curDev] = \
+                    devAttrs['docker-image']
+                opstestfw.LogOutput('debug',
+                                    "Found docker image, need to boot centos")
+                systemProfile = "CentOS"
+            elif "system-profile" in devAttrs:
+                opstestfw.LogOutput(
+                    'debug',
+                    "Found system-profile attribute stated for device "
+                    "- not assuming auto-ubuntu-12-04")
+                continue
+            else:
                 opstestfw.LogOutput(
                     'debug',
                     "No system-profile attribute, default auto-ubuntu-12-04")
-                deviceTag = ET.SubElement(
-                    curTag,
-                    'attribute',
-                    attrib={
-                        'name': "system-profile",
-                        'value': "auto-ubuntu-12-04"})
-            if found_docker == 1:
-                opstestfw.LogOutput('debug',
-                                    "Found docker image, need to boot centos")
-                deviceTag = ET.SubElement(
-                    curTag,
-                    'attribute',
-                    attrib={
-                        'name': "system-profile",
-                        'value': "CentOS"})
+                systemProfile = "auto-ubuntu-12-04"
+            self.model.DeviceDerivedAttrSet(device=curDev,
+                                            name="system-profile",
+                                            value=systemProfile)
+            attributeTag = ET.SubElement(
+                deviceTag,
+                'attribute',
+                attrib={
+                    'name': "system-profile",
+                    'value': systemProfile})
+
+        self.LogicalTopologyXMLWrite()
+
+    # Write out Topology File Logical
+    def LogicalTopologyXMLWrite(self):
+        """
 
+        This routine writes the logical topology xml file to
+        results directory corresponding to a particular test run.
+
+        """
         dumpString = ET.tostring(self.LOGICAL_TOPOLOGY)
 
         # Write the topology out
@@ -1026,19 +1901,7 @@ class Topology (OpsVsiTest):
         """
 
         deviceName = kwargs.get('device', None)
-        xpath = ".//device[@name=" + deviceName + "]"
-        #xpath = ".//device"
-        deviceTag = opstestfw.XmlGetElementsByTag(
-            self.LOGICAL_TOPOLOGY, xpath, allElements=True)
-
-        attribute_list = deviceTag.findall('attribute')
-        retDict = dict()
-
-        for curAttr in attribute_list:
-            attrName = curAttr.get('name')
-            attrValue = curAttr.get('value')
-            retDict[attrName] = attrValue
-        return retDict
+        return self.model.DeviceAttrsGet(device=deviceName)
 
     # Routine to go and create device objects and establish connections
     def CreateDeviceObjects(self):
@@ -1047,79 +1910,119 @@ class Topology (OpsVsiTest):
 
         """
         # Look to the logical topology to
-        xpathString = ".//device"
-        deviceEtreeElements = opstestfw.XmlGetElementsByTag(
-            self.LOGICAL_TOPOLOGY, xpathString, allElements=True)
-
-        if deviceEtreeElements is None:
+        if len(self.model.deviceOrder) == 0:
             opstestfw.LogOutput(
                 'error',
                 "Did not find devices to spawn off device connections")
             return None
 
-        for curEtree in deviceEtreeElements:
-            deviceName = curEtree.get('name')
-            attribute_list = curEtree.iter('attribute')
-
-            for curAttr in attribute_list:
-                # print "curAttr"
-                attrName = curAttr.get('name')
-                # print attrName
-                if attrName == "system-category":
-                    categoryValue = curAttr.get('value')
-
-                    if categoryValue == "switch":
-                        # Do logic to spawn switch off
-                        opstestfw.LogOutput(
-                            'info',
-                            "Connecting to switch " +
-                            deviceName +
-                            " (" +
-                            self.topo[
-                                deviceName] +
-                            ")")
-                        switchObj = self.LaunchSwitch(
-                            device=self.topo[deviceName])
-                        self.deviceObj[deviceName] = switchObj
-                        deviceLinks = self.Links(device=deviceName)
-                        # Populate Link dictionary for each device str
-                        switchObj.linkPortMapping = dict()
-                        # Populate the name of the switch devices in the
-                        # topology
-                        switchObj.topo = dict()
-
-                        for curLink in deviceLinks:
-                            portStruct = self.InterfaceGetByDeviceLink(
-                                link=self.topo[curLink],
-                                device=self.topo[deviceName])
-                            port = portStruct.valueGet()
-                            switchObj.linkPortMapping[curLink] = port
-
-                        # Set up default Context
-                        switchObj.setDefaultContext(context=self.defaultSwitchContext)
-
-                    if categoryValue == "workstation":
-                        # Do logic to spawn host off
-                        opstestfw.LogOutput(
-                            'info',
-                            "Connecting to host " +
-                            deviceName +
-                            " (" +
-                            self.topo[
-                                deviceName] +
-                            ")")
-                        hostObj = self.LaunchHost(device=self.topo[deviceName])
-                        self.deviceObj[deviceName] = hostObj
-
-                        deviceLinks = self.Links(device=deviceName)
-                        # Populate Link dictionary for each device str
-                        hostObj.linkPortMapping = dict()
-                        for curLink in deviceLinks:
-                            portStruct = self.InterfaceGetByDeviceLink(
-                                link=self.topo[curLink],
-                                device=self.topo[deviceName])
-                            port = portStruct.valueGet()
-                            hostObj.linkPortMapping[curLink] = port
+        # Connections are opened on a bounded worker pool
+        phaseStart = time.time()
+        self.deviceTimes = dict()
+        pool = opstestfw.WorkerPool()
+        requests = []
+        for deviceName in self.model.deviceOrder:
+            categoryValue = self.model.DeviceCategoryGet(device=deviceName)
+            if categoryValue == "switch" or \
+                    categoryValue == "workstation":
+                request = pool.submit(self.DeviceConnect,
+                                      deviceName=deviceName,
+                                      category=categoryValue)
+                requests.append((deviceName, request))
+
+        # Merge the device objects back and report failures per device
+        self.deviceConnectFailures = dict()
+        for (deviceName, request) in requests:
+            try:
+                devObj = request.result()
+            except Exception as e:
+                devObj = None
+                self.deviceConnectFailures[deviceName] = str(e)
+                opstestfw.LogOutput('error',
+                                    "Failed to connect to " + deviceName
+                                    + ": " + str(e))
+                continue
+            if devObj.ConnectPending() is False \
+                    and devObj.Connected() is False:
+                self.deviceConnectFailures[deviceName] = \
+                    "no connection established"
+                opstestfw.LogOutput('error',
+                                    "Failed to connect to " + deviceName)
+            self.deviceObj[deviceName] = devObj
+        pool.close()
+        self.phaseTimes['connect'] = time.time() - phaseStart
+        # Default contexts are entered in parallel, the slowest device
+        # is what the phase costs
+        contextTimes = [curTimes.get('defaultContext', 0.0)
+                        for curTimes in self.deviceTimes.values()]
+        self.phaseTimes['defaultContext'] = max(contextTimes + [0.0])
+
+    def DeviceConnect(self, **kwargs):
+        """
+        This routine creates the device object for one device of the logical
+        topology, connects to it and fills in its link to port mapping.  It
+        is run on the CreateDeviceObjects worker pool.
+
+        :param deviceName: logical device name
+        :type deviceName: string
+        :param category: "switch" or "workstation"
+        :type category: string
+        :return: device object
+        :rtype: object
+        """
+        deviceName = kwargs.get('deviceName')
+        categoryValue = kwargs.get('category')
+        deviceTimes = dict()
+        self.deviceTimes[deviceName] = deviceTimes
+        phaseStart = time.time()
+
+        if categoryValue == "switch":
+            # Do logic to spawn switch off
+            opstestfw.LogOutput('info',
+                                "Connecting to switch " + deviceName + " ("
+                                + self.topo[deviceName] + ")")
+            devObj = self.LaunchSwitch(device=self.topo[deviceName])
+            # Populate the name of the switch devices in the
+            # topology
+            devObj.topo = dict()
+        else:
+            # Do logic to spawn host off
+            opstestfw.LogOutput('info',
+                                "Connecting to host " + deviceName + " ("
+                                + self.topo[deviceName] + ")")
+            devObj = self.LaunchHost(device=self.topo[deviceName])
+        deviceTimes['connect'] = time.time() - phaseStart
+
+        deviceLinks = self.Links(device=deviceName)
+        # Populate Link dictionary for each device str
+        devObj.linkPortMapping = dict()
+        for curLink in deviceLinks:
+            portStruct = self.InterfaceGetByDeviceLink(
+                link=self.topo[curLink],
+                device=self.topo[deviceName])
+            port = portStruct.valueGet()
+            devObj.linkPortMapping[curLink] = port
+
+        if categoryValue == "switch" and (devObj.ConnectPending() is True
+                                          or devObj.Connected() is True):
+            if opstestfw.TopologyPoolEnabled() is True \
+                    and deviceName not in self.baselineSaved:
+                # Keep the configuration the switch booted with, so it can
+                # be rolled back when the topology is parked.  The switch
+                # is connected now, the baseline cannot wait for first use.
+                devObj.LazyConnect()
+                retStruct = devObj.ConfigBaselineSave()
+                if retStruct.returnCode() == 0:
+                    self.baselineSaved.add(deviceName)
+                else:
+                    opstestfw.LogOutput('error', "Failed to save the "
+                                        "baseline configuration of "
+                                        + deviceName)
+            # Set up default Context
+            phaseStart = time.time()
+            devObj.setDefaultContext(context=self.defaultSwitchContext)
+            deviceTimes['defaultContext'] = time.time() - phaseStart
+        return devObj
 
     def deviceObjGet(self, **kwargs):
         """
@@ -1143,6 +2046,13 @@ class Topology (OpsVsiTest):
 
         device = kwargs.get('device')
         noConnect = kwargs.get('noConnect', False)
+        if self.emulator is True:
+            switchObj = opstestfw.VSwitch(topology=self, device=device,
+                                          noConnect=noConnect,
+                                          lazyConnect=True)
+            if noConnect is False:
+                self.EmulatorAttach(deviceObj=switchObj, category="switch")
+            return switchObj
         switchObj = opstestfw.VSwitch(
             topology=self,
             device=device,
@@ -1157,6 +2067,11 @@ class Topology (OpsVsiTest):
 
         """
         device = kwargs.get('device')
+        if self.emulator is True:
+            hostObj = opstestfw.VHost(topology=self, device=device,
+                                      lazyConnect=True)
+            self.EmulatorAttach(deviceObj=hostObj, category="workstation")
+            return hostObj
         hostObj = opstestfw.VHost(topology=self, device=device)
         return hostObj
 
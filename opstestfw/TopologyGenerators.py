@@ -0,0 +1,190 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+from testEnviron import LogOutput
+
+"""
+Topology dictionary generators.  Each routine returns a topoDict for a common
+topology shape that can be handed to testEnviron like a hand written one.
+Switches are named dut01, dut02, ..., workstations wrkston01, wrkston02, ...
+and links lnk01, lnk02, ... in the order they are created.
+"""
+
+
+def TopoDictCreate(**kwargs):
+    """
+    Library routine to build a topology dictionary out of lists of devices
+    and links
+
+    :param switches: number of switches, named dut01 onwards
+    :type switches: integer
+    :param workstations: number of workstations, named wrkston01 onwards
+    :type workstations: integer
+    :param links: list of (device1, device2) tuples, one per link
+    :type links: list
+    :return: topology dictionary
+    :rtype: dictionary
+    """
+    switches = kwargs.get('switches', 0)
+    workstations = kwargs.get('workstations', 0)
+    links = kwargs.get('links', [])
+
+    switchList = [SwitchName(index=curIndex)
+                  for curIndex in range(1, switches + 1)]
+    wrkstonList = [WorkstationName(index=curIndex)
+                   for curIndex in range(1, workstations + 1)]
+    topoFilters = [curDev + ":system-category:switch"
+                   for curDev in switchList]
+    topoFilters += [curDev + ":system-category:workstation"
+                    for curDev in wrkstonList]
+    topoLinks = ["lnk%02d:%s:%s" % (curIndex + 1, dev1, dev2)
+                 for (curIndex, (dev1, dev2)) in enumerate(links)]
+
+    topoDict = {"topoTarget": " ".join(switchList),
+                "topoDevices": " ".join(switchList + wrkstonList),
+                "topoFilters": ",".join(topoFilters)}
+    if len(topoLinks) != 0:
+        topoDict["topoLinks"] = ",".join(topoLinks)
+    return topoDict
+
+
+def SwitchName(**kwargs):
+    """
+    Library routine to name the switches of generated topologies
+
+    :param index: switch number, starting at 1
+    :type index: integer
+    :return: logical device name
+    :rtype: string
+    """
+    return "dut%02d" % kwargs.get('index')
+
+
+def WorkstationName(**kwargs):
+    """
+    Library routine to name the workstations of generated topologies
+
+    :param index: workstation number, starting at 1
+    :type index: integer
+    :return: logical device name
+    :rtype: string
+    """
+    return "wrkston%02d" % kwargs.get('index')
+
+
+def TopoDictLine(**kwargs):
+    """
+    Library routine to generate a line of switches, each switch linked to
+    the next one
+
+    :param switches: number of switches
+    :type switches: integer
+    :return: topology dictionary
+    :rtype: dictionary
+    """
+    switches = kwargs.get('switches', 2)
+    links = [(SwitchName(index=curIndex), SwitchName(index=curIndex + 1))
+             for curIndex in range(1, switches)]
+    return TopoDictCreate(switches=switches, links=links)
+
+
+def TopoDictRing(**kwargs):
+    """
+    Library routine to generate a ring of switches, a line with the last
+    switch linked back to the first one
+
+    :param switches: number of switches, at least 3
+    :type switches: integer
+    :return: topology dictionary, None if there are too few switches
+    :rtype: dictionary
+    """
+    switches = kwargs.get('switches', 3)
+    if switches < 3:
+        LogOutput('error', "A ring needs at least 3 switches")
+        return None
+    links = [(SwitchName(index=curIndex), SwitchName(index=curIndex + 1))
+             for curIndex in range(1, switches)]
+    links.append((SwitchName(index=switches), SwitchName(index=1)))
+    return TopoDictCreate(switches=switches, links=links)
+
+
+def TopoDictMesh(**kwargs):
+    """
+    Library routine to generate a full mesh of switches, every switch linked
+    to every other switch
+
+    :param switches: number of switches
+    :type switches: integer
+    :return: topology dictionary
+    :rtype: dictionary
+    """
+    switches = kwargs.get('switches', 3)
+    links = []
+    for curIndex in range(1, switches + 1):
+        for peerIndex in range(curIndex + 1, switches + 1):
+            links.append((SwitchName(index=curIndex),
+                          SwitchName(index=peerIndex)))
+    return TopoDictCreate(switches=switches, links=links)
+
+
+def TopoDictLeafSpine(**kwargs):
+    """
+    Library routine to generate a leaf-spine fabric.  The spines are the
+    first switches, every leaf is linked to every spine and the
+    workstations are spread over the leaves.
+
+    :param spines: number of spine switches
+    :type spines: integer
+    :param leaves: number of leaf switches
+    :type leaves: integer
+    :param workstations: number of workstations per leaf
+    :type workstations: integer
+    :return: topology dictionary
+    :rtype: dictionary
+    """
+    spines = kwargs.get('spines', 2)
+    leaves = kwargs.get('leaves', 2)
+    workstations = kwargs.get('workstations', 0)
+    links = []
+    for leafIndex in range(spines + 1, spines + leaves + 1):
+        for spineIndex in range(1, spines + 1):
+            links.append((SwitchName(index=leafIndex),
+                          SwitchName(index=spineIndex)))
+    wrkstonIndex = 1
+    for leafIndex in range(spines + 1, spines + leaves + 1):
+        for curIndex in range(0, workstations):
+            links.append((SwitchName(index=leafIndex),
+                          WorkstationName(index=wrkstonIndex)))
+            wrkstonIndex += 1
+    return TopoDictCreate(switches=spines + leaves,
+                          workstations=leaves * workstations,
+                          links=links)
+
+
+def TopoDictStar(**kwargs):
+    """
+    Library routine to generate a star, one switch with every workstation
+    linked to it
+
+    :param workstations: number of workstations
+    :type workstations: integer
+    :return: topology dictionary
+    :rtype: dictionary
+    """
+    workstations = kwargs.get('workstations', 2)
+    links = [(SwitchName(index=1), WorkstationName(index=curIndex))
+             for curIndex in range(1, workstations + 1)]
+    return TopoDictCreate(switches=1, workstations=workstations,
+                          links=links)
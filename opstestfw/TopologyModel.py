@@ -0,0 +1,436 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import re
+from collections import OrderedDict
+
+"""
+In memory model of a test topology.  The topology dictionary of the test case
+is parsed once into indexed device, link and adjacency dictionaries so the
+lookups done while building and connecting the topology do not walk the
+logical or physical topology XML trees.
+"""
+
+
+class TopologyModel(object):
+    """
+    TopologyModel Class definition
+
+    The logical part of the model (devices, attributes, links, link filters
+    and adjacency) is keyed by logical device name and comes from the
+    topology dictionary.  The physical part (connections and the interfaces
+    at each end of a link) is keyed by physical device name and is filled in
+    while the topology is brought up.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        TopologyModel init method
+
+        :param topoDict: topology dictionary defined in the test case
+        :type topoDict: dictionary
+        """
+        self.topoDict = kwargs.get('topoDict', None)
+        self.reservation = "virtual"
+        # Logical topology
+        self.devices = dict()
+        self.deviceOrder = []
+        self.links = dict()
+        self.linkOrder = []
+        self.adjacency = dict()
+        self.targets = []
+        self.signature = None
+        # Physical topology
+        self.connections = dict()
+        self.interfaces = dict()
+        if self.topoDict is not None:
+            self.Parse()
+
+    def Parse(self):
+        """
+        Parse method
+
+        Builds the logical topology out of the topoDevices, topoLinks,
+        topoFilters, topoLinkFilter and topoTarget entries of the topology
+        dictionary.
+        """
+        self.targets = str.split(str(self.topoDict.get('topoTarget', "")))
+        for curDev in str.split(str(self.topoDict['topoDevices'])):
+            self.DeviceAdd(device=curDev)
+
+        topoLinks = re.sub('\s+', '', str(self.topoDict.get('topoLinks', "")))
+        if topoLinks != "":
+            for curLink in str.split(topoLinks, ','):
+                (link, dev1, dev2) = str.split(curLink, ':')
+                self.LinkAdd(link=link, device1=dev1, device2=dev2)
+
+        topoFilters = re.sub('\s+', '',
+                             str(self.topoDict.get('topoFilters', "")))
+        if topoFilters != "":
+            for curFilter in str.split(topoFilters, ','):
+                (cDev, cAttr, cVal) = str.split(curFilter, ':')
+                if cDev in self.devices:
+                    self.devices[cDev]['attributes'][cAttr] = cVal
+
+        topoLinkFilter = re.sub('\s+', '',
+                                str(self.topoDict.get('topoLinkFilter', "")))
+        if topoLinks != "" and topoLinkFilter != "":
+            for curFilter in str.split(topoLinkFilter, ','):
+                (cLink, cDev, cTag, cPort) = str.split(curFilter, ':')
+                if cLink in self.links:
+                    self.links[cLink]['filters'].append((cDev, cTag, cPort))
+                if cDev in self.devices:
+                    self.devices[cDev]['ports'][cLink] = cPort
+        self.signature = self.SignatureBuild()
+
+    def SignatureBuild(self):
+        """
+        SignatureBuild method
+
+        :return: hashable description of the logical topology - two
+                 topology dictionaries with the same devices, attributes,
+                 links and link filters have the same signature
+        :rtype: tuple
+        """
+        deviceSig = []
+        for curDev in sorted(self.devices.keys()):
+            deviceSig.append(self.DeviceSignature(device=curDev)
+                             + (tuple(sorted(
+                                 self.devices[curDev]['ports'].items())),))
+        linkSig = []
+        for curLink in sorted(self.links.keys()):
+            linkSig.append(self.LinkSignature(link=curLink))
+        return (tuple(deviceSig), tuple(linkSig))
+
+    def DeviceSignature(self, **kwargs):
+        """
+        DeviceSignature method
+
+        :param device: logical device name
+        :type device: string
+        :return: hashable description of the device - its name, whether it
+                 is a target and its attributes
+        :rtype: tuple
+        """
+        device = kwargs.get('device')
+        devInfo = self.devices[device]
+        return (device,
+                devInfo['target'],
+                tuple(sorted(devInfo['attributes'].items())))
+
+    def LinkSignature(self, **kwargs):
+        """
+        LinkSignature method
+
+        :param link: logical link name
+        :type link: string
+        :return: hashable description of the link - its name, end devices
+                 and link filters
+        :rtype: tuple
+        """
+        link = kwargs.get('link')
+        linkInfo = self.links[link]
+        return (link,
+                linkInfo['device1'],
+                linkInfo['device2'],
+                tuple(linkInfo['filters']))
+
+    def Diff(self, **kwargs):
+        """
+        Diff method
+
+        Compares the logical topology of the model with the one of another
+        model.  A link whose end devices or link filters differ is reported
+        as removed and added again.
+
+        :param model: model of the requested topology
+        :type model: object
+        :return: dictionary with the devicesAdded, devicesRemoved,
+                 devicesChanged, linksAdded and linksRemoved lists, in the
+                 order of the model they come from
+        :rtype: dictionary
+        """
+        model = kwargs.get('model')
+        diff = dict(devicesAdded=[], devicesRemoved=[], devicesChanged=[],
+                    linksAdded=[], linksRemoved=[])
+        for curDev in model.deviceOrder:
+            if curDev not in self.devices:
+                diff['devicesAdded'].append(curDev)
+            elif self.DeviceSignature(device=curDev) != \
+                    model.DeviceSignature(device=curDev):
+                diff['devicesChanged'].append(curDev)
+        for curDev in self.deviceOrder:
+            if curDev not in model.devices:
+                diff['devicesRemoved'].append(curDev)
+        for curLink in self.linkOrder:
+            if curLink not in model.links \
+                    or self.LinkSignature(link=curLink) != \
+                    model.LinkSignature(link=curLink):
+                diff['linksRemoved'].append(curLink)
+        for curLink in model.linkOrder:
+            if curLink not in self.links \
+                    or curLink in diff['linksRemoved']:
+                diff['linksAdded'].append(curLink)
+        return diff
+
+    def PhysicalCopy(self, **kwargs):
+        """
+        PhysicalCopy method
+
+        Takes over the connections and interfaces of another model, used
+        when the logical topology of a live topology is replaced.
+
+        :param model: model of the live topology
+        :type model: object
+        """
+        model = kwargs.get('model')
+        self.connections = dict(model.connections)
+        self.interfaces = dict(model.interfaces)
+
+    def Signature(self):
+        """
+        Signature method
+
+        :return: signature of the topology dictionary the model was parsed
+                 from
+        :rtype: tuple
+        """
+        if self.signature is None:
+            self.signature = self.SignatureBuild()
+        return self.signature
+
+    def DeviceAdd(self, **kwargs):
+        """
+        DeviceAdd method
+
+        :param device: logical device name
+        :type device: string
+        """
+        device = kwargs.get('device')
+        if device in self.devices:
+            return
+        # derived holds the attributes worked out while the topology is
+        # built, they are not part of the device signature
+        self.devices[device] = dict(name=device,
+                                    target=device in self.targets,
+                                    attributes=OrderedDict(),
+                                    derived=OrderedDict(),
+                                    ports=dict())
+        self.deviceOrder.append(device)
+        self.adjacency[device] = []
+
+    def LinkAdd(self, **kwargs):
+        """
+        LinkAdd method
+
+        :param link: logical link name
+        :type link: string
+        :param device1: logical device at one end of the link
+        :type device1: string
+        :param device2: logical device at the other end of the link
+        :type device2: string
+        """
+        link = kwargs.get('link')
+        device1 = kwargs.get('device1')
+        device2 = kwargs.get('device2')
+        self.links[link] = dict(name=link,
+                                device1=device1,
+                                device2=device2,
+                                filters=[])
+        self.linkOrder.append(link)
+        for curDev in (device1, device2):
+            self.DeviceAdd(device=curDev)
+            if link not in self.adjacency[curDev]:
+                self.adjacency[curDev].append(link)
+
+    def DeviceAttrsGet(self, **kwargs):
+        """
+        DeviceAttrsGet method
+
+        :param device: logical device name
+        :type device: string
+        :return: dictionary of the device attributes, the derived ones
+                 included
+        :rtype: dictionary
+        """
+        device = kwargs.get('device')
+        if device not in self.devices:
+            return dict()
+        attributes = dict(self.devices[device]['derived'])
+        attributes.update(self.devices[device]['attributes'])
+        return attributes
+
+    def DeviceDerivedAttrSet(self, **kwargs):
+        """
+        DeviceDerivedAttrSet method
+
+        Records an attribute that was not in the topology dictionary but
+        worked out for the device, such as the default system-profile of a
+        workstation.  Derived attributes do not change the signature, so a
+        model stays comparable with a fresh parse of its topology dictionary.
+
+        :param device: logical device name
+        :type device: string
+        :param name: attribute name
+        :type name: string
+        :param value: attribute value
+        :type value: string
+        """
+        device = kwargs.get('device')
+        if device not in self.devices:
+            return
+        self.devices[device]['derived'][kwargs.get('name')] = \
+            kwargs.get('value')
+
+    def DeviceCategoryGet(self, **kwargs):
+        """
+        DeviceCategoryGet method
+
+        :param device: logical device name
+        :type device: string
+        :return: system-category attribute, None if not set
+        :rtype: string
+        """
+        device = kwargs.get('device')
+        if device not in self.devices:
+            return None
+        return self.devices[device]['attributes'].get('system-category', None)
+
+    def LinksGet(self, **kwargs):
+        """
+        LinksGet method
+
+        :param device: logical device name
+        :type device: string
+        :return: list of the logical links of the device
+        :rtype: list
+        """
+        device = kwargs.get('device')
+        return list(self.adjacency.get(device, []))
+
+    def LinkGet(self, **kwargs):
+        """
+        LinkGet method
+
+        :param link: logical link name
+        :type link: string
+        :return: dictionary with the name, device1, device2 and filters keys,
+                 None if the link is not in the topology
+        :rtype: dictionary
+        """
+        link = kwargs.get('link')
+        return self.links.get(link, None)
+
+    def ConnectionAdd(self, **kwargs):
+        """
+        ConnectionAdd method
+
+        :param device: physical device name
+        :type device: string
+        :param name: connection name
+        :type name: string
+        :param ipAddr: address of the connection (physical devices)
+        :type ipAddr: string
+        :param port: port of the connection (physical devices)
+        :type port: string
+        """
+        device = kwargs.get('device')
+        self.connections[device] = dict(name=kwargs.get('name', device),
+                                        ipAddr=kwargs.get('ipAddr', None),
+                                        port=kwargs.get('port', None))
+
+    def ConnectionGet(self, **kwargs):
+        """
+        ConnectionGet method
+
+        :param device: physical device name
+        :type device: string
+        :return: dictionary with the name, ipAddr and port keys, None if the
+                 device is not in the topology
+        :rtype: dictionary
+        """
+        device = kwargs.get('device')
+        return self.connections.get(device, None)
+
+    def InterfaceAdd(self, **kwargs):
+        """
+        InterfaceAdd method
+
+        Records the interfaces used at both ends of a link.
+
+        :param link: link name
+        :type link: string
+        :param device1: physical device at one end of the link
+        :type device1: string
+        :param device1Port: interface of device1
+        :type device1Port: string
+        :param device2: physical device at the other end of the link
+        :type device2: string
+        :param device2Port: interface of device2
+        :type device2Port: string
+        """
+        link = kwargs.get('link')
+        device1 = kwargs.get('device1')
+        device2 = kwargs.get('device2')
+        device1Port = str(kwargs.get('device1Port'))
+        device2Port = str(kwargs.get('device2Port'))
+        self.interfaces[(device1, link)] = dict(local=device1Port,
+                                                remoteDevice=device2,
+                                                remote=device2Port)
+        self.interfaces[(device2, link)] = dict(local=device2Port,
+                                                remoteDevice=device1,
+                                                remote=device1Port)
+
+    def ConnectionDelete(self, **kwargs):
+        """
+        ConnectionDelete method
+
+        :param device: physical device name
+        :type device: string
+        """
+        device = kwargs.get('device')
+        self.connections.pop(device, None)
+
+    def InterfaceDelete(self, **kwargs):
+        """
+        InterfaceDelete method
+
+        Forgets the interfaces used at both ends of a link.
+
+        :param link: link name
+        :type link: string
+        """
+        link = kwargs.get('link')
+        for curKey in list(self.interfaces.keys()):
+            if curKey[1] == link:
+                del self.interfaces[curKey]
+
+    def InterfaceGet(self, **kwargs):
+        """
+        InterfaceGet method
+
+        :param device: physical device name
+        :type device: string
+        :param link: link name
+        :type link: string
+        :return: local interface of the device on the link, None if the link
+                 is not attached to the device
+        :rtype: string
+        """
+        entry = self.interfaces.get((kwargs.get('device'), kwargs.get('link')),
+                                    None)
+        if entry is None:
+            return None
+        return entry['local']
@@ -0,0 +1,144 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import os
+import threading
+import atexit
+from testEnviron import LogOutput
+from TopologyModel import TopologyModel
+
+"""
+Warm topology pool.  When the VSIWARMPOOL environment variable is set, a
+virtual topology is not destroyed when a test module is done with it.  It is
+reset to its baseline and parked, and the next test module with a compatible
+topology dictionary picks it up instead of booting new containers.  A topology
+that differs by a few links or devices is reconfigured in place.  Parked
+topologies are destroyed when the test run exits.
+"""
+
+
+def TopologyPoolEnabled():
+    """
+    Library routine to check if the warm topology pool is turned on
+
+    :return: True if the VSIWARMPOOL environment variable is set
+    :rtype: boolean
+    """
+    envWarmPool = os.environ.get('VSIWARMPOOL', None)
+    if envWarmPool is None or envWarmPool == "0":
+        return False
+    return True
+
+
+class TopologyPool(object):
+    """
+    TopologyPool Class definition
+
+    Keeps parked Topology objects keyed by the signature of their topology
+    dictionary.
+    """
+
+    def __init__(self):
+        """
+        TopologyPool init method
+        """
+        self.parked = dict()
+        self.lock = threading.Lock()
+
+    def park(self, topoObj):
+        """
+        park method
+
+        :param topoObj: topology object that has been reset to its baseline
+        :type topoObj: object
+        """
+        signature = topoObj.model.Signature()
+        self.lock.acquire()
+        try:
+            self.parked.setdefault(signature, []).append(topoObj)
+        finally:
+            self.lock.release()
+
+    def checkout(self, **kwargs):
+        """
+        checkout method
+
+        A parked topology built from the same topology dictionary is taken
+        first.  Otherwise the parked topology that needs the fewest links
+        and devices added or removed is taken, as long as none of the shared
+        devices changed attributes - the caller reconfigures it with
+        Topology.WarmStart.
+
+        :param topoDict: topology dictionary defined in the test case
+        :type topoDict: dictionary
+        :return: parked topology object compatible with topoDict, None if
+                 there is none
+        :rtype: object
+        """
+        topoDict = kwargs.get('topoDict')
+        model = TopologyModel(topoDict=topoDict)
+        signature = model.Signature()
+        self.lock.acquire()
+        try:
+            topoList = self.parked.get(signature, [])
+            if len(topoList) != 0:
+                return topoList.pop()
+
+            bestTopo = None
+            bestChanges = None
+            for curList in self.parked.values():
+                for curTopo in curList:
+                    diff = curTopo.model.Diff(model=model)
+                    if len(diff['devicesChanged']) != 0:
+                        continue
+                    changes = len(diff['devicesAdded']) \
+                        + len(diff['devicesRemoved']) \
+                        + len(diff['linksAdded']) \
+                        + len(diff['linksRemoved'])
+                    if bestChanges is None or changes < bestChanges:
+                        bestTopo = curTopo
+                        bestChanges = changes
+            if bestTopo is None:
+                return None
+            self.parked[bestTopo.model.Signature()].remove(bestTopo)
+            return bestTopo
+        finally:
+            self.lock.release()
+
+    def drain(self):
+        """
+        drain method
+
+        Destroys all of the parked topologies.
+        """
+        self.lock.acquire()
+        try:
+            topoList = []
+            for curList in self.parked.values():
+                topoList.extend(curList)
+            self.parked = dict()
+        finally:
+            self.lock.release()
+        for curTopo in topoList:
+            LogOutput('info', "Destroying parked topology")
+            try:
+                curTopo.TopologyDestroy()
+            except Exception as e:
+                LogOutput('error',
+                          "Failed to destroy parked topology: " + str(e))
+
+
+topologyPool = TopologyPool()
+atexit.register(topologyPool.drain)
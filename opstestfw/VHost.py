@@ -32,6 +32,8 @@ class VHost(Device):
 
     This Class defines the host connections and interface connectivity
     """
+    # Counter used to build a unique output file name for each ping probe
+    pingProbeCounter = 0
 
     def __init__(self, **kwargs):
         """
@@ -46,23 +48,33 @@ class VHost(Device):
         :type topology: dictionary
         :param device: device name to create the object
         :type device: string
+        :param lazyConnect: connect on first use instead of now, defaults to
+                            True unless VSIEAGERCONNECT is set
+        :type lazyConnect: boolean
         """
         self.topology = kwargs.get('topology', None)
         self.device = kwargs.get('device', None)
         # Bring in Default member values
         self.defaultMembers()
-        self.expectDefaultPrompts = ['login:\s*$',
-                                     'Password:',
-                                     '\[root@\S+.*\]#',
-                                     'root@\S+#',
-                                     '\(yes/no\)?',
-                                     'password:',
-                                     'Connection closed by foreign host.',
-                                     'Login incorrect',
-                                     pexpect.EOF,
-                                     pexpect.TIMEOUT]
+        # Prompt state machine used by DeviceInteract.  Each entry is
+        # (pattern, action) and expectDefaultPrompts is kept in the same
+        # order.
+        self.promptTable = [('login:\s*$', "login"),
+                            ('Password:', "password"),
+                            ('\[root@\S+.*\]#', "shell"),
+                            ('root@\S+#', "done"),
+                            ('\(yes/no\)?', "yesno"),
+                            ('password:', "password"),
+                            ('Connection closed by foreign host.', "closed"),
+                            ('Login incorrect', "incorrect"),
+                            (pexpect.EOF, "eof"),
+                            (pexpect.TIMEOUT, "timeout")]
+        self.expectDefaultPrompts = [entry[0] for entry in self.promptTable]
         self.initExtMembers()
-        self.Connect()
+        if kwargs.get('lazyConnect', self.lazyConnect) is True:
+            self.ConnectDefer()
+        else:
+            self.Connect()
 
     def defaultMembers(self):
         """
@@ -74,6 +86,17 @@ class VHost(Device):
         self.expectHndl = ""
         self.connectStringBase = "docker exec -ti "
         self.commandErrorCheck = 1
+        # The shell prompt carries the exit status of the last command so
+        # DeviceInteract does not need a separate "echo $?" transaction.
+        self.exitCodePrompt = False
+        self.exitCodePS1 = "[\\u@\\h \\W __RC=$?__]# "
+        self.exitCodeRegex = re.compile(r'__RC=(\d+)__\]#')
+        # Only the tail of the buffer is searched for a prompt so long
+        # outputs do not get rescanned on every read
+        self.searchWindowSize = 2048
+        self.promptPatterns = None
+        self.promptPatternsHndl = None
+        self.InteractDefaults()
 
     def initExtMembers(self):
         """
@@ -99,10 +122,8 @@ class VHost(Device):
         """
         # Look up the device name in the topology - grab connectivity
         # information
-        xpathString = ".//device[name='" + self.device + "']"
-        etreeElement = opstestfw.XmlGetElementsByTag(self.topology.TOPOLOGY,
-                                                     xpathString)
-        if etreeElement is None:
+        connInfo = self.ConnectionInfoGet()
+        if connInfo is None:
             # We are not in a good situation, we need to bail
             opstestfw.LogOutput('error',
                                 "Could not find"
@@ -110,16 +131,12 @@ class VHost(Device):
             return None
         # Code for virtual
         # Go and grab the connection name
-        xpathString = ".//device[name='" + self.device + "']/connection/name"
-        virtualConn = opstestfw.XmlGetElementsByTag(self.topology.TOPOLOGY,
-                                                    xpathString)
-        if virtualConn is None:
+        if connInfo['name'] is None:
             opstestfw.LogOutput('error',
                                 "Failed to virtual connection "
                                 "for " + self.device)
             return None
         telnetString = self.connectStringBase + self.device + " /bin/bash"
-        self.expectHndl = pexpect.spawn(telnetString, echo=False)
         expectFileString = self.device + ".log"
 
         ExpectInstance = opstestfw.DeviceLogger(expectFileString)
@@ -136,6 +153,7 @@ class VHost(Device):
                                         echo=False,
                                         logfile=opstestfw.DeviceLogger(expLog))
         # self.expectHndl.delaybeforesend = .05
+        self.InteractSpawnTune()
 
         # Lets go and detect our connection - this will get us to a context
         # we know about
@@ -143,8 +161,34 @@ class VHost(Device):
 
         if retVal is None:
             return None
+        self.ExitCodePromptSet()
         return self.expectHndl
 
+    def ExitCodePromptSet(self):
+        """
+        ExitCodePromptSet Method
+
+        This method sets up a shell prompt that embeds the exit status of the
+        last command, so DeviceInteract can read it back from the prompt it
+        is already waiting for.  If the new prompt is not seen, DeviceInteract
+        keeps using the ErrorCheck method.
+
+        :return: True if the exit code prompt is in use
+        :rtype: boolean
+        """
+        self.exitCodePrompt = False
+        command = "export PS1='" + self.exitCodePS1 + "'"
+        self.InteractSend(command)
+        index = self.expectHndl.expect(self.expectDefaultPrompts, timeout=30)
+        if index == 2 and \
+                self.exitCodeRegex.search(self.expectHndl.after) is not None:
+            self.exitCodePrompt = True
+        else:
+            opstestfw.LogOutput('debug', "Exit code prompt not detected on "
+                                + str(self.device) + ", using ErrorCheck")
+        self.expectHndl.expect(['$'], timeout=1)
+        return self.exitCodePrompt
+
     def DetectConnection(self):
         """
         DetectConnection Method
@@ -162,7 +206,8 @@ class VHost(Device):
         connectionBuffer = []
         sanitizedBuffer = ""
         while bailflag == 0:
-            time.sleep(1)
+            if self.lowLatency is False:
+                time.sleep(1)
             index = self.expectHndl.expect(self.expectDefaultPrompts,
                                            timeout=30)
             opstestfw.LogOutput('debug', "Got index ->" + str(index))
@@ -253,95 +298,90 @@ class VHost(Device):
         retStruct['returnCode'] = 1
         retStruct['buffer'] = []
         # Clear out buffer
-        try:
-            opstestfw.LogOutput('debug', "Flushing buffer")
-            buf = self.expectHndl.read_nonblocking(128, 0)
-            opstestfw.LogOutput('debug', "Buffer data \n" + buf)
-        except pexpect.TIMEOUT:
-            pass
-        except pexpect.EOF:
-            pass
+        if self.lowLatency is True:
+            self.InteractDrain()
+        else:
+            try:
+                opstestfw.LogOutput('debug', "Flushing buffer")
+                buf = self.expectHndl.read_nonblocking(128, 0)
+                opstestfw.LogOutput('debug', "Buffer data \n" + buf)
+            except pexpect.TIMEOUT:
+                pass
+            except pexpect.EOF:
+                pass
 
         # Send the command
-        self.expectHndl.send(command)
-        self.expectHndl.send('\r')
+        startTime = time.time()
+        waitTime = 0.0
+        self.InteractSend(command)
         connectionBuffer = []
+        promptExitCode = None
 
+        promptPatterns = self.PromptPatternsGet()
         while bailflag == 0:
-            index = self.expectHndl.expect(self.expectDefaultPrompts,
-                                           timeout=timeout)
+            waitStart = time.time()
+            index = self.expectHndl.expect_list(
+                promptPatterns, timeout=timeout,
+                searchwindowsize=self.searchWindowSize)
+            waitTime += time.time() - waitStart
             opstestfw.LogOutput('debug', "index = " + str(index))
-            if index == 0:
+            action = self.promptTable[index][1]
+            connectionBuffer.append(self.expectHndl.before)
+            if action == "login":
                 # Need to send login string
-                self.expectHndl.send("root")
-                self.expectHndl.send("\r")
-                connectionBuffer.append(self.expectHndl.before)
-            elif index == 1:
+                self.InteractSend("root")
+            elif action == "password":
                 # Need to send password string
-                self.expectHndl.send("procurve")
-                self.expectHndl.send("\r")
-                connectionBuffer.append(self.expectHndl.before)
-            elif index == 2:
+                self.InteractSend("procurve")
+            elif action == "shell":
                 # Got prompt.  We should be good
                 bailflag = 1
-                connectionBuffer.append(self.expectHndl.before)
-            elif index == 3:
+                if self.exitCodePrompt is True:
+                    exitMatch = self.exitCodeRegex.search(
+                        self.expectHndl.after)
+                    if exitMatch is not None:
+                        promptExitCode = int(exitMatch.group(1))
+            elif action == "done":
                 # Got prompt.  We should be good
                 bailflag = 1
-                connectionBuffer.append(self.expectHndl.before)
-            elif index == 4:
+            elif action == "yesno":
                 # Got yes / no prompt.  We should be good
                 bailflag = 1
-                connectionBuffer.append(self.expectHndl.before)
                 if yesPromptResp == "yes":
-                    self.expectHndl.send("yes")
+                    self.InteractSend("yes")
                 else:
-                    self.expectHndl.send("no")
-                self.expectHndl.send("\r")
-            elif index == 5:
-                # Need to send password string
-                connectionBuffer.append(self.expectHndl.before)
-                self.expectHndl.send("procurve")
-                self.expectHndl.send("\r")
-            elif index == 6:
-                # Need to send password string
-                connectionBuffer.append(self.expectHndl.before)
+                    self.InteractSend("no")
+            elif action == "closed":
                 opstestfw.LogOutput('error', "Connection closed")
-                returnCode = 1
                 bailflag = 1
-            elif index == 7:
-                # Need to send password string
-                connectionBuffer.append(self.expectHndl.before)
+            elif action == "incorrect":
                 opstestfw.LogOutput('error', "Login incorrect")
-                #returnCode = 1
-                # bailflag = 1
-            elif index == 8:
-                # got EOF
-                bailflag = 1
-                connectionBuffer.append(self.expectHndl.before)
+            elif action == "eof":
                 opstestfw.LogOutput('error', "reached EOF")
-                returnCode = 1
                 exit(105)
-            elif index == 9:
+            else:
                 # got Timeout
                 bailflag = 1
-                connectionBuffer.append(self.expectHndl.before)
                 opstestfw.LogOutput('error', "command timeout")
-                returnCode = 1
-            else:
-                connectionBuffer.append(self.expectHndl.before)
 
         connectionBuffer.append(self.expectHndl.after)
-        self.expectHndl.expect(['$'], timeout=1)
+        if self.lowLatency is True:
+            connectionBuffer.append(self.InteractDrain())
+        else:
+            self.expectHndl.expect(['$'], timeout=1)
         santString = ""
         for curLine in connectionBuffer:
             santString += str(curLine)
 
         returnCode = 0
         if errorCheck is True and returnCode == 0 and self.commandErrorCheck == 1:
-            # time.sleep(1)
-            errorCheckRetStruct = self.ErrorCheck(buffer=santString)
-            returnCode = errorCheckRetStruct['returnCode']
+            if promptExitCode is not None:
+                # Exit status came back with the prompt
+                returnCode = promptExitCode
+            else:
+                # time.sleep(1)
+                errorCheckRetStruct = self.ErrorCheck(buffer=santString)
+                returnCode = errorCheckRetStruct['returnCode']
         # Dump the buffer the the debug log
         opstestfw.LogOutput('debug',
                             "Sent and received from device:"
@@ -350,9 +390,120 @@ class VHost(Device):
         # Return dictionary
         retStruct['returnCode'] = returnCode
         retStruct['buffer'] = santString
+        self.InteractStatsRecord(totalTime=time.time() - startTime,
+                                 waitTime=waitTime)
 
         return retStruct
 
+    def PromptPatternsGet(self):
+        """
+        PromptPatternsGet Method
+
+        This method returns the prompt table patterns compiled for the
+        current expect handle.  The list is compiled once per connection.
+
+        :return: list of compiled patterns for expect_list
+        :rtype: list
+        """
+        if self.promptPatternsHndl is not self.expectHndl:
+            self.promptPatterns = self.expectHndl.compile_pattern_list(
+                self.expectDefaultPrompts)
+            self.promptPatternsHndl = self.expectHndl
+        return self.promptPatterns
+
+    def DeviceInteractBatch(self, **kwargs):
+        """
+        DeviceInteractBatch Method
+
+        This method will write a list of commands to the host in one go,
+        wait for the whole transaction to complete and then split the output
+        back into one result per command.  The exit status of every command
+        is carried back in its sentinel marker, so no separate ErrorCheck
+        transaction is needed.  Commands that prompt for input should be
+        sent with DeviceInteract instead.
+
+        :param commands: list of command strings to execute
+        :type commands: list
+        :param errorCheck: boolean True to error check, False to turn off
+                           error checking.
+        :type errorCheck: boolean
+        :param timeout: seconds to wait for output between two reads
+        :type timeout: integer
+        :return: list of dictionaries containing returnCode and buffer, one
+                 per command
+        :rtype: list
+        """
+        commands = kwargs.get('commands', [])
+        errorCheck = kwargs.get('errorCheck', True)
+        timeout = kwargs.get('timeout', 30)
+
+        if len(commands) == 0:
+            return []
+
+        (tag, payload) = self.BatchCommandsBuild(commands=commands,
+                                                 context="linux")
+        endMarker = tag + "_" + str(len(commands)) + "_\d+\s"
+
+        # Clear out buffer
+        try:
+            buf = self.expectHndl.read_nonblocking(128, 0)
+        except pexpect.TIMEOUT:
+            pass
+        except pexpect.EOF:
+            pass
+
+        # Send all the commands
+        self.expectHndl.send(payload)
+        connectionBuffer = []
+        transactionCode = 0
+        index = self.expectHndl.expect([endMarker,
+                                        pexpect.EOF,
+                                        pexpect.TIMEOUT],
+                                       timeout=timeout)
+        connectionBuffer.append(self.expectHndl.before)
+        if index == 0:
+            connectionBuffer.append(self.expectHndl.after)
+            # Collect the prompt the last marker leaves us at
+            index = self.expectHndl.expect_list(
+                self.PromptPatternsGet(), timeout=timeout,
+                searchwindowsize=self.searchWindowSize)
+            connectionBuffer.append(self.expectHndl.before)
+            if index < 8:
+                connectionBuffer.append(self.expectHndl.after)
+        elif index == 1:
+            opstestfw.LogOutput('error', "reached EOF")
+            transactionCode = 1
+        else:
+            opstestfw.LogOutput('error', "batch command timeout")
+            transactionCode = 1
+
+        santString = ""
+        for curLine in connectionBuffer:
+            santString += str(curLine)
+        opstestfw.LogOutput('debug',
+                            "Sent and received from device:"
+                            " \n" + santString + "\n")
+
+        splitList = self.BatchBufferSplit(buffer=santString, tag=tag,
+                                          count=len(commands),
+                                          commands=commands)
+        retList = []
+        for curSplit in splitList:
+            retStruct = dict()
+            if curSplit['buffer'] is None:
+                # Never saw the marker for this command
+                retStruct['returnCode'] = 1
+                retStruct['buffer'] = ""
+                retList.append(retStruct)
+                continue
+            returnCode = 0
+            if errorCheck is True and self.commandErrorCheck == 1:
+                returnCode = curSplit['exitStatus']
+            retStruct['returnCode'] = returnCode
+            retStruct['buffer'] = curSplit['buffer']
+            retList.append(retStruct)
+        return retList
+
     def ErrorCheck(self, **kwargs):
         """
         ErrorCheck Method
@@ -886,6 +1037,88 @@ class VHost(Device):
                                            buffer=bufferString, data=retStruct)
         return returnCls
 
+    def PingProbeStart(self, **kwargs):
+        """
+        PingProbeStart Method
+
+        This method starts a ping in the background that keeps probing a
+        destination at a short interval.  Every reply is stamped with the
+        time it was received, so the replies collected by PingProbeStop show
+        when traffic stopped and resumed.
+
+        :param ipAddr: destination ip address string
+        :type ipAddr: string
+        :param ipv6Flag: True to ipv6 / False to ipv4
+        :type ipv6Flag: boolean
+        :param interval: seconds between echo requests
+        :type interval: float
+        :return: returnStruct Object
+        :rtype: object
+        """
+        ipAddr = kwargs.get('ipAddr')
+        ipv6Flag = kwargs.get('ipv6Flag', False)
+        interval = kwargs.get('interval', 0.01)
+
+        pingCommand = "ping"
+        if ipv6Flag:
+            pingCommand = "ping6"
+        VHost.pingProbeCounter += 1
+        self.pingProbeFile = "/tmp/pingProbe_%d_%d.log" \
+            % (os.getpid(), VHost.pingProbeCounter)
+        self.pingProbeInterval = interval
+        # The pid file lets PingProbeStop stop only this probe
+        command = "%s -D -n -i %s %s > %s 2>&1 & echo $! > %s.pid" \
+            % (pingCommand, str(interval), ipAddr, self.pingProbeFile,
+               self.pingProbeFile)
+        retStruct = self.DeviceInteract(command=command)
+        returnCls = opstestfw.returnStruct(
+            returnCode=retStruct.get('returnCode'),
+            buffer=retStruct.get('buffer'))
+        return returnCls
+
+    def PingProbeStop(self):
+        """
+        PingProbeStop Method
+
+        This method stops the ping started by the last PingProbeStart and
+        collects its replies.
+
+        :return: returnStruct Object
+             data: - Dictionary:
+                    'interval': seconds between echo requests
+                    'replies': list of (receive time, icmp_seq) tuples,
+                               receive time in seconds since the epoch
+        :rtype: object
+        """
+        overallBuffer = []
+        retStruct = self.DeviceInteract(
+            command="kill -INT $(cat " + self.pingProbeFile + ".pid)")
+        overallBuffer.append(retStruct.get('buffer'))
+        retStruct = self.DeviceInteract(command="cat " + self.pingProbeFile)
+        overallBuffer.append(retStruct.get('buffer'))
+        returnCode = retStruct.get('returnCode')
+        probeBuffer = retStruct.get('buffer')
+        retStruct = self.DeviceInteract(command="rm -f " + self.pingProbeFile
+                                        + " " + self.pingProbeFile + ".pid")
+        overallBuffer.append(retStruct.get('buffer'))
+
+        # [1444240215.912372] 64 bytes from 10.0.0.2: icmp_seq=1 ttl=64 ...
+        replies = []
+        for curLine in str(probeBuffer).split('\r\n'):
+            replyLine = re.match(r'\[([0-9]+\.[0-9]+)\] \d+ bytes from .*'
+                                 r'icmp_seq=(\d+)', curLine)
+            if replyLine:
+                replies.append((float(replyLine.group(1)),
+                                int(replyLine.group(2))))
+
+        bufferString = ""
+        for curLine in overallBuffer:
+            bufferString += str(curLine)
+        returnCls = opstestfw.returnStruct(
+            returnCode=returnCode, buffer=bufferString,
+            data=dict(interval=self.pingProbeInterval, replies=replies))
+        return returnCls
+
     def IPRoutesConfig(self, **kwargs):
         """
         IPRoutesConfig Method
@@ -1021,6 +1254,40 @@ class VHost(Device):
         return localLinkElements
 
 
+    def AddressReset(self):
+        """
+        AddressReset Method
+
+        This method removes the addresses and neighbor entries of the
+        interfaces on the test links of the host and brings the interfaces
+        up.  The eth0 management interface is left alone.
+
+        :return: returnStruct Object
+        :rtype: object
+        """
+        linkPortMapping = getattr(self, 'linkPortMapping', dict())
+        overallBuffer = []
+        returnCode = 0
+        for curInterface in sorted(set(linkPortMapping.values())):
+            if curInterface is None or curInterface == "eth0":
+                continue
+            command = "ip -4 addr flush dev %s; " \
+                      "ip -6 addr flush dev %s scope global; " \
+                      "ip neigh flush dev %s; " \
+                      "ip link set %s up" % ((curInterface,) * 4)
+            retStruct = self.DeviceInteract(command=command)
+            overallBuffer.append(retStruct.get('buffer'))
+            if retStruct.get('returnCode') != 0:
+                opstestfw.LogOutput('error', "Failed to reset interface "
+                                    + curInterface + " on " + self.device)
+                returnCode = retStruct.get('returnCode')
+        bufferString = ""
+        for curLine in overallBuffer:
+            bufferString += str(curLine)
+        returnCls = opstestfw.returnStruct(returnCode=returnCode,
+                                           buffer=bufferString)
+        return returnCls
+
     def FileTransfer(self, filepath, localpath, direction):
         """
         FileTransfer Method
@@ -1039,29 +1306,22 @@ class VHost(Device):
         returnCode = 0
         paramiko.util.log_to_file('/tmp/paramiko.log')
         # Look up and see if we are physical or virtual
-        xpathString = ".//reservation/id"
-        rsvnEtreeElement = opstestfw.XmlGetElementsByTag(
-            self.topology.TOPOLOGY,
-            xpathString)
-        if rsvnEtreeElement is None:
+        rsvnType = self.ReservationTypeGet()
+        if rsvnType is None:
             # We are not in a good situation, we need to bail
             opstestfw.LogOutput(
                 'error', "Could not find reservation id tag in topology")
             return None
-        rsvnType = rsvnEtreeElement.text
         if rsvnType != 'virtual':
             # Get the credentials of the workstation from XML file (physical
             # devices)
-            xpathString = ".//device[name='" + self.device\
-                + "']/connection/ipAddr"
-            ipNode = opstestfw.XmlGetElementsByTag(
-                self.topology.TOPOLOGY, xpathString)
-            if ipNode is None:
+            connInfo = self.ConnectionInfoGet()
+            if connInfo is None or connInfo['ipAddr'] is None:
                 opstestfw.LogOutput('error',
                                     "Failed to obtain IP address for device "
                                     + self.device)
                 return None
-            hostIP = ipNode.text
+            hostIP = connInfo['ipAddr']
             opstestfw.LogOutput(
                 'debug',
                 self.device +
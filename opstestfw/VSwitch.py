@@ -13,13 +13,23 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 #
+import os
 import pexpect
 import time
 import re
+import pipes
+import shlex
 from Topology import Topology
 from Device import Device
+from CliErrorRegistry import cliErrorRegistry
 from opstestfw import *
 
+# Commands that only move between the linux, vtysh and config contexts.
+# They leave the show cache alone.
+showCacheNavigation = ["vtysh", "exit", "end", "configure",
+                       "configure terminal", "config terminal", "conf",
+                       "conf t"]
+
 class VSwitch(Device):
 
     """
@@ -43,6 +53,9 @@ class VSwitch(Device):
         :param noConnect:  Boolean to flag not actually connecting to the
                            device
         :type noConnect: boolean
+        :param lazyConnect: connect on first use instead of now, defaults to
+                            True unless VSIEAGERCONNECT is set
+        :type lazyConnect: boolean
         """
         self.topology = kwargs.get('topology', None)
         self.device = kwargs.get('device', None)
@@ -50,8 +63,11 @@ class VSwitch(Device):
         # Lets initialize some member variables
         self.memberDefaults()
         if self.noConnect is False:
-            self.Connect()
-            self.defaultContextEnter()
+            if kwargs.get('lazyConnect', self.lazyConnect) is True:
+                self.ConnectDefer()
+            else:
+                self.Connect()
+                self.defaultContextEnter()
 
     def memberDefaults(self):
         """
@@ -62,22 +78,44 @@ class VSwitch(Device):
         """
         self.expectHndl = None
         self.connectStringBase = "docker exec -ti "
-        self.expectList = ['login:\s*$',
-                           'root@\S+:.*#\s*$',
-                           'bash-[0-9.]+#',
-                           '[A-Za-z0-9]+#',
-                           '\(config\)#',
-                           '\(config-\S+\)#\s*$',
-                           'ONIE:/\s+#\s*$',
-                           'telnet: Unable to connect to remote host:',
-                           'Connection refused',
-                           '--More--',
-                           'Password:',
-                           'switch:~[#$]\s*$',
-                           '\(yes/no\)?',
-                           '\[y/n\]?',
-                           pexpect.EOF,
-                           pexpect.TIMEOUT]
+        # Prompt state machine used by DeviceInteract.  Each entry is
+        # (pattern, action, context, errorFlag) - the action tells
+        # DeviceInteract how to answer the prompt, the context is the device
+        # context the prompt belongs to and errorFlag selects the error check
+        # to run on the output.  expectList is kept in the same order.
+        self.promptTable = [
+            ('login:\s*$', "login", None, None),
+            ('root@\S+:.*#\s*$', "done", "linux", None),
+            ('bash-[0-9.]+#', "done", "linux", None),
+            ('[A-Za-z0-9]+#', "done", "vtyShell", "CLI"),
+            ('\(config\)#', "done", "vtyShellConfig", "CLI"),
+            ('\(config-\S+\)#\s*$', "done", "vtyShellConfigSub", "CLI"),
+            ('ONIE:/\s+#\s*$', "done", None, "Onie"),
+            ('telnet: Unable to connect to remote host:', "closed", None,
+             None),
+            ('Connection refused', "closed", None, None),
+            ('--More--', "more", None, None),
+            ('Password:', "password", None, None),
+            ('switch:~[#$]\s*$', "done", "linux", None),
+            ('\(yes/no\)?', "yesno", None, None),
+            ('\[y/n\]?', "yn", None, None),
+            (pexpect.EOF, "eof", None, None),
+            (pexpect.TIMEOUT, "timeout", None, None)]
+        self.expectList = [entry[0] for entry in self.promptTable]
+        # Only the tail of the buffer is searched for a prompt so long
+        # outputs do not get rescanned on every read
+        self.searchWindowSize = 2048
+        # The vtysh prompts are narrowed down to the host name learned from
+        # the prompt vtysh starts with, so output text is not mistaken for
+        # a prompt.  The host name is put in front of these patterns for
+        # the prompt table entries of each vtysh context.
+        self.vtyshHostname = None
+        self.vtyshHostPatterns = {
+            "vtyShell": '#',
+            "vtyShellConfig": '\(config\)#',
+            "vtyShellConfigSub": '\(config-\S+\)#\s*$'}
+        self.promptPatterns = None
+        self.promptPatternsKey = None
         # Device Contexts
         # linux - assumed root
         # vtyShell
@@ -87,6 +125,37 @@ class VSwitch(Device):
         self.loginUser = "root"
         self.loginPassword = ""
         self.commandErrorCheck = 1
+        self.InteractDefaults()
+        # Sticky context session - context changes asked for by the helpers
+        # are deferred until the next command is sent, and only the commands
+        # needed to get from the current context to that one are sent
+        self.stickyContext = False
+        self.requestedContext = None
+        # Context the device is in for each prompt index of expectList.
+        # vtyShellConfigSub is only tracked while in a sticky session
+        self.promptContexts = dict()
+        for index in range(0, len(self.promptTable)):
+            if self.promptTable[index][2] is not None:
+                self.promptContexts[index] = self.promptTable[index][2]
+        # Read-through cache of show command results, keyed by the context
+        # of the prompt the command is sent at and the command.  It is on
+        # when VSISHOWCACHE is set to the time to live in seconds.
+        self.showCache = dict()
+        self.showCacheContext = None
+        self.showCacheTtl = None
+        envShowCache = os.environ.get('VSISHOWCACHE', None)
+        if envShowCache is not None:
+            self.showCacheTtl = float(envShowCache)
+        self.contextTransitions = {
+            ("linux", "vtyShell"): ["vtysh"],
+            ("linux", "vtyShellConfig"): ["vtysh", "config terminal"],
+            ("vtyShell", "linux"): ["exit"],
+            ("vtyShell", "vtyShellConfig"): ["config terminal"],
+            ("vtyShellConfig", "linux"): ["end", "exit"],
+            ("vtyShellConfig", "vtyShell"): ["end"],
+            ("vtyShellConfigSub", "linux"): ["end", "exit"],
+            ("vtyShellConfigSub", "vtyShell"): ["end"],
+            ("vtyShellConfigSub", "vtyShellConfig"): ["exit"]}
 
     def setSwitchAuthentication(self, **kwargs):
         self.loginUser = kwargs.get('username', "root")
@@ -99,8 +168,121 @@ class VSwitch(Device):
             # Got an invalid entry, thus set to linux
         #    self.defaultContext = "linux"
         LogOutput('info', "Default switch context = " + self.defaultContext)
+        if self.ConnectPending() is False:
+            self.defaultContextEnter()
+
+    def ConnectDone(self):
+        """
+        ConnectDone method
+
+        Gets a switch connected on first use to its default context.
+        """
         self.defaultContextEnter()
 
+    def DeviceContextGet(self):
+        """
+        DeviceContextGet method
+
+        Method behind the deviceContext member.  If the connection to the
+        switch was deferred, the switch is connected first, so the context
+        read is the one the connect leaves the switch in.
+
+        :return: device context
+        :rtype: string
+        """
+        if self.__dict__.get('connectPending', False) is True:
+            self.LazyConnect()
+        return self.__dict__.get('currentContext', "")
+
+    def DeviceContextSet(self, context):
+        """
+        DeviceContextSet method
+
+        Method behind the deviceContext member, sets the device context.
+
+        :param context: device context
+        :type context: string
+        """
+        self.__dict__['currentContext'] = context
+
+    deviceContext = property(DeviceContextGet, DeviceContextSet)
+
+    def setStickyContext(self, **kwargs):
+        """
+        setStickyContext method
+
+        This method turns the sticky context session on or off.  While the
+        session is on, VtyshShell and ConfigVtyShell only record the context
+        they are asked for, and the device is moved there when the next
+        command is sent.  Back to back helpers then skip the vtysh, config,
+        end and exit round trips between them.  Turning the session off
+        settles the device in the last requested context.
+
+        :param enable: True to turn the session on, False to turn it off
+        :type enable: boolean
+        :returnType: returnStruct Class
+        :rtype: object
+        """
+        enable = kwargs.get('enable', True)
+        if enable is True:
+            LogOutput('debug', "Sticky context session enabled")
+            self.stickyContext = True
+            self.requestedContext = None
+            returnCls = returnStruct(returnCode=0)
+            return returnCls
+
+        returnCls = self.pendingContextEnter()
+        self.stickyContext = False
+        LogOutput('debug', "Sticky context session disabled")
+        return returnCls
+
+    def pendingContextEnter(self):
+        """
+        pendingContextEnter method
+
+        This method will move the device to the context requested while in
+        a sticky context session, sending only the commands needed to get
+        there from the context the device is in.
+
+        :returnType: returnStruct Class
+        :rtype: object
+        """
+        targetContext = self.requestedContext
+        self.requestedContext = None
+        if targetContext is None or targetContext == self.deviceContext:
+            returnCls = returnStruct(returnCode=0)
+            return returnCls
+
+        transitions = self.contextTransitions.get((self.deviceContext,
+                                                   targetContext), None)
+        if transitions is None:
+            LogOutput('error',
+                      "Do not know how to get from context "
+                      + str(self.deviceContext) + " to " + targetContext)
+            returnCls = returnStruct(returnCode=1)
+            return returnCls
+
+        overallBuffer = []
+        for command in transitions:
+            devIntRetStruct = self.DeviceInteract(command=command,
+                                                  CheckError='CLI')
+            returnCode = devIntRetStruct.get('returnCode')
+            overallBuffer.append(devIntRetStruct.get('buffer'))
+            if returnCode != 0:
+                LogOutput('error', "Failed to move to context "
+                          + targetContext + " with " + command)
+                bufferString = ""
+                for curLine in overallBuffer:
+                    bufferString += str(curLine)
+                returnCls = returnStruct(returnCode=returnCode,
+                                         buffer=bufferString)
+                return returnCls
+        bufferString = ""
+        for curLine in overallBuffer:
+            bufferString += str(curLine)
+        returnCls = returnStruct(returnCode=0, buffer=bufferString)
+        return returnCls
+
     def defaultContextEnter(self):
         """
         defaultContextEnter method
@@ -110,6 +292,11 @@ class VSwitch(Device):
         if self.defaultContext == "":
             self.defaultContext = "linux"
 
+        if self.stickyContext is True:
+            self.requestedContext = self.defaultContext
+            returnCls = returnStruct(returnCode=0)
+            return returnCls
+
         retstruct = None
 
         if self.defaultContext == "vtyShell":
@@ -140,13 +327,27 @@ class VSwitch(Device):
         specified, and exit the vtysh context.  It will return the output of
         the command
 
-        :param command: command string to execute
+        :param command: command string to execute, or a list of command
+                        strings when oneShot is True
         :type command: string
+        :param oneShot: True to run the command(s) with vtysh -c from the
+                        linux context instead of the vtysh prompt
+        :type oneShot: boolean
         :return: string buffer from the vty command execution
         :rtype: string
         """
         # Get into the VTYsh
         cmd = kwargs.get('command', None)
+        oneShot = kwargs.get('oneShot', False)
+
+        if oneShot is True:
+            retStruct = self.VtyshOneShot(commands=cmd)
+            if retStruct.get('returnCode') != 0:
+                LogOutput('error',
+                          "Failed to send command " + str(cmd) + " to "
+                          "device " + self.device)
+                return None
+            return retStruct.get('buffer')
 
         # Get into the VTY Shell
         vtyEnterRet = self.VtyshShell(enter=True)
@@ -175,6 +376,145 @@ class VSwitch(Device):
         returnBuffer = retStruct.get('buffer')
         return returnBuffer
 
+    def VtyshOneShot(self, **kwargs):
+        """
+        VtyshOneShot method
+
+        This method will run one or more vtysh commands as a single
+        non-interactive "vtysh -c cmd1 -c cmd2 ..." command from the linux
+        context.  This avoids the vtysh prompt, paging, and the vtysh
+        enter / exit transactions.  The combined output is error checked the
+        same way the vtysh prompt output is.  If the device sits in a vtysh
+        context outside of a sticky context session, the commands are run
+        through the vtysh prompt instead.
+
+        :param commands: list of vtysh command strings (or a single string)
+        :type commands: list
+        :param errorCheck: boolean True to error check, False to turn off
+                           error checking.
+        :type errorCheck: boolean
+        :param timeout: seconds to wait for the command to complete
+        :type timeout: integer
+        :param cache: False to bypass the show cache
+        :type cache: boolean
+        :return: dictionary containing returnCode and buffer
+        :rtype: dictionary
+        """
+        commands = kwargs.get('commands', [])
+        errorCheck = kwargs.get('errorCheck', True)
+        timeout = kwargs.get('timeout', 120)
+        cache = kwargs.get('cache', True)
+
+        if isinstance(commands, basestring):
+            commands = [commands]
+        retStruct = dict()
+
+        if self.stickyContext is True:
+            self.requestedContext = "linux"
+        elif self.deviceContext != "linux":
+            LogOutput('debug', "Not in the linux context, running the "
+                      "commands through the vtysh prompt")
+            overallBuffer = []
+            returnCode = 0
+            vtyEnterRet = self.VtyshShell(enter=True)
+            overallBuffer.append(vtyEnterRet.buffer())
+            for curCommand in commands:
+                devIntRetStruct = self.DeviceInteract(command=curCommand,
+                                                      errorCheck=errorCheck,
+                                                      timeout=timeout,
+                                                      cache=cache)
+                overallBuffer.append(devIntRetStruct.get('buffer'))
+                if devIntRetStruct.get('returnCode') != 0:
+                    returnCode = devIntRetStruct.get('returnCode')
+            vtyExitRet = self.VtyshShell(enter=False)
+            overallBuffer.append(vtyExitRet.buffer())
+            bufferString = ""
+            for curLine in overallBuffer:
+                bufferString += str(curLine)
+            retStruct['returnCode'] = returnCode
+            retStruct['buffer'] = bufferString
+            return retStruct
+
+        command = "vtysh"
+        for curCommand in commands:
+            command += " -c " + pipes.quote(str(curCommand))
+        devIntRetStruct = self.DeviceInteract(command=command,
+                                              errorCheck=errorCheck,
+                                              timeout=timeout,
+                                              cache=cache)
+        returnCode = devIntRetStruct.get('returnCode')
+        buffer = devIntRetStruct.get('buffer')
+
+        # Drop the echo of the vtysh command line
+        echoIndex = buffer.find(command)
+        if echoIndex != -1:
+            lineEnd = buffer.find("\n", echoIndex)
+            if lineEnd != -1:
+                buffer = buffer[lineEnd + 1:]
+
+        if returnCode == 0 and errorCheck is True \
+                and self.commandErrorCheck == 1:
+            errCheckRetStr = self.ErrorCheckCLI(buffer=buffer)
+            returnCode = errCheckRetStr['returnCode']
+        # Special Logic for Segmentation Faults
+        if returnCode == 14:
+            assert False, "Received a Segmentation Fault during sending cmd " +\
+                str(command)
+        retStruct['returnCode'] = returnCode
+        retStruct['buffer'] = buffer
+        return retStruct
+
+    def ConfigCopy(self, **kwargs):
+        """
+        ConfigCopy method
+
+        This method moves the switch to the linux context and copies one
+        configuration over the other with vtysh.
+
+        :param command: vtysh copy command
+        :type command: string
+        :returnType: returnStruct Class
+        :rtype: object
+        """
+        command = kwargs.get('command')
+        self.requestedContext = "linux"
+        returnCls = self.pendingContextEnter()
+        if returnCls.returnCode() != 0:
+            return returnCls
+        retStruct = self.VtyshOneShot(commands=[command])
+        returnCls = returnStruct(returnCode=retStruct['returnCode'],
+                                 buffer=retStruct['buffer'])
+        return returnCls
+
+    def ConfigBaselineSave(self):
+        """
+        ConfigBaselineSave method
+
+        This method saves the running configuration as the startup-config,
+        the baseline ConfigBaselineRestore rolls back to.
+
+        :returnType: returnStruct Class
+        :rtype: object
+        """
+        LogOutput('debug', "Saving baseline configuration of " + self.device)
+        return self.ConfigCopy(
+            command="copy running-config startup-config")
+
+    def ConfigBaselineRestore(self):
+        """
+        ConfigBaselineRestore method
+
+        This method rolls the running configuration back to the
+        startup-config saved by ConfigBaselineSave.
+
+        :returnType: returnStruct Class
+        :rtype: object
+        """
+        LogOutput('debug', "Restoring baseline configuration of "
+                  + self.device)
+        return self.ConfigCopy(
+            command="copy startup-config running-config")
+
     def Connect(self):
         """
         Connect Method
@@ -184,18 +524,15 @@ class VSwitch(Device):
         """
         # Look up the device name in the topology - grab connectivity
         # information
-        xpathString = ".//device[name='" + self.device + "']"
-        etreeElement = XmlGetElementsByTag(self.topology.TOPOLOGY, xpathString)
-        if etreeElement is None:
+        connInfo = self.ConnectionInfoGet()
+        if connInfo is None:
             # We are not in a good situation, we need to bail
             LogOutput('error',
                       "Could not find device " + self.device + " in topology")
             return None
         # Code for virtual
         # Go and grab the connection name
-        xpathString = ".//device[name='" + self.device + "']/connection/name"
-        virtualConn = XmlGetElementsByTag(self.topology.TOPOLOGY, xpathString)
-        if virtualConn is None:
+        if connInfo['name'] is None:
             LogOutput('error',
                       "Failed to virtual connection for " + self.device)
             return None
@@ -215,6 +552,7 @@ class VSwitch(Device):
                                         echo=False,
                                         logfile=DeviceLogger(expectLogFile))
         # self.expectHndl.delaybeforesend = .50
+        self.InteractSpawnTune()
 
         # Lets go and detect our connection - this will get us to a context
         # we know about
@@ -222,6 +560,46 @@ class VSwitch(Device):
         if retVal is None:
             return None
 
+    def Reconnect(self):
+        """
+        Reconnect Method
+
+        This method drops the connection to the VSwitch device and connects
+        again, for instance after the switch container has been restarted.
+        The default context and the link to port mapping are kept.
+
+        :returnType: returnStruct Class
+        :rtype: object
+        """
+        self.connectLock.acquire()
+        try:
+            # The handle is read through __dict__ so a deferred connection
+            # is not opened just to be closed again.  A deferred connection
+            # is replaced by this one.
+            self.connectPending = False
+            if self.Connected() is True:
+                try:
+                    self.__dict__['expectHandle'].close()
+                except Exception:
+                    pass
+            self.expectHndl = None
+            self.deviceContext = ""
+            self.requestedContext = None
+            self.vtyshHostname = None
+            self.promptPatterns = None
+            self.promptPatternsKey = None
+            self.ShowCacheInvalidate()
+            self.showCacheContext = None
+            self.Connect()
+        finally:
+            self.connectLock.release()
+        if self.Connected() is False:
+            returnCls = returnStruct(returnCode=1)
+            return returnCls
+        self.defaultContextEnter()
+        returnCls = returnStruct(returnCode=0)
+        return returnCls
+
     def DetectConnection(self):
         """
         DetectConnection Method
@@ -234,67 +612,52 @@ class VSwitch(Device):
         :rtype: expect object
         """
         bailflag = 0
+        self.vtyshHostname = None
 
         self.expectHndl.send('\r')
-        time.sleep(2)
+        if self.lowLatency is False:
+            time.sleep(2)
         connectionBuffer = []
         sanitizedBuffer = ""
         while bailflag == 0:
             index = self.expectHndl.expect(self.expectList,
                                            timeout=30)
             LogOutput('debug', "Index -> " + str(index))
-            if index == 0:
+            (pattern, action, context, promptErrorFlag) = \
+                self.promptTable[index]
+            if action == "login":
                 # Need to send login string
                 LogOutput("debug", "Login required::")
-                self.expectHndl.sendline("root")
+                self.expectHndl.sendline(self.loginUser)
                 connectionBuffer.append(self.expectHndl.before)
-            elif index == 1:
-                # logged-in in prompt
-                bailflag = 1
-                LogOutput("debug", "Root prompt detected:")
+            elif action == "password":
+                LogOutput("debug", "Password required::")
+                self.expectHndl.sendline(self.loginPassword)
                 connectionBuffer.append(self.expectHndl.before)
-            elif index == 2:
+            elif action == "done" and context == "linux":
                 # Got prompt.  We should be good
                 bailflag = 1
-                LogOutput("debug", "Root bash prompt detected: Virtual")
-                connectionBuffer.append(self.expectHndl.before)
-            elif index == 3:
-                LogOutput("debug", "vtysh prompt detected: Revert to root")
-                self.expectHndl.send('exit\r')
+                LogOutput("debug", "Root prompt detected:")
                 connectionBuffer.append(self.expectHndl.before)
-            elif index == 4:
+            elif action == "done" and context in self.vtyshHostPatterns:
                 LogOutput("debug",
-                          "vtysh config prompt detected: Revert to root")
+                          context + " prompt detected: Revert to root")
                 self.expectHndl.send('exit\r')
                 connectionBuffer.append(self.expectHndl.before)
-            elif index == 5:
-                LogOutput("debug",
-                          "vtysh config subcontext prompt detected:"
-                          " Revert to root")
-                self.expectHndl.send('exit \r')
-                connectionBuffer.append(self.expectHndl.before)
-            elif index == 6:
+            elif action == "done" and promptErrorFlag == "Onie":
                 # Got ONIE prompt - reboot and get to where we need to be
                 self.expectHndl.sendline("reboot")
                 connectionBuffer.append(self.expectHndl.before)
-            elif index == 7:
-                # Got EOF
-                LogOutput('error', "Telnet to switch failed")
-                return None
-            elif index == 8:
-                # Got EOF
-                LogOutput('error', "Connection Refused")
-                return None
-            elif index == 9:
-                # Got EOF
+            elif action == "more":
                 LogOutput('debug', "More prompt")
                 self.expectHndl.send(' ')
-            elif index == 10:
-                # Got EOF
+            elif action == "closed":
+                LogOutput('error', "Connection Refused")
+                return None
+            elif action == "eof":
                 LogOutput('error', "Telnet to switch failed")
                 return None
-            elif index == 11:
-                # Got a Timeout
+            elif action == "timeout":
                 LogOutput('error', "Connection timed out")
                 return None
             else:
@@ -325,6 +688,9 @@ class VSwitch(Device):
         :param CheckError: Type of error to check CLI for CLI command.
                            ONIE for onie context.
         :type CheckError: string
+        :param cache: False to send a show command to the device even if
+                      the show cache holds its result
+        :type cache: boolean
         :return: dictionary containing returnCode and buffer
         :rtype: dictionary
         """
@@ -333,6 +699,7 @@ class VSwitch(Device):
         ErrorFlag = kwargs.get('CheckError')
         yesPromptResp = kwargs.get('yesPrompt', "yes")
         timeout = kwargs.get('timeout', 120)
+        cache = kwargs.get('cache', True)
 
         # Local variables
         bailflag = 0
@@ -341,143 +708,114 @@ class VSwitch(Device):
         retStruct['returnCode'] = 1
         retStruct['buffer'] = []
 
+        # Get to the context a sticky session deferred before sending
+        if self.stickyContext is True and self.requestedContext is not None:
+            self.pendingContextEnter()
+
+        # Answer show commands out of the cache, anything that may change
+        # the device drops it
+        cacheKey = None
+        if self.showCacheTtl is not None:
+            commandClass = self.CommandClassGet(command=command)
+            if commandClass == "show" and self.showCacheContext is not None:
+                cacheKey = (self.showCacheContext, command)
+                if cache is True:
+                    cachedStruct = self.ShowCacheGet(key=cacheKey)
+                    if cachedStruct is not None:
+                        self.santString = cachedStruct['buffer']
+                        return cachedStruct
+            elif commandClass == "change":
+                self.ShowCacheInvalidate()
+
         # Clear out buffer
-        try:
-            #LogOutput('debug', "Flushing buffer")
-            buf = self.expectHndl.read_nonblocking(128, 0)
-            #LogOutput('debug', "Buffer data \n" + buf)
-        except pexpect.TIMEOUT:
-            # pass
-            LogOutput('debug', "Timeout on clear buffer read")
-        except pexpect.EOF:
-            # pass
-            LogOutput('debug', "EOF on clear buffer read")
+        if self.lowLatency is True:
+            self.InteractDrain()
+        else:
+            try:
+                #LogOutput('debug', "Flushing buffer")
+                buf = self.expectHndl.read_nonblocking(128, 0)
+                #LogOutput('debug', "Buffer data \n" + buf)
+            except pexpect.TIMEOUT:
+                # pass
+                LogOutput('debug', "Timeout on clear buffer read")
+            except pexpect.EOF:
+                # pass
+                LogOutput('debug', "EOF on clear buffer read")
 
         # Send the command
-        self.expectHndl.send(command)
-        self.expectHndl.send('\r')
+        startTime = time.time()
+        waitTime = 0.0
+        self.InteractSend(command)
         # time.sleep(1)
         connectionBuffer = []
 
+        commandWords = command.split()
+        if len(commandWords) > 0 and "hostname" in commandWords[0:2]:
+            # The vtysh prompt is about to change
+            self.vtyshHostname = None
+        promptPatterns = self.PromptPatternsGet()
         while bailflag == 0:
-            index = self.expectHndl.expect(self.expectList,
-                                           timeout=timeout)
+            waitStart = time.time()
+            index = self.expectHndl.expect_list(
+                promptPatterns, timeout=timeout,
+                searchwindowsize=self.searchWindowSize)
+            waitTime += time.time() - waitStart
             LogOutput('debug', "Index ->" + str(index))
-            if index == 0:
+            (pattern, action, context, promptErrorFlag) = \
+                self.promptTable[index]
+            connectionBuffer.append(self.expectHndl.before)
+            if promptErrorFlag is not None:
+                ErrorFlag = promptErrorFlag
+            if action == "login":
                 # Need to send login string
                 self.expectHndl.sendline(self.loginUser)
-                connectionBuffer.append(self.expectHndl.before)
-            elif index == 1:
-                # root prompt
-                bailflag = 1
-                connectionBuffer.append(self.expectHndl.before)
-                break
-            elif index == 2:
-                # Got bash prompt - virtual
-                bailflag = 1
-                connectionBuffer.append(self.expectHndl.before)
-                break
-            elif index == 3:
-                LogOutput("debug", "vtysh prompt detected")
-                ErrorFlag = "CLI"
-                bailflag = 1
-                connectionBuffer.append(self.expectHndl.before)
-                break
-            elif index == 4:
-                # Got vtysh config prompts
-                LogOutput('debug', "config prompt")
-                ErrorFlag = "CLI"
-                bailflag = 1
-                connectionBuffer.append(self.expectHndl.before)
-                break
-            elif index == 5:
-                # Got vtysh config interface prompts
-                LogOutput('debug', "config subcontext prompt")
-                ErrorFlag = "CLI"
-                bailflag = 1
-                connectionBuffer.append(self.expectHndl.before)
-                break
-            elif index == 6:
-                # Got ONIE prompt - reboot and get to where we need to be
-                LogOutput('debug', "Got Onie prompt")
-                ErrorFlag = "Onie"
-                bailflag = 1
-                connectionBuffer.append(self.expectHndl.before)
-                break
-            elif index == 7:
-                # got EOF
-                bailflag = 1
-                connectionBuffer.append(self.expectHndl.before)
-                LogOutput('error', "connection closed to console")
-                returnCode = 1
-                break
-            elif index == 8:
-                # got EOF
-                bailflag = 1
-                connectionBuffer.append(self.expectHndl.before)
-                LogOutput('error', "connection closed to console")
-                returnCode = 1
-                break
-            elif index == 9:
-                # more prompt
-                connectionBuffer.append(self.expectHndl.before)
+            elif action == "more":
                 LogOutput('debug', "saw more prompt")
                 self.expectHndl.send(" \r")
-            elif index == 10:
-                # Password prompt
-                connectionBuffer.append(self.expectHndl.before)
+            elif action == "password":
                 LogOutput('debug', "saw password prompt")
-                #if self.loginUser == "admin":
-                #    self.expectHndl.sendline("admin")
                 self.expectHndl.sendline(self.loginPassword)
-            elif index == 11:
-                # Password prompt
-                connectionBuffer.append(self.expectHndl.before)
-                LogOutput('debug', "saw start shell prompt")
-                bailflag = 1
-                break
-            elif index == 12:
-                # yes / no prompt
+            elif action == "yesno":
                 bailflag = 1
-                connectionBuffer.append(self.expectHndl.before)
                 if yesPromptResp == "yes":
-                    self.expectHndl.send("yes")
+                    self.InteractSend("yes")
                 else:
-                    self.expectHndl.send("no")
-                self.expectHndl.send("\r")
-                break
-            elif index == 13:
-                # y/n prompt
+                    self.InteractSend("no")
+            elif action == "yn":
                 bailflag = 1
-                connectionBuffer.append(self.expectHndl.before)
                 if yesPromptResp == "yes":
-                    self.expectHndl.send("y")
+                    self.InteractSend("y")
                 else:
-                    self.expectHndl.send("n")
-                self.expectHndl.send("\r")
-                break
-            elif index == 14:
-                # got EOF
+                    self.InteractSend("n")
+            elif action == "closed":
                 bailflag = 1
-                connectionBuffer.append(self.expectHndl.before)
+                LogOutput('error', "connection closed to console")
+                returnCode = 1
+            elif action == "eof":
                 LogOutput('error', "connection closed to console")
                 returnCode = 1
                 exit(105)
-                break
-            elif index == 15:
-                # got Timeout
+            elif action == "timeout":
                 bailflag = 1
-                connectionBuffer.append(self.expectHndl.before)
                 LogOutput('error', "command timeout")
                 returnCode = 1
-                break
             else:
-                connectionBuffer.append(self.expectHndl.before)
+                # Got a prompt.  We should be good
+                bailflag = 1
+                if context == "vtyShell" and command.strip() == "vtysh":
+                    self.vtyshHostname = self.expectHndl.after.rstrip("#")
+        # Track the context from the prompt we landed on
+        if self.stickyContext is True and index in self.promptContexts:
+            self.deviceContext = self.promptContexts[index]
+        self.showCacheContext = self.promptContexts.get(index, None)
         # Move collecting after buffer until after we flush the buffer
         # connectionBuffer.append(self.expectHndl.after)
-        self.expectHndl.expect(['$'], timeout=0.05)
-        connectionBuffer.append(self.expectHndl.before)
-        connectionBuffer.append(self.expectHndl.after)
+        if self.lowLatency is True:
+            connectionBuffer.append(self.InteractDrain())
+        else:
+            self.expectHndl.expect(['$'], timeout=0.05)
+            connectionBuffer.append(self.expectHndl.before)
+            connectionBuffer.append(self.expectHndl.after)
         #LogOutput('debug',
         #          "Index = " + str(index) + " Command = " + command
         #          + "\nOutput\n" + str(connectionBuffer))
@@ -495,7 +833,7 @@ class VSwitch(Device):
                   "Sent and received from "
                   "device: \n" + self.santString + "\n")
         # The following portion checks for Errors in CLI commands
-        if self.commandErrorCheck == 1:
+        if self.commandErrorCheck == 1 and errorCheck is True:
             if ErrorFlag == 'CLI':
                 LogOutput('debug', "Doing error check for CLI prompt in vtysh")
                 errCheckRetStr = self.ErrorCheckCLI(buffer=self.santString)
@@ -515,8 +853,261 @@ class VSwitch(Device):
         #          "device: \n" + self.santString + "\n")
         retStruct['returnCode'] = returnCode
         retStruct['buffer'] = self.santString
+        if cacheKey is not None and returnCode == 0:
+            self.showCache[cacheKey] = (time.time(), self.santString)
+        self.InteractStatsRecord(totalTime=time.time() - startTime,
+                                 waitTime=waitTime)
+        return retStruct
+
+    def CommandClassGet(self, **kwargs):
+        """
+        CommandClassGet method
+
+        This method sorts a command for the show cache.  show and do show
+        commands, and vtysh -c one shots made only of them, are "show".
+        Moving between the linux, vtysh and config contexts is "navigate".
+        Everything else may change the device and is "change".
+
+        :param command: command string
+        :type command: string
+        :return: "show", "navigate" or "change"
+        :rtype: string
+        """
+        command = kwargs.get('command', "")
+        words = command.split()
+        if len(words) == 0:
+            return "navigate"
+        if words[0] == "show" or words[0:2] == ["do", "show"]:
+            return "show"
+        if " ".join(words) in showCacheNavigation:
+            return "navigate"
+        if words[0] == "vtysh" and len(words) > 2:
+            try:
+                args = shlex.split(command)
+            except ValueError:
+                return "change"
+            oneShotCommands = [args[index + 1]
+                               for index in range(1, len(args) - 1)
+                               if args[index] == "-c"]
+            if len(oneShotCommands) != 0 \
+                    and len(oneShotCommands) * 2 + 1 == len(args):
+                for curCommand in oneShotCommands:
+                    if self.CommandClassGet(command=curCommand) != "show":
+                        return "change"
+                return "show"
+        return "change"
+
+    def ShowCacheGet(self, **kwargs):
+        """
+        ShowCacheGet method
+
+        :param key: (context, command) key of the cached result
+        :type key: tuple
+        :return: dictionary containing returnCode and buffer, None if the
+                 result is not cached or has expired
+        :rtype: dictionary
+        """
+        key = kwargs.get('key')
+        cacheEntry = self.showCache.get(key, None)
+        if cacheEntry is None:
+            return None
+        (cacheTime, buffer) = cacheEntry
+        if time.time() - cacheTime > self.showCacheTtl:
+            del self.showCache[key]
+            return None
+        LogOutput('debug', "Show cache hit for " + key[1])
+        retStruct = dict()
+        retStruct['returnCode'] = 0
+        retStruct['buffer'] = buffer
         return retStruct
 
+    def ShowCacheInvalidate(self):
+        """
+        ShowCacheInvalidate method
+
+        This method drops the cached show results of the device.  It is
+        called for every command that may change the device, and by the
+        topology on link and restart events.
+        """
+        self.showCache = dict()
+
+    def ShowCacheSet(self, **kwargs):
+        """
+        ShowCacheSet method
+
+        This method turns the show cache of the device on or off.
+
+        :param ttl: seconds a cached result is good for, None to turn the
+                    cache off
+        :type ttl: float
+        """
+        self.showCacheTtl = kwargs.get('ttl', None)
+        self.ShowCacheInvalidate()
+
+    def PromptPatternsGet(self):
+        """
+        PromptPatternsGet method
+
+        This method returns the prompt table patterns compiled for the
+        current expect handle.  Once the vtysh host name is known the vtysh
+        prompt patterns only match that host name.  The list is compiled
+        again only when the connection or the host name changes.
+
+        :return: list of compiled patterns for expect_list
+        :rtype: list
+        """
+        patternsKey = (self.expectHndl, self.vtyshHostname)
+        if self.promptPatternsKey != patternsKey:
+            patternList = list(self.expectList)
+            if self.vtyshHostname is not None:
+                hostname = re.escape(self.vtyshHostname)
+                for index in range(0, len(self.promptTable)):
+                    context = self.promptTable[index][2]
+                    if context in self.vtyshHostPatterns:
+                        patternList[index] = hostname + \
+                            self.vtyshHostPatterns[context]
+            self.promptPatterns = self.expectHndl.compile_pattern_list(
+                patternList)
+            self.promptPatternsKey = patternsKey
+        return self.promptPatterns
+
+    def DeviceInteractBatch(self, **kwargs):
+        """
+        DeviceInteractBatch Method
+
+        This method will write a list of commands to the device in one go,
+        wait for the whole transaction to complete and then split the output
+        back into one result per command.  Results from the vtysh contexts
+        are error checked the same way DeviceInteract checks them, in the
+        linux context the exit status carried back in the sentinel marker
+        of each command is its return code.  The commands must all run in
+        the context the device is in when the batch starts (config
+        sub-contexts inside vtysh are fine).
+
+        :param commands: list of command strings to execute
+        :type commands: list
+        :param errorCheck: boolean True to error check, False to turn off
+                           error checking.
+        :type errorCheck: boolean
+        :param timeout: seconds to wait for output between two reads
+        :type timeout: integer
+        :return: list of dictionaries containing returnCode and buffer, one
+                 per command
+        :rtype: list
+        """
+        commands = kwargs.get('commands', [])
+        errorCheck = kwargs.get('errorCheck', True)
+        timeout = kwargs.get('timeout', 120)
+
+        if len(commands) == 0:
+            return []
+
+        # Get to the context a sticky session deferred before sending
+        if self.stickyContext is True and self.requestedContext is not None:
+            self.pendingContextEnter()
+
+        # The batch is not cached, and the context it ends in is not known
+        # to the cache
+        if self.showCacheTtl is not None:
+            for curCommand in commands:
+                if self.CommandClassGet(command=curCommand) == "change":
+                    self.ShowCacheInvalidate()
+                    break
+        self.showCacheContext = None
+
+        if self.deviceContext == "linux":
+            batchContext = "linux"
+        else:
+            batchContext = "CLI"
+        (tag, payload) = self.BatchCommandsBuild(commands=commands,
+                                                 context=batchContext)
+        if batchContext == "linux":
+            endMarker = tag + "_" + str(len(commands)) + "_\d+\s"
+        else:
+            endMarker = tag + "_" + str(len(commands))
+
+        # Clear out buffer
+        try:
+            buf = self.expectHndl.read_nonblocking(128, 0)
+        except pexpect.TIMEOUT:
+            LogOutput('debug', "Timeout on clear buffer read")
+        except pexpect.EOF:
+            LogOutput('debug', "EOF on clear buffer read")
+
+        # Send all the commands
+        self.expectHndl.send(payload)
+        connectionBuffer = []
+        transactionCode = 0
+        bailflag = 0
+        while bailflag == 0:
+            index = self.expectHndl.expect([endMarker,
+                                            '--More--',
+                                            pexpect.EOF,
+                                            pexpect.TIMEOUT],
+                                           timeout=timeout)
+            connectionBuffer.append(self.expectHndl.before)
+            if index == 0:
+                connectionBuffer.append(self.expectHndl.after)
+                bailflag = 1
+            elif index == 1:
+                LogOutput('debug', "saw more prompt")
+                self.expectHndl.send(" ")
+            elif index == 2:
+                LogOutput('error', "connection closed to console")
+                transactionCode = 1
+                bailflag = 1
+            else:
+                LogOutput('error', "batch command timeout")
+                transactionCode = 1
+                bailflag = 1
+
+        if transactionCode == 0:
+            # Collect the prompt the last marker leaves us at
+            index = self.expectHndl.expect_list(
+                self.PromptPatternsGet(), timeout=timeout,
+                searchwindowsize=self.searchWindowSize)
+            connectionBuffer.append(self.expectHndl.before)
+            if index < 14:
+                connectionBuffer.append(self.expectHndl.after)
+            if self.stickyContext is True and index in self.promptContexts:
+                self.deviceContext = self.promptContexts[index]
+        santString = ""
+        for curLine in connectionBuffer:
+            santString += str(curLine)
+        LogOutput('debug',
+                  "Sent and received from "
+                  "device: \n" + santString + "\n")
+
+        splitList = self.BatchBufferSplit(buffer=santString, tag=tag,
+                                          count=len(commands),
+                                          commands=commands)
+        retList = []
+        for index in range(0, len(commands)):
+            retStruct = dict()
+            chunk = splitList[index]['buffer']
+            if chunk is None:
+                # Never saw the marker for this command
+                retStruct['returnCode'] = 1
+                retStruct['buffer'] = ""
+                retList.append(retStruct)
+                continue
+            returnCode = 0
+            if errorCheck is True and self.commandErrorCheck == 1:
+                if batchContext == "CLI":
+                    errCheckRetStr = self.ErrorCheckCLI(buffer=chunk)
+                    returnCode = errCheckRetStr['returnCode']
+                else:
+                    # The marker carries the exit status of the command
+                    returnCode = splitList[index]['exitStatus']
+            # Special Logic for Segmentation Faults
+            if returnCode == 14:
+                assert False, "Received a Segmentation Fault during " \
+                    "sending cmd " + str(commands[index])
+            retStruct['returnCode'] = returnCode
+            retStruct['buffer'] = chunk
+            retList.append(retStruct)
+        return retList
+
     def ErrorCheck(self, **kwargs):
         """
         ErrorCheck Method
@@ -572,98 +1163,15 @@ class VSwitch(Device):
         ErrorCheckCLI Method
 
         This method is used to do error checking specifically over the switch
-        CLI.
+        CLI.  The error signatures come from the CLI error registry, see
+        CliErrorRegister to add more.
         :param buffer: buffer string from self.DeviceInteract to get checked
         :type buffer: string
+        :return: dictionary with returnCode, fatal and errors keys
+        :rtype: dictionary
         """
         self.buffer = kwargs.get('buffer')
-        # Local variables
-        returnCode = 0
-        returnDict = dict()
-        returnDict['returnCode'] = returnCode
-        bufferSplit = self.buffer.split("\n")
-        for line in bufferSplit:
-            # Enter a error code for every failure
-            # Error codes correspond to errors in expect buffer interactions
-            # with switch
-            Error_Code1 = re.match(".*(command not found)", line, re.I)
-            if re.match(".*(command not found)", line, re.I):
-                LogOutput("error",
-                          "Error detected--->" + Error_Code1.group(1))
-                returnCode = 2
-            Error_Code2 = re.match(".*(Unknown command)", line, re.I)
-            if re.match(".*(unknown command)", line, re.I):
-                LogOutput("error",
-                          "Error detected--->" + Error_Code2.group(1))
-                returnCode = 3
-            Error_Code3 = re.match(".*(Command incomplete)", line, re.I)
-            if re.match(".*(Command incomplete)", line, re.I):
-                LogOutput("error",
-                          "Error detected--->" + Error_Code3.group(1))
-                returnCode = 4
-            Error_Code4 = re.match(".*(LAG\s+port\s+doesn't\s+exist)",
-                                   line, re.I)
-            if re.match(".*(LAG\s+port\s+doesn't\s+exist)", line, re.I):
-                LogOutput("error",
-                          "Error detected--->" + Error_Code4.group(1))
-                returnCode = 5
-            Error_Code5 = re.match(".*(no\s+matched\s+command)",
-                                   line, re.I)
-            if re.match(".*(no\s+matched\s+command)", line, re.I):
-                LogOutput("error",
-                          "Error detected--->" + Error_Code5.group(1))
-                returnCode = 6
-            #ssh error codes
-            Error_Code7 = re.match(".*(Permission denied)",
-                                   line, re.I)
-            if re.match(".*(Permission denied)", line, re.I):
-                LogOutput("error",
-                          "Error detected--->" + Error_Code7.group(1))
-                returnCode = 7 
-            #User add/remove error codes
-            Error_Code8 = re.match(".*(user [A-Za-z0-9]+ already exists)",
-                                   line, re.I)
-            if Error_Code8:
-                LogOutput("error",
-                          "Detected--->" + Error_Code8.group(1))
-                returnCode = 8
-            Error_Code9 = re.match(".*(Passwords do not match)",
-                                   line, re.I)
-            if Error_Code9:
-                LogOutput("error",
-                          "Detected--->" + Error_Code9.group(1))
-                returnCode = 9
-            Error_Code10 = re.match(".*(Unknown user:)",
-                                   line, re.I)
-            if Error_Code10:
-                LogOutput("error",
-                          "Detected--->" + Error_Code10.group(1))
-                returnCode = 10
-            Error_Code11 = re.match(".*(Cannot delete the last user:)",
-                                   line, re.I)
-            if Error_Code11:
-                LogOutput("error",
-                          "Detected--->" + Error_Code11.group(1))
-                returnCode = 11
-            Error_Code12 = re.match(".*(user [A-Za-z0-9_]+ is currently used by process)",
-                                   line, re.I)
-            if Error_Code12:
-                LogOutput("error",
-                          "Detected--->" + Error_Code12.group(1))
-                returnCode = 12
-            Error_Code13 = re.match(".*(Cannot add more interfaces to LAG. Maximum interface count is reached)",
-                                   line, re.I)
-            if Error_Code13:
-                LogOutput("error",
-                          "Detected--->" + Error_Code13.group(1))
-                returnCode = 13
-            Error_Code14 = re.match("Segmentation fault", line, re.I)
-            if Error_Code14:
-                returnCode = 14
-
-
-        returnDict['returnCode'] = returnCode
-        return returnDict
+        return cliErrorRegistry.classify(buffer=self.buffer)
 
     def Reboot(self, **kwargs):
         """
@@ -699,6 +1207,16 @@ class VSwitch(Device):
             configOption = "unconfig"
         # returnDict = dict()
         overallBuffer = []
+        if self.stickyContext is True:
+            # Defer the context change until a command needs it
+            if option is True:
+                self.requestedContext = "vtyShell"
+            elif self.defaultContext == "":
+                self.requestedContext = "linux"
+            else:
+                self.requestedContext = self.defaultContext
+            returnCls = returnStruct(returnCode=0)
+            return returnCls
         if configOption == "config" or option is True:
             if self.deviceContext == "vtyShell":
                 # LogOutput('debug', "Already in vtysh context")
@@ -772,6 +1290,14 @@ class VSwitch(Device):
         option = kwargs.get('enter', True)
 
         overallBuffer = []
+        if self.stickyContext is True:
+            # Defer the context change until a command needs it
+            if option is True or self.defaultContext == "vtyShellConfig":
+                self.requestedContext = "vtyShellConfig"
+            else:
+                self.requestedContext = "vtyShell"
+            returnCls = returnStruct(returnCode=0)
+            return returnCls
         if option is True:
             if self.deviceContext == "vtyShellConfig":
                 LogOutput('debug', "Already in vtysh config context")
@@ -0,0 +1,94 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import os
+import threading
+import Queue
+from DeviceSession import DeviceRequest
+
+"""
+Bounded pool of worker threads used to run independent per device jobs,
+such as opening connections, at the same time.
+"""
+
+
+class WorkerPool(object):
+    """
+    WorkerPool Class definition
+
+    Runs submitted jobs on at most maxWorkers threads.  The number of workers
+    defaults to the VSIMAXWORKERS environment variable, or 8.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        WorkerPool init method
+
+        :param maxWorkers: maximum number of worker threads
+        :type maxWorkers: integer
+        """
+        self.maxWorkers = kwargs.get('maxWorkers', None)
+        if self.maxWorkers is None:
+            self.maxWorkers = int(os.environ.get('VSIMAXWORKERS', 8))
+        if self.maxWorkers < 1:
+            self.maxWorkers = 1
+        self.jobQueue = Queue.Queue()
+        self.workers = []
+
+    def workerLoop(self):
+        """
+        workerLoop method
+
+        Worker thread body - runs queued jobs until the pool closes.
+        """
+        while True:
+            request = self.jobQueue.get()
+            if request is None:
+                break
+            request.run()
+
+    def submit(self, function, **kwargs):
+        """
+        submit method
+
+        Queues a job.  Workers are started as needed up to maxWorkers.
+
+        :param function: callable to run
+        :type function: function
+        :return: DeviceRequest handle
+        :rtype: object
+        """
+        request = DeviceRequest(function, **kwargs)
+        self.jobQueue.put(request)
+        if len(self.workers) < self.maxWorkers:
+            worker = threading.Thread(target=self.workerLoop,
+                                      name="WorkerPool-"
+                                      + str(len(self.workers)))
+            worker.daemon = True
+            worker.start()
+            self.workers.append(worker)
+        return request
+
+    def close(self):
+        """
+        close method
+
+        Stops the workers once the queued jobs are done.
+        """
+        for curWorker in self.workers:
+            self.jobQueue.put(None)
+        for curWorker in self.workers:
+            curWorker.join()
+        self.workers = []
@@ -21,5 +21,12 @@ from Device import *
 from testEnviron import *
 from VHost import *
 from VSwitch import *
+from CliErrorRegistry import *
+from TopologyModel import *
 from Topology import *
+from DeviceSession import *
+from WorkerPool import *
+from TopologyPool import *
+from TopologyGenerators import *
+from DeviceEmulator import *
 from GetLinuxInterfaceIp import *
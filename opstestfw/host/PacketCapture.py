@@ -46,6 +46,22 @@ import re
 import collections
 from opstestfw import *
 import pdb
+from opstestfw.switch.ShowParser import *
+
+# tshark frame header and the LLDP lines of a frame, in the order they are
+# checked.  Add rules here for other protocols.
+captureFrameRegex = re.compile(r'Frame \d+:')
+lldpFrameParser = ShowParser(
+    strip=True,
+    rules=[("Protocol", r'\[Protocols in frame:\s+([A-Za-z:0-9]+)\]'),
+           ("LldpSystemName", r'System Name = ([A-Za-z1-9]+)'),
+           ("PortID", r'Port Id: (\d+)'),
+           ("TimeToLive", r'Time To Live = (.*)'),
+           # The SystemDescription key has always had a trailing space
+           ("SystemDescription ", r'System Description = (.*)'),
+           ("PortVLanID", r'Port VLAN Identifier: (.*)'),
+           ("VlanNameTLV", r'VLAN Name: (.*)'),
+           ("PortDescr", r'Port Description = (.*)')])
 
 class PacketCapture():
     returnDict = dict()
@@ -133,78 +149,29 @@ class PacketCapture():
         fileHandle = open(localpath, "r")
         captureBuffer = fileHandle.read()
         frameCount = 0
-        FrameList = re.split(r'Frame \d+:', captureBuffer)
+        FrameList = captureFrameRegex.split(captureBuffer)
         # FrameList has the capture packet buffer as list
         FrameList = filter(None, FrameList)
         if len(FrameList) != 0:
             for frame in FrameList:
                 frameCount = frameCount + 1
-                splitFrame = frame.split('\n')
-                for line in splitFrame:
-                    line = line.strip()
-
-              #<This block needs to replicated for whichever protocol packets need to be parsed>
-                    # Regular expressions to parse the tshark output buffer frames
-                    # LLDP frame parsing begins here
-                    # Protocol
-                    Protocol = re.match(
-                        r'\[Protocols in frame:\s+([A-Za-z:0-9]+)\]',
-                        line)
-                    if Protocol:
-                        if Protocol not in self.FrameDetails.get(frameCount, {}):
-                            self.FrameDetails[frameCount] = dict()
-                            VlanNameTLVList = []
-                            self.FrameDetails[frameCount][
-                                'Protocol'] = Protocol.group(1)
-                            LogOutput("info","Protocol detected -->" + self.FrameDetails[frameCount][
-                                        'Protocol'])
-                    # System Name
-                    LldpSystemName = re.match(
-                        r'System Name = ([A-Za-z1-9]+)',
-                        line)
-                    if LldpSystemName:
-                        if LldpSystemName not in self.FrameDetails.get(frameCount, {}):
-                            self.FrameDetails[frameCount][
-                                'LldpSystemName'] = LldpSystemName.group(1)
-                    # Port ID:
-                    PortID = re.match(r'Port Id: (\d+)', line)
-                    if PortID:
-                        if PortID not in self.FrameDetails.get(frameCount, {}):
-                            self.FrameDetails[frameCount][
-                                'PortID'] = PortID.group(1)
-                    # Time To Live
-                    TimeToLive = re.match(r'Time To Live = (.*)', line)
-                    if TimeToLive:
-                        if TimeToLive not in self.FrameDetails.get(frameCount, {}):
-                            self.FrameDetails[frameCount][
-                                'TimeToLive'] = TimeToLive.group(1)
-                    # System Description
-                    SystemDescription = re.match(
-                        r'System Description = (.*)',
-                        line)
-                    if SystemDescription:
-                        if SystemDescription not in self.FrameDetails.get(frameCount, {}):
-                            self.FrameDetails[frameCount][
-                                'SystemDescription '] = SystemDescription.group(1)
-                    # Port Vlan Identifier
-                    PortVLanID = re.match(r'Port VLAN Identifier: (.*)', line)
-                    if PortVLanID:
-                        if PortVLanID not in self.FrameDetails.get(frameCount, {}):
-                            self.FrameDetails[frameCount][
-                                'PortVLanID'] = PortVLanID.group(1)
-                    # Vlan Name
-                    VlanName = re.match(r'VLAN Name: (.*)', line)
-                    if VlanName:
-                            VlanNameTLVList.append(VlanName.group(1))
-                            self.FrameDetails[frameCount]['VlanNameTLV'] = VlanNameTLVList
-                    # Port Description
-                    PortDescr = re.match(r'Port Description = (.*)', line)
-                    if PortDescr:
-                        if PortDescr not in self.FrameDetails.get(frameCount, {}):
-                            self.FrameDetails[frameCount][
-                                'PortDescr'] = PortDescr.group(1)
-                    # Dump the results in Dictionar(returnDictionary)
-                    returnDictionary['LLDPFrames'] = self.FrameDetails
+                for (rule, fields) in lldpFrameParser.Parse(buffer=frame):
+                    # Protocol starts the details of a new frame
+                    if rule == "Protocol":
+                        self.FrameDetails[frameCount] = dict()
+                        VlanNameTLVList = []
+                        self.FrameDetails[frameCount][
+                            'Protocol'] = fields[0]
+                        LogOutput("info", "Protocol detected -->" +
+                                  self.FrameDetails[frameCount]['Protocol'])
+                    elif rule == "VlanNameTLV":
+                        VlanNameTLVList.append(fields[0])
+                        self.FrameDetails[frameCount][
+                            'VlanNameTLV'] = VlanNameTLVList
+                    else:
+                        self.FrameDetails[frameCount][rule] = fields[0]
+                # Dump the results in Dictionar(returnDictionary)
+                returnDictionary['LLDPFrames'] = self.FrameDetails
     #<Block ends here ***>>
     #Frame parsing ends
 
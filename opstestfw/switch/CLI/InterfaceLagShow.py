@@ -15,7 +15,27 @@
 #
 
 import opstestfw
-import re
+from opstestfw.switch.ShowParser import *
+
+lacpInterfaceParser = ShowParser(
+    rules=[("lagId", "Aggregate-name\s* :\s*lag(\w*)"),
+           ("systemId", "System-id\s*\|(.*)\|(.*)"),
+           ("portId", "Port-id\s*\|(.*)\|(.*)"),
+           ("key", "Key\s*\|(.*)\|(.*)"),
+           ("state", "State\s*\|(.*)\|(.*)")])
+
+lacpStateFlags = {"A": "activeFlag",
+                  "S": "shortTimeFlag",
+                  "C": "collectingFlag",
+                  "X": "stateExpiredFlag",
+                  "P": "passiveFlag",
+                  "L": "longTimeOutFlag",
+                  "D": "distributingFlag",
+                  "F": "aggregableFlag",
+                  "N": "inSyncFlag",
+                  "E": "neighborStateFlag",
+                  "I": "individualFlag",
+                  "O": "outSyncFlag"}
 
 
 def InterfaceLagShow(** kwargs):
@@ -104,193 +124,26 @@ def InterfaceLagShow(** kwargs):
 
     for curLine in overallBuffer:
         bufferString += str(curLine)
-    bufferSplit = bufferString.split("\r\n")
 
-    data['localPort'] = []
-    data['remotePort'] = []
     localPort = dict()
     remotePort = dict()
 
-    for curLine in bufferSplit:
-        # Search System id
-        lagIdLine = re.match("Aggregate-name\s* :\s*lag(\w*)", curLine)
-        if lagIdLine:
-            curLocalLagId = lagIdLine.group(1)
-            curRemoteLagId = lagIdLine.group(1)
-            localPort['lagId'] = curLocalLagId
-            remotePort['lagId'] = curRemoteLagId
-
-        systemIdLine = re.match("System-id\s*\|(.*)\|(.*)", curLine)
-        if systemIdLine:
-            curLocalSystemId = systemIdLine.group(1)
-            curRemoteSystemId = systemIdLine.group(2)
-            localPort['systemId'] = curLocalSystemId
-            remotePort['systemId'] = curRemoteSystemId
-
-        portIdLine = re.match("Port-id\s*\|(.*)\|(.*)", curLine)
-        if portIdLine:
-            curLocalPort = portIdLine.group(1)
-            curRemotePort = portIdLine.group(2)
-            localPort['portId'] = curLocalPort
-            remotePort['portId'] = curRemotePort
-
-        keyLine = re.match("Key\s*\|(.*)\|(.*)", curLine)
-        if keyLine:
-            curLocalKey = keyLine.group(1)
-            curRemoteKey = keyLine.group(2)
-            localPort['key'] = curLocalKey
-            remotePort['key'] = curRemoteKey
-
-        stateLine = re.match("State\s*\|(.*)\|(.*)", curLine)
-        if stateLine:
-            # Catch from local
-            activeFlag = re.match("A", stateLine.group(1))
-            if activeFlag:
-                localPort['activeFlag'] = True
-            else:
-                localPort['activeFlag'] = False
-
-            shortTimeFlag = re.match("S", stateLine.group(1))
-            if shortTimeFlag:
-                localPort['shortTimeFlag'] = True
-            else:
-                localPort['shortTimeFlag'] = False
-
-            collectingFlag = re.match("C", stateLine.group(1))
-            if collectingFlag:
-                localPort['collectingFlag'] = True
-            else:
-                localPort['collectingFlag'] = False
-
-            stateExpiredFlag = re.match("X", stateLine.group(1))
-            if stateExpiredFlag:
-                localPort['stateExpiredFlag'] = True
-            else:
-                localPort['stateExpiredFlag'] = False
-
-            passiveFlag = re.match("P", stateLine.group(1))
-            if passiveFlag:
-                localPort['passiveFlag'] = True
-            else:
-                localPort['passiveFlag'] = False
-
-            longTimeOutFlag = re.match("L", stateLine.group(1))
-            if longTimeOutFlag:
-                localPort['longTimeOutFlag'] = True
-            else:
-                localPort['longTimeOutFlag'] = False
-
-            distributingFlag = re.match("D", stateLine.group(1))
-            if distributingFlag:
-                localPort['distributingFlag'] = True
-            else:
-                localPort['distributingFlag'] = False
-
-            aggregableFlag = re.match("F", stateLine.group(1))
-            if aggregableFlag:
-                localPort['aggregableFlag'] = True
-            else:
-                localPort['aggregableFlag'] = False
-
-            inSyncFlag = re.match("N", stateLine.group(1))
-            if inSyncFlag:
-                localPort['inSyncFlag'] = True
-            else:
-                localPort['inSyncFlag'] = False
-
-            neighborStateFlag = re.match("E", stateLine.group(1))
-            if neighborStateFlag:
-                localPort['neighborStateFlag'] = True
-            else:
-                localPort['neighborStateFlag'] = False
-
-            individualFlag = re.match("I", stateLine.group(1))
-            if individualFlag:
-                localPort['individualFlag'] = True
-            else:
-                localPort['individualFlag'] = False
-
-            outSyncFlag = re.match("O", stateLine.group(1))
-            if outSyncFlag:
-                localPort['outSyncFlag'] = True
-            else:
-                localPort['outSyncFlag'] = False
-
-            # Cath from remote
-            activeFlag = re.match("A", stateLine.group(1))
-            if activeFlag:
-                remotePort['activeFlag'] = True
-            else:
-                remotePort['activeFlag'] = False
-
-            shortTimeFlag = re.match("S", stateLine.group(1))
-            if shortTimeFlag:
-                remotePort['shortTimeFlag'] = True
-            else:
-                remotePort['shortTimeFlag'] = False
-
-            collectingFlag = re.match("C", stateLine.group(1))
-            if collectingFlag:
-                remotePort['collectingFlag'] = True
-            else:
-                remotePort['collectingFlag'] = False
-
-            stateExpiredFlag = re.match("X", stateLine.group(1))
-            if stateExpiredFlag:
-                remotePort['stateExpiredFlag'] = True
-            else:
-                remotePort['stateExpiredFlag'] = False
-
-            passiveFlag = re.match("P", stateLine.group(1))
-            if passiveFlag:
-                remotePort['passiveFlag'] = True
-            else:
-                remotePort['passiveFlag'] = False
-
-            longTimeOutFlag = re.match("L", stateLine.group(1))
-            if longTimeOutFlag:
-                remotePort['longTimeOutFlag'] = True
-            else:
-                remotePort['longTimeOutFlag'] = False
-
-            distributingFlag = re.match("D", stateLine.group(1))
-            if distributingFlag:
-                remotePort['distributingFlag'] = True
-            else:
-                remotePort['distributingFlag'] = False
-
-            aggregableFlag = re.match("F", stateLine.group(1))
-            if aggregableFlag:
-                remotePort['aggregableFlag'] = True
-            else:
-                remotePort['aggregableFlag'] = False
-
-            inSyncFlag = re.match("N", stateLine.group(1))
-            if inSyncFlag:
-                remotePort['inSyncFlag'] = True
-            else:
-                remotePort['inSyncFlag'] = False
-
-            neighborStateFlag = re.match("E", stateLine.group(1))
-            if neighborStateFlag:
-                remotePort['neighborStateFlag'] = True
-            else:
-                remotePort['neighborStateFlag'] = False
-
-            individualFlag = re.match("I", stateLine.group(1))
-            if individualFlag:
-                remotePort['individualFlag'] = True
-            else:
-                remotePort['individualFlag'] = False
-
-            outSyncFlag = re.match("O", stateLine.group(1))
-            if outSyncFlag:
-                remotePort['outSyncFlag'] = True
-            else:
-                remotePort['outSyncFlag'] = False
-
-        data['localPort'] = localPort
-        data['remotePort'] = remotePort
+    for (rule, fields) in lacpInterfaceParser.Parse(buffer=bufferString,
+                                                    separator="\r\n"):
+        if rule == "lagId":
+            localPort['lagId'] = fields[0]
+            remotePort['lagId'] = fields[0]
+        elif rule == "state":
+            localPort.update(ShowFlagsGet(value=fields[0],
+                                          flags=lacpStateFlags))
+            remotePort.update(ShowFlagsGet(value=fields[1],
+                                           flags=lacpStateFlags))
+        else:
+            localPort[rule] = fields[0]
+            remotePort[rule] = fields[1]
+
+    data['localPort'] = localPort
+    data['remotePort'] = remotePort
 
     # Return results
     bufferString = ""
@@ -26,6 +26,9 @@ def InterfaceStatisticsShow(**kwargs):
     :type  deviceObj : object
     :param interface : interface to configure
     :type  interface : integer
+    :param oneShot : True to run the show command with vtysh -c from the
+                     linux context
+    :type  oneShot : boolean
 
     :return: returnStruct Object
                  data:
@@ -39,6 +42,7 @@ def InterfaceStatisticsShow(**kwargs):
     # Params
     deviceObj = kwargs.get('deviceObj', None)
     interface = kwargs.get('interface', None)
+    oneShot = kwargs.get('oneShot', False)
 
     # Variables
     overallBuffer = []
@@ -57,43 +61,58 @@ def InterfaceStatisticsShow(**kwargs):
         returnCls = opstestfw.returnStruct(returnCode=1)
         return returnCls
 
-    # Get into vtyshelll
-    returnStructure = deviceObj.VtyshShell(enter=True)
-    returnCode = returnStructure.returnCode()
-    overallBuffer.append(returnStructure.buffer())
-    if returnCode != 0:
-        opstestfw.LogOutput('error', "Failed to get vtysh prompt")
-        bufferString = ""
-        for curLine in overallBuffer:
-            bufferString += str(curLine)
-        returnCls = opstestfw.returnStruct(returnCode=1, buffer=bufferString)
-        return returnCls
-
-    # Send Command
     command = "show interface"
     if interface is not None:
         command += " " + str(interface)
-    opstestfw.LogOutput('info', "Show interface statistics.*****" + command)
-    returnDevInt = deviceObj.DeviceInteract(command=command)
-    retCode = returnDevInt['returnCode']
-    overallBuffer.append(returnDevInt['buffer'])
-    # temporaryBuffer = returnDevInt['buffer']
-
-    if retCode != 0:
-        opstestfw.LogOutput('error', "Failed to get information ." + command)
 
-    # Get out of the Shell
-    # Get out of vtyshell
-    returnStructure = deviceObj.VtyshShell(enter=False)
-    returnCode = returnStructure.returnCode()
-    overallBuffer.append(returnStructure.buffer())
-    if returnCode != 0:
-        opstestfw.LogOutput('error', "Failed to exit vtysh prompt")
-        bufferString = ""
-        for curLine in overallBuffer:
-            bufferString += str(curLine)
-        returnCls = opstestfw.returnStruct(returnCode=1, buffer=bufferString)
-        return returnCls
+    if oneShot is True:
+        opstestfw.LogOutput('info',
+                            "Show interface statistics.*****" + command)
+        returnDevInt = deviceObj.VtyshOneShot(commands=[command])
+        retCode = returnDevInt['returnCode']
+        overallBuffer.append(returnDevInt['buffer'])
+        if retCode != 0:
+            opstestfw.LogOutput('error',
+                                "Failed to get information ." + command)
+    else:
+        # Get into vtyshelll
+        returnStructure = deviceObj.VtyshShell(enter=True)
+        returnCode = returnStructure.returnCode()
+        overallBuffer.append(returnStructure.buffer())
+        if returnCode != 0:
+            opstestfw.LogOutput('error', "Failed to get vtysh prompt")
+            bufferString = ""
+            for curLine in overallBuffer:
+                bufferString += str(curLine)
+            returnCls = opstestfw.returnStruct(returnCode=1,
+                                               buffer=bufferString)
+            return returnCls
+
+        # Send Command
+        opstestfw.LogOutput('info',
+                            "Show interface statistics.*****" + command)
+        returnDevInt = deviceObj.DeviceInteract(command=command)
+        retCode = returnDevInt['returnCode']
+        overallBuffer.append(returnDevInt['buffer'])
+        # temporaryBuffer = returnDevInt['buffer']
+
+        if retCode != 0:
+            opstestfw.LogOutput('error',
+                                "Failed to get information ." + command)
+
+        # Get out of the Shell
+        # Get out of vtyshell
+        returnStructure = deviceObj.VtyshShell(enter=False)
+        returnCode = returnStructure.returnCode()
+        overallBuffer.append(returnStructure.buffer())
+        if returnCode != 0:
+            opstestfw.LogOutput('error', "Failed to exit vtysh prompt")
+            bufferString = ""
+            for curLine in overallBuffer:
+                bufferString += str(curLine)
+            returnCls = opstestfw.returnStruct(returnCode=1,
+                                               buffer=bufferString)
+            return returnCls
 
     # End Return Command
 
@@ -20,8 +20,7 @@
 from opstestfw import *
 from opstestfw.switch.CLI import *
 from opstestfw.switch.OVS import *
-from RouteUtilitiesShow import *
-import re
+from RouteTable import *
 
 
 def get_route_from_show_route(**kwargs):
@@ -40,6 +39,10 @@ def get_route_from_show_route(**kwargs):
     :type  route     : string
     :param routetype : Route type which can be "static/BGP"
     :type  routetype : string
+    :param routeTable: RouteTable snapshot of "show ip route/show ipv6 route"
+                       to look the route up in instead of running the
+                       command, see RouteTableGet
+    :type  routeTable: object
     :return: returnStruct Object
             buffer
             data keys
@@ -63,9 +66,10 @@ def get_route_from_show_route(**kwargs):
     if_ipv4 = kwargs.get('if_ipv4', True)
     route = kwargs.get('route', None)
     routetype = kwargs.get('routetype', None)
+    routeTable = kwargs.get('routeTable', None)
 
     # If Device object is not passed, we need to error out
-    if deviceObj is None:
+    if deviceObj is None and routeTable is None:
         opstestfw.LogOutput('error',
                             "Need to pass switch device object deviceObj "
                             "to this routine")
@@ -86,6 +90,13 @@ def get_route_from_show_route(**kwargs):
         returnCls = opstestfw.returnStruct(returnCode=1)
         return returnCls
 
+    # Look the route up in the snapshot
+    if routeTable is not None:
+        returnCls = returnStruct(
+            returnCode=0,
+            data=routeTable.RouteGet(route=route, routeType=routetype))
+        return returnCls
+
     # Get into vtyshelll
     returnStructure = deviceObj.VtyshShell(enter=True)
     returnCode = returnStructure.returnCode()
@@ -129,41 +140,8 @@ def get_route_from_show_route(**kwargs):
 
     # Get the route and the next-hops for the 'routetype' from the
     # "show ip route/show ipv6 route".
-    route_output = get_route_and_nexthops_from_output(show_ip_route_output,
-                                                      route, routetype)
-
-    # Initialize the return route dictionary
-    RouteDict = dict()
-
-    # Add the prefix and the mask length of the route in the return
-    # dictionary
-    RouteDict['Route'] = route
-
-    lines = route_output.split('\n')
-
-    # Walk through all the lines of the route output for the route and
-    # populate the return route distionary
-    for line in lines:
-
-        # Match the route ("prefix/mask-length") against the regular expression
-        routeline = re.match("(%s)(,  )(\d+)( unicast next-hops)" %(route),
-                             line)
-
-        # The output line matches the route, then populate the route and number
-        # of next-hops in the return route dictionary
-        if routeline:
-            RouteDict['Route'] = routeline.group(1)
-            RouteDict['NumberNexthops'] = routeline.group(3)
-
-        # Match the next-hop lines against the regular expression and populate
-        # the next-hop dictionary with distance, metric and routetype
-        nexthopline = re.match("(.+)via  ([0-9.:]+),  \[(\d+)/(\d+)\],  (.+)",
-                               line)
-        if nexthopline:
-            RouteDict[nexthopline.group(2)] = dict()
-            RouteDict[nexthopline.group(2)]['Distance'] = nexthopline.group(3)
-            RouteDict[nexthopline.group(2)]['Metric'] = nexthopline.group(4)
-            RouteDict[nexthopline.group(2)]['RouteType'] = nexthopline.group(5).rstrip('\r')
+    RouteDict = RouteTable(buffer=show_ip_route_output).RouteGet(
+        route=route, routeType=routetype)
 
     # Return results in the form of the structure 'returnCls'
     bufferString = ""
@@ -177,7 +155,7 @@ def get_route_from_show_route(**kwargs):
 
 
 def verify_route_in_show_route(switch, if_ipv4, ExpRouteDictStaticRoute,
-                               RouteType):
+                               RouteType, routeTable=None):
     """
     Library function tests whether a route ("prefix/mask-length") in the
     command "show ip route/show ipv6 route" exactly matches an expected route
@@ -195,6 +173,9 @@ def verify_route_in_show_route(switch, if_ipv4, ExpRouteDictStaticRoute,
     :type  ExpRouteDictStaticRoute: dictionary
     :param routetype : Route type which can be "static/BGP"
     :type  routetype : string
+    :param routeTable : RouteTable snapshot of the route table to check
+                        instead of running the command
+    :type  routeTable : object
     """
 
     LogOutput('info', "\nCheck ipv4 route table for "
@@ -202,7 +183,8 @@ def verify_route_in_show_route(switch, if_ipv4, ExpRouteDictStaticRoute,
 
     # Get the actual route dictionary for the route
     retStruct = get_route_from_show_route(deviceObj=switch, if_ipv4=if_ipv4, route=ExpRouteDictStaticRoute['Route'],
-                                          routetype=RouteType)
+                                          routetype=RouteType,
+                                          routeTable=routeTable)
 
     # If there was error getting the actual route dictionary, then assert and
     # fail the test case
@@ -220,3 +202,59 @@ def verify_route_in_show_route(switch, if_ipv4, ExpRouteDictStaticRoute,
 
     # Assert if the two route dictionaries are not equal
     assert cmp(ExpRouteDictStaticRoute, ActualRouteDictStaticRoute) == 0, "Verfication failed for the route " + ExpRouteDictStaticRoute['Route']
+
+
+def verify_routes_in_show_route(switch, if_ipv4, ExpRouteDicts, RouteType,
+                                routeTable=None, exact=False):
+    """
+    Library function tests a whole set of routes against the command
+    "show ip route/show ipv6 route" out of a single dump of it.  A route
+    dictionary with only the Route key expects the route to be absent.  The
+    test case fails by calling assert() if a route is missing, present or has
+    other next-hops than expected.
+
+    :param deviceObj : Device object
+    :type  deviceObj : object
+    :param if_ipv4   : If the routes are IPv4 or IPv6 routes
+    :type  if_ipv4   : boolean
+    :param ExpRouteDicts : List of expected route dictionaries
+    :type  ExpRouteDicts : list
+    :param routetype : Route type which can be "static/BGP"
+    :type  routetype : string
+    :param routeTable : RouteTable snapshot of the route table to check
+                        instead of running the command
+    :type  routeTable : object
+    :param exact : Also fail if the route table has routes of the route type
+                   that are not in the list
+    :type  exact : boolean
+    """
+
+    if if_ipv4 is True:
+        command = "show ip route"
+    else:
+        command = "show ipv6 route"
+
+    LogOutput('info', "\nCheck " + command + " for "
+              + str(len(ExpRouteDicts)) + " routes")
+
+    # Take a single snapshot of the route table
+    if routeTable is None:
+        retStruct = RouteTableGet(deviceObj=switch, command=command)
+        assert retStruct.returnCode() == 0, "Failed to get the route table"
+        routeTable = retStruct.data
+
+    result = routeTable.Verify(expected=ExpRouteDicts, routeType=RouteType)
+    for (ExpRouteDict, ActualRouteDict) in result['wrongNexthops']:
+        LogOutput('info', "\nThe expected route dictionary is: "
+                  + str(ExpRouteDict))
+        LogOutput('info', "\nThe actual route dictionary is: "
+                  + str(ActualRouteDict))
+    LogOutput('info', "\nMissing routes: " + str(result['missing'])
+              + "\nRoutes expected to be absent: " + str(result['present'])
+              + "\nRoutes not listed: " + str(result['extra']))
+
+    assert len(result['missing']) == 0, "Routes missing from the route table " + str(result['missing'])
+    assert len(result['present']) == 0, "Routes not removed from the route table " + str(result['present'])
+    assert len(result['wrongNexthops']) == 0, "Verfication failed for the routes " + str([curRoute[0]['Route'] for curRoute in result['wrongNexthops']])
+    if exact is True:
+        assert len(result['extra']) == 0, "Unexpected routes in the route table " + str(result['extra'])
@@ -20,8 +20,7 @@
 from opstestfw import *
 from opstestfw.switch.CLI import *
 from opstestfw.switch.OVS import *
-from RouteUtilitiesShow import *
-import re
+from RouteTable import *
 
 
 def get_route_from_show_rib(**kwargs):
@@ -36,6 +35,12 @@ def get_route_from_show_rib(**kwargs):
     :type  route     : string
     :param routetype : Route type which can be "static/BGP"
     :type  routetype : string
+    :param oneShot   : True to run "show rib" with vtysh -c from the linux
+                       context
+    :type  oneShot   : boolean
+    :param routeTable: RouteTable snapshot of "show rib" to look the route up
+                       in instead of running the command, see RouteTableGet
+    :type  routeTable: object
     :return: returnStruct Object
             buffer
             data keys
@@ -59,9 +64,11 @@ def get_route_from_show_rib(**kwargs):
     deviceObj = kwargs.get('deviceObj', None)
     route = kwargs.get('route', None)
     routetype = kwargs.get('routetype', None)
+    oneShot = kwargs.get('oneShot', False)
+    routeTable = kwargs.get('routeTable', None)
 
     # If Device object is not passed, we need to error out
-    if deviceObj is None:
+    if deviceObj is None and routeTable is None:
         opstestfw.LogOutput('error',
                             "Need to pass switch device object deviceObj "
                             "to this routine")
@@ -82,80 +89,69 @@ def get_route_from_show_rib(**kwargs):
         returnCls = opstestfw.returnStruct(returnCode=1)
         return returnCls
 
-    # Get into vtyshelll
-    returnStructure = deviceObj.VtyshShell(enter=True)
-    returnCode = returnStructure.returnCode()
-    overallBuffer.append(returnStructure.buffer())
-    if returnCode != 0:
-        opstestfw.LogOutput('error', "Failed to get vtysh prompt")
-        bufferString = ""
-        for curLine in overallBuffer:
-            bufferString += str(curLine)
-        returnCls = opstestfw.returnStruct(returnCode=1, buffer=bufferString)
+    # Look the route up in the snapshot
+    if routeTable is not None:
+        returnCls = returnStruct(
+            returnCode=0,
+            data=routeTable.RouteGet(route=route, routeType=routetype))
         return returnCls
 
     # Command to get the dump of "show rib"
     command = "show rib"
 
-    # Execute the command in the vtyshell
-    returnDevInt = deviceObj.DeviceInteract(command=command)
-    retCode = returnDevInt['returnCode']
-    overallBuffer.append(returnDevInt['buffer'])
-    show_rib_output = returnDevInt['buffer']
-    if retCode != 0:
-        opstestfw.LogOutput('error', "No route in route table" + command)
+    if oneShot is True:
+        # Execute the command from the linux context
+        returnDevInt = deviceObj.VtyshOneShot(commands=[command])
+        retCode = returnDevInt['returnCode']
+        overallBuffer.append(returnDevInt['buffer'])
+        show_rib_output = returnDevInt['buffer']
+        if retCode != 0:
+            opstestfw.LogOutput('error', "No route in route table" + command)
+        else:
+            opstestfw.LogOutput('debug',
+                                "Found routes in route table" + command)
     else:
-        opstestfw.LogOutput('debug', "Found routes in route table" + command)
-
-    # Get out of vtyshell
-    returnStructure = deviceObj.VtyshShell(enter=False)
-    returnCode = returnStructure.returnCode()
-    overallBuffer.append(returnStructure.buffer())
-    if returnCode != 0:
-        opstestfw.LogOutput('error', "Failed to exit vtysh prompt")
-        bufferString = ""
-        for curLine in overallBuffer:
-            bufferString += str(curLine)
-        returnCls = opstestfw.returnStruct(returnCode=1, buffer=bufferString)
-        return returnCls
+        # Get into vtyshelll
+        returnStructure = deviceObj.VtyshShell(enter=True)
+        returnCode = returnStructure.returnCode()
+        overallBuffer.append(returnStructure.buffer())
+        if returnCode != 0:
+            opstestfw.LogOutput('error', "Failed to get vtysh prompt")
+            bufferString = ""
+            for curLine in overallBuffer:
+                bufferString += str(curLine)
+            returnCls = opstestfw.returnStruct(returnCode=1,
+                                               buffer=bufferString)
+            return returnCls
+
+        # Execute the command in the vtyshell
+        returnDevInt = deviceObj.DeviceInteract(command=command)
+        retCode = returnDevInt['returnCode']
+        overallBuffer.append(returnDevInt['buffer'])
+        show_rib_output = returnDevInt['buffer']
+        if retCode != 0:
+            opstestfw.LogOutput('error', "No route in route table" + command)
+        else:
+            opstestfw.LogOutput('debug',
+                                "Found routes in route table" + command)
+
+        # Get out of vtyshell
+        returnStructure = deviceObj.VtyshShell(enter=False)
+        returnCode = returnStructure.returnCode()
+        overallBuffer.append(returnStructure.buffer())
+        if returnCode != 0:
+            opstestfw.LogOutput('error', "Failed to exit vtysh prompt")
+            bufferString = ""
+            for curLine in overallBuffer:
+                bufferString += str(curLine)
+            returnCls = opstestfw.returnStruct(returnCode=1,
+                                               buffer=bufferString)
+            return returnCls
 
     # Get the route and the next-hops for the 'routetype' from the
     # "show rib".
-    route_output = get_route_and_nexthops_from_output(show_rib_output, route,
-                                                      routetype)
-
-    # Initialize the return route dictionary
-    RouteDict = dict()
-
-    # Add the prefix and the mask length of the route in the return
-    # dictionary
-    RouteDict['Route'] = route
-
-    lines = route_output.split('\n')
-
-    # Walk through all the lines of the route output for the route and
-    # populate the return route distionary
-    for line in lines:
-
-        # Match the route ("prefix/mask-length") against the regular expression
-        routeline = re.match("(.*)(%s)(,  )(\d+)( unicast next-hops)" %(route),
-                             line)
-
-        # The output line matches the route, then populate the route and number
-        # of next-hops in the return route dictionary
-        if routeline:
-            RouteDict['Route'] = routeline.group(2)
-            RouteDict['NumberNexthops'] = routeline.group(4)
-
-        # Match the next-hop lines against the regular expression and populate
-        # the next-hop dictionary with distance, metric and routetype
-        nexthopline = re.match("(.+)via  ([0-9.:]+),  \[(\d+)/(\d+)\],  (.+)",
-                               line)
-        if nexthopline:
-            RouteDict[nexthopline.group(2)] = dict()
-            RouteDict[nexthopline.group(2)]['Distance'] = nexthopline.group(3)
-            RouteDict[nexthopline.group(2)]['Metric'] = nexthopline.group(4)
-            RouteDict[nexthopline.group(2)]['RouteType'] = nexthopline.group(5).rstrip('\r')
+    RouteDict = RouteTable(buffer=show_rib_output).RouteGet(
+        route=route, routeType=routetype)
 
     # Return results in the form of the structure 'returnCls'
     bufferString = ""
@@ -168,7 +164,8 @@ def get_route_from_show_rib(**kwargs):
     return returnCls
 
 
-def verify_route_in_show_rib(switch, ExpRouteDictStaticRoute, RouteType):
+def verify_route_in_show_rib(switch, ExpRouteDictStaticRoute, RouteType,
+                             oneShot=False, routeTable=None):
 
     """
     Library function tests whether a route ("prefix/mask-length") in the
@@ -183,6 +180,11 @@ def verify_route_in_show_rib(switch, ExpRouteDictStaticRoute, RouteType):
     :type  ExpRouteDictStaticRoute: dictionary
     :param routetype : Route type which can be "static/BGP"
     :type  routetype : string
+    :param oneShot : True to read "show rib" with vtysh -c
+    :type  oneShot : boolean
+    :param routeTable : RouteTable snapshot of "show rib" to check instead of
+                        running the command
+    :type  routeTable : object
     """
 
     LogOutput('info', "\nCheck rib for route "
@@ -190,7 +192,9 @@ def verify_route_in_show_rib(switch, ExpRouteDictStaticRoute, RouteType):
 
     # Get the actual route dictionary for the route
     retStruct = get_route_from_show_rib(deviceObj=switch, route=ExpRouteDictStaticRoute['Route'],
-                                        routetype=RouteType)
+                                        routetype=RouteType,
+                                        oneShot=oneShot,
+                                        routeTable=routeTable)
 
     # If there was error getting the actual route dictionary, then assert and
     # fail the test case
@@ -208,3 +212,56 @@ def verify_route_in_show_rib(switch, ExpRouteDictStaticRoute, RouteType):
 
     # Assert if the two route dictionaries are not equal
     assert cmp(ExpRouteDictStaticRoute, ActualRouteDictStaticRoute) == 0, "Verfication failed for the route " + ExpRouteDictStaticRoute['Route']
+
+
+def verify_routes_in_show_rib(switch, ExpRouteDicts, RouteType,
+                              oneShot=False, routeTable=None, exact=False):
+
+    """
+    Library function tests a whole set of routes against the command
+    "show rib" out of a single dump of it.  A route dictionary with only the
+    Route key expects the route to be absent.  The test case fails by calling
+    assert() if a route is missing, present or has other next-hops than
+    expected.
+
+    :param deviceObj : Device object
+    :type  deviceObj : object
+    :param ExpRouteDicts : List of expected route dictionaries
+    :type  ExpRouteDicts : list
+    :param routetype : Route type which can be "static/BGP"
+    :type  routetype : string
+    :param oneShot : True to read "show rib" with vtysh -c
+    :type  oneShot : boolean
+    :param routeTable : RouteTable snapshot of "show rib" to check instead of
+                        running the command
+    :type  routeTable : object
+    :param exact : Also fail if "show rib" has routes of the route type that
+                   are not in the list
+    :type  exact : boolean
+    """
+
+    LogOutput('info', "\nCheck rib for " + str(len(ExpRouteDicts))
+              + " routes")
+
+    # Take a single snapshot of the rib
+    if routeTable is None:
+        retStruct = RouteTableGet(deviceObj=switch, command="show rib",
+                                  oneShot=oneShot)
+        assert retStruct.returnCode() == 0, "Failed to get the rib"
+        routeTable = retStruct.data
+
+    result = routeTable.Verify(expected=ExpRouteDicts, routeType=RouteType)
+    for (ExpRouteDict, ActualRouteDict) in result['wrongNexthops']:
+        LogOutput('info', "\nThe expected route dictionary is: "
+                  + str(ExpRouteDict))
+        LogOutput('info', "\nThe actual route dictionary is: "
+                  + str(ActualRouteDict))
+    LogOutput('info', "\nMissing routes: " + str(result['missing'])
+              + "\nRoutes expected to be absent: " + str(result['present'])
+              + "\nRoutes not listed: " + str(result['extra']))
+
+    assert len(result['missing']) == 0, "Routes missing from the rib " + str(result['missing'])
+    assert len(result['present']) == 0, "Routes not removed from the rib " + str(result['present'])
+    assert len(result['wrongNexthops']) == 0, "Verfication failed for the routes " + str([curRoute[0]['Route'] for curRoute in result['wrongNexthops']])
+    if exact is True:
+        assert len(result['extra']) == 0, "Unexpected routes in the rib " + str(result['extra'])
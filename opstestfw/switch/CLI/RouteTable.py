@@ -0,0 +1,347 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+import opstestfw
+import socket
+import struct
+from opstestfw.switch.ShowParser import *
+
+# Route and next-hop lines of show rib / show ip route / show ipv6 route
+routeTableParser = ShowParser(
+    rules=[("route",
+            "^\s*\*?\s*([0-9a-fA-F.:]+/\d+),\s+(\d+) unicast next-hops"),
+           ("nexthop",
+            "^\s*(\*?)\s*via\s+([0-9a-fA-F.:]+),\s+\[(\d+)/(\d+)\],"
+            "\s+(.+?)\s*$")])
+
+
+def RoutePrefixKey(**kwargs):
+    """
+    Library routine to turn a prefix into the key of the route table trie
+
+    :param route: "prefix/masklen" or an address, an address is a host
+                  route
+    :type route: string
+    :return: (family, value, length, width) - family 4 or 6, the address
+             as an integer, the mask length and the address width in bits,
+             None if the prefix does not parse
+    :rtype: tuple
+    """
+    route = kwargs.get('route')
+    if "/" in route:
+        (address, length) = route.split("/", 1)
+    else:
+        (address, length) = (route, None)
+    try:
+        if ":" in address:
+            (high, low) = struct.unpack(
+                "!QQ", socket.inet_pton(socket.AF_INET6, address))
+            (family, value, width) = (6, (high << 64) | low, 128)
+        else:
+            value = struct.unpack("!I", socket.inet_aton(address))[0]
+            (family, width) = (4, 32)
+        if length is None:
+            length = width
+        length = int(length)
+    except (socket.error, ValueError, struct.error):
+        return None
+    if length < 0 or length > width:
+        return None
+    return (family, value, length, width)
+
+
+class RouteTable(object):
+    """
+    RouteTable Class definition
+
+    Routes of a show rib / show ip route output, parsed once.  The routes
+    are kept by their prefix string for exact lookups and in a binary
+    prefix trie per address family for longest prefix match.  A trie node
+    is a [zero child, one child, route] list.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        RouteTable init method
+
+        :param buffer: show rib, show ip route or show ipv6 route output
+        :type buffer: string
+        """
+        # prefix string -> dict with Route, NumberNexthops and Nexthops,
+        # next-hop -> dict with Distance, Metric, RouteType and Selected
+        self.routes = dict()
+        self.routeOrder = []
+        self.tries = {4: [None, None, None], 6: [None, None, None]}
+        self.Parse(buffer=kwargs.get('buffer', ""))
+
+    def Parse(self, **kwargs):
+        """
+        Parse method
+
+        :param buffer: show command output
+        :type buffer: string
+        """
+        buffer = kwargs.get('buffer', "")
+        curRoute = None
+        for (rule, fields) in routeTableParser.Parse(buffer=buffer):
+            if rule == "route":
+                curRoute = self.RouteAdd(route=fields[0],
+                                         numberNexthops=fields[1])
+            elif curRoute is not None:
+                curRoute['Nexthops'][fields[1]] = dict(
+                    Distance=fields[2], Metric=fields[3],
+                    RouteType=fields[4], Selected=fields[0] == "*")
+
+    def RouteAdd(self, **kwargs):
+        """
+        RouteAdd method
+
+        :param route: "prefix/masklen"
+        :type route: string
+        :param numberNexthops: number of next-hops shown for the route
+        :type numberNexthops: string
+        :return: the route entry, next-hops are added to its Nexthops
+        :rtype: dictionary
+        """
+        route = kwargs.get('route')
+        if route in self.routes:
+            return self.routes[route]
+        entry = dict(Route=route,
+                     NumberNexthops=kwargs.get('numberNexthops'),
+                     Nexthops=dict())
+        self.routes[route] = entry
+        self.routeOrder.append(route)
+        prefixKey = RoutePrefixKey(route=route)
+        if prefixKey is None:
+            return entry
+        (family, value, length, width) = prefixKey
+        node = self.tries[family]
+        for bit in range(0, length):
+            branch = (value >> (width - 1 - bit)) & 1
+            if node[branch] is None:
+                node[branch] = [None, None, None]
+            node = node[branch]
+        node[2] = entry
+        return entry
+
+    def Routes(self):
+        """
+        Routes method
+
+        :return: prefixes of the table, in output order
+        :rtype: list
+        """
+        return list(self.routeOrder)
+
+    def EntryGet(self, **kwargs):
+        """
+        EntryGet method
+
+        :param route: "prefix/masklen"
+        :type route: string
+        :return: route entry, None if the route is not in the table
+        :rtype: dictionary
+        """
+        route = kwargs.get('route')
+        if route in self.routes:
+            return self.routes[route]
+        # The prefix may be written differently, look it up in the trie
+        prefixKey = RoutePrefixKey(route=route)
+        if prefixKey is None:
+            return None
+        (family, value, length, width) = prefixKey
+        node = self.tries[family]
+        for bit in range(0, length):
+            node = node[(value >> (width - 1 - bit)) & 1]
+            if node is None:
+                return None
+        return node[2]
+
+    def RouteGet(self, **kwargs):
+        """
+        RouteGet method
+
+        :param route: "prefix/masklen"
+        :type route: string
+        :param routeType: only return the next-hops of this route type,
+                          such as "static" or "BGP"
+        :type routeType: string
+        :return: route dictionary in the get_route_from_show_rib format -
+                 Route, NumberNexthops and a Distance / Metric / RouteType
+                 dictionary per next-hop.  Only Route is set when the route
+                 has no next-hop of the route type.
+        :rtype: dictionary
+        """
+        route = kwargs.get('route')
+        routeType = kwargs.get('routeType', None)
+        RouteDict = dict()
+        RouteDict['Route'] = route
+        entry = self.EntryGet(route=route)
+        if entry is None:
+            return RouteDict
+        for (nexthop, nexthopInfo) in entry['Nexthops'].items():
+            if routeType is not None \
+                    and routeType not in nexthopInfo['RouteType']:
+                continue
+            RouteDict[nexthop] = dict()
+            RouteDict[nexthop]['Distance'] = nexthopInfo['Distance']
+            RouteDict[nexthop]['Metric'] = nexthopInfo['Metric']
+            RouteDict[nexthop]['RouteType'] = nexthopInfo['RouteType']
+        if len(RouteDict) != 1:
+            RouteDict['Route'] = entry['Route']
+            RouteDict['NumberNexthops'] = entry['NumberNexthops']
+        return RouteDict
+
+    def LongestPrefixMatch(self, **kwargs):
+        """
+        LongestPrefixMatch method
+
+        :param address: IPv4 or IPv6 address
+        :type address: string
+        :return: entry of the most specific route covering the address, None
+                 if no route covers it
+        :rtype: dictionary
+        """
+        prefixKey = RoutePrefixKey(route=kwargs.get('address'))
+        if prefixKey is None:
+            return None
+        (family, value, length, width) = prefixKey
+        node = self.tries[family]
+        bestEntry = node[2]
+        for bit in range(0, width):
+            node = node[(value >> (width - 1 - bit)) & 1]
+            if node is None:
+                break
+            if node[2] is not None:
+                bestEntry = node[2]
+        return bestEntry
+
+    def Verify(self, **kwargs):
+        """
+        Verify method
+
+        Compares the table with a whole set of expected routes in one go.
+
+        :param expected: list of expected route dictionaries in the
+                         RouteGet format.  A dictionary with only Route set
+                         expects the route to be absent.
+        :type expected: list
+        :param routeType: route type of the next-hops to compare
+        :type routeType: string
+        :return: dictionary with missing, the expected routes not in the
+                 table, present, the routes expected to be absent that are
+                 in the table, wrongNexthops, (expected, actual) route
+                 dictionaries of the routes whose next-hops differ, and
+                 extra, the routes in the table that were not listed
+        :rtype: dictionary
+        """
+        expected = kwargs.get('expected', [])
+        routeType = kwargs.get('routeType', None)
+        result = dict(missing=[], present=[], wrongNexthops=[], extra=[])
+        expectedEntries = set()
+        for curExpected in expected:
+            actual = self.RouteGet(route=curExpected['Route'],
+                                   routeType=routeType)
+            entry = self.EntryGet(route=curExpected['Route'])
+            if entry is not None:
+                expectedEntries.add(entry['Route'])
+            if len(curExpected) == 1:
+                # Expected to be absent
+                if len(actual) != 1:
+                    result['present'].append(actual['Route'])
+            elif len(actual) == 1:
+                result['missing'].append(curExpected['Route'])
+            elif actual != curExpected:
+                result['wrongNexthops'].append((curExpected, actual))
+        for curRoute in self.routeOrder:
+            if curRoute in expectedEntries:
+                continue
+            if len(self.RouteGet(route=curRoute, routeType=routeType)) != 1:
+                result['extra'].append(curRoute)
+        return result
+
+
+def RouteTableGet(**kwargs):
+    """
+    Library function to take a parsed snapshot of the route table
+
+    :param deviceObj : Device object
+    :type  deviceObj : object
+    :param command   : "show rib", "show ip route" or "show ipv6 route"
+    :type  command   : string
+    :param oneShot   : True to run the command with vtysh -c from the linux
+                       context
+    :type  oneShot   : boolean
+    :return: returnStruct Object
+            buffer
+            data - RouteTable object
+    :returnType: object
+    """
+    deviceObj = kwargs.get('deviceObj', None)
+    command = kwargs.get('command', "show rib")
+    oneShot = kwargs.get('oneShot', False)
+
+    # If Device object is not passed, we need to error out
+    if deviceObj is None:
+        opstestfw.LogOutput('error',
+                            "Need to pass switch device object deviceObj "
+                            "to this routine")
+        returnCls = opstestfw.returnStruct(returnCode=1)
+        return returnCls
+
+    overallBuffer = []
+    if oneShot is True:
+        returnDevInt = deviceObj.VtyshOneShot(commands=[command])
+        overallBuffer.append(returnDevInt['buffer'])
+        showOutput = returnDevInt['buffer']
+    else:
+        # Get into vtyshelll
+        returnStructure = deviceObj.VtyshShell(enter=True)
+        overallBuffer.append(returnStructure.buffer())
+        if returnStructure.returnCode() != 0:
+            opstestfw.LogOutput('error', "Failed to get vtysh prompt")
+            returnCls = opstestfw.returnStruct(
+                returnCode=1, buffer="".join(map(str, overallBuffer)))
+            return returnCls
+
+        returnDevInt = deviceObj.DeviceInteract(command=command)
+        overallBuffer.append(returnDevInt['buffer'])
+        showOutput = returnDevInt['buffer']
+
+        # Get out of vtyshell
+        returnStructure = deviceObj.VtyshShell(enter=False)
+        overallBuffer.append(returnStructure.buffer())
+        if returnStructure.returnCode() != 0:
+            opstestfw.LogOutput('error', "Failed to exit vtysh prompt")
+            returnCls = opstestfw.returnStruct(
+                returnCode=1, buffer="".join(map(str, overallBuffer)))
+            return returnCls
+
+    if returnDevInt['returnCode'] != 0:
+        opstestfw.LogOutput('error', "Failed to get the route table: "
+                            + command)
+        returnCls = opstestfw.returnStruct(
+            returnCode=returnDevInt['returnCode'],
+            buffer="".join(map(str, overallBuffer)))
+        return returnCls
+
+    routeTable = RouteTable(buffer=showOutput)
+    opstestfw.LogOutput('debug', "Parsed %d routes out of %s"
+                        % (len(routeTable.routeOrder), command))
+    returnCls = opstestfw.returnStruct(returnCode=0,
+                                       buffer="".join(map(str, overallBuffer)),
+                                       data=routeTable)
+    return returnCls
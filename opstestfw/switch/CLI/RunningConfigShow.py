@@ -20,6 +20,7 @@
 from opstestfw import *
 from opstestfw.switch.CLI import *
 from opstestfw.switch.OVS import *
+from RunningConfigTree import RunningConfigTreeGet
 
 IPV4_STATIC_ROUTE = "ipv4_static_route"
 IPV6_STATIC_ROUTE = "ipv6_static_route"
@@ -49,15 +50,19 @@ def if_config_in_running_config(**kwargs):
     :type nexthop    : string
     :param distance  : Administration distance of the route
     :type distance   : string
+    :param runningConfig : RunningConfigTree snapshot to look in instead of
+                           fetching "show running-config" from the device
+    :type runningConfig  : object
     :returnType: Boolean
     """
 
     deviceObj = kwargs.get('deviceObj', None)
     configtype = kwargs.get('configtype', None)
+    runningConfig = kwargs.get('runningConfig', None)
     running_config_string = ''
 
     # If Device object is not passed, we need to error out and return 'False'
-    if deviceObj is None:
+    if deviceObj is None and runningConfig is None:
         opstestfw.LogOutput('error',
                             "Need to pass switch device object deviceObj "
                             "to this routine")
@@ -111,46 +116,16 @@ def if_config_in_running_config(**kwargs):
                 running_config_string = 'ipv6 route ' + route + ' ' + \
                                         nexthop + ' ' + distance
 
-    # Get into vtyshelll
-    returnStructure = deviceObj.VtyshShell(enter=True)
-    returnCode = returnStructure.returnCode()
-    if returnCode != 0:
-        opstestfw.LogOutput('error', "Failed to get vtysh prompt")
-        return False
-
-    # The command in whose output we need to check the presence of
-    # configuration
-    command = "show running-config"
-
-    # Execute the command in the vtyshell
-    returnDevInt = deviceObj.DeviceInteract(command=command)
-    retCode = returnDevInt['returnCode']
-    show_running_config = returnDevInt['buffer']
-    if retCode != 0:
-        opstestfw.LogOutput('error', "No running config on the device"
-                            + command)
-    else:
-        opstestfw.LogOutput('debug', "Found running config on the device"
-                            + command)
-
-    # Get out of vtyshell
-    returnStructure = deviceObj.VtyshShell(enter=False)
-    returnCode = returnStructure.returnCode()
-    if returnCode != 0:
-        opstestfw.LogOutput('error', "Failed to exit vtysh prompt")
-        return False
-
-    # Split the output of "show running-config" into lines
-    show_running_config_lines = show_running_config.split('\n')
-
-    # Walk through all the lines of "show running-config" and check if the
-    # configuration exists in one of the lines
-    for line in show_running_config_lines:
+    if runningConfig is None:
+        returnStructure = RunningConfigTreeGet(deviceObj=deviceObj)
+        if returnStructure.returnCode() != 0:
+            return False
+        runningConfig = returnStructure.valueGet()
 
-        # If the configuration exists in the "show running-config" output,
-        # then return 'True'
-        if running_config_string in line:
-            return True
+    # The configuration exists if a command starts with the words of the
+    # configuration string
+    if len(runningConfig.CommandsMatch(prefix=running_config_string)) != 0:
+        return True
 
     # If the configuration does not exists in the "show running-config" output,
     # then return 'False'
@@ -178,6 +153,9 @@ def verify_route_and_nexthop_in_show_running_config(**kwargs):
     :type nexthop    : string
     :param distance  : Administration distance of the route
     :type distance   : string
+    :param runningConfig : RunningConfigTree snapshot to check instead of
+                           fetching "show running-config"
+    :type runningConfig  : object
     """
 
     deviceObj = kwargs.get('deviceObj', None)
@@ -185,6 +163,7 @@ def verify_route_and_nexthop_in_show_running_config(**kwargs):
     route = kwargs.get('route', None)
     nexthop = kwargs.get('nexthop', None)
     distance = kwargs.get('distance', None)
+    runningConfig = kwargs.get('runningConfig', None)
 
     if distance is None:
         LogOutput('info', "\nCheck presence in running-config static route "
@@ -202,13 +181,15 @@ def verify_route_and_nexthop_in_show_running_config(**kwargs):
                                            configtype=IPV4_STATIC_ROUTE,
                                            route=route,
                                            nexthop=nexthop,
-                                           distance=distance)
+                                           distance=distance,
+                                           runningConfig=runningConfig)
     else:
         assert if_config_in_running_config(deviceObj=deviceObj,
                                            configtype=IPV6_STATIC_ROUTE,
                                            route=route,
                                            nexthop=nexthop,
-                                           distance=distance)
+                                           distance=distance,
+                                           runningConfig=runningConfig)
 
 
 def verify_route_and_nexthop_not_in_show_running_config(**kwargs):
@@ -232,12 +213,16 @@ def verify_route_and_nexthop_not_in_show_running_config(**kwargs):
     :type nexthop    : string
     :param distance  : Administration distance of the route
     :type distance   : string
+    :param runningConfig : RunningConfigTree snapshot to check instead of
+                           fetching "show running-config"
+    :type runningConfig  : object
     """
     deviceObj = kwargs.get('deviceObj', None)
     if_ipv4 = kwargs.get('if_ipv4', None)
     route = kwargs.get('route', None)
     nexthop = kwargs.get('nexthop', None)
     distance = kwargs.get('distance', None)
+    runningConfig = kwargs.get('runningConfig', None)
 
     if distance is None:
         LogOutput('info', "\nCheck absence in running-config static route "
@@ -255,10 +240,12 @@ def verify_route_and_nexthop_not_in_show_running_config(**kwargs):
                                                configtype=IPV4_STATIC_ROUTE,
                                                route=route,
                                                nexthop=nexthop,
-                                               distance=distance)
+                                               distance=distance,
+                                               runningConfig=runningConfig)
     else:
         assert not if_config_in_running_config(deviceObj=deviceObj,
                                                configtype=IPV6_STATIC_ROUTE,
                                                route=route,
                                                nexthop=nexthop,
-                                               distance=distance)
+                                               distance=distance,
+                                               runningConfig=runningConfig)
@@ -0,0 +1,269 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+import opstestfw
+import re
+from collections import OrderedDict
+from showRun import showRun
+
+# Lines of the show running-config buffer that are not configuration - the
+# command echoes, the vtysh or shell prompts and the header
+runningConfigNoise = re.compile("^(\S+#|\S*root@\S+#|vtysh$"
+                                "|.*show running-config"
+                                "|Current configuration:)")
+
+# Global commands that open a context even when it holds no commands
+runningConfigContextWords = ["interface", "vlan", "router"]
+
+
+class RunningConfigTree(object):
+    """
+    RunningConfigTree Class definition
+
+    Parsed show running-config output.  Every command is filed under the
+    context it was entered in.  A context is the tuple of the context lines
+    leading to it, for instance ("interface 1",) or ("router bgp 1",
+    "address-family ipv6 unicast"), and the global context is ().  Context
+    arguments may also be given as a single context line string.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        RunningConfigTree init method
+
+        :param buffer: show running-config output
+        :type buffer: string
+        """
+        # context -> ordered list of commands
+        self.contexts = OrderedDict()
+        self.contexts[()] = []
+        # context -> set of commands, for membership tests
+        self.commandSets = dict()
+        self.commandSets[()] = set()
+        # first word of a command -> list of (context, command)
+        self.firstWordIndex = dict()
+        self.Parse(buffer=kwargs.get('buffer', ""))
+
+    def Parse(self, **kwargs):
+        """
+        Parse method
+
+        Builds the context tree out of the indentation of the output.
+
+        :param buffer: show running-config output
+        :type buffer: string
+        """
+        buffer = kwargs.get('buffer', "")
+        # (indent, context) of the open contexts, innermost last
+        openContexts = [(-1, ())]
+        lastLine = None
+        for curLine in buffer.replace("\r", "").split("\n"):
+            command = curLine.strip()
+            if command == "" or command == "!" \
+                    or runningConfigNoise.match(command):
+                continue
+            indent = len(curLine) - len(curLine.lstrip())
+            if lastLine is not None and indent > lastLine[0]:
+                # The previous line opened a context
+                (lastIndent, lastContext, lastCommand) = lastLine
+                openContexts.append((lastIndent, lastContext + (lastCommand,)))
+                self.ContextAdd(context=openContexts[-1][1])
+            while openContexts[-1][0] >= indent:
+                openContexts.pop()
+            if command.startswith("exit"):
+                lastLine = None
+                continue
+            context = openContexts[-1][1]
+            self.CommandAdd(context=context, command=command)
+            lastLine = (indent, context, command)
+
+    def CommandAdd(self, **kwargs):
+        """
+        CommandAdd method
+
+        :param context: context of the command
+        :type context: tuple
+        :param command: command line
+        :type command: string
+        """
+        context = kwargs.get('context')
+        command = " ".join(kwargs.get('command').split())
+        if command in self.commandSets[context]:
+            return
+        self.contexts[context].append(command)
+        self.commandSets[context].add(command)
+        self.firstWordIndex.setdefault(command.split()[0], []).append(
+            (context, command))
+        if context == () and command.split()[0] in runningConfigContextWords:
+            self.ContextAdd(context=(command,))
+
+    def ContextAdd(self, **kwargs):
+        """
+        ContextAdd method
+
+        :param context: context to add if it is not there yet
+        :type context: tuple
+        """
+        context = kwargs.get('context')
+        if context not in self.contexts:
+            self.contexts[context] = []
+            self.commandSets[context] = set()
+
+    def ContextKey(self, context):
+        """
+        ContextKey method
+
+        :param context: context tuple, context line string or None for the
+                        global context
+        :return: context tuple
+        :rtype: tuple
+        """
+        if context is None:
+            return ()
+        if isinstance(context, basestring):
+            return (" ".join(context.split()),)
+        return tuple(context)
+
+    def ContextsGet(self, **kwargs):
+        """
+        ContextsGet method
+
+        :param prefix: leading words of the context lines to return, for
+                       instance "interface", "interface lag", "vlan" or
+                       "router"
+        :type prefix: string
+        :return: list of the contexts whose last line starts with the
+                 prefix words, in output order
+        :rtype: list
+        """
+        prefixWords = kwargs.get('prefix', "").split()
+        return [curContext for curContext in self.contexts.keys()
+                if len(curContext) != 0
+                and curContext[-1].split()[:len(prefixWords)] == prefixWords]
+
+    def CommandsGet(self, **kwargs):
+        """
+        CommandsGet method
+
+        :param context: context, defaults to the global context
+        :type context: tuple
+        :return: list of the commands of the context, in output order.  The
+                 lines opening sub-contexts are included.
+        :rtype: list
+        """
+        context = self.ContextKey(kwargs.get('context', None))
+        return list(self.contexts.get(context, []))
+
+    def Contains(self, **kwargs):
+        """
+        Contains method
+
+        :param command: command line
+        :type command: string
+        :param context: context, defaults to the global context
+        :type context: tuple
+        :return: True if the context holds exactly this command
+        :rtype: boolean
+        """
+        command = " ".join(kwargs.get('command', "").split())
+        context = self.ContextKey(kwargs.get('context', None))
+        return command in self.commandSets.get(context, set())
+
+    def CommandsMatch(self, **kwargs):
+        """
+        CommandsMatch method
+
+        :param prefix: leading words of the commands to look for
+        :type prefix: string
+        :param context: context to look in, all contexts if not given
+        :type context: tuple
+        :return: list of (context, command) for the commands starting with
+                 the prefix words
+        :rtype: list
+        """
+        prefixWords = kwargs.get('prefix', "").split()
+        context = kwargs.get('context', None)
+        if len(prefixWords) == 0:
+            return []
+        if context is not None:
+            context = self.ContextKey(context)
+        matches = []
+        for (curContext, curCommand) in \
+                self.firstWordIndex.get(prefixWords[0], []):
+            if context is not None and curContext != context:
+                continue
+            if curCommand.split()[:len(prefixWords)] == prefixWords:
+                matches.append((curContext, curCommand))
+        return matches
+
+    def Diff(self, **kwargs):
+        """
+        Diff method
+
+        :param config: earlier snapshot to compare this one with
+        :type config: RunningConfigTree
+        :return: dictionary with the contextsAdded and contextsRemoved lists
+                 of contexts, and the commandsAdded and commandsRemoved lists
+                 of (context, command), going from config to this snapshot
+        :rtype: dictionary
+        """
+        config = kwargs.get('config')
+        diff = dict(contextsAdded=[], contextsRemoved=[],
+                    commandsAdded=[], commandsRemoved=[])
+        for (curContext, curCommands) in self.contexts.items():
+            oldSet = config.commandSets.get(curContext, None)
+            if oldSet is None:
+                diff['contextsAdded'].append(curContext)
+                oldSet = set()
+            for curCommand in curCommands:
+                if curCommand not in oldSet:
+                    diff['commandsAdded'].append((curContext, curCommand))
+        for (curContext, curCommands) in config.contexts.items():
+            newSet = self.commandSets.get(curContext, None)
+            if newSet is None:
+                diff['contextsRemoved'].append(curContext)
+                newSet = set()
+            for curCommand in curCommands:
+                if curCommand not in newSet:
+                    diff['commandsRemoved'].append((curContext, curCommand))
+        return diff
+
+
+def RunningConfigTreeGet(**kwargs):
+    """
+    Library function to take a parsed snapshot of the running configuration
+
+    :param deviceObj : Device object
+    :type  deviceObj : object
+    :param oneShot : True to run the show command with vtysh -c from the
+                     linux context
+    :type  oneShot : boolean
+    :return: returnStruct Object
+            buffer
+            data - RunningConfigTree object
+    :returnType: object
+    """
+    deviceObj = kwargs.get('deviceObj', None)
+    oneShot = kwargs.get('oneShot', False)
+
+    returnStructure = showRun(deviceObj=deviceObj, oneShot=oneShot)
+    if returnStructure.returnCode() != 0:
+        return returnStructure
+    bufferString = returnStructure.buffer()
+    returnCls = opstestfw.returnStruct(
+        returnCode=0, buffer=bufferString,
+        data=RunningConfigTree(buffer=bufferString))
+    return returnCls
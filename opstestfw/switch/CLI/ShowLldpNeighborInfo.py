@@ -15,7 +15,55 @@
 #
 
 from opstestfw import *
-import re
+from opstestfw.switch.ShowParser import *
+
+# show lldp neighbor-info <port>
+lldpPortParser = ShowParser(
+    rules=[("port", "^Port\s+:\s*(\d{1,2}-\d{1}|\d+)\s*$"),
+           ("Neighbor_Entries", "^Neighbor\s+entries\s+:\s*(\d+)\s*$"),
+           ("Neighbor_Entries_Deleted",
+            "^Neighbor\s+entries\s+deleted\s+:\s*(\d+)\s*$"),
+           ("Neighbor_Entries_Dropped",
+            "^Neighbor\s+entries\s+dropped\s+:\s*(\d+)\s*$"),
+           ("Neighbor_Entries_Aged-out",
+            "^Neighbor\s+entries\s+aged-out\s+:\s*(\d+)\s*$"),
+           ("Neighbor_chassisName", r'Neighbor Chassis-Name\s+:\s*(.*)$'),
+           ("Neighbor_chassisDescription",
+            r'Neighbor Chassis-Description\s+:\s*(.*)$'),
+           ("Neighbor_chasisID", r'Neighbor Chassis-ID :([0-9a-f:]+|\s*)$'),
+           ("Neighbor_Management_address",
+            r'Neighbor Management-Address\s+:\s*(.*)$'),
+           ("Chassis_Capabilities_Available",
+            r'Chassis Capabilities Available\s*:\s*(.*)$'),
+           ("Chassis_Capabilities_Enabled",
+            r'Chassis Capabilities Enabled\s*:\s*(.*)$'),
+           ("Neighbor_portID", r'Neighbor Port-ID\s*:\s*(.*)$'),
+           ("TTL", r'TTL :(\d+|\s*)$')])
+
+# show lldp neighbor-info
+lldpSummaryParser = ShowParser(
+    rules=[("Total_Neighbor_Entries",
+            "^Total\s+neighbor\s+entries\s+:\s+(\d+)\s*$"),
+           ("Total_Neighbor_Entries_Deleted",
+            "^Total\s+neighbor\s+entries\s+deleted\s+:\s+(\d+)\s*$"),
+           ("Total_Neighbor_Entries_Dropped",
+            "^Total\s+neighbor\s+entries\s+dropped\s+:\s+(\d+)\s*$"),
+           ("Total_Neighbor_Entries_Aged-out",
+            "^Total\s+neighbor\s+entries\s+aged-out\s+:\s+(\d+)\s*$"),
+           ("blankPort", "^([0-9-]+)\s*$"),
+           ("populatedPort",
+            "^([0-9-]+)\s+([0-9a-f:]+)\s+(\S+)\s+(\d+)\s*$")])
+
+lldpSummaryPortKeys = ['Neighbor_Entries_Deleted',
+                       'Neighbor_Entries_Dropped',
+                       'Neighbor_Entries',
+                       'Neighbor_Chassis-ID',
+                       'Neighbor_chassisName',
+                       'Neighbor_chassisDescription',
+                       'Chassis_Capabilities_Available',
+                       'Neighbor_Port-ID',
+                       'Chassis_Capabilities_Enabled',
+                       'TTL']
 
 
 def ShowLldpNeighborInfo(**kwargs):
@@ -84,7 +132,6 @@ def ShowLldpNeighborInfo(**kwargs):
         return returnCls
     else:
         rawBuffer = devIntRetStruct.get('buffer')
-        bufferSplit = rawBuffer.split("\r\n")
         globalStatsDict = dict()
         portDict = dict()
         if port is not None:
@@ -92,171 +139,32 @@ def ShowLldpNeighborInfo(**kwargs):
             globalStatsDict['Total_Neighbor_Entries_Deleted'] = ""
             globalStatsDict['Total_Neighbor_Entries_Dropped'] = ""
             globalStatsDict['Total_Neighbor_Entries_Aged-out'] = ""
-            for line in bufferSplit:
-                portLine = re.match("^Port\s+:\s*(\d{1,2}-\d{1}|\d+)\s*$", line)
-                if portLine:
-                    curPort = portLine.group(1)
+            for (rule, fields) in lldpPortParser.Parse(buffer=rawBuffer,
+                                                       separator="\r\n"):
+                if rule == "port":
+                    curPort = fields[0]
                     portDict[curPort] = dict()
-                    continue
-                NeighborEntries = re.match(
-                    "^Neighbor\s+entries\s+:\s*(\d+)\s*$",
-                    line)
-                if NeighborEntries:
-                    portDict[curPort][
-                        'Neighbor_Entries'] = NeighborEntries.group(1)
-                    continue
-                NeighborEntriesDeleted = re.match(
-                    "^Neighbor\s+entries\s+deleted\s+:\s*(\d+)\s*$",
-                    line)
-                if NeighborEntriesDeleted:
-                    portDict[curPort][
-                        'Neighbor_Entries_Deleted'] = \
-                        NeighborEntriesDeleted.group(1)
-                    continue
-                NeighborEntriesDropped = re.match(
-                    "^Neighbor\s+entries\s+dropped\s+:\s*(\d+)\s*$",
-                    line)
-                if NeighborEntriesDropped:
-                    portDict[curPort][
-                        'Neighbor_Entries_Dropped'] = \
-                        NeighborEntriesDropped.group(1)
-                    continue
-                NeighborEntriesAgedOut = re.match(
-                    "^Neighbor\s+entries\s+aged-out\s+:\s*(\d+)\s*$",
-                    line)
-                if NeighborEntriesAgedOut:
-                    portDict[curPort][
-                        'Neighbor_Entries_Aged-out'] = \
-                        NeighborEntriesAgedOut.group(1)
-                    continue
-                Neighbor_chasisName = re.match(
-                    r'Neighbor Chassis-Name\s+:\s*(.*)$',
-                    line)
-                if Neighbor_chasisName:
-                    portDict[curPort][
-                        'Neighbor_chassisName'] = Neighbor_chasisName.group(1)
-                    continue
-                Neighbor_chasisDescrip = re.match(
-                    r'Neighbor Chassis-Description\s+:\s*(.*)$',
-                    line)
-                if Neighbor_chasisDescrip:
-                    portDict[curPort][
-                        'Neighbor_chassisDescription'] = \
-                        Neighbor_chasisDescrip.group(1)
-                    continue
-                Neighbor_chasisID = re.match(
-                    r'Neighbor Chassis-ID :([0-9a-f:]+|\s*)$',
-                    line)
-                if Neighbor_chasisID:
-                    portDict[curPort][
-                        'Neighbor_chasisID'] = Neighbor_chasisID.group(1)
-                    continue
-                Management_address = re.match(
-                    r'Neighbor Management-Address\s+:\s*(.*)$',
-                    line)
-                if Management_address:
-                    portDict[curPort][
-                        'Neighbor_Management_address'] = Management_address.group(1)
-                    continue
-                Chassis_CapAvail = re.match(
-                    r'Chassis Capabilities Available\s*:\s*(.*)$',
-                    line)
-                if Chassis_CapAvail:
-                    portDict[curPort][
-                        'Chassis_Capabilities_Available'] = \
-                        Chassis_CapAvail.group(1)
-                    continue
-                Chassis_CapEnabled = re.match(
-                    r'Chassis Capabilities Enabled\s*:\s*(.*)$',
-                    line)
-                if Chassis_CapEnabled:
-                    portDict[curPort][
-                        'Chassis_Capabilities_Enabled'] = \
-                        Chassis_CapEnabled.group(1)
-                    continue
-                Neighbor_portID = re.match(
-                    r'Neighbor Port-ID\s*:\s*(.*)$',
-                    line)
-                if Neighbor_portID:
-                    portDict[curPort][
-                        'Neighbor_portID'] = Neighbor_portID.group(1)
-                ttl = re.match(r'TTL :(\d+|\s*)$', line)
-                if ttl:
-                    portDict[curPort]['TTL'] = ttl.group(1)
+                else:
+                    portDict[curPort][rule] = fields[0]
             returnDict['globalStats'] = globalStatsDict
             returnDict['portStats'] = portDict
             # returnDict['buffer'] = rawBuffer
             # returnDict['lldpNeighborBuffer'] = rawBuffer
         else:
             # This means we are parsing out output w/out ports
-            for line in bufferSplit:
-                # Pull out Totals
-                totalNeighEntries = re.match(
-                    "^Total\s+neighbor\s+entries\s+:\s+(\d+)\s*$",
-                    line)
-                if totalNeighEntries:
-                    globalStatsDict[
-                        'Total_Neighbor_Entries'] = totalNeighEntries.group(1)
-                    continue
-                totalNeighEntriesDeleted = re.match(
-                    "^Total\s+neighbor\s+entries\s+deleted\s+:\s+(\d+)\s*$",
-                    line)
-                if totalNeighEntriesDeleted:
-                    globalStatsDict[
-                        'Total_Neighbor_Entries_Deleted'] = \
-                        totalNeighEntriesDeleted.group(1)
-                    continue
-                totalNeighEntriesDropped = re.match(
-                    "^Total\s+neighbor\s+entries\s+dropped\s+:\s+(\d+)\s*$",
-                    line)
-                if totalNeighEntriesDropped:
-                    globalStatsDict[
-                        'Total_Neighbor_Entries_Dropped'] = \
-                        totalNeighEntriesDropped.group(1)
-                    continue
-                totalNeighEntriesAgedOut = re.match(
-                    "^Total\s+neighbor\s+entries\s+aged-out\s+:\s+(\d+)\s*$",
-                    line)
-                if totalNeighEntriesAgedOut:
-                    globalStatsDict[
-                        'Total_Neighbor_Entries_Aged-out'] = \
-                        totalNeighEntriesAgedOut.group(1)
-                    continue
-
-                # Now lets go through each line
-                blankPortEntry = re.match("^([0-9-]+)\s*$", line)
-                if blankPortEntry:
-                    curPort = blankPortEntry.group(1)
-                    portDict[curPort] = dict()
-                    portDict[curPort]['Neighbor_Entries_Deleted'] = ""
-                    portDict[curPort]['Neighbor_Entries_Dropped'] = ""
-                    portDict[curPort]['Neighbor_Entries'] = ""
-                    portDict[curPort]['Neighbor_Chassis-ID'] = ""
-                    portDict[curPort]['Neighbor_chassisName'] = ""
-                    portDict[curPort]['Neighbor_chassisDescription'] = ""
-                    portDict[curPort]['Chassis_Capabilities_Available'] = ""
-                    portDict[curPort]['Neighbor_Port-ID'] = ""
-                    portDict[curPort]['Chassis_Capabilities_Enabled'] = ""
-                    portDict[curPort]['TTL'] = ""
-                    continue
-                populatedPortEntry = re.match(
-                    "^([0-9-]+)\s+([0-9a-f:]+)\s+(\S+)\s+(\d+)\s*$",
-                    line)
-                if populatedPortEntry:
-                    curPort = populatedPortEntry.group(1)
-                    portDict[curPort] = dict()
-                    portDict[curPort]['Neighbor_Entries_Deleted'] = ""
-                    portDict[curPort]['Neighbor_Entries_Dropped'] = ""
-                    portDict[curPort]['Neighbor_Entries'] = ""
-                    portDict[curPort][
-                        'Neighbor_Chassis-ID'] = populatedPortEntry.group(2)
-                    portDict[curPort]['Neighbor_chassisName'] = ""
-                    portDict[curPort]['Neighbor_chassisDescription'] = ""
-                    portDict[curPort]['Chassis_Capabilities_Available'] = ""
-                    portDict[curPort]['Chassis_Capabilities_Enabled'] = ""
-                    portDict[curPort][
-                        'Neighbor_Port-ID'] = populatedPortEntry.group(3)
-                    portDict[curPort]['TTL'] = populatedPortEntry.group(4)
+            for (rule, fields) in lldpSummaryParser.Parse(buffer=rawBuffer,
+                                                          separator="\r\n"):
+                if rule == "blankPort":
+                    curPort = fields[0]
+                    portDict[curPort] = dict.fromkeys(lldpSummaryPortKeys, "")
+                elif rule == "populatedPort":
+                    curPort = fields[0]
+                    portDict[curPort] = dict.fromkeys(lldpSummaryPortKeys, "")
+                    portDict[curPort]['Neighbor_Chassis-ID'] = fields[1]
+                    portDict[curPort]['Neighbor_Port-ID'] = fields[2]
+                    portDict[curPort]['TTL'] = fields[3]
+                else:
+                    globalStatsDict[rule] = fields[0]
             returnDict['globalStats'] = globalStatsDict
             returnDict['portStats'] = portDict
             # returnDict['buffer'] = rawBuffer
@@ -23,6 +23,9 @@ def ShowVlan(**kwargs):
 
     :param deviceObj : Device object
     :type  deviceObj : object
+    :param oneShot : True to run the show command with vtysh -c from the
+                     linux context
+    :type  oneShot : boolean
     :return: returnStruct Object
             buffer
             data keys
@@ -35,6 +38,7 @@ def ShowVlan(**kwargs):
     :returnType: object
     """
     deviceObj = kwargs.get('deviceObj', None)
+    oneShot = kwargs.get('oneShot', False)
 
     overallBuffer = []
     # If Device object is not passed, we need to error out
@@ -45,40 +49,52 @@ def ShowVlan(**kwargs):
         returnCls = opstestfw.returnStruct(returnCode=1)
         return returnCls
 
-    # Get into vtyshelll
-    returnStructure = deviceObj.VtyshShell(enter=True)
-    returnCode = returnStructure.returnCode()
-    overallBuffer.append(returnStructure.buffer())
-    if returnCode != 0:
-        opstestfw.LogOutput('error', "Failed to get vtysh prompt")
-        bufferString = ""
-        for curLine in overallBuffer:
-            bufferString += str(curLine)
-        returnCls = opstestfw.returnStruct(returnCode=1, buffer=bufferString)
-        return returnCls
-
     command = "show vlan"
 
-    returnDevInt = deviceObj.DeviceInteract(command=command)
-    retCode = returnDevInt['returnCode']
-    overallBuffer.append(returnDevInt['buffer'])
-    temporaryBuffer = returnDevInt['buffer']
-    if retCode != 0:
-        opstestfw.LogOutput('error', "Failed to create VLAN." + command)
+    if oneShot is True:
+        returnDevInt = deviceObj.VtyshOneShot(commands=[command])
+        retCode = returnDevInt['returnCode']
+        overallBuffer.append(returnDevInt['buffer'])
+        temporaryBuffer = returnDevInt['buffer']
+        if retCode != 0:
+            opstestfw.LogOutput('error', "Failed to create VLAN." + command)
+        else:
+            opstestfw.LogOutput('debug', "Created VLAN." + command)
     else:
-        opstestfw.LogOutput('debug', "Created VLAN." + command)
+        # Get into vtyshelll
+        returnStructure = deviceObj.VtyshShell(enter=True)
+        returnCode = returnStructure.returnCode()
+        overallBuffer.append(returnStructure.buffer())
+        if returnCode != 0:
+            opstestfw.LogOutput('error', "Failed to get vtysh prompt")
+            bufferString = ""
+            for curLine in overallBuffer:
+                bufferString += str(curLine)
+            returnCls = opstestfw.returnStruct(returnCode=1,
+                                               buffer=bufferString)
+            return returnCls
 
-    # Get out of vtyshell
-    returnStructure = deviceObj.VtyshShell(enter=False)
-    returnCode = returnStructure.returnCode()
-    overallBuffer.append(returnStructure.buffer())
-    if returnCode != 0:
-        opstestfw.LogOutput('error', "Failed to exit vtysh prompt")
-        bufferString = ""
-        for curLine in overallBuffer:
-            bufferString += str(curLine)
-        returnCls = opstestfw.returnStruct(returnCode=1, buffer=bufferString)
-        return returnCls
+        returnDevInt = deviceObj.DeviceInteract(command=command)
+        retCode = returnDevInt['returnCode']
+        overallBuffer.append(returnDevInt['buffer'])
+        temporaryBuffer = returnDevInt['buffer']
+        if retCode != 0:
+            opstestfw.LogOutput('error', "Failed to create VLAN." + command)
+        else:
+            opstestfw.LogOutput('debug', "Created VLAN." + command)
+
+        # Get out of vtyshell
+        returnStructure = deviceObj.VtyshShell(enter=False)
+        returnCode = returnStructure.returnCode()
+        overallBuffer.append(returnStructure.buffer())
+        if returnCode != 0:
+            opstestfw.LogOutput('error', "Failed to exit vtysh prompt")
+            bufferString = ""
+            for curLine in overallBuffer:
+                bufferString += str(curLine)
+            returnCls = opstestfw.returnStruct(returnCode=1,
+                                               buffer=bufferString)
+            return returnCls
 
     result = []
     opstestfw.LogOutput('debug', "Buffer: " + temporaryBuffer)
@@ -68,6 +68,10 @@ def UserAddRemove(** kwargs):
             bufferString += str(curLine)
         returnCls = returnStruct(returnCode=returnCode, buffer=bufferString)
         return returnCls
+    # The commands below go straight to the expect handle, so a sticky
+    # context session has to settle in vtysh first
+    if deviceObj.stickyContext is True:
+        deviceObj.pendingContextEnter()
 
     expectList = ['Enter password:',
                   'Confirm password:',
@@ -52,9 +52,11 @@ from MgmtInterfaceConfig import *
 from SwitchCpuLoad import *
 from MgmtInterfaceUpDown import *
 from RouteUtilitiesShow import *
+from RouteTable import *
 from IpRouteShow import *
 from RibShow import *
 from RunningConfigShow import *
+from RunningConfigTree import *
 from ConfigCopy import *
 from MgmtInterfaceShow import *
 from showRun import *
@@ -23,12 +23,16 @@ def showRun(**kwargs):
 
     :param deviceObj : Device object
     :type  deviceObj : object
+    :param oneShot : True to run the show command with vtysh -c from the
+                     linux context
+    :type  oneShot : boolean
     :return: returnStruct Object
             buffer
 
     :returnType: object
     """
     deviceObj = kwargs.get('deviceObj', None)
+    oneShot = kwargs.get('oneShot', False)
 
     overallBuffer = []
     bufferString = ""
@@ -40,6 +44,21 @@ def showRun(**kwargs):
         returnCls = opstestfw.returnStruct(returnCode=1)
         return returnCls
 
+    if oneShot is True:
+        command = "show running-config"
+        opstestfw.LogOutput('debug', "Sending: " + command)
+        returnDevInt = deviceObj.VtyshOneShot(commands=[command])
+        retCode = returnDevInt['returnCode']
+        overallBuffer.append(returnDevInt['buffer'])
+        if retCode != 0:
+            opstestfw.LogOutput('error',
+                                "Failed to get information ." + command)
+        for curLine in overallBuffer:
+            bufferString += str(curLine)
+        returnCls = opstestfw.returnStruct(returnCode=retCode,
+                                           buffer=bufferString)
+        return returnCls
+
 # Get into vtyshelll
     returnStructure = deviceObj.VtyshShell(enter=True)
     returnCode = returnStructure.returnCode()
@@ -84,5 +103,6 @@ def showRun(**kwargs):
     for curLine in overallBuffer:
         bufferString += str(curLine)
 
-    returnCls = opstestfw.returnStruct(returnCode=0, buffer=bufferString)
+    returnCls = opstestfw.returnStruct(returnCode=retCode,
+                                       buffer=bufferString)
     return returnCls
@@ -15,7 +15,33 @@
 #
 
 from opstestfw import *
-import re
+from opstestfw.switch.ShowParser import *
+
+ovsShowParser = ShowParser(
+    rules=[("uuid", "^\s*([0-9a-f-]+)\s*$"),
+           ("bridge", "^\s+Bridge\s+(\S+)\s*$"),
+           ("vlan", "\s+VLAN\s+\"(\S+)\""),
+           ("vlanAttr", "\s+(id|admin|description?):\s+(\S+)\s*$"),
+           ("port", "^\s+Port\s+\"(\S+)\"\s*$"),
+           ("tag", "^\s+tag:\s+(\d+)\s*$"),
+           ("trunks", "^\s+trunks:\s+\[(.*)\]\s*$"),
+           ("Interface", "^\s+Interface\s+\"(\S+)\"\s*$"),
+           ("fan", "^\s+Fan\s+\"(.*)\""),
+           ("fanAttr", "^\s+(speed|rpm|status?):\s+(\S+)\s*$"),
+           ("tempSensor", "^\s+Temp_sensor\s+\"(.*)\""),
+           ("tempSensorAttr", "^\s+(max|min|temperature?):\s+(\S+)\s*$"),
+           ("otherConfig", "^\s+other_config:\s+\{(.*)\}")])
+
+# Items of the other_config column, quoted ones first
+ovsOtherConfigParser = ShowParser(
+    rules=[("quoted",
+            '^\s*\"?(Product Name|base_mac_address|device_version|'
+            'diag_version|interface_count|label_revision|'
+            'manufacture_date|max_bond_count|max_bond_member_count|'
+            'max_interface_speed|number_of_macs|onie_version|'
+            'part_number|platform_name|serial_number'
+            ')\"?=\"(.*)\"\s*$'),
+           ("unquoted", '^\s*(country_code|manufacturer|vendor)=(.*)\s*$')])
 
 
 def OvsShow(**kwargs):
@@ -76,127 +102,42 @@ def OvsShow(**kwargs):
     # curTempSensor = ""
     tempSensorDict = dict()
 
-    for curLine in buffer.split('\n'):
-        # Match the UUID
-        testForUUID = re.match("^\s*([0-9a-f-]+)\s*$", curLine)
-        if testForUUID:
-            retStruct['Open_vSwitch_UUID'] = str(testForUUID.group(1))
-            continue
-
-        # Match for bridge information
-        testForBridge = re.match("^\s+Bridge\s+(\S+)\s*$", curLine)
-        if testForBridge:
-            curBridgeName = testForBridge.group(1)
+    for (rule, fields) in ovsShowParser.Parse(buffer=buffer):
+        if rule == "uuid":
+            retStruct['Open_vSwitch_UUID'] = str(fields[0])
+        elif rule == "bridge":
+            curBridgeName = fields[0]
             bridgeDict[curBridgeName] = dict()
             bridgeDict[curBridgeName]['Vlans'] = dict()
             bridgeDict[curBridgeName]['Ports'] = dict()
-            continue
-
-        # Vlan Matching
-        testForVlan = re.match("\s+VLAN\s+\"(\S+)\"", curLine)
-        if testForVlan:
-            curVlanName = testForVlan.group(1)
+        elif rule == "vlan":
+            curVlanName = fields[0]
             bridgeDict[curBridgeName]['Vlans'][curVlanName] = dict()
-            continue
-
-        # VLAN attributes
-        testForVlanAttr = re.match("\s+(id|admin|description?):\s+(\S+)\s*$",
-                                   curLine)
-        if testForVlanAttr:
-            curAttr = testForVlanAttr.group(1)
-            bridgeDict[curBridgeName]['Vlans'][curVlanName][curAttr] =\
-                testForVlanAttr.group(2)
-            continue
-
-        # Port matching underneath bridge
-        testForPort = re.match("^\s+Port\s+\"(\S+)\"\s*$", curLine)
-        if testForPort:
-            curPortName = testForPort.group(1)
+        elif rule == "vlanAttr":
+            bridgeDict[curBridgeName]['Vlans'][curVlanName][fields[0]] =\
+                fields[1]
+        elif rule == "port":
+            curPortName = fields[0]
             bridgeDict[curBridgeName]['Ports'][curPortName] = dict()
-            continue
-
-        # Port Tag Attributes
-        testForPortTag = re.match("^\s+tag:\s+(\d+)\s*$", curLine)
-        if testForPortTag:
-            bridgeDict[curBridgeName]['Ports'][curPortName]['tag'] =\
-                testForPortTag.group(1)
-            continue
-
-        # Port Trunks Attribute
-        testForPortTrunk = re.match("^\s+trunks:\s+\[(.*)\]\s*$", curLine)
-        if testForPortTrunk:
-            bridgeDict[curBridgeName]['Ports'][curPortName]['trunks'] =\
-                testForPortTrunk.group(1)
-            continue
-
-        # Port Interface Attribute
-        testForPortInterface = re.match("^\s+Interface\s+\"(\S+)\"\s*$",
-                                        curLine)
-        if testForPortInterface:
-            bridgeDict[curBridgeName]['Ports'][curPortName]['Interface'] =\
-                testForPortInterface.group(1)
-            continue
-
-        # Match for Fan
-        testForFan = re.match("^\s+Fan\s+\"(.*)\"", curLine)
-        if testForFan:
-            curFanName = testForFan.group(1)
+        elif rule in ("tag", "trunks", "Interface"):
+            bridgeDict[curBridgeName]['Ports'][curPortName][rule] = fields[0]
+        elif rule == "fan":
+            curFanName = fields[0]
             fanDict[curFanName] = dict()
-            continue
-
-        testForFanAttr = re.match("^\s+(speed|rpm|status?):\s+(\S+)\s*$",
-                                  curLine)
-        if testForFanAttr:
-            fanDict[curFanName][testForFanAttr.group(1)] =\
-                testForFanAttr.group(2)
-            continue
-
-        # Match for Temp Sensors
-        testForTempSensors = re.match("^\s+Temp_sensor\s+\"(.*)\"", curLine)
-        if testForTempSensors:
-            curTempSensorName = testForTempSensors.group(1)
+        elif rule == "fanAttr":
+            fanDict[curFanName][fields[0]] = fields[1]
+        elif rule == "tempSensor":
+            curTempSensorName = fields[0]
             tempSensorDict[curTempSensorName] = dict()
-            continue
-
-        testForTempSensorAttr =\
-            re.match("^\s+(max|min|temperature?):\s+(\S+)\s*$", curLine)
-        if testForTempSensorAttr:
-            tempSensorDict[curTempSensorName][testForTempSensorAttr.group(1)] =\
-                testForTempSensorAttr.group(2)
-            continue
-
-        # Other Config
-        testForOther = re.match("^\s+other_config:\s+\{(.*)\}", curLine)
-        if testForOther:
+        elif rule == "tempSensorAttr":
+            tempSensorDict[curTempSensorName][fields[0]] = fields[1]
+        elif rule == "otherConfig":
             retStruct['other_config'] = dict()
-            otherDataString = testForOther.group(1)
-            splitArray = otherDataString.split(',')
-            for item in splitArray:
-                # Split this by =
-                # Split out items with quotes
-                stringSplitter =\
-                    re.match('^\s*\"?(Product Name|base_mac_address|'
-                             'device_version|'
-                             'diag_version|interface_count|label_revision|'
-                             'manufacture_date|max_bond_count|'
-                             'max_bond_member_count'
-                             '|max_interface_speed|number_of_macs|'
-                             'onie_version|'
-                             'part_number|platform_name|serial_number'
-                             ')\"?=\"(.*)\"\s*$', item)
-                if stringSplitter:
-                    retStruct['other_config'][stringSplitter.group(1)] =\
-                        stringSplitter.group(2)
-                    continue
-
-                # Split out other oddball items
-                stringSplitter =\
-                    re.match('^\s*(country_code|manufacturer|vendor)=(.*)\s*$',
-                             item)
-                if stringSplitter:
-                    retStruct['other_config'][stringSplitter.group(1)] =\
-                        stringSplitter.group(2)
-                    continue
+            for item in fields[0].split(','):
+                itemMatch = ovsOtherConfigParser.LineMatch(line=item)
+                if itemMatch is not None:
+                    retStruct['other_config'][itemMatch[1][0]] =\
+                        itemMatch[1][1]
 
     # Create mock data
     retStruct['Bridge'] = bridgeDict
@@ -0,0 +1,148 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import re
+
+"""
+Declarative parser for show command output.  A parser is built once per
+command out of an ordered list of line rules, each rule a name and a regular
+expression matched at the start of a line.  The rules are compiled into a
+single alternation so every line is matched once instead of once per rule,
+and the first rule in the list that matches a line wins, the same as an
+if / continue cascade of re.match calls.
+
+    lagParser = ShowParser(rules=[("systemId", "System-id\s*\|(.*)\|(.*)"),
+                                  ("key", "Key\s*\|(.*)\|(.*)")])
+    for (rule, fields) in lagParser.Parse(buffer=buffer):
+        ...
+
+Rule patterns may use unnamed groups only, the fields of a match are the
+groups of its rule in order.
+"""
+
+# Group limit of the re module in older python releases
+showParserMaxGroups = 99
+
+
+class ShowParser(object):
+    """
+    ShowParser Class definition
+
+    Compiled line rules of one show command.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        ShowParser init method
+
+        :param rules: ordered list of (name, pattern) tuples
+        :type rules: list
+        :param strip: strip white space off every line before matching
+        :type strip: boolean
+        """
+        self.rules = list(kwargs.get('rules', []))
+        self.strip = kwargs.get('strip', False)
+        # List of (regex, ruleMap) - ruleMap maps the group wrapping a rule
+        # to (name, first field group index, field count).  Rules are split
+        # over several regexes only when they carry too many groups for one.
+        self.chunks = []
+        chunkPatterns = []
+        ruleMap = dict()
+        groupCount = 0
+        for (name, pattern) in self.rules:
+            fieldCount = re.compile(pattern).groups
+            if groupCount + fieldCount + 1 > showParserMaxGroups \
+                    and len(chunkPatterns) != 0:
+                self.ChunkAdd(chunkPatterns, ruleMap)
+                chunkPatterns = []
+                ruleMap = dict()
+                groupCount = 0
+            ruleMap[groupCount + 1] = (name, groupCount, fieldCount)
+            chunkPatterns.append("(" + pattern + ")")
+            groupCount += fieldCount + 1
+        if len(chunkPatterns) != 0:
+            self.ChunkAdd(chunkPatterns, ruleMap)
+
+    def ChunkAdd(self, patterns, ruleMap):
+        """
+        ChunkAdd method
+
+        :param patterns: wrapped rule patterns
+        :type patterns: list
+        :param ruleMap: wrapping group index to rule information
+        :type ruleMap: dictionary
+        """
+        self.chunks.append((re.compile("|".join(patterns)), ruleMap))
+
+    def LineMatch(self, **kwargs):
+        """
+        LineMatch method
+
+        :param line: one line of output
+        :type line: string
+        :return: (name, fields) of the first rule matching the line, None if
+                 no rule matches
+        :rtype: tuple
+        """
+        line = kwargs.get('line')
+        if self.strip is True:
+            line = line.strip()
+        for (regex, ruleMap) in self.chunks:
+            match = regex.match(line)
+            if match:
+                # The group wrapping the rule is the last one to close
+                (name, first, count) = ruleMap[match.lastindex]
+                return (name, match.groups()[first + 1:first + 1 + count])
+        return None
+
+    def Parse(self, **kwargs):
+        """
+        Parse method
+
+        Matches every line of the output against the rules in one pass.
+
+        :param buffer: show command output
+        :type buffer: string
+        :param separator: line separator, defaults to "\\n"
+        :type separator: string
+        :return: list of (name, fields) tuples, one per matching line, in
+                 output order
+        :rtype: list
+        """
+        buffer = kwargs.get('buffer', "")
+        separator = kwargs.get('separator', "\n")
+        results = []
+        for curLine in buffer.split(separator):
+            lineMatch = self.LineMatch(line=curLine)
+            if lineMatch is not None:
+                results.append(lineMatch)
+        return results
+
+
+def ShowFlagsGet(**kwargs):
+    """
+    Library routine to decode a string of one letter flags, such as the LACP
+    state column of show lacp interface
+
+    :param value: flags string
+    :type value: string
+    :param flags: dictionary of flag letter to key name
+    :type flags: dictionary
+    :return: dictionary of key name to True if the letter is in the value
+    :rtype: dictionary
+    """
+    value = kwargs.get('value', "")
+    flags = kwargs.get('flags', dict())
+    return dict((name, letter in value) for (letter, name) in flags.items())
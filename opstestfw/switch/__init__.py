@@ -14,4 +14,4 @@
 #    under the License.
 #
 # Submodules
-__all__ = ['OVS', 'CLI']
+__all__ = ['OVS', 'CLI', 'ShowParser']
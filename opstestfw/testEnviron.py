@@ -27,6 +27,10 @@ import opstestfw.gbldata
 import logging
 import glob
 import pdb
+import threading
+import Queue
+import atexit
+import weakref
 from commands import *
 
 
@@ -248,10 +252,25 @@ class testEnviron ():
             self.topoType = "virtual"
             LogOutput('info', "Topology is virtual - creating environment "
                       "specified in the test case topoDict structure")
-            # Create a topology object
-            self.topoObj = Topology(topoDict=self.topoDict, runEnv=self,
-                                    defSwitchContext=self.defaultSwitchContext,
-                                    resultsDir=self.ResultsDirectory['resultsDir'])
+            # Take a compatible topology out of the warm pool if there is one
+            if opstestfw.TopologyPoolEnabled() is True:
+                self.topoObj = opstestfw.topologyPool.checkout(
+                    topoDict=self.topoDict)
+            if self.topoObj is not None:
+                retStruct = self.topoObj.WarmStart(
+                    topoDict=self.topoDict, runEnv=self,
+                    defSwitchContext=self.defaultSwitchContext)
+                if retStruct.returnCode() != 0:
+                    LogOutput('info', "Unable to reuse parked topology - "
+                              "creating a new one")
+                    self.topoObj.TopologyDestroy()
+                    self.topoObj = None
+            if self.topoObj is None:
+                # Create a topology object
+                self.topoObj = Topology(
+                    topoDict=self.topoDict, runEnv=self,
+                    defSwitchContext=self.defaultSwitchContext,
+                    resultsDir=self.ResultsDirectory['resultsDir'])
 
         elif str.isdigit(self.rsvnId) is True:
             self.topoType = "physical"
@@ -405,7 +424,9 @@ class returnStruct():
         localDict['returnCode'] = self.retCode
         localDict['buffer'] = self.return_buffer
         localDict['data'] = self.data
-        self.jsonData = json.dumps(localDict, indent=3)
+        # Objects returned as data, such as a RouteTable snapshot, are shown
+        # by their repr
+        self.jsonData = json.dumps(localDict, indent=3, default=repr)
 
 # General / Common library routines
 
@@ -518,19 +539,65 @@ class DeviceLogger(object):
     """
     DeviceLogger Class definition
 
-    This class will create / manage testcase log file structure
+    This class will create / manage testcase log file structure.  As the
+    logfile of an expect session it buffers the device transcript in memory
+    and writes it out at most once per flushInterval, when more than
+    maxBuffer bytes are waiting, or when DeviceLogFlush is called.
     """
 
-    def __init__(self, file):
+    # Loggers that may hold buffered data
+    registry = weakref.WeakSet()
+    registryLock = threading.Lock()
+
+    def __init__(self, file, **kwargs):
 
         """
         DeviceLogger initialization method
 
         :param arg1 : filename
         :type  arg1 : string
+        :param timestamps : True to start every record with a compact
+                            timestamp.  Defaults to the VSIEXPECTLOGTS
+                            environment variable.
+        :type  timestamps : boolean
+        :param attribution : True to note the calling module whenever it
+                             changes
+        :type  attribution : boolean
 
         """
         self.file = file
+        self.timestamps = kwargs.get(
+            'timestamps', os.environ.get('VSIEXPECTLOGTS', None) is not None)
+        self.attribution = kwargs.get('attribution', False)
+        self.flushInterval = 1.0
+        self.maxBuffer = 65536
+        self.pending = []
+        self.pendingBytes = 0
+        self.lastFlush = time.time()
+        self.lastModule = None
+        self.lock = threading.Lock()
+        if not isinstance(file, basestring):
+            with DeviceLogger.registryLock:
+                DeviceLogger.registry.add(self)
+
+    def callerModule(self):
+
+        """
+        callerModule method for DeviceLogger.  Walks up the frames to the
+        first one outside of pexpect and this module
+
+        :return:  module name
+        :returnType:  string
+
+        """
+        frame = sys._getframe(2)
+        while frame is not None:
+            modulename = frame.f_globals.get('__name__', "")
+            if not modulename.startswith("pexpect") and \
+                    modulename != __name__:
+                return modulename
+            frame = frame.f_back
+        return None
 
     def write(self, data):
 
@@ -543,36 +610,52 @@ class DeviceLogger(object):
         """
 
         # .. filter data however you like
-        ts = time.time()
-        ts = datetime.datetime.fromtimestamp(ts).strftime('%H:%M:%S')
         data = data.strip()
 
         # Do not log blank spaces
-        if data in [' ', '', '\n', '\r', '\r\n']:
+        if not data:
             return
-        if data:  # non-blank
-            # Inspect the stacktrace to get the called module
-            # Module trace needs to be dumped to logging module
-            # This code will not log unnecessary internal modules
-            # (so that log looks clean)
-            stackTrace = inspect.stack()
-            module = inspect.getmodule(stackTrace[4][0])
-            if module is None:
-                modulename = module.__name__
-                if modulename == "pexpect":
-                    modulename = None
-                else:
-                    self.file.write("++++" + ts + "  " + "Module:"
-                                    + "(" + modulename + ")" + "  " + "\n")
-            return self.file.write(data + "\n")
-
-    def flush(self):
+        record = data + "\n"
+        if self.timestamps is True:
+            now = time.time()
+            record = "%s.%03d %s" % (time.strftime('%H:%M:%S',
+                                                   time.localtime(now)),
+                                     int((now % 1) * 1000), record)
+        if self.attribution is True:
+            modulename = self.callerModule()
+            if modulename != self.lastModule:
+                self.lastModule = modulename
+                ts = time.strftime('%H:%M:%S', time.localtime())
+                record = "++++" + ts + "  " + "Module:" + "(" \
+                    + str(modulename) + ")" + "  " + "\n" + record
+        with self.lock:
+            self.pending.append(record)
+            self.pendingBytes += len(record)
+        if self.pendingBytes > self.maxBuffer:
+            self.flush(force=True)
+
+    def flush(self, **kwargs):
 
         """
-        flush method for DeviceLogger.  This will flush the file descriptor
+        flush method for DeviceLogger.  This will write out the buffered
+        data and flush the file descriptor.  Unless forced, this only
+        happens once per flushInterval.
+
+        :param force : True to write out the buffered data now
+        :type  force : boolean
 
         """
-        self.file.flush()
+        force = kwargs.get('force', False)
+        if force is False and time.time() - self.lastFlush < self.flushInterval:
+            return
+        with self.lock:
+            data = "".join(self.pending)
+            self.pending = []
+            self.pendingBytes = 0
+            self.lastFlush = time.time()
+            if data:
+                self.file.write(data)
+            self.file.flush()
 
     def OpenExpectLog(self, ExpectFileName):
 
@@ -612,6 +695,200 @@ class DeviceLogger(object):
         return returnCode
 
 
+class LogWriter(object):
+
+    """
+    LogWriter Class definition
+
+    Background writer for the summary and detail log files.  Records are
+    queued by LogOutputToFile and written in batches by one thread, which
+    keeps the log files open between writes.
+    """
+
+    def __init__(self):
+
+        """
+        LogWriter initialization method
+
+        """
+        self.recordQueue = Queue.Queue()
+        self.logFiles = dict()
+        self.checkedPaths = dict()
+        self.maxBatch = 1000
+        self.writer = None
+        self.startLock = threading.Lock()
+
+    def start(self):
+
+        """
+        start method for LogWriter.  Starts the writer thread on first use
+
+        """
+        with self.startLock:
+            if self.writer is None or not self.writer.is_alive():
+                self.writer = threading.Thread(target=self.writerLoop,
+                                               name="LogWriter")
+                self.writer.daemon = True
+                self.writer.start()
+
+    def pathCheck(self, fileName):
+
+        """
+        pathCheck method for LogWriter.  Checks once per file that the log
+        file exists and is writable
+
+        :param arg1 : fileName
+        :type  arg1 : string
+        :return:  True if the file can be written
+        :returnType:  boolean
+
+        """
+        if fileName in self.checkedPaths:
+            return True
+        if os.access(fileName, os.W_OK):
+            self.checkedPaths[fileName] = True
+            return True
+        print("either file not exists for %s or no write permission"
+              % fileName)
+        return False
+
+    def put(self, fileNames, level, message):
+
+        """
+        put method for LogWriter.  Queues a record for the given files
+
+        :param arg1 : fileNames
+        :type  arg1 : list
+        :param arg2 : level
+        :type  arg2 : string
+        :param arg3 : message
+        :type  arg3 : string
+
+        """
+        if self.writer is None:
+            self.start()
+        self.recordQueue.put((fileNames, level, time.time(), message))
+
+    def fileGet(self, fileName):
+
+        """
+        fileGet method for LogWriter.  Returns the open file for a log file,
+        opening it again if it was replaced on disk
+
+        :param arg1 : fileName
+        :type  arg1 : string
+        :return:  file object
+        :returnType:  file
+
+        """
+        logFile = self.logFiles.get(fileName)
+        if logFile is not None:
+            try:
+                if os.stat(fileName).st_ino == \
+                        os.fstat(logFile.fileno()).st_ino:
+                    return logFile
+            except OSError:
+                pass
+            logFile.close()
+        logFile = open(fileName, 'a')
+        self.logFiles[fileName] = logFile
+        return logFile
+
+    def writerLoop(self):
+
+        """
+        writerLoop method for LogWriter.  Writer thread body
+
+        """
+        while True:
+            records = [self.recordQueue.get()]
+            while len(records) < self.maxBatch:
+                try:
+                    records.append(self.recordQueue.get_nowait())
+                except Queue.Empty:
+                    break
+            try:
+                self.recordsWrite(records)
+            except Exception as e:
+                print("Failed to write log records: %s" % str(e))
+            for curRecord in records:
+                self.recordQueue.task_done()
+
+    def recordsWrite(self, records):
+
+        """
+        recordsWrite method for LogWriter.  Formats a batch of records and
+        writes them with one write per file
+
+        :param arg1 : records
+        :type  arg1 : list
+
+        """
+        fileLines = dict()
+        fileOrder = []
+        for (fileNames, level, stamp, message) in records:
+            if fileNames is None:
+                # Flush marker
+                continue
+            line = "%-5s - %-6s - %s\n" % (
+                level.upper(),
+                time.strftime('%H:%M:%S', time.localtime(stamp)),
+                message)
+            for curFile in fileNames:
+                if curFile not in fileLines:
+                    fileLines[curFile] = []
+                    fileOrder.append(curFile)
+                fileLines[curFile].append(line)
+        for curFile in fileOrder:
+            logFile = self.fileGet(curFile)
+            logFile.write("".join(fileLines[curFile]))
+            logFile.flush()
+
+    def flush(self):
+
+        """
+        flush method for LogWriter.  Waits until every queued record is
+        written
+
+        """
+        if self.writer is not None and self.writer.is_alive():
+            self.recordQueue.join()
+
+
+logWriter = LogWriter()
+atexit.register(logWriter.flush)
+
+
+def DeviceLogFlush():
+
+    """
+    Library routine to write out the data buffered by all the device
+    transcript loggers
+
+    """
+    with DeviceLogger.registryLock:
+        loggers = list(DeviceLogger.registry)
+    for curLogger in loggers:
+        try:
+            curLogger.flush(force=True)
+        except (IOError, ValueError):
+            # The underlying file is already closed
+            pass
+
+
+atexit.register(DeviceLogFlush)
+
+
+def LogFlush():
+
+    """
+    Library routine to wait until all queued log records are written to the
+    summary and detail files
+
+    """
+    logWriter.flush()
+
+
 def LogOutputToFile(path, level, message):
 
     """
@@ -629,68 +906,27 @@ def LogOutputToFile(path, level, message):
     intResult = 1
     strSummaryFileName = path + "summary.log"
     strDetailedFileName = path + "detail.log"
-    if(os.access(strSummaryFileName, os.W_OK)):
-        pass
-    else:
-        print("either file not exists for %s or no write permission"
-              % strSummaryFileName)
+    if logWriter.pathCheck(strSummaryFileName) is False:
         return intResult
 
-    if(os.access(strDetailedFileName, os.W_OK)):
-        pass
-    else:
-        print("either file not exists for %s or no write permission"
-              % strDetailedFileName)
+    if logWriter.pathCheck(strDetailedFileName) is False:
         return intResult
 
     if (level == "debug"):
-        writeLogFile(strDetailedFileName, level, message)
+        logWriter.put([strDetailedFileName], level, message)
     else:
-        writeLogFile(strSummaryFileName, level, message)
-        writeLogFile(strDetailedFileName, level, message)
+        logWriter.put([strSummaryFileName, strDetailedFileName], level,
+                      message)
     intResult = 0
     return intResult
 
 
-def writeLogFile(logfile, level, message):
-
-    """
-    Library routine to write the logger message to passed file
-    based on the level
-
-    :param arg1 : logfile
-    :type  arg1 : string
-    :param arg2 : level
-    :type  arg2 : string
-    :param arg3 : message
-    :type  arg3 : string
-
-    """
-
-    logger = logging.getLogger()
-    formatter = logging.Formatter('%(levelname)-5s - %(asctime)-6s - '
-                                  '%(message)s',
-                                  '%H:%M:%S')
-    fh = logging.FileHandler(logfile)
-    if (level == "info"):
-        fh.setLevel(logging.INFO)
-        logger.setLevel(logging.INFO)
-        fh.setFormatter(formatter)
-        logger.addHandler(fh)
-        logger.info(message)
-    elif (level == "error"):
-        fh.setLevel(logging.ERROR)
-        logger.setLevel(logging.ERROR)
-        fh.setFormatter(formatter)
-        logger.addHandler(fh)
-        logger.error(message)
-    elif (level == "debug"):
-        fh.setLevel(logging.DEBUG)
-        logger.setLevel(logging.DEBUG)
-        fh.setFormatter(formatter)
-        logger.addHandler(fh)
-        logger.debug(message)
-    logger.removeHandler(fh)
+# Serializes the console output of LogOutput calls made from several
+# threads
+logOutputLock = threading.RLock()
+# Debug messages are written to detail.log unless VSILOGLEVEL asks for a
+# higher level
+logDebugEnabled = os.environ.get('VSILOGLEVEL', "debug") == "debug"
 
 
 def LogOutput(dest, message, **kwargs):
@@ -708,19 +944,16 @@ def LogOutput(dest, message, **kwargs):
 
     """
 
-    datestamp = kwargs.get('datastamp', False)
     logType = str(dest)
+    if logType == 'debug' and logDebugEnabled is False:
+        return
+    datestamp = kwargs.get('datastamp', False)
 
-    if datestamp is True:
-        timestring = time.strftime("%m/%d/%y %H:%M:%S", time.localtime())
-    else:
+    if datestamp is False and (logType == 'info' or logType == 'error'):
         timestring = time.strftime("%H:%M:%S", time.localtime())
         messageSpl = message.split("\n")
-        timestampSent = 0
-        for msgLine in messageSpl:
-            if timestampSent:
-                print('%s' % msgLine)
-            if logType == 'info' or logType == 'error':
+        with logOutputLock:
+            for msgLine in messageSpl:
                 print("%s %-6s\t%s" % (timestring, logType, msgLine))
     # Logging messages to Log files based on severity
     if logType == 'info':
@@ -0,0 +1,167 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import re
+import shutil
+import tempfile
+from opstestfw import *
+from opstestfw import gbldata
+
+# The CLI error check only looks at the buffer it is given, so these cases
+# run it on sample switch output without a topology.
+
+# Signatures of the regex ladder ErrorCheckCLI used before the registry,
+# each line was matched against all of them and the last match won
+ladderSignatures = [
+    (2, "command not found"),
+    (3, "unknown command"),
+    (4, "Command incomplete"),
+    (5, "LAG\s+port\s+doesn't\s+exist"),
+    (6, "no\s+matched\s+command"),
+    (7, "Permission denied"),
+    (8, "user [A-Za-z0-9]+ already exists"),
+    (9, "Passwords do not match"),
+    (10, "Unknown user:"),
+    (11, "Cannot delete the last user:"),
+    (12, "user [A-Za-z0-9_]+ is currently used by process"),
+    (13, "Cannot add more interfaces to LAG. Maximum interface count is "
+     "reached")]
+
+sampleBuffers = [
+    "switch# show vlan\r\nNo vlan is configured\r\nswitch# ",
+    "switch# shw vlan\r\n% Unknown command.\r\nswitch# ",
+    "root@switch:~# vtysh -c foo\r\nbash: foo: command not found\r\n",
+    "switch(config)# interface\r\n% Command incomplete.\r\n",
+    "switch(config-if)# lag 99\r\nLAG port doesn't exist.\r\n",
+    "switch# show foo\r\n% There is no matched command.\r\n",
+    "admin@switch's password:\r\nPermission denied, please try again.\r\n",
+    "useradd: user netop already exists\r\n",
+    "Passwords do not match. Try again.\r\n",
+    "Unknown user: nobody\r\n",
+    "Cannot delete the last user: admin\r\n",
+    "userdel: user netop_1 is currently used by process 4242\r\n",
+    "Cannot add more interfaces to LAG. Maximum interface count is "
+    "reached.\r\n",
+    # Several errors, the last line with an error wins
+    "% Unknown command.\r\nbash: x: command not found\r\n",
+    "bash: x: command not found\r\n% Command incomplete.\r\nswitch# ",
+    # Several errors on one line, the last signature wins
+    "% Unknown command. Permission denied\r\n",
+    "Permission denied % Unknown command.\r\n",
+    # Case does not matter
+    "% UNKNOWN COMMAND\r\n"]
+
+
+def LadderReturnCode(buffer):
+    returnCode = 0
+    for line in buffer.split("\n"):
+        for (curCode, curPattern) in ladderSignatures:
+            if re.match(".*(" + curPattern + ")", line, re.I):
+                returnCode = curCode
+        if re.match("Segmentation fault", line, re.I):
+            returnCode = 14
+    return returnCode
+
+
+class Test_ft_cli_errors:
+
+    def setup_class(cls):
+
+        Test_ft_cli_errors.resultsDir = tempfile.mkdtemp()
+        Test_ft_cli_errors.logDir = getattr(gbldata, 'ResultsDirectory',
+                                            None)
+        gbldata.ResultsDirectory = Test_ft_cli_errors.resultsDir + "/"
+        Test_ft_cli_errors.entries = list(cliErrorRegistry.entries)
+        # Only the buffer is used by the error check
+        Test_ft_cli_errors.switchObj = VSwitch.__new__(VSwitch)
+
+    def teardown_class(cls):
+
+        cliErrorRegistry.entries = Test_ft_cli_errors.entries
+        cliErrorRegistry.regex = None
+        LogFlush()
+        if Test_ft_cli_errors.logDir is None:
+            del gbldata.ResultsDirectory
+        else:
+            gbldata.ResultsDirectory = Test_ft_cli_errors.logDir
+        shutil.rmtree(Test_ft_cli_errors.resultsDir)
+
+    def test_ladder(self):
+
+        for buffer in sampleBuffers:
+            retDict = self.switchObj.ErrorCheckCLI(buffer=buffer)
+            assert retDict['returnCode'] == LadderReturnCode(buffer), buffer
+            assert retDict['fatal'] is False
+        retDict = self.switchObj.ErrorCheckCLI(buffer=sampleBuffers[0])
+        assert retDict == dict(returnCode=0, fatal=False, errors=[])
+        retDict = self.switchObj.ErrorCheckCLI(buffer=sampleBuffers[13])
+        assert retDict['returnCode'] == 2
+        assert retDict['errors'] == [(3, "Unknown command"),
+                                     (2, "command not found")]
+
+    def test_fatal(self):
+
+        buffer = "switch# show run\r\nSegmentation fault (core dumped)\r\n" \
+            "bash: x: command not found\r\n"
+        retDict = self.switchObj.ErrorCheckCLI(buffer=buffer)
+        # The scan stops at the crash, the errors after it are not looked at
+        assert retDict['returnCode'] == 14
+        assert retDict['fatal'] is True
+        assert retDict['errors'] == [(14, "Segmentation fault")]
+        # Only a crash at the start of a line is fatal
+        retDict = self.switchObj.ErrorCheckCLI(
+            buffer="grep 'Segmentation fault' log\r\n")
+        assert retDict['returnCode'] == 0
+
+    def test_register(self):
+
+        registry = CliErrorRegistry()
+        registry.register(returnCode=2, pattern="command not found")
+        registry.register(returnCode=20, pattern="VLAN\s+\d+\s+not found",
+                          label="VLAN error")
+        assert registry.classify(buffer="VLAN 10 not found\r\n")['errors'] \
+            == [(20, "VLAN 10 not found")]
+        # A new signature is picked up by the regex compiled before it
+        registry.register(returnCode=21, pattern="Invalid MTU")
+        assert registry.classify(buffer="% Invalid MTU\r\n")['returnCode'] \
+            == 21
+        # Registering a code again replaces its signature
+        registry.register(returnCode=20, pattern="No such VLAN")
+        assert registry.classify(buffer="VLAN 10 not found\r\n")[
+            'returnCode'] == 0
+        assert registry.classify(buffer="No such VLAN\r\n")['returnCode'] \
+            == 20
+        # Patterns with groups or that do not compile are refused
+        assert registry.register(returnCode=22,
+                                 pattern="(bad) group").returnCode() == 1
+        assert registry.register(returnCode=22,
+                                 pattern="bad [").returnCode() == 1
+        assert [curEntry['returnCode'] for curEntry in registry.entries] \
+            == [2, 21, 20]
+
+    def test_feature_register(self):
+
+        # Feature modules add their signatures to the switch error check
+        buffer = "switch(config)# router ospf\r\n% OSPF is not enabled\r\n"
+        assert self.switchObj.ErrorCheckCLI(buffer=buffer)['returnCode'] == 0
+        assert CliErrorRegister(returnCode=40,
+                                pattern="OSPF is not enabled",
+                                label="OSPF error").returnCode() == 0
+        retDict = self.switchObj.ErrorCheckCLI(buffer=buffer)
+        assert retDict['returnCode'] == 40
+        assert retDict['errors'] == [(40, "OSPF is not enabled")]
+        # The built in signatures still apply
+        assert self.switchObj.ErrorCheckCLI(
+            buffer="% Unknown command.\r\n")['returnCode'] == 3
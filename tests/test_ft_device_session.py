@@ -0,0 +1,194 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import os
+import pytest
+from opstestfw import *
+from opstestfw.switch.CLI import *
+
+# Device session tests.  The devices are attached to the local device
+# emulator, which waits before answering every command so requests on
+# different sessions visibly overlap.
+topoDict = {"topoTarget": "dut01 dut02 dut03",
+            "topoDevices": "dut01 dut02 dut03 wrkston01",
+            "topoLinks": "lnk01:dut01:dut02,\
+                          lnk02:dut02:dut03,\
+                          lnk03:dut03:wrkston01",
+            "topoFilters": "dut01:system-category:switch,\
+                            dut02:system-category:switch,\
+                            dut03:system-category:switch,\
+                            wrkston01:system-category:workstation"}
+
+switches = ["dut01", "dut02", "dut03"]
+
+emulatorLatency = 0.5
+
+
+def OwnOutputCheck(topoObj, device, buffer):
+    # Canned output names the device it came from, and only that device
+    for curDev in topoObj.deviceObjList():
+        deviceName = topoObj.deviceObjGet(device=curDev).device
+        if curDev == device:
+            assert deviceName + " line 10 " in buffer
+        else:
+            assert deviceName + " line" not in buffer
+
+
+def VtyshEnter(sessions):
+    requests = [sessions[curDev].submit(sessions[curDev].deviceObj.VtyshShell,
+                                        enter=True)
+                for curDev in switches]
+    for retStruct in DeviceRequestsWait(requests):
+        assert retStruct.returnCode() == 0
+
+
+def SessionFail(**kwargs):
+    raise ValueError("session failure on " + kwargs.get('device'))
+
+
+def SessionExit(**kwargs):
+    # Lost connections end the interaction with exit()
+    exit(105)
+
+
+class Test_ft_device_session:
+
+    def setup_class(cls):
+
+        if TopologyPoolEnabled() is True:
+            pytest.skip("Emulated devices are not pooled - unset VSIWARMPOOL")
+        Test_ft_device_session.emulatorEnv = \
+            os.environ.get('VSIEMULATOR', None)
+        os.environ['VSIEMULATOR'] = "--latency %.1f" % emulatorLatency
+        Test_ft_device_session.testObj = testEnviron(topoDict=topoDict)
+        Test_ft_device_session.topoObj = \
+            Test_ft_device_session.testObj.topoObjGet()
+        Test_ft_device_session.sessions = \
+            DeviceSessionsOpen(topology=Test_ft_device_session.topoObj,
+                               devices=switches)
+
+    def teardown_class(cls):
+
+        DeviceSessionsClose(Test_ft_device_session.sessions)
+        Test_ft_device_session.topoObj.terminate_nodes()
+        if Test_ft_device_session.emulatorEnv is None:
+            del os.environ['VSIEMULATOR']
+        else:
+            os.environ['VSIEMULATOR'] = Test_ft_device_session.emulatorEnv
+
+    def test_open(self):
+
+        assert sorted(self.sessions.keys()) == switches
+        for curDev in switches:
+            assert self.sessions[curDev].deviceObj is \
+                self.topoObj.deviceObjGet(device=curDev)
+            assert self.sessions[curDev].worker.is_alive()
+
+    def test_concurrent(self):
+
+        # Every session enters vtysh and runs two show commands, in order
+        requests = []
+        for curDev in switches:
+            curSession = self.sessions[curDev]
+            requests.append(curSession.submit(
+                curSession.deviceObj.VtyshShell, enter=True))
+            requests.append(curSession.interact(command="show vlan"))
+            requests.append(curSession.interact(command="show interface"))
+        results = DeviceRequestsWait(requests)
+        for (index, curDev) in enumerate(switches):
+            (enterStruct, vlanDict, interfaceDict) = \
+                results[index * 3:index * 3 + 3]
+            assert enterStruct.returnCode() == 0
+            assert vlanDict['returnCode'] == 0
+            assert interfaceDict['returnCode'] == 0
+            OwnOutputCheck(self.topoObj, curDev, vlanDict['buffer'])
+            OwnOutputCheck(self.topoObj, curDev, interfaceDict['buffer'])
+            assert "show vlan" in vlanDict['buffer']
+            assert "show interface" in interfaceDict['buffer']
+            # A session runs its requests one after the other
+            (enterRequest, vlanRequest, interfaceRequest) = \
+                requests[index * 3:index * 3 + 3]
+            assert vlanRequest.startTime >= enterRequest.endTime
+            assert interfaceRequest.startTime >= vlanRequest.endTime
+            assert vlanRequest.elapsed() >= emulatorLatency
+
+        # The sessions run side by side, the show commands of all the
+        # switches overlap
+        showRequests = [curRequest for (index, curRequest)
+                        in enumerate(requests) if index % 3 == 1]
+        assert max([curRequest.startTime for curRequest in showRequests]) < \
+            min([curRequest.endTime for curRequest in showRequests])
+
+    def test_library_call(self):
+
+        requests = [self.sessions[curDev].call(showRun)
+                    for curDev in switches]
+        results = DeviceRequestsWait(requests)
+        for (curDev, retStruct) in zip(switches, results):
+            assert retStruct.returnCode() == 0
+            OwnOutputCheck(self.topoObj, curDev, retStruct.buffer())
+
+    def test_batch(self):
+
+        VtyshEnter(self.sessions)
+        requests = [self.sessions[curDev].batch(commands=["show vlan",
+                                                          "show lldp"])
+                    for curDev in switches]
+        for (curDev, results) in zip(switches, DeviceRequestsWait(requests)):
+            assert len(results) == 2
+            for curResult in results:
+                assert curResult['returnCode'] == 0
+                OwnOutputCheck(self.topoObj, curDev, curResult['buffer'])
+
+    def test_errors(self):
+
+        # A command error is returned for its device only
+        VtyshEnter(self.sessions)
+        requests = []
+        for curDev in switches:
+            command = "show vlan"
+            if curDev == "dut02":
+                command = "shw vlan"
+            requests.append(self.sessions[curDev].interact(command=command))
+        results = DeviceRequestsWait(requests)
+        assert [curResult['returnCode'] for curResult in results] == \
+            [0, 3, 0]
+        assert "Unknown command" in results[1]['buffer']
+
+        # Exceptions are raised again in the caller, and the session keeps
+        # running the requests after them
+        failRequest = self.sessions["dut01"].submit(SessionFail,
+                                                    device="dut01")
+        exitRequest = self.sessions["dut02"].submit(SessionExit)
+        nextRequest = self.sessions["dut01"].interact(command="show vlan")
+        with pytest.raises(ValueError) as excInfo:
+            failRequest.result()
+        assert "dut01" in str(excInfo.value)
+        with pytest.raises(SystemExit):
+            exitRequest.result()
+        assert nextRequest.result()['returnCode'] == 0
+        assert self.sessions["dut01"].worker.is_alive()
+        assert self.sessions["dut02"].worker.is_alive()
+
+    def test_timeout(self):
+
+        request = self.sessions["dut03"].interact(command="show vlan")
+        # Not done yet, the emulator is still waiting to answer
+        assert request.result(timeout=0.05) is None
+        assert request.done() is False
+        assert DeviceRequestsWait([request], timeout=0.05) == [None]
+        assert request.result(timeout=emulatorLatency * 10)[
+            'returnCode'] == 0
+        assert request.done() is True
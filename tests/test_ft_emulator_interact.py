@@ -0,0 +1,192 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import os
+import time
+import pytest
+from opstestfw import *
+
+# Interaction layer tests and benchmark.  The devices are attached to the
+# local device emulator instead of docker containers, so the numbers measure
+# the framework and not the device.  Extra emulator options (latency, output
+# size, paging) can be given in the VSIEMULATOR environment variable, the
+# output checks assume the default of 10 canned lines per command.
+topoDict = {"topoTarget": "dut01",
+            "topoDevices": "dut01 dut02 wrkston01",
+            "topoLinks": "lnk01:dut01:wrkston01",
+            "topoFilters": "dut01:system-category:switch,\
+                            dut02:system-category:switch,\
+                            wrkston01:system-category:workstation"}
+
+benchCommands = int(os.environ.get('VSIBENCHCOMMANDS', "50"))
+
+
+def CannedOutputCheck(deviceObj, buffer):
+    # Every line of canned output names the device it came from
+    assert deviceObj.device + " line 1 " in buffer
+    assert deviceObj.device + " line 10 " in buffer
+
+
+def InteractBenchmark(deviceObj, commands):
+    startTime = time.time()
+    for curCommand in commands:
+        retStruct = deviceObj.DeviceInteract(command=curCommand)
+        assert retStruct.get('returnCode') == 0
+        CannedOutputCheck(deviceObj, retStruct.get('buffer'))
+    return time.time() - startTime
+
+
+class Test_ft_emulator_interact:
+
+    def setup_class(cls):
+
+        if TopologyPoolEnabled() is True:
+            pytest.skip("Emulated devices are not pooled - unset VSIWARMPOOL")
+        Test_ft_emulator_interact.emulatorEnv = \
+            os.environ.get('VSIEMULATOR', None)
+        if Test_ft_emulator_interact.emulatorEnv is None:
+            os.environ['VSIEMULATOR'] = "1"
+        Test_ft_emulator_interact.testObj = testEnviron(topoDict=topoDict)
+        Test_ft_emulator_interact.topoObj = \
+            Test_ft_emulator_interact.testObj.topoObjGet()
+
+    def teardown_class(cls):
+
+        Test_ft_emulator_interact.topoObj.terminate_nodes()
+        if Test_ft_emulator_interact.emulatorEnv is None:
+            del os.environ['VSIEMULATOR']
+
+    def test_vtysh_helper_fresh_switch(self):
+
+        # Nothing has been sent to dut02 yet, the vtysh helper connects it
+        dut02Obj = self.topoObj.deviceObjGet(device="dut02")
+        assert dut02Obj.ConnectPending() is True
+        retStruct = dut02Obj.VtyshShell(enter=True)
+        assert retStruct.returnCode() == 0
+        assert dut02Obj.deviceContext == "vtyShell"
+        retStruct = dut02Obj.ConfigVtyShell(enter=True)
+        assert retStruct.returnCode() == 0
+        assert dut02Obj.deviceContext == "vtyShellConfig"
+        retStruct = dut02Obj.ConfigVtyShell(enter=False)
+        assert retStruct.returnCode() == 0
+        assert dut02Obj.deviceContext == "vtyShell"
+        retStruct = dut02Obj.VtyshShell(enter=False)
+        assert retStruct.returnCode() == 0
+        assert dut02Obj.deviceContext == "linux"
+
+    def test_interact_throughput(self):
+
+        dut01Obj = self.topoObj.deviceObjGet(device="dut01")
+        wrkston01Obj = self.topoObj.deviceObjGet(device="wrkston01")
+        for (deviceObj, command) in ((dut01Obj, "uname -a"),
+                                     (wrkston01Obj, "uname -a")):
+            deviceObj.InteractStatsReset()
+            elapsed = InteractBenchmark(deviceObj, [command] * benchCommands)
+            stats = deviceObj.InteractStatsGet()
+            assert stats['commands'] == benchCommands
+            LogOutput('info', "%s: %d commands in %.2f seconds, %.1f per "
+                      "second, average overhead %.4f seconds"
+                      % (deviceObj.device, benchCommands, elapsed,
+                         benchCommands / elapsed, stats['avgOverhead']))
+        assert dut01Obj.deviceContext == "linux"
+
+    def test_interact_batch(self):
+
+        wrkston01Obj = self.topoObj.deviceObjGet(device="wrkston01")
+        commands = ["uname -a"] * benchCommands
+        serialTime = InteractBenchmark(wrkston01Obj, commands)
+        startTime = time.time()
+        results = wrkston01Obj.DeviceInteractBatch(commands=commands)
+        batchTime = time.time() - startTime
+        assert len(results) == benchCommands
+        for curResult in results:
+            assert curResult.get('returnCode') == 0
+            CannedOutputCheck(wrkston01Obj, curResult.get('buffer'))
+            assert "OPSBATCH" not in curResult.get('buffer')
+        LogOutput('info', "%d commands: serial %.2f seconds, batched %.2f "
+                  "seconds" % (benchCommands, serialTime, batchTime))
+
+        # The exit status of every command comes back with its output
+        results = wrkston01Obj.DeviceInteractBatch(
+            commands=["true", "false", "uname -a"])
+        assert [curResult.get('returnCode') for curResult in results] == \
+            [0, 1, 0]
+        CannedOutputCheck(wrkston01Obj, results[2].get('buffer'))
+        for (curResult, command) in zip(results, ["true", "false"]):
+            assert curResult.get('buffer').lstrip().startswith(command)
+
+    def test_interact_batch_switch(self):
+
+        dut01Obj = self.topoObj.deviceObjGet(device="dut01")
+        results = dut01Obj.DeviceInteractBatch(
+            commands=["true", "false", "uname -a"])
+        assert [curResult.get('returnCode') for curResult in results] == \
+            [0, 1, 0]
+        # Each buffer starts with its own command, not the previous prompt
+        for (curResult, command) in zip(results,
+                                        ["true", "false", "uname -a"]):
+            assert curResult.get('buffer').lstrip().startswith(command)
+        CannedOutputCheck(dut01Obj, results[2].get('buffer'))
+
+        retStruct = dut01Obj.VtyshShell(enter=True)
+        assert retStruct.returnCode() == 0
+        results = dut01Obj.DeviceInteractBatch(
+            commands=["show version", "bogus"])
+        assert [curResult.get('returnCode') for curResult in results] == \
+            [0, 3]
+        assert results[1].get('buffer').lstrip().startswith("bogus")
+        retStruct = dut01Obj.VtyshShell(enter=False)
+        assert retStruct.returnCode() == 0
+        assert dut01Obj.deviceContext == "linux"
+
+    def test_interact_low_latency(self):
+
+        dut01Obj = self.topoObj.deviceObjGet(device="dut01")
+        commands = ["uname -a"] * benchCommands
+        dut01Obj.setLowLatency(enable=False)
+        defaultTime = InteractBenchmark(dut01Obj, commands)
+        dut01Obj.setLowLatency(enable=True)
+        lowLatencyTime = InteractBenchmark(dut01Obj, commands)
+        assert dut01Obj.deviceContext == "linux"
+        LogOutput('info', "%d commands: default %.2f seconds, low latency "
+                  "%.2f seconds" % (benchCommands, defaultTime,
+                                    lowLatencyTime))
+
+    def test_vtysh_one_shot(self):
+
+        dut01Obj = self.topoObj.deviceObjGet(device="dut01")
+        commands = ["show version"] * benchCommands
+        startTime = time.time()
+        retStruct = dut01Obj.VtyshOneShot(commands=commands)
+        oneShotTime = time.time() - startTime
+        assert retStruct.get('returnCode') == 0
+        # One block of canned output per command
+        lastLine = "\n" + dut01Obj.device + " line 10 "
+        assert retStruct.get('buffer').count(lastLine) == benchCommands
+        assert dut01Obj.deviceContext == "linux"
+
+        retStruct = dut01Obj.VtyshShell(enter=True)
+        assert retStruct.returnCode() == 0
+        assert dut01Obj.deviceContext == "vtyShell"
+        interactiveTime = InteractBenchmark(dut01Obj, commands)
+        # vtysh errors are caught by the CLI error check
+        retStruct = dut01Obj.DeviceInteract(command="bogus")
+        assert retStruct.get('returnCode') == 3
+        retStruct = dut01Obj.VtyshShell(enter=False)
+        assert retStruct.returnCode() == 0
+        assert dut01Obj.deviceContext == "linux"
+        LogOutput('info', "%d vtysh commands: one shot %.2f seconds, "
+                  "interactive %.2f seconds" % (benchCommands, oneShotTime,
+                                                interactiveTime))
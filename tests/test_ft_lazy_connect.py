@@ -0,0 +1,97 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import os
+import pytest
+from opstestfw.switch.CLI import *
+from opstestfw import *
+
+# Every test case starts on a switch nothing has been sent to yet, so the
+# call under test is the one that connects the switch.  Runs on docker or,
+# with VSIEMULATOR set, on the local device emulator.
+topoDict = {"topoTarget": "dut01",
+            "topoDevices": "dut01 dut02 dut03 dut04 dut05",
+            "topoFilters": "dut01:system-category:switch,\
+                            dut02:system-category:switch,\
+                            dut03:system-category:switch,\
+                            dut04:system-category:switch,\
+                            dut05:system-category:switch"}
+
+
+class Test_ft_lazy_connect:
+
+    def setup_class(cls):
+
+        if os.environ.get('VSIEAGERCONNECT', None) is not None:
+            pytest.skip("Devices are connected eagerly - unset "
+                        "VSIEAGERCONNECT")
+        Test_ft_lazy_connect.testObj = testEnviron(topoDict=topoDict)
+        Test_ft_lazy_connect.topoObj = \
+            Test_ft_lazy_connect.testObj.topoObjGet()
+
+    def teardown_class(cls):
+
+        Test_ft_lazy_connect.topoObj.terminate_nodes()
+
+    def freshSwitchGet(self, device):
+        switchObj = self.topoObj.deviceObjGet(device=device)
+        assert switchObj.ConnectPending() is True
+        return switchObj
+
+    def test_vtysh_shell_first(self):
+
+        dut02Obj = self.freshSwitchGet("dut02")
+        retStruct = dut02Obj.VtyshShell(enter=True)
+        assert retStruct.returnCode() == 0
+        assert dut02Obj.ConnectPending() is False
+        assert dut02Obj.deviceContext == "vtyShell"
+        retStruct = dut02Obj.VtyshShell(enter=False)
+        assert retStruct.returnCode() == 0
+        assert dut02Obj.deviceContext == "linux"
+
+    def test_config_helper_first(self):
+
+        dut01Obj = self.freshSwitchGet("dut01")
+        retStruct = AddVlan(deviceObj=dut01Obj, vlanId=10)
+        assert retStruct.returnCode() == 0
+        assert dut01Obj.deviceContext == "linux"
+
+    def test_vtysh_one_shot_first(self):
+
+        dut03Obj = self.freshSwitchGet("dut03")
+        retStruct = dut03Obj.VtyshOneShot(commands=["show version"])
+        assert retStruct.get('returnCode') == 0
+        assert dut03Obj.deviceContext == "linux"
+        # The session is still open
+        retStruct = dut03Obj.DeviceInteract(command="uname -a")
+        assert retStruct.get('returnCode') == 0
+
+    def test_batch_first(self):
+
+        dut04Obj = self.freshSwitchGet("dut04")
+        results = dut04Obj.DeviceInteractBatch(commands=["true", "true"])
+        assert [curResult['returnCode'] for curResult in results] == [0, 0]
+
+    def test_reconnect_pending(self):
+
+        dut05Obj = self.freshSwitchGet("dut05")
+        retStruct = dut05Obj.Reconnect()
+        assert retStruct.returnCode() == 0
+        assert dut05Obj.ConnectPending() is False
+        expectHndl = dut05Obj.expectHndl
+        retStruct = dut05Obj.DeviceInteract(command="uname -a")
+        assert retStruct.get('returnCode') == 0
+        # No second session was opened by the first use
+        assert dut05Obj.expectHndl is expectHndl
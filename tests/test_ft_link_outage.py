@@ -0,0 +1,124 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import pytest
+from opstestfw import *
+
+# LinkOutageMeasure only looks at the transitions and replies it is given,
+# so these cases run it on synthetic probe replies without a topology.
+interval = 0.1
+
+
+def RepliesBuild(start, end, skip=()):
+    # One reply per interval from start up to end, less the skipped seqs
+    replies = []
+    seq = 1
+    stamp = start
+    while stamp < end - interval / 2:
+        if seq not in skip:
+            replies.append((stamp, seq))
+        seq += 1
+        stamp = round(stamp + interval, 6)
+    return replies
+
+
+def TransitionBuild(link, status, start):
+    return dict(link=link, status=status, start=start, end=start + 0.01)
+
+
+class Test_ft_link_outage:
+
+    def setup_class(cls):
+
+        # No topology is built, the method does not use the object state
+        Test_ft_link_outage.topoObj = Topology.__new__(Topology)
+
+    def test_outage_between_replies(self):
+
+        # Replies stop at 10.9 and come back at 11.5 after the link goes
+        # down at 11.0, then flow until the link comes up again
+        replies = RepliesBuild(10.0, 13.0, skip=range(11, 16))
+        transitions = [TransitionBuild("lnk01", "down", 11.0),
+                       TransitionBuild("lnk01", "up", 12.0)]
+        measured = self.topoObj.LinkOutageMeasure(transitions=transitions,
+                                                  replies=replies,
+                                                  interval=interval,
+                                                  end=13.0)
+        assert len(measured) == 2
+        assert measured[0]['outage'] == pytest.approx(0.5)
+        assert measured[0]['lost'] == 5
+        assert measured[1]['outage'] == pytest.approx(0.0)
+        assert measured[1]['lost'] == 0
+        # The transitions passed in are left alone
+        assert 'outage' not in transitions[0]
+
+    def test_outage_open_at_next_transition(self):
+
+        # Traffic stops at the first transition and has not come back when
+        # the second one starts
+        replies = RepliesBuild(10.0, 13.0, skip=range(11, 26))
+        transitions = [TransitionBuild("lnk01", "down", 11.0),
+                       TransitionBuild("lnk02", "down", 12.0)]
+        measured = self.topoObj.LinkOutageMeasure(transitions=transitions,
+                                                  replies=replies,
+                                                  interval=interval,
+                                                  end=13.0)
+        # From the last reply at 10.9 up to the next transition
+        assert measured[0]['outage'] == pytest.approx(1.0)
+        assert measured[0]['lost'] == 10
+        # The outage still open at the second transition counts from the
+        # same last reply, up to the reply at 12.5
+        assert measured[1]['outage'] == pytest.approx(1.5)
+        assert measured[1]['lost'] == 15
+
+    def test_outage_open_at_end(self):
+
+        replies = RepliesBuild(10.0, 11.0)
+        transitions = [TransitionBuild("lnk01", "down", 11.0)]
+        measured = self.topoObj.LinkOutageMeasure(transitions=transitions,
+                                                  replies=replies,
+                                                  interval=interval,
+                                                  end=12.0)
+        assert measured[0]['outage'] == pytest.approx(1.0)
+        # Without the end of the probing only gaps between replies count
+        measured = self.topoObj.LinkOutageMeasure(transitions=transitions,
+                                                  replies=replies,
+                                                  interval=interval)
+        assert measured[0]['outage'] == 0.0
+
+    def test_no_replies(self):
+
+        transitions = [TransitionBuild("lnk01", "down", 11.0),
+                       TransitionBuild("lnk01", "up", 12.0)]
+        measured = self.topoObj.LinkOutageMeasure(transitions=transitions,
+                                                  replies=[],
+                                                  interval=interval,
+                                                  end=13.0)
+        # Every transition is an outage up to the end of its window
+        assert measured[0]['outage'] == pytest.approx(1.0)
+        assert measured[0]['lost'] == 10
+        assert measured[1]['outage'] == pytest.approx(1.0)
+        assert measured[1]['lost'] == 10
+        assert self.topoObj.LinkOutageMeasure(transitions=[], replies=[],
+                                              interval=interval) == []
+
+        # Replies only start after the transition, the gap counts from it
+        replies = RepliesBuild(11.3, 13.0)
+        measured = self.topoObj.LinkOutageMeasure(transitions=transitions,
+                                                  replies=replies,
+                                                  interval=interval,
+                                                  end=13.0)
+        assert measured[0]['outage'] == pytest.approx(0.3)
+        assert measured[0]['lost'] == 3
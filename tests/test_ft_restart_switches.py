@@ -0,0 +1,117 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import os
+import shutil
+import tempfile
+import threading
+from opstestfw import *
+from opstestfw import gbldata
+
+# RestartSwitches is run against a stand-in Mininet network that records the
+# thread every call is made on, so no containers are needed.
+
+
+class FakeSwitch(object):
+
+    def __init__(self, net, name, containerName, testdir):
+        self.net = net
+        self.name = name
+        self.container_name = containerName
+        self.testdir = testdir
+        self.ports = dict()
+        os.mkdir(testdir + "/" + name)
+
+    def start(self, controllers):
+        self.net.calls.append(("start", self.name,
+                               threading.current_thread()))
+
+
+class FakeNet(object):
+
+    def __init__(self, testdir, names):
+        self.testdir = testdir
+        self.calls = []
+        self.links = []
+        self.hosts = []
+        self.controllers = []
+        self.switches = [FakeSwitch(self, name, "old_" + name, testdir)
+                         for name in names]
+        self.nameToNode = dict((curSwitch.name, curSwitch)
+                               for curSwitch in self.switches)
+
+    def delNode(self, node):
+        self.calls.append(("delNode", node.name, threading.current_thread()))
+        self.switches.remove(node)
+        del self.nameToNode[node.name]
+
+    def addSwitch(self, name, **kwargs):
+        self.calls.append(("addSwitch", name, threading.current_thread()))
+        newSwitch = FakeSwitch(self, name, "new_" + name, self.testdir)
+        self.switches.append(newSwitch)
+        self.nameToNode[name] = newSwitch
+        return newSwitch
+
+
+class Test_ft_restart_switches:
+
+    def setup_class(cls):
+
+        Test_ft_restart_switches.resultsDir = tempfile.mkdtemp()
+        Test_ft_restart_switches.logDir = getattr(gbldata,
+                                                  'ResultsDirectory', None)
+        gbldata.ResultsDirectory = Test_ft_restart_switches.resultsDir + "/"
+
+    def teardown_class(cls):
+
+        LogFlush()
+        if Test_ft_restart_switches.logDir is None:
+            del gbldata.ResultsDirectory
+        else:
+            gbldata.ResultsDirectory = Test_ft_restart_switches.logDir
+        shutil.rmtree(Test_ft_restart_switches.resultsDir)
+
+    def test_restart(self):
+
+        names = ["dut%02d" % curIndex for curIndex in range(1, 7)]
+        topoObj = Topology.__new__(Topology)
+        topoObj.id = "1"
+        topoObj.testdir = tempfile.mkdtemp(dir=self.resultsDir)
+        topoObj.net = FakeNet(topoObj.testdir, names)
+        topoObj.deviceObj = dict()
+        topoObj.topo = dict()
+        for name in names:
+            topoObj.topo[name] = "old_" + name
+            topoObj.topo["old_" + name] = name
+
+        retStruct = topoObj.RestartSwitches(
+            switches=["old_" + name for name in names])
+        assert retStruct.returnCode() == 0
+        assert sorted(retStruct.data.keys()) == names
+        for name in names:
+            assert topoObj.topo[name] == "new_" + name
+            assert topoObj.topo["new_" + name] == name
+            assert "old_" + name not in topoObj.topo
+
+        # The network is only changed from the calling thread, the new
+        # switches are started on the worker pool
+        mainThread = threading.current_thread()
+        for (call, name, callThread) in topoObj.net.calls:
+            if call == "start":
+                assert callThread is not mainThread
+            else:
+                assert callThread is mainThread
+        assert sorted([name for (call, name, callThread)
+                       in topoObj.net.calls if call == "start"]) == names
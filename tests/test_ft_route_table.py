@@ -0,0 +1,257 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import shutil
+import tempfile
+from opstestfw import *
+from opstestfw import gbldata
+from opstestfw.switch.CLI import *
+
+# The route table is parsed out of captured show output, so these cases
+# need no devices.
+showRibBuffer = "\r\n".join([
+    "Displaying ipv4 rib entries ",
+    "",
+    "'*' denotes selected",
+    "'[x/y]' denotes [distance/metric]",
+    "",
+    "*0.0.0.0/0,  1 unicast next-hops",
+    "\t*via  192.168.1.1,  [1/0],  static",
+    "*10.0.0.0/8,  1 unicast next-hops",
+    "\t*via  10.255.0.1,  [20/0],  BGP",
+    "*10.0.10.0/24,  2 unicast next-hops",
+    "\t*via  10.0.30.1,  [1/0],  static",
+    "\tvia  10.0.40.1,  [1/0],  static",
+    "*11.1.1.0/24,  1 unicast next-hops",
+    "\t*via  11.0.0.2,  [1/0],  static",
+    "*1.1.1.0/24,  2 unicast next-hops",
+    "\t*via  1.0.0.2,  [1/0],  static",
+    "\t*via  1.0.0.3,  [20/0],  BGP",
+    "",
+    "Displaying ipv6 rib entries ",
+    "",
+    "'*' denotes selected",
+    "'[x/y]' denotes [distance/metric]",
+    "",
+    "*2001::/64,  1 unicast next-hops",
+    "\t*via  2002::2,  [1/0],  static",
+    "", ""])
+
+showIpv6RouteBuffer = "\r\n".join([
+    "Displaying ipv6 routes selected for forwarding",
+    "",
+    "'[x/y]' denotes [distance/metric]",
+    "",
+    "2010:bd9::/120,  1 unicast next-hops",
+    "\tvia  2000::2,  [1/0],  static",
+    "2010:bd9::/32,  2 unicast next-hops",
+    "\tvia  2000::3,  [1/0],  static",
+    "\tvia  2000::4,  [1/0],  static",
+    "", ""])
+
+
+class FixtureDevice(object):
+
+    # Switch returning the same captured output for every command
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.commands = []
+
+    def VtyshShell(self, **kwargs):
+        return returnStruct(returnCode=0, buffer="")
+
+    def DeviceInteract(self, **kwargs):
+        self.commands.append(kwargs.get('command'))
+        return dict(returnCode=0, buffer=self.buffer)
+
+    def VtyshOneShot(self, **kwargs):
+        self.commands.extend(kwargs.get('commands'))
+        return dict(returnCode=0, buffer=self.buffer)
+
+
+def NexthopDict(distance, metric, routeType):
+    return dict(Distance=distance, Metric=metric, RouteType=routeType)
+
+
+class Test_ft_route_table:
+
+    def setup_class(cls):
+
+        Test_ft_route_table.resultsDir = tempfile.mkdtemp()
+        Test_ft_route_table.logDir = getattr(gbldata, 'ResultsDirectory',
+                                             None)
+        gbldata.ResultsDirectory = Test_ft_route_table.resultsDir + "/"
+
+    def teardown_class(cls):
+
+        LogFlush()
+        if Test_ft_route_table.logDir is None:
+            del gbldata.ResultsDirectory
+        else:
+            gbldata.ResultsDirectory = Test_ft_route_table.logDir
+        shutil.rmtree(Test_ft_route_table.resultsDir)
+
+    def test_prefix_key(self):
+
+        assert RoutePrefixKey(route="10.0.10.0/24") == \
+            (4, 0x0a000a00, 24, 32)
+        assert RoutePrefixKey(route="10.0.10.1") == (4, 0x0a000a01, 32, 32)
+        assert RoutePrefixKey(route="2001::/64") == \
+            (6, 0x2001 << 112, 64, 128)
+        assert RoutePrefixKey(route="10.0.10.0/33") is None
+        assert RoutePrefixKey(route="10.0.10/x") is None
+        assert RoutePrefixKey(route="2001::zz/64") is None
+
+    def test_parse(self):
+
+        routeTable = RouteTable(buffer=showRibBuffer)
+        assert routeTable.Routes() == ["0.0.0.0/0", "10.0.0.0/8",
+                                       "10.0.10.0/24", "11.1.1.0/24",
+                                       "1.1.1.0/24", "2001::/64"]
+        entry = routeTable.EntryGet(route="10.0.10.0/24")
+        assert entry['NumberNexthops'] == "2"
+        assert entry['Nexthops'] == {
+            '10.0.30.1': dict(Distance="1", Metric="0", RouteType="static",
+                              Selected=True),
+            '10.0.40.1': dict(Distance="1", Metric="0", RouteType="static",
+                              Selected=False)}
+
+        routeTable = RouteTable(buffer=showIpv6RouteBuffer)
+        assert routeTable.Routes() == ["2010:bd9::/120", "2010:bd9::/32"]
+        assert sorted(routeTable.EntryGet(
+            route="2010:bd9::/32")['Nexthops'].keys()) == ["2000::3",
+                                                          "2000::4"]
+
+    def test_trie(self):
+
+        routeTable = RouteTable(buffer=showRibBuffer + showIpv6RouteBuffer)
+        # Prefixes written differently are found through the trie
+        assert routeTable.EntryGet(route="2001:0:0::/64")['Route'] == \
+            "2001::/64"
+        assert routeTable.EntryGet(route="2010:0bd9::/120")['Route'] == \
+            "2010:bd9::/120"
+        # Only the exact prefix length matches
+        assert routeTable.EntryGet(route="10.0.10.0/25") is None
+        assert routeTable.EntryGet(route="10.0.0.0/16") is None
+        assert routeTable.EntryGet(route="10.0.10.0") is None
+        assert routeTable.EntryGet(route="bad/24") is None
+
+    def test_longest_prefix_match(self):
+
+        routeTable = RouteTable(buffer=showRibBuffer + showIpv6RouteBuffer)
+        assert routeTable.LongestPrefixMatch(
+            address="10.0.10.7")['Route'] == "10.0.10.0/24"
+        assert routeTable.LongestPrefixMatch(
+            address="10.0.11.7")['Route'] == "10.0.0.0/8"
+        assert routeTable.LongestPrefixMatch(
+            address="192.0.2.1")['Route'] == "0.0.0.0/0"
+        assert routeTable.LongestPrefixMatch(
+            address="2010:bd9::5")['Route'] == "2010:bd9::/120"
+        assert routeTable.LongestPrefixMatch(
+            address="2010:bd9:1::5")['Route'] == "2010:bd9::/32"
+        # There is no IPv6 default route
+        assert routeTable.LongestPrefixMatch(address="3000::1") is None
+        assert routeTable.LongestPrefixMatch(address="not-an-ip") is None
+
+    def test_route_get(self):
+
+        routeTable = RouteTable(buffer=showRibBuffer)
+        assert routeTable.RouteGet(route="1.1.1.0/24", routeType="BGP") == {
+            'Route': "1.1.1.0/24",
+            'NumberNexthops': "2",
+            '1.0.0.3': NexthopDict("20", "0", "BGP")}
+        # No next-hop of the route type only sets the route
+        assert routeTable.RouteGet(route="10.0.0.0/8",
+                                   routeType="static") == \
+            dict(Route="10.0.0.0/8")
+        assert routeTable.RouteGet(route="10.9.9.0/24",
+                                   routeType="static") == \
+            dict(Route="10.9.9.0/24")
+
+    def test_verify(self):
+
+        routeTable = RouteTable(buffer=showRibBuffer)
+        expected = [
+            {'Route': "0.0.0.0/0", 'NumberNexthops': "1",
+             '192.168.1.1': NexthopDict("1", "0", "static")},
+            # Right route, one next-hop missing
+            {'Route': "10.0.10.0/24", 'NumberNexthops': "2",
+             '10.0.30.1': NexthopDict("1", "0", "static")},
+            # Not in the table
+            {'Route': "10.0.20.0/24", 'NumberNexthops': "1",
+             '10.0.50.1': NexthopDict("1", "0", "static")},
+            # Expected to be absent but present
+            {'Route': "11.1.1.0/24"},
+            # Expected to be absent and absent
+            {'Route': "12.1.1.0/24"},
+            # Expected to be absent, only has next-hops of another type
+            {'Route': "10.0.0.0/8"}]
+        result = routeTable.Verify(expected=expected, routeType="static")
+        assert result['missing'] == ["10.0.20.0/24"]
+        assert result['present'] == ["11.1.1.0/24"]
+        assert result['wrongNexthops'] == [(expected[1], {
+            'Route': "10.0.10.0/24", 'NumberNexthops': "2",
+            '10.0.30.1': NexthopDict("1", "0", "static"),
+            '10.0.40.1': NexthopDict("1", "0", "static")})]
+        # Routes with static next-hops that were not listed
+        assert result['extra'] == ["1.1.1.0/24", "2001::/64"]
+
+        expected = [routeTable.RouteGet(route=curRoute, routeType="static")
+                    for curRoute in routeTable.Routes()]
+        assert routeTable.Verify(expected=expected, routeType="static") == \
+            dict(missing=[], present=[], wrongNexthops=[], extra=[])
+
+    def test_show_rib_exact_prefix(self):
+
+        device = FixtureDevice(showRibBuffer)
+        # 1.1.1.0/24 is also a substring of 11.1.1.0/24, which comes first
+        # in the output.  The route is looked up by its exact prefix.
+        data = get_route_from_show_rib(deviceObj=device, route="1.1.1.0/24",
+                                       routetype="static").data
+        assert data == {'Route': "1.1.1.0/24",
+                        'NumberNexthops': "2",
+                        '1.0.0.2': NexthopDict("1", "0", "static")}
+        data = get_route_from_show_rib(deviceObj=device, route="1.1.1.0/2",
+                                       routetype="static").data
+        assert data == dict(Route="1.1.1.0/2")
+        # The dots of the prefix are not wildcards
+        data = get_route_from_show_rib(deviceObj=device, route="1.1.1.0/24",
+                                       routetype="static").data
+        assert '11.0.0.2' not in data
+        assert device.commands == ["show rib"] * 3
+
+    def test_show_rib_snapshot(self):
+
+        device = FixtureDevice(showRibBuffer)
+        retStruct = RouteTableGet(deviceObj=device, oneShot=True)
+        assert retStruct.returnCode() == 0
+        assert device.commands == ["show rib"]
+        routeTable = retStruct.data
+        data = get_route_from_show_rib(routeTable=routeTable,
+                                       route="10.0.10.0/24",
+                                       routetype="static").data
+        assert data == {'Route': "10.0.10.0/24",
+                        'NumberNexthops': "2",
+                        '10.0.30.1': NexthopDict("1", "0", "static"),
+                        '10.0.40.1': NexthopDict("1", "0", "static")}
+        # Looked up in the snapshot, the switch is not asked again
+        assert device.commands == ["show rib"]
+
+        data = get_route_from_show_rib(deviceObj=device, route="2001::/64",
+                                       routetype="static",
+                                       oneShot=True).data
+        assert data == {'Route': "2001::/64",
+                        'NumberNexthops': "1",
+                        '2002::2': NexthopDict("1", "0", "static")}
@@ -0,0 +1,233 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import shutil
+import tempfile
+from opstestfw import *
+from opstestfw import gbldata
+from opstestfw.switch.CLI import *
+
+# The running configuration is parsed out of captured show running-config
+# output, so these cases need no devices.
+runningConfigBuffer = "\r\n".join([
+    "switch# show running-config",
+    "Current configuration:",
+    "!",
+    "!",
+    "hostname switch",
+    "ip route 10.0.0.0/24 1.1.1.10",
+    "ip route 20.0.0.0/24 2.2.2.2 20",
+    "ipv6 route 2001::/64 2002::2",
+    "vlan 10",
+    "    no shutdown",
+    "interface 1",
+    "    no shutdown",
+    "    ip   address 10.0.0.1/24",
+    "interface 2",
+    "    no shutdown",
+    "    exit",
+    "interface lag 1",
+    "router bgp 1",
+    "    bgp router-id 1.1.1.1",
+    "    address-family ipv6 unicast",
+    "        network 2001::/64",
+    "    exit-address-family",
+    "    network 10.0.0.0/24",
+    "!",
+    "switch# ", ""])
+
+changedConfigBuffer = "\r\n".join([
+    "Current configuration:",
+    "!",
+    "hostname switch",
+    "ip route 10.0.0.0/24 1.1.1.10",
+    "vlan 10",
+    "    no shutdown",
+    "interface 1",
+    "    ip address 10.0.0.1/24",
+    "interface 3",
+    "    no shutdown",
+    "interface lag 1",
+    "router bgp 1",
+    "    bgp router-id 1.1.1.1",
+    "    network 10.0.0.0/24",
+    "!", ""])
+
+
+class FixtureDevice(object):
+
+    # Switch returning the same captured output for every command
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.commands = []
+
+    def VtyshShell(self, **kwargs):
+        return returnStruct(returnCode=0, buffer="")
+
+    def DeviceInteract(self, **kwargs):
+        self.commands.append(kwargs.get('command'))
+        return dict(returnCode=0, buffer=self.buffer)
+
+
+class Test_ft_running_config:
+
+    def setup_class(cls):
+
+        Test_ft_running_config.resultsDir = tempfile.mkdtemp()
+        Test_ft_running_config.logDir = getattr(gbldata, 'ResultsDirectory',
+                                                None)
+        gbldata.ResultsDirectory = Test_ft_running_config.resultsDir + "/"
+
+    def teardown_class(cls):
+
+        LogFlush()
+        if Test_ft_running_config.logDir is None:
+            del gbldata.ResultsDirectory
+        else:
+            gbldata.ResultsDirectory = Test_ft_running_config.logDir
+        shutil.rmtree(Test_ft_running_config.resultsDir)
+
+    def test_contexts(self):
+
+        config = RunningConfigTree(buffer=runningConfigBuffer)
+        # Prompts, the command echo, the header and the ! lines are dropped
+        assert config.CommandsGet() == [
+            "hostname switch",
+            "ip route 10.0.0.0/24 1.1.1.10",
+            "ip route 20.0.0.0/24 2.2.2.2 20",
+            "ipv6 route 2001::/64 2002::2",
+            "vlan 10", "interface 1", "interface 2", "interface lag 1",
+            "router bgp 1"]
+        assert config.ContextsGet(prefix="interface") == [
+            ("interface 1",), ("interface 2",), ("interface lag 1",)]
+        assert config.ContextsGet(prefix="interface lag") == \
+            [("interface lag 1",)]
+        # Commands are filed under the context line above them, with their
+        # white space folded
+        assert config.CommandsGet(context="interface 1") == \
+            ["no shutdown", "ip address 10.0.0.1/24"]
+        assert config.CommandsGet(context=("vlan 10",)) == ["no shutdown"]
+        # An empty context is still a context
+        assert config.CommandsGet(context="interface lag 1") == []
+        assert ("interface lag 1",) in config.contexts
+        assert config.CommandsGet(context="interface 9") == []
+
+    def test_exit(self):
+
+        config = RunningConfigTree(buffer=runningConfigBuffer)
+        # exit lines close their context and are not commands
+        assert config.CommandsGet(context="interface 2") == ["no shutdown"]
+        assert config.CommandsGet(context="router bgp 1") == [
+            "bgp router-id 1.1.1.1", "address-family ipv6 unicast",
+            "network 10.0.0.0/24"]
+        assert config.CommandsGet(context=("router bgp 1",
+                                           "address-family ipv6 unicast")) \
+            == ["network 2001::/64"]
+        assert config.CommandsMatch(prefix="exit") == []
+        assert config.CommandsMatch(prefix="exit-address-family") == []
+
+    def test_contains_and_match(self):
+
+        config = RunningConfigTree(buffer=runningConfigBuffer)
+        assert config.Contains(command="ip  address 10.0.0.1/24",
+                               context="interface 1") is True
+        assert config.Contains(command="ip address 10.0.0.1/24") is False
+        assert config.Contains(command="ip route 10.0.0.0/24") is False
+
+        assert config.CommandsMatch(prefix="no shutdown") == [
+            (("vlan 10",), "no shutdown"),
+            (("interface 1",), "no shutdown"),
+            (("interface 2",), "no shutdown")]
+        assert config.CommandsMatch(prefix="no shutdown",
+                                    context="interface 2") == \
+            [(("interface 2",), "no shutdown")]
+        assert config.CommandsMatch(prefix="network") == [
+            (("router bgp 1", "address-family ipv6 unicast"),
+             "network 2001::/64"),
+            (("router bgp 1",), "network 10.0.0.0/24")]
+        # Whole words are matched
+        assert config.CommandsMatch(prefix="ip route 20.0.0.0/24 2.2.2.2") \
+            == [((), "ip route 20.0.0.0/24 2.2.2.2 20")]
+        assert config.CommandsMatch(prefix="ip route 10.0.0.0/2") == []
+        assert config.CommandsMatch(prefix="") == []
+
+    def test_diff(self):
+
+        config = RunningConfigTree(buffer=runningConfigBuffer)
+        assert config.Diff(config=RunningConfigTree(
+            buffer=runningConfigBuffer)) == \
+            dict(contextsAdded=[], contextsRemoved=[], commandsAdded=[],
+                 commandsRemoved=[])
+
+        diff = RunningConfigTree(buffer=changedConfigBuffer).Diff(
+            config=config)
+        assert diff['contextsAdded'] == [("interface 3",)]
+        assert diff['contextsRemoved'] == [
+            ("interface 2",),
+            ("router bgp 1", "address-family ipv6 unicast")]
+        assert diff['commandsAdded'] == [((), "interface 3"),
+                                         (("interface 3",), "no shutdown")]
+        assert diff['commandsRemoved'] == [
+            ((), "ip route 20.0.0.0/24 2.2.2.2 20"),
+            ((), "ipv6 route 2001::/64 2002::2"),
+            ((), "interface 2"),
+            (("interface 1",), "no shutdown"),
+            (("interface 2",), "no shutdown"),
+            (("router bgp 1",), "address-family ipv6 unicast"),
+            (("router bgp 1", "address-family ipv6 unicast"),
+             "network 2001::/64")]
+
+    def test_static_route_in_running_config(self):
+
+        config = RunningConfigTree(buffer=runningConfigBuffer)
+        assert if_config_in_running_config(configtype=IPV4_STATIC_ROUTE,
+                                           route="10.0.0.0/24",
+                                           nexthop="1.1.1.10",
+                                           runningConfig=config) is True
+        # A next-hop that is only the start of the configured one is not a
+        # match
+        assert if_config_in_running_config(configtype=IPV4_STATIC_ROUTE,
+                                           route="10.0.0.0/24",
+                                           nexthop="1.1.1.1",
+                                           runningConfig=config) is False
+        assert if_config_in_running_config(configtype=IPV4_STATIC_ROUTE,
+                                           route="20.0.0.0/24",
+                                           nexthop="2.2.2.2",
+                                           runningConfig=config) is True
+        assert if_config_in_running_config(configtype=IPV4_STATIC_ROUTE,
+                                           route="20.0.0.0/24",
+                                           nexthop="2.2.2.2", distance="20",
+                                           runningConfig=config) is True
+        assert if_config_in_running_config(configtype=IPV4_STATIC_ROUTE,
+                                           route="20.0.0.0/24",
+                                           nexthop="2.2.2.2", distance="2",
+                                           runningConfig=config) is False
+        assert if_config_in_running_config(configtype=IPV6_STATIC_ROUTE,
+                                           route="2001::/64",
+                                           nexthop="2002::2",
+                                           runningConfig=config) is True
+        assert if_config_in_running_config(configtype=IPV6_STATIC_ROUTE,
+                                           route="2001::/6",
+                                           nexthop="2002::2",
+                                           runningConfig=config) is False
+
+        # Without a snapshot the running configuration is read off the
+        # switch
+        device = FixtureDevice(runningConfigBuffer)
+        assert if_config_in_running_config(deviceObj=device,
+                                           configtype=IPV4_STATIC_ROUTE,
+                                           route="10.0.0.0/24",
+                                           nexthop="1.1.1.10") is True
+        assert device.commands == ["show running-config"]
@@ -0,0 +1,204 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import os
+import time
+import pytest
+from opstestfw import *
+
+# Show cache tests.  The switches are attached to the local device emulator,
+# a command answered out of the cache is not sent and does not show up in
+# the interaction statistics of the switch.
+topoDict = {"topoTarget": "dut01 dut02",
+            "topoDevices": "dut01 dut02",
+            "topoLinks": "lnk01:dut01:dut02",
+            "topoFilters": "dut01:system-category:switch,\
+                            dut02:system-category:switch"}
+
+
+class LinkStatusNet(object):
+
+    # The emulator has no Mininet network, this records the link changes
+    def __init__(self):
+        self.changes = []
+
+    def configLinkStatus(self, device1, device2, status):
+        self.changes.append((device1, device2, status))
+
+
+def SentCount(deviceObj):
+    return deviceObj.InteractStatsGet()['commands']
+
+
+def ShowSend(deviceObj, **kwargs):
+    retStruct = deviceObj.DeviceInteract(command="show vlan", **kwargs)
+    assert retStruct.get('returnCode') == 0
+    assert deviceObj.device + " line 10 " in retStruct.get('buffer')
+    return retStruct
+
+
+class Test_ft_show_cache:
+
+    def setup_class(cls):
+
+        if TopologyPoolEnabled() is True:
+            pytest.skip("Emulated devices are not pooled - unset VSIWARMPOOL")
+        Test_ft_show_cache.emulatorEnv = os.environ.get('VSIEMULATOR', None)
+        if Test_ft_show_cache.emulatorEnv is None:
+            os.environ['VSIEMULATOR'] = "1"
+        Test_ft_show_cache.testObj = testEnviron(topoDict=topoDict)
+        Test_ft_show_cache.topoObj = Test_ft_show_cache.testObj.topoObjGet()
+        Test_ft_show_cache.dut01Obj = \
+            Test_ft_show_cache.topoObj.deviceObjGet(device="dut01")
+        Test_ft_show_cache.dut02Obj = \
+            Test_ft_show_cache.topoObj.deviceObjGet(device="dut02")
+        for deviceObj in (Test_ft_show_cache.dut01Obj,
+                          Test_ft_show_cache.dut02Obj):
+            retStruct = deviceObj.VtyshShell(enter=True)
+            assert retStruct.returnCode() == 0
+
+    def teardown_class(cls):
+
+        Test_ft_show_cache.topoObj.terminate_nodes()
+        if Test_ft_show_cache.emulatorEnv is None:
+            del os.environ['VSIEMULATOR']
+
+    def setup_method(self, method):
+
+        # Every case starts with an empty cache
+        self.dut01Obj.ShowCacheSet(ttl=60)
+        self.dut02Obj.ShowCacheSet(ttl=60)
+
+    def test_command_class(self):
+
+        classes = [("show vlan", "show"),
+                   ("do show running-config", "show"),
+                   ("", "navigate"),
+                   ("configure terminal", "navigate"),
+                   ("conf  t", "navigate"),
+                   ("exit", "navigate"),
+                   ("end", "navigate"),
+                   ("vtysh", "navigate"),
+                   ("vlan 10", "change"),
+                   ("do vlan 10", "change"),
+                   ("showx", "change"),
+                   ("vtysh -c 'show vlan' -c \"show running-config\"",
+                    "show"),
+                   ("vtysh -c 'show vlan' -c 'conf t'", "change"),
+                   ("vtysh -c 'show vlan' extra", "change"),
+                   ("vtysh -c 'show vlan", "change"),
+                   ("vtysh -c", "change")]
+        for (command, commandClass) in classes:
+            assert self.dut01Obj.CommandClassGet(command=command) == \
+                commandClass, command
+
+    def test_ttl(self):
+
+        sentCount = SentCount(self.dut01Obj)
+        firstStruct = ShowSend(self.dut01Obj)
+        secondStruct = ShowSend(self.dut01Obj)
+        assert SentCount(self.dut01Obj) == sentCount + 1
+        assert secondStruct.get('buffer') == firstStruct.get('buffer')
+        assert self.dut01Obj.santString == firstStruct.get('buffer')
+
+        self.dut01Obj.ShowCacheSet(ttl=0.2)
+        ShowSend(self.dut01Obj)
+        ShowSend(self.dut01Obj)
+        assert SentCount(self.dut01Obj) == sentCount + 2
+        time.sleep(0.3)
+        ShowSend(self.dut01Obj)
+        assert SentCount(self.dut01Obj) == sentCount + 3
+
+        # Without a time to live nothing is cached
+        self.dut01Obj.ShowCacheSet(ttl=None)
+        ShowSend(self.dut01Obj)
+        ShowSend(self.dut01Obj)
+        assert SentCount(self.dut01Obj) == sentCount + 5
+
+    def test_bypass(self):
+
+        sentCount = SentCount(self.dut01Obj)
+        ShowSend(self.dut01Obj)
+        ShowSend(self.dut01Obj, cache=False)
+        assert SentCount(self.dut01Obj) == sentCount + 2
+        # The result read past the cache refreshes it
+        ShowSend(self.dut01Obj)
+        assert SentCount(self.dut01Obj) == sentCount + 2
+
+    def test_config_context(self):
+
+        sentCount = SentCount(self.dut01Obj)
+        ShowSend(self.dut01Obj)
+        # Moving in and out of the config context leaves the cache alone
+        for command in ("configure terminal", "end"):
+            retStruct = self.dut01Obj.DeviceInteract(command=command)
+            assert retStruct.get('returnCode') == 0
+        ShowSend(self.dut01Obj)
+        assert SentCount(self.dut01Obj) == sentCount + 3
+
+        # Results are cached per context
+        self.dut01Obj.DeviceInteract(command="configure terminal")
+        retStruct = self.dut01Obj.DeviceInteract(command="do show vlan")
+        assert retStruct.get('returnCode') == 0
+        self.dut01Obj.DeviceInteract(command="do show vlan")
+        assert SentCount(self.dut01Obj) == sentCount + 5
+
+        # A configuration command drops every cached result
+        self.dut01Obj.DeviceInteract(command="lldp enable")
+        self.dut01Obj.DeviceInteract(command="do show vlan")
+        self.dut01Obj.DeviceInteract(command="end")
+        ShowSend(self.dut01Obj)
+        assert SentCount(self.dut01Obj) == sentCount + 9
+
+    def test_link_events(self):
+
+        ShowSend(self.dut01Obj)
+        ShowSend(self.dut02Obj)
+        sentCount01 = SentCount(self.dut01Obj)
+        sentCount02 = SentCount(self.dut02Obj)
+
+        # A link change drops the cache of the switches on both ends
+        self.topoObj.net = LinkStatusNet()
+        try:
+            retStruct = self.topoObj.VirtualLinkModifyStatus(link="lnk01",
+                                                             status="down")
+            assert retStruct.returnCode() == 0
+            assert self.topoObj.net.changes == [("dut01", "dut02", "down")]
+        finally:
+            self.topoObj.net = None
+        ShowSend(self.dut01Obj)
+        ShowSend(self.dut02Obj)
+        assert SentCount(self.dut01Obj) == sentCount01 + 1
+        assert SentCount(self.dut02Obj) == sentCount02 + 1
+
+        # An event on other switches leaves the cache alone
+        self.topoObj.ShowCachesInvalidate(devices=["dut02"])
+        ShowSend(self.dut01Obj)
+        ShowSend(self.dut02Obj)
+        assert SentCount(self.dut01Obj) == sentCount01 + 1
+        assert SentCount(self.dut02Obj) == sentCount02 + 2
+
+    def test_restart(self):
+
+        ShowSend(self.dut01Obj)
+        # Restarted switches are reconnected, which drops the cache
+        retStruct = self.dut01Obj.Reconnect()
+        assert retStruct.returnCode() == 0
+        assert self.dut01Obj.showCache == dict()
+        retStruct = self.dut01Obj.VtyshShell(enter=True)
+        assert retStruct.returnCode() == 0
+        sentCount = SentCount(self.dut01Obj)
+        ShowSend(self.dut01Obj)
+        assert SentCount(self.dut01Obj) == sentCount + 1
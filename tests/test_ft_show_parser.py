@@ -0,0 +1,362 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import shutil
+import tempfile
+from opstestfw import *
+from opstestfw import gbldata
+from opstestfw.switch.CLI import *
+from opstestfw.switch.OVS import *
+from opstestfw.switch.ShowParser import *
+from opstestfw.host.PacketCapture import PacketCapture
+
+# The show helpers only parse what the device returns, so these cases run
+# them on captured output without a topology.  The expected dictionaries are
+# the output of the helpers before they were ported to ShowParser, run on the
+# same buffers.
+
+lacpStateBuffer = "\r\n".join([
+    "Aggregate-name : lag100",
+    "-------------------------------------------------",
+    "                       Actor          Partner",
+    "-------------------------------------------------",
+    "Port-id            | 17              | 18",
+    "Port-priority      | 1               | 1",
+    "Key                | 100             | 200",
+    "State              | ALFNCD          | PSFO",
+    "System-id          | 70:72:cf:52:54:84 | 70:72:cf:8d:13:b0",
+    "System-priority    | 65534           | 65534", ""])
+
+lacpNoStateBuffer = "\r\n".join([
+    "Aggregate-name : lag100",
+    "Port-id            | 17              | 18",
+    "Key                | 100             | 200",
+    "System-id          | 70:72:cf:52:54:84 | 70:72:cf:8d:13:b0", ""])
+
+lldpPortBuffer = "\r\n".join([
+    "Port                           : 1",
+    "Neighbor entries               : 1",
+    "Neighbor entries deleted       : 0",
+    "Neighbor entries dropped       : 2",
+    "Neighbor entries aged-out      : 3",
+    "Neighbor Chassis-Name          : switch",
+    "Neighbor Chassis-Description   : OpenSwitch 0.1.0",
+    "Neighbor Chassis-ID :70:72:cf:8d:13:b0",
+    "Neighbor Management-Address    : 10.0.0.2",
+    "Chassis Capabilities Available : Bridge, Router",
+    "Chassis Capabilities Enabled   : Bridge",
+    "Neighbor Port-ID               : 4",
+    "TTL :120", ""])
+
+lldpSummaryBuffer = "\r\n".join([
+    "Total neighbor entries : 1",
+    "Total neighbor entries deleted : 0",
+    "Total neighbor entries dropped : 0",
+    "Total neighbor entries aged-out : 0",
+    "",
+    "Local Port     Neighbor Chassis-ID     Neighbor Port-ID     TTL",
+    "1              70:72:cf:8d:13:b0       4                    120",
+    "2", ""])
+
+ovsShowBuffer = "\n".join([
+    "f7a56a4c-6c3e-4a46-bd2a-1b5e2ba4f0a1",
+    "    Bridge bridge_normal",
+    "        VLAN \"VLAN10\"",
+    "            id: 10",
+    "            admin: up",
+    "        Port \"1\"",
+    "            tag: 10",
+    "            Interface \"1\"",
+    "        Port \"2\"",
+    "            trunks: [10, 20]",
+    "            Interface \"2\"",
+    "    Fan \"base-1L\"",
+    "        speed: normal",
+    "        rpm: 9000",
+    "    Temp_sensor \"base-1\"",
+    "        max: 30500",
+    "        temperature: 29000",
+    "    other_config: {\"Product Name\"=\"5712-54X-O-AC-F\", "
+    "base_mac_address=\"70:72:cf:52:54:84\", "
+    "interface_count=\"54\", manufacturer=Accton, vendor=Edgecore}", ""])
+
+ribBuffer = "\r\n".join([
+    "Displaying ipv4 rib entries ",
+    "",
+    "'*' denotes selected",
+    "'[x/y]' denotes [distance/metric]",
+    "",
+    "*10.0.10.0/24,  2 unicast next-hops",
+    "\t*via  10.0.30.1,  [1/0],  static",
+    "\t*via  10.0.40.1,  [1/0],  static",
+    "*10.0.20.0/24,  1 unicast next-hops",
+    "\t*via  10.0.50.1,  [20/0],  BGP",
+    "",
+    "Displaying ipv6 rib entries ",
+    "",
+    "*2001::/64,  1 unicast next-hops",
+    "\t*via  2002::2,  [1/0],  static", ""])
+
+captureBuffer = "\n".join([
+    "Frame 1: 120 bytes on wire (960 bits)",
+    "    [Protocols in frame: eth:ethertype:lldp]",
+    "    Link Layer Discovery Protocol",
+    "        Port Id: 1",
+    "        Time To Live = 120 sec",
+    "        System Name = switch",
+    "        System Description = OpenSwitch 0.1.0",
+    "        Port Description = 1",
+    "        Port VLAN Identifier: 10 (0x000A)",
+    "        VLAN Name: VLAN10",
+    "        VLAN Name: VLAN20",
+    "Frame 2: 98 bytes on wire (784 bits)",
+    "    [Protocols in frame: eth:ethertype:lldp]",
+    "        Port Id: 2",
+    "        System Name = peer2", ""])
+
+lldpPortKeys = ['Neighbor_Entries_Deleted', 'Neighbor_Entries_Dropped',
+                'Neighbor_Entries', 'Neighbor_Chassis-ID',
+                'Neighbor_chassisName', 'Neighbor_chassisDescription',
+                'Chassis_Capabilities_Available', 'Neighbor_Port-ID',
+                'Chassis_Capabilities_Enabled', 'TTL']
+
+
+class FixtureDevice(object):
+
+    # Device returning the same captured output for every command
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.commands = []
+
+    def VtyshShell(self, **kwargs):
+        return returnStruct(returnCode=0, buffer="")
+
+    def DeviceInteract(self, **kwargs):
+        self.commands.append(kwargs.get('command'))
+        return dict(returnCode=0, buffer=self.buffer)
+
+    def FileTransfer(self, src, dst, direction):
+        fileHandle = open(dst, "w")
+        fileHandle.write(self.buffer)
+        fileHandle.close()
+        return 0
+
+
+class Test_ft_show_parser:
+
+    def setup_class(cls):
+
+        Test_ft_show_parser.resultsDir = tempfile.mkdtemp()
+        Test_ft_show_parser.logDir = getattr(gbldata, 'ResultsDirectory',
+                                             None)
+        gbldata.ResultsDirectory = Test_ft_show_parser.resultsDir + "/"
+
+    def teardown_class(cls):
+
+        LogFlush()
+        if Test_ft_show_parser.logDir is None:
+            del gbldata.ResultsDirectory
+        else:
+            gbldata.ResultsDirectory = Test_ft_show_parser.logDir
+        shutil.rmtree(Test_ft_show_parser.resultsDir)
+
+    def test_rule_order(self):
+
+        parser = ShowParser(rules=[("total", "Total\s+(\w+)\s*:\s*(\d+)"),
+                                   ("any", "(\w+)\s*:\s*(\d+)"),
+                                   ("blank", "^\s*$")])
+        # The first rule in the list wins, as in an if / continue cascade
+        assert parser.LineMatch(line="Total entries : 4") == \
+            ("total", ("entries", "4"))
+        assert parser.LineMatch(line="entries : 4") == \
+            ("any", ("entries", "4"))
+        assert parser.LineMatch(line="") == ("blank", ())
+        # Rules are matched at the start of the line only
+        assert parser.LineMatch(line="- entries : 4") is None
+        assert parser.Parse(buffer="entries : 1\r\nnothing\r\nTotal x : 2",
+                            separator="\r\n") == \
+            [("any", ("entries", "1")), ("total", ("x", "2"))]
+
+    def test_strip(self):
+
+        rules = [("port", "Port Id: (\d+)")]
+        assert ShowParser(rules=rules).LineMatch(line="  Port Id: 3") is None
+        assert ShowParser(rules=rules, strip=True).LineMatch(
+            line="  Port Id: 3\r") == ("port", ("3",))
+
+    def test_group_chunks(self):
+
+        # More groups than one regex may hold split the rules over several
+        # regexes without changing which rule matches
+        rules = [("rule%d" % ruleNum, "r%d" % ruleNum + "(a)" * 30 + "$")
+                 for ruleNum in range(8)]
+        rules.append(("last", "r(\d+)"))
+        parser = ShowParser(rules=rules)
+        assert len(parser.chunks) > 1
+        for ruleNum in range(8):
+            assert parser.LineMatch(line="r%d" % ruleNum + "a" * 30) == \
+                ("rule%d" % ruleNum, ("a",) * 30)
+        assert parser.LineMatch(line="r7a") == ("last", ("7",))
+
+    def test_flags(self):
+
+        flags = dict(A="activeFlag", S="shortTimeFlag", P="passiveFlag")
+        assert ShowFlagsGet(value=" AS  ", flags=flags) == \
+            dict(activeFlag=True, shortTimeFlag=True, passiveFlag=False)
+        assert ShowFlagsGet(value="", flags=flags) == \
+            dict(activeFlag=False, shortTimeFlag=False, passiveFlag=False)
+        assert ShowFlagsGet(value="AS") == dict()
+
+    def test_lacp_interface(self):
+
+        device = FixtureDevice(lacpStateBuffer)
+        data = InterfaceLagShow(deviceObj=device, interface=1).data
+        assert device.commands == ["show lacp interface 1"]
+        assert data['localPort'] == dict(
+            lagId="100", portId=" 17              ",
+            key=" 100             ", systemId=" 70:72:cf:52:54:84 ",
+            activeFlag=True, shortTimeFlag=False, collectingFlag=True,
+            stateExpiredFlag=False, passiveFlag=False, longTimeOutFlag=True,
+            distributingFlag=True, aggregableFlag=True, inSyncFlag=True,
+            neighborStateFlag=False, individualFlag=False, outSyncFlag=False)
+        # The state flags differ from the old helper on purpose.  It only
+        # looked for each letter at the start of the column, so the padded
+        # columns decoded as all False, and it decoded the remote flags out
+        # of the local column.
+        assert data['remotePort'] == dict(
+            lagId="100", portId=" 18", key=" 200",
+            systemId=" 70:72:cf:8d:13:b0",
+            activeFlag=False, shortTimeFlag=True, collectingFlag=False,
+            stateExpiredFlag=False, passiveFlag=True, longTimeOutFlag=False,
+            distributingFlag=False, aggregableFlag=True, inSyncFlag=False,
+            neighborStateFlag=False, individualFlag=False, outSyncFlag=True)
+
+    def test_lacp_interface_no_state(self):
+
+        data = InterfaceLagShow(deviceObj=FixtureDevice(lacpNoStateBuffer),
+                                interface=1).data
+        assert data == dict(
+            localPort=dict(lagId="100", portId=" 17              ",
+                           key=" 100             ",
+                           systemId=" 70:72:cf:52:54:84 "),
+            remotePort=dict(lagId="100", portId=" 18", key=" 200",
+                            systemId=" 70:72:cf:8d:13:b0"))
+        # Output with nothing to parse still returns the port dictionaries
+        data = InterfaceLagShow(deviceObj=FixtureDevice(""),
+                                interface=1).data
+        assert data == dict(localPort=dict(), remotePort=dict())
+
+    def test_lldp_neighbor_port(self):
+
+        device = FixtureDevice(lldpPortBuffer)
+        data = ShowLldpNeighborInfo(deviceObj=device, port=1).data
+        assert device.commands == ["show lldp neighbor-info 1"]
+        assert data['globalStats'] == {
+            'Total_Neighbor_Entries': "",
+            'Total_Neighbor_Entries_Deleted': "",
+            'Total_Neighbor_Entries_Dropped': "",
+            'Total_Neighbor_Entries_Aged-out': ""}
+        assert data['portStats'] == {'1': {
+            'Neighbor_Entries': "1",
+            'Neighbor_Entries_Deleted': "0",
+            'Neighbor_Entries_Dropped': "2",
+            'Neighbor_Entries_Aged-out': "3",
+            'Neighbor_chassisName': "switch",
+            'Neighbor_chassisDescription': "OpenSwitch 0.1.0",
+            'Neighbor_chasisID': "70:72:cf:8d:13:b0",
+            'Neighbor_Management_address': "10.0.0.2",
+            'Chassis_Capabilities_Available': "Bridge, Router",
+            'Chassis_Capabilities_Enabled': "Bridge",
+            'Neighbor_portID': "4",
+            'TTL': "120"}}
+
+    def test_lldp_neighbor_summary(self):
+
+        data = ShowLldpNeighborInfo(
+            deviceObj=FixtureDevice(lldpSummaryBuffer)).data
+        assert data['globalStats'] == {
+            'Total_Neighbor_Entries': "1",
+            'Total_Neighbor_Entries_Deleted': "0",
+            'Total_Neighbor_Entries_Dropped': "0",
+            'Total_Neighbor_Entries_Aged-out': "0"}
+        populatedPort = dict((key, "") for key in lldpPortKeys)
+        populatedPort['Neighbor_Chassis-ID'] = "70:72:cf:8d:13:b0"
+        populatedPort['Neighbor_Port-ID'] = "4"
+        populatedPort['TTL'] = "120"
+        assert data['portStats'] == {
+            '1': populatedPort,
+            '2': dict((key, "") for key in lldpPortKeys)}
+
+    def test_ovs_show(self):
+
+        device = FixtureDevice(ovsShowBuffer)
+        data = OvsShow(device=device).data
+        assert device.commands == ["ovs-vsctl show"]
+        assert data['Open_vSwitch_UUID'] == \
+            "f7a56a4c-6c3e-4a46-bd2a-1b5e2ba4f0a1"
+        assert data['Bridge'] == {'bridge_normal': {
+            'Vlans': {'VLAN10': {'id': "10", 'admin': "up"}},
+            'Ports': {'1': {'tag': "10", 'Interface': "1"},
+                      '2': {'trunks': "10, 20", 'Interface': "2"}}}}
+        assert data['Fans'] == {'base-1L': {'speed': "normal",
+                                            'rpm': "9000"}}
+        assert data['Temp_Sensors'] == {'base-1': {'max': "30500",
+                                                   'temperature': "29000"}}
+        assert data['other_config'] == {
+            'Product Name': "5712-54X-O-AC-F",
+            'base_mac_address': "70:72:cf:52:54:84",
+            'interface_count': "54",
+            'manufacturer': "Accton",
+            'vendor': "Edgecore"}
+
+    def test_show_rib(self):
+
+        device = FixtureDevice(ribBuffer)
+        data = get_route_from_show_rib(deviceObj=device,
+                                       route="10.0.10.0/24",
+                                       routetype="static").data
+        assert device.commands == ["show rib"]
+        assert data == {
+            'Route': "10.0.10.0/24",
+            'NumberNexthops': "2",
+            '10.0.30.1': dict(Distance="1", Metric="0", RouteType="static"),
+            '10.0.40.1': dict(Distance="1", Metric="0", RouteType="static")}
+        data = get_route_from_show_rib(deviceObj=device, route="2001::/64",
+                                       routetype="static").data
+        assert data == {
+            'Route': "2001::/64",
+            'NumberNexthops': "1",
+            '2002::2': dict(Distance="1", Metric="0", RouteType="static")}
+        data = get_route_from_show_rib(deviceObj=device,
+                                       route="10.9.9.0/24",
+                                       routetype="static").data
+        assert data == dict(Route="10.9.9.0/24")
+
+    def test_packet_capture(self):
+
+        capture = PacketCapture("wrkston01", "eth1", "lldp.pcap")
+        data = capture.ParseCapture(FixtureDevice(captureBuffer)).data
+        assert data == {'LLDPFrames': {
+            1: {'Protocol': "eth:ethertype:lldp",
+                'PortID': "1",
+                'TimeToLive': "120 sec",
+                'LldpSystemName': "switch",
+                'SystemDescription ': "OpenSwitch 0.1.0",
+                'PortDescr': "1",
+                'PortVLanID': "10 (0x000A)",
+                'VlanNameTLV': ["VLAN10", "VLAN20"]},
+            2: {'Protocol': "eth:ethertype:lldp",
+                'PortID': "2",
+                'LldpSystemName': "peer2"}}}
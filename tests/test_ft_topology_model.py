@@ -0,0 +1,155 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import copy
+import shutil
+import tempfile
+from opstestfw import *
+from opstestfw import gbldata
+
+# The topology model is parsed out of the topology dictionary alone, so
+# these cases need no devices.
+topoDict = {"topoTarget": "dut01 dut02",
+            "topoDevices": "dut01 dut02 wrkston01 wrkston02",
+            "topoLinks": "lnk01:dut01:dut02,\
+                          lnk02:dut01:wrkston01,\
+                          lnk03:dut02:wrkston02",
+            "topoFilters": "dut01:system-category:switch,\
+                            dut02:system-category:switch,\
+                            wrkston01:system-category:workstation,\
+                            wrkston02:system-category:workstation",
+            "topoLinkFilter": "lnk01:dut01:interface:2,\
+                               lnk01:dut02:interface:4,\
+                               lnk02:dut01:interface:6"}
+
+
+class ResultsEnviron(object):
+
+    # Only the results directory of the test environment is used to write
+    # the logical topology XML
+    def __init__(self, resultsDir):
+        self.ResultsDirectory = dict(resultsDir=resultsDir)
+
+
+def LogicalModelBuild(topoDict, resultsDir):
+    # Model of a Topology after the logical topology is created from the
+    # topology dictionary, without bringing any device up
+    topoObj = Topology.__new__(Topology)
+    topoObj.topoDict = topoDict
+    topoObj.runEnv = ResultsEnviron(resultsDir)
+    topoObj.LogicalTopologyCreate()
+    return topoObj.model
+
+
+class Test_ft_topology_model:
+
+    def setup_class(cls):
+
+        Test_ft_topology_model.resultsDir = tempfile.mkdtemp()
+        Test_ft_topology_model.logDir = getattr(gbldata, 'ResultsDirectory',
+                                                None)
+        gbldata.ResultsDirectory = Test_ft_topology_model.resultsDir + "/"
+
+    def teardown_class(cls):
+
+        LogFlush()
+        if Test_ft_topology_model.logDir is None:
+            del gbldata.ResultsDirectory
+        else:
+            gbldata.ResultsDirectory = Test_ft_topology_model.logDir
+        shutil.rmtree(Test_ft_topology_model.resultsDir)
+
+    def test_parse(self):
+
+        model = TopologyModel(topoDict=topoDict)
+        assert model.deviceOrder == ["dut01", "dut02", "wrkston01",
+                                     "wrkston02"]
+        assert model.linkOrder == ["lnk01", "lnk02", "lnk03"]
+        assert model.devices['dut01']['target'] is True
+        assert model.devices['wrkston01']['target'] is False
+        assert model.DeviceCategoryGet(device="dut02") == "switch"
+        assert model.DeviceCategoryGet(device="wrkston02") == "workstation"
+        assert model.DeviceCategoryGet(device="dut09") is None
+        assert model.LinksGet(device="dut01") == ["lnk01", "lnk02"]
+        assert model.LinksGet(device="wrkston02") == ["lnk03"]
+        # Link filters
+        assert model.LinkGet(link="lnk01")['filters'] == \
+            [("dut01", "interface", "2"), ("dut02", "interface", "4")]
+        assert model.LinkGet(link="lnk03")['filters'] == []
+        assert model.devices['dut01']['ports'] == dict(lnk01="2", lnk02="6")
+        assert model.devices['wrkston02']['ports'] == dict()
+        assert model.LinkGet(link="lnk09") is None
+
+    def test_signature(self):
+
+        model = TopologyModel(topoDict=topoDict)
+        sameDict = copy.deepcopy(topoDict)
+        # Whitespace and the order of the filters do not matter
+        sameDict['topoFilters'] = "wrkston02:system-category:workstation," \
+            "wrkston01:system-category:workstation," \
+            "dut02:system-category:switch,dut01:system-category:switch"
+        assert model.Signature() == \
+            TopologyModel(topoDict=sameDict).Signature()
+
+        otherDict = copy.deepcopy(topoDict)
+        otherDict['topoTarget'] = "dut01"
+        assert model.Signature() != \
+            TopologyModel(topoDict=otherDict).Signature()
+
+        otherDict = copy.deepcopy(topoDict)
+        otherDict['topoLinkFilter'] = "lnk01:dut01:interface:3"
+        assert model.Signature() != \
+            TopologyModel(topoDict=otherDict).Signature()
+
+    def test_diff(self):
+
+        model = TopologyModel(topoDict=topoDict)
+        assert model.Diff(model=TopologyModel(topoDict=topoDict)) == \
+            dict(devicesAdded=[], devicesRemoved=[], devicesChanged=[],
+                 linksAdded=[], linksRemoved=[])
+
+        newDict = copy.deepcopy(topoDict)
+        newDict['topoDevices'] = "dut01 dut02 wrkston01 wrkston03"
+        newDict['topoLinks'] = "lnk01:dut01:dut02,lnk02:dut01:wrkston01," \
+            "lnk04:dut02:wrkston03"
+        newDict['topoFilters'] = "dut01:system-category:switch," \
+            "dut02:system-category:switch," \
+            "wrkston01:system-category:host," \
+            "wrkston03:system-category:workstation"
+        # lnk01 moves to other ports, lnk02 keeps its filter
+        newDict['topoLinkFilter'] = "lnk01:dut01:interface:3," \
+            "lnk01:dut02:interface:4,lnk02:dut01:interface:6"
+        diff = model.Diff(model=TopologyModel(topoDict=newDict))
+        assert diff['devicesAdded'] == ["wrkston03"]
+        assert diff['devicesRemoved'] == ["wrkston02"]
+        assert diff['devicesChanged'] == ["wrkston01"]
+        assert diff['linksRemoved'] == ["lnk01", "lnk03"]
+        assert diff['linksAdded'] == ["lnk01", "lnk04"]
+
+    def test_diff_after_logical_topology(self):
+
+        model = LogicalModelBuild(topoDict, self.resultsDir)
+        # The default system-profile of the workstations is reported with
+        # their attributes
+        assert model.DeviceAttrsGet(device="wrkston01")['system-profile'] == \
+            "auto-ubuntu-12-04"
+        assert 'system-profile' not in \
+            model.devices['wrkston01']['attributes']
+        # but the model still matches a fresh parse of the same dictionary
+        freshModel = TopologyModel(topoDict=topoDict)
+        assert model.Diff(model=freshModel) == \
+            dict(devicesAdded=[], devicesRemoved=[], devicesChanged=[],
+                 linksAdded=[], linksRemoved=[])
+        assert model.Signature() == freshModel.Signature()
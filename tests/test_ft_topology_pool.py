@@ -0,0 +1,93 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import copy
+import shutil
+import tempfile
+from opstestfw import *
+from opstestfw import gbldata
+
+# The pool only looks at the model of a parked topology, so the parked
+# topologies here have their logical topology created and nothing else.
+topoDict = {"topoTarget": "dut01",
+            "topoDevices": "dut01 wrkston01",
+            "topoLinks": "lnk01:dut01:wrkston01",
+            "topoFilters": "dut01:system-category:switch,\
+                            wrkston01:system-category:workstation"}
+
+
+class ResultsEnviron(object):
+
+    # Only the results directory of the test environment is used to write
+    # the logical topology XML
+    def __init__(self, resultsDir):
+        self.ResultsDirectory = dict(resultsDir=resultsDir)
+
+
+def LogicalTopologyBuild(topoDict, resultsDir):
+    topoObj = Topology.__new__(Topology)
+    topoObj.topoDict = topoDict
+    topoObj.runEnv = ResultsEnviron(resultsDir)
+    topoObj.LogicalTopologyCreate()
+    return topoObj
+
+
+class Test_ft_topology_pool:
+
+    def setup_class(cls):
+
+        Test_ft_topology_pool.resultsDir = tempfile.mkdtemp()
+        Test_ft_topology_pool.logDir = getattr(gbldata, 'ResultsDirectory',
+                                               None)
+        gbldata.ResultsDirectory = Test_ft_topology_pool.resultsDir + "/"
+
+    def teardown_class(cls):
+
+        LogFlush()
+        if Test_ft_topology_pool.logDir is None:
+            del gbldata.ResultsDirectory
+        else:
+            gbldata.ResultsDirectory = Test_ft_topology_pool.logDir
+        shutil.rmtree(Test_ft_topology_pool.resultsDir)
+
+    def test_checkout_same_topology(self):
+
+        pool = TopologyPool()
+        topoObj = LogicalTopologyBuild(topoDict, self.resultsDir)
+        pool.park(topoObj)
+        assert pool.checkout(topoDict=copy.deepcopy(topoDict)) is topoObj
+        # Checked out topologies leave the pool
+        assert pool.checkout(topoDict=topoDict) is None
+
+    def test_checkout_reconfigured_topology(self):
+
+        pool = TopologyPool()
+        topoObj = LogicalTopologyBuild(topoDict, self.resultsDir)
+        pool.park(topoObj)
+        # One more link to the workstation, the parked topology is picked
+        # and reconfigured
+        newDict = copy.deepcopy(topoDict)
+        newDict['topoLinks'] = "lnk01:dut01:wrkston01,lnk02:dut01:wrkston01"
+        assert pool.checkout(topoDict=newDict) is topoObj
+
+    def test_checkout_changed_attributes(self):
+
+        pool = TopologyPool()
+        pool.park(LogicalTopologyBuild(topoDict, self.resultsDir))
+        newDict = copy.deepcopy(topoDict)
+        newDict['topoFilters'] = "dut01:system-category:switch," \
+            "wrkston01:system-category:workstation," \
+            "wrkston01:docker-image:centos"
+        assert pool.checkout(topoDict=newDict) is None
@@ -0,0 +1,108 @@
+# (C) Copyright 2015 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+import os
+import pytest
+from opstestfw import *
+
+# Bring-up benchmark.  Every topology shape is brought up and torn down at
+# increasing sizes and the time spent in each phase is logged.  The sizes
+# come from the VSIBENCHSIZES environment variable.  Devices are connected
+# during the bring-up so the connect and default context phases are timed.
+benchSizes = [int(curSize) for curSize in
+              str.split(os.environ.get('VSIBENCHSIZES', "2 4 8"))]
+
+benchPhases = ["xmlModel", "mininetBuild", "linkCreate", "mininetStart",
+               "connect", "defaultContext", "teardown"]
+
+
+def TopologyBenchmark(shape, topoDicts):
+    # topoDicts is a list of (size, topology dictionary, device count,
+    # link count)
+    results = []
+    for (size, topoDict, deviceCount, linkCount) in topoDicts:
+        model = TopologyModel(topoDict=topoDict)
+        assert len(model.deviceOrder) == deviceCount
+        assert len(model.linkOrder) == linkCount
+        testObj = testEnviron(topoDict=topoDict)
+        topoObj = testObj.topoObjGet()
+        connected = [deviceName for deviceName in model.deviceOrder
+                     if topoObj.deviceObj[deviceName].Connected() is True]
+        topoObj.TopologyDestroy()
+        assert connected == model.deviceOrder
+        for curPhase in benchPhases:
+            assert topoObj.phaseTimes.get(curPhase, -1.0) >= 0.0
+        results.append((size, topoObj.phaseTimes))
+
+    LogOutput('info', "Bring-up timings in seconds for " + shape)
+    LogOutput('info', "%-6s" % "size" + "".join(["%15s" % curPhase
+                                                 for curPhase in benchPhases]))
+    for (size, phaseTimes) in results:
+        LogOutput('info', "%-6d" % size
+                  + "".join(["%15.2f" % phaseTimes.get(curPhase, 0.0)
+                             for curPhase in benchPhases]))
+
+
+class Test_ft_topology_scale:
+
+    def setup_class(cls):
+
+        if TopologyPoolEnabled() is True:
+            pytest.skip("Benchmark needs cold bring-ups - unset VSIWARMPOOL")
+        Test_ft_topology_scale.eagerConnect = \
+            os.environ.get('VSIEAGERCONNECT', None)
+        os.environ['VSIEAGERCONNECT'] = "1"
+
+    def teardown_class(cls):
+
+        if Test_ft_topology_scale.eagerConnect is None:
+            del os.environ['VSIEAGERCONNECT']
+        else:
+            os.environ['VSIEAGERCONNECT'] = \
+                Test_ft_topology_scale.eagerConnect
+
+    def test_line(self):
+
+        TopologyBenchmark("line",
+                          [(size, TopoDictLine(switches=size), size, size - 1)
+                           for size in benchSizes])
+
+    def test_ring(self):
+
+        TopologyBenchmark("ring",
+                          [(size, TopoDictRing(switches=size), size, size)
+                           for size in benchSizes if size >= 3])
+
+    def test_mesh(self):
+
+        TopologyBenchmark("full mesh",
+                          [(size, TopoDictMesh(switches=size), size,
+                            size * (size - 1) / 2)
+                           for size in benchSizes])
+
+    def test_leaf_spine(self):
+
+        TopologyBenchmark("leaf-spine (2 spines, 1 workstation per leaf)",
+                          [(size, TopoDictLeafSpine(spines=2, leaves=size,
+                                                    workstations=1),
+                            2 + size * 2, size * 3)
+                           for size in benchSizes])
+
+    def test_star(self):
+
+        TopologyBenchmark("star",
+                          [(size, TopoDictStar(workstations=size),
+                            size + 1, size)
+                           for size in benchSizes])